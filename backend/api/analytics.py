@@ -1,58 +1,142 @@
 # backend/api/analytics.py
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select, func, extract
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select, func, extract, union_all
 from sqlalchemy.orm import Session, joinedload
 
+from backend.core.columnar import ARROW_STREAM, ArrowColumn, arrow_response, wants_arrow
+from backend.core.metrics import InstrumentedRoute, timed_serialization
 from backend.db.session import get_db
-from backend.db.models import Report, ServiceArea, Category, Severity, StatusUpdate, Assignment
+from backend.db.models import (
+    Report, ServiceArea, Category, Severity, StatusUpdate, Assignment,
+    ReportArchive, StatusUpdateArchive, AssignmentArchive
+)
 from backend.schemas import reports,analytics as schemas
+from backend.services import analytics_service, columnar_store, spike_detector
+
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=InstrumentedRoute)
+
+# Arrow IPC is offered on tabular endpoints (see backend/core/columnar.py)
+_ARROW_RESPONSES = {200: {"content": {ARROW_STREAM: {}}, "description": "JSON, or Arrow IPC stream when requested via Accept"}}
+
+HOTSPOT_COLUMNS = [
+    ArrowColumn("area_id", "int64"),
+    ArrowColumn("category_id", "int64"),
+    ArrowColumn("report_count", "int64"),
+]
+
+_HOTSPOT_LIST = TypeAdapter(List[schemas.HotSpots])
+
+# Every endpoint builds a finished Response and hands it to
+# analytics_service.shared_response, which coalesces identical concurrent
+# requests and caches the body briefly (X-Cache: hit / miss / coalesced).
+
+
+def _json(body: BaseModel, headers: Optional[dict] = None) -> Response:
+    with timed_serialization():
+        return Response(content=body.model_dump_json(), media_type="application/json", headers=headers)
+
+
+# ?source=columnar answers from the Parquet copy (backend/services/columnar_store.py),
+# which trails Postgres by up to one sync; X-Columnar-Synced-At says how far
+Source = Literal["postgres", "columnar"]
+_SOURCE = Query("postgres", description="postgres (live), or columnar (Parquet copy as of the last columnar-sync)")
+
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+def _synced_header(as_of: str) -> dict:
+    return {"X-Columnar-Synced-At": as_of}
 
 # -----------
 # READ: Hot Spots
 # -----------
 
-@router.get("/hotspots", response_model=List[schemas.HotSpots])
-def list_hotspots(db: Session = Depends(get_db)):
+@router.get("/hotspots", response_model=List[schemas.HotSpots], responses=_ARROW_RESPONSES)
+def list_hotspots(request: Request, source: Source = _SOURCE, db: Session = Depends(get_db)):
+    build = _columnar_hotspots if source == "columnar" else _hotspots
+    return analytics_service.shared_response(db, request, lambda: build(db, request))
+
+
+def _columnar_hotspots(db: Session, request: Request) -> Response:
+    rows, as_of = columnar_store.hotspots()
+    if wants_arrow(request):
+        return arrow_response(HOTSPOT_COLUMNS, rows, headers=_synced_header(as_of))
+    with timed_serialization():
+        body = _HOTSPOT_LIST.dump_json([schemas.HotSpots(area_id=a, category_id=c, report_count=n) for a, c, n in rows])
+    return Response(content=body, media_type="application/json", headers=_synced_header(as_of))
+
+
+def _hotspots(db: Session, request: Request) -> Response:
+    # hot + archived reports (db/Archive.sql)
+    all_reports = union_all(
+        select(Report.area_id, Report.category_id),
+        select(ReportArchive.area_id, ReportArchive.category_id)
+    ).subquery("all_reports")
+
     stmt = (
     select(
-        Report.area_id,
-        Report.category_id,
-        func.count(Report.report_id).label("report_count")
+        all_reports.c.area_id,
+        all_reports.c.category_id,
+        func.count().label("report_count")
     )
-    .join(ServiceArea, Report.area_id == ServiceArea.area_id)
-    .join(Category, Report.category_id == Category.category_id)
-    .group_by(Report.area_id, Report.category_id)
-    .order_by(Report.area_id, Report.category_id)
+    .join(ServiceArea, all_reports.c.area_id == ServiceArea.area_id)
+    .join(Category, all_reports.c.category_id == Category.category_id)
+    .group_by(all_reports.c.area_id, all_reports.c.category_id)
+    .order_by(all_reports.c.area_id, all_reports.c.category_id)
 )
+    if wants_arrow(request):
+        return arrow_response(HOTSPOT_COLUMNS, db.execute(stmt).all())
+
     areas = db.execute(stmt).mappings().all()
-    return areas
+    with timed_serialization():
+        return Response(content=_HOTSPOT_LIST.dump_json(_HOTSPOT_LIST.validate_python(areas)), media_type="application/json")
 
 # -----------
 # READ: Average Resolution Times
 # -----------
 
-@router.get("/resolution-times", response_model=schemas.ResolutionTimes)
-def avg_resolution_time(db: Session = Depends(get_db)):
-    resolved_reports_cte = (
+def _resolved_reports(assignment, status_update):
+    """(report_id, accepted_at, resolved_at) for one storage tier."""
+    return (
         select(
-            Assignment.report_id,
-            Assignment.accepted_at,
-            func.max(StatusUpdate.changed_at).label("resolved_at")
+            assignment.report_id,
+            assignment.accepted_at,
+            func.max(status_update.changed_at).label("resolved_at")
         )
-        .join(StatusUpdate, Assignment.report_id == StatusUpdate.report_id)
+        .join(status_update, assignment.report_id == status_update.report_id)
         .where(
-            Assignment.is_active == False,
-            StatusUpdate.status.in_(["RESOLVED", "CLOSED"]),
-            Assignment.accepted_at.isnot(None)
+            assignment.is_active == False,
+            status_update.status.in_(["RESOLVED", "CLOSED"]),
+            assignment.accepted_at.isnot(None)
         )
-        .group_by(Assignment.report_id, Assignment.accepted_at)
-        .cte("resolved_reports")
+        .group_by(assignment.report_id, assignment.accepted_at)
+    )
+
+
+@router.get("/resolution-times", response_model=schemas.ResolutionTimes)
+def avg_resolution_time(request: Request, source: Source = _SOURCE, db: Session = Depends(get_db)):
+    build = _columnar_resolution_times if source == "columnar" else _resolution_times
+    return analytics_service.shared_response(db, request, lambda: build(db))
+
+
+def _columnar_resolution_times(db: Session) -> Response:
+    result, as_of = columnar_store.avg_resolution_days()
+    return _json(
+        schemas.ResolutionTimes(avg_resolution_days=round(float(result), 2) if result else 0.0),
+        headers=_synced_header(as_of)
     )
 
+
+def _resolution_times(db: Session) -> Response:
+    # a report and its children always live in the same tier, so each tier
+    # is resolved on its own and the results are concatenated
+    resolved_reports_cte = union_all(
+        _resolved_reports(Assignment, StatusUpdate),
+        _resolved_reports(AssignmentArchive, StatusUpdateArchive)
+    ).cte("resolved_reports")
+
     # Final query: average resolution in days
     stmt = select(
         func.avg(
@@ -61,4 +145,96 @@ def avg_resolution_time(db: Session = Depends(get_db)):
     )
 
     result = db.execute(stmt).scalar()
-    return {"avg_resolution_days": round(float(result),2) if result else 0.0}
\ No newline at end of file
+    return _json(schemas.ResolutionTimes(avg_resolution_days=round(float(result),2) if result else 0.0))
+
+# -----------
+# READ: Time Series
+# -----------
+
+@router.get("/timeseries", response_model=schemas.TimeSeries, responses=_ARROW_RESPONSES)
+def timeseries(
+    request: Request,
+    interval: Literal["hour", "day", "week"] = Query("day"),
+    group_by: Literal["category", "area", "status"] = Query("category"),
+    since: Optional[datetime] = Query(None, description="Inclusive start (UTC); defaults to 30 days before until"),
+    until: Optional[datetime] = Query(None, description="Exclusive end (UTC); defaults to now"),
+    db: Session = Depends(get_db)
+):
+    """
+    Report activity per bucket, read from pre-aggregated buckets
+    (db/Timeseries.sql). category / area count reports created; status
+    counts transitions into each status. Empty buckets are omitted.
+    """
+    since, until = analytics_service.resolve_window(interval, since, until)
+
+    def build() -> Response:
+        rows = analytics_service.timeseries_rows(db, interval, group_by, since, until)
+        if wants_arrow(request):
+            return arrow_response(analytics_service.TIMESERIES_COLUMNS, rows)
+        return _json(schemas.TimeSeries(
+            interval=interval,
+            group_by=group_by,
+            since=since,
+            until=until,
+            points=[schemas.TimeSeriesPoint.model_validate(r) for r in rows]
+        ))
+
+    return analytics_service.shared_response(db, request, build)
+
+
+# -----------
+# READ: Repair costs
+# -----------
+
+@router.get("/costs", response_model=schemas.CostBreakdown, responses=_ARROW_RESPONSES)
+def costs(
+    request: Request,
+    group_by: Literal["department", "category", "area", "none"] = Query("department"),
+    interval: Literal["month", "total"] = Query("month"),
+    since: Optional[datetime] = Query(None, description="Inclusive start (UTC, aligned to its month); defaults to 11 months before the current one"),
+    until: Optional[datetime] = Query(None, description="Exclusive end (UTC); defaults to now"),
+    db: Session = Depends(get_db)
+):
+    """
+    Work-order estimate vs actual, parts spend and cost per resolved report,
+    by month of work-order opening, read from the work_order_cost_monthly
+    rollup (db/Costs.sql).
+    """
+    since, until = analytics_service.resolve_cost_window(since, until)
+
+    def build() -> Response:
+        rows = analytics_service.cost_rows(db, group_by, interval, since, until)
+        if wants_arrow(request):
+            return arrow_response(analytics_service.COST_COLUMNS, rows)
+        return _json(schemas.CostBreakdown(
+            group_by=group_by,
+            interval=interval,
+            since=since,
+            until=until,
+            rows=[schemas.CostRow.model_validate(r) for r in rows]
+        ))
+
+    return analytics_service.shared_response(db, request, build)
+
+
+# -----------
+# READ: Spikes
+# -----------
+
+@router.get("/spikes", response_model=schemas.Spikes)
+def spikes(
+    dimension: Optional[Literal["area_category", "area", "cell"]] = Query(None, description="Only this dimension; all three by default"),
+    z: float = Query(spike_detector.DEFAULT_Z, ge=1.0, description="Minimum deviation from the seasonal baseline"),
+    min_count: int = Query(spike_detector.DEFAULT_MIN_COUNT, ge=1, description="Minimum reports in the window"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Areas, (area, category) pairs and geohash cells whose report count over
+    the previous and the current bucket is well above their seasonal EWMA
+    baseline, highest z first (backend/services/spike_detector.py). Answered
+    from this worker's in-memory rates after reading in new reports, so it is
+    not cached: 501 without numpy, 503 until the baselines are built.
+    """
+    detector, found, now = spike_detector.detect(db, z, min_count, dimension)
+    return _json(schemas.Spikes(**spike_detector.describe(detector, found[:limit], now)))
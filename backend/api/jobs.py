@@ -0,0 +1,67 @@
+# backend/api/jobs.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from backend.core.metrics import InstrumentedRoute
+from backend.db.session import get_db
+from backend.schemas import jobs as schemas
+from backend.services import job_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=InstrumentedRoute)
+
+
+# -----------
+# READ
+# -----------
+
+@router.get("/types", response_model=List[schemas.JobTypeOut])
+def list_job_types():
+    # what can be submitted, with each type's params schema and concurrency limit
+    return job_service.list_job_types()
+
+
+@router.get("/", response_model=List[schemas.JobOut])
+def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status", description="QUEUED, RUNNING, SUCCEEDED, FAILED or CANCELLED"),
+    job_type: Optional[str] = Query(None),
+    before: Optional[int] = Query(None, description="job_id of the last job on the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    return job_service.list_jobs(db=db, status_filter=status_filter, job_type=job_type, before=before, limit=limit)
+
+
+@router.get("/{job_id}", response_model=schemas.JobOut)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    # poll this: status, progress, and once finished the result summary or error
+    return job_service.get_job(db=db, job_id=job_id)
+
+
+@router.get(
+    "/{job_id}/result",
+    response_class=FileResponse,
+    responses={200: {"content": {"text/csv": {}}, "description": "The job's result file"}}
+)
+def get_job_result(job_id: int, db: Session = Depends(get_db)):
+    path = job_service.result_file(db=db, job_id=job_id)
+    return FileResponse(path, media_type="text/csv", filename=f"job-{job_id}.csv")
+
+
+# -----------
+# WRITE
+# -----------
+
+@router.post("/", response_model=schemas.JobOut, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(payload: schemas.JobCreate, response: Response, db: Session = Depends(get_db)):
+    # queued only; a worker (`python -m backend.manage worker`) runs it
+    job = job_service.submit_job(db=db, payload=payload)
+    response.headers["Location"] = f"/jobs/{job.job_id}"
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=schemas.JobOut)
+def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    return job_service.cancel_job(db=db, job_id=job_id)
@@ -1,41 +1,36 @@
 # backend/api/refdata.py
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 
+from backend.core.metrics import InstrumentedRoute
 from backend.db.session import get_db
-from backend.db.models import ServiceArea, Category, Severity
 from backend.schemas import reports as schemas
+from backend.services import refdata_service
+from backend.services.status_machine import REPORT_STATUSES, TRANSITIONS
 
-router = APIRouter(prefix="", tags=["reference"])
+router = APIRouter(prefix="", tags=["reference"], route_class=InstrumentedRoute)
 
 
 @router.get("/service-areas", response_model=list[schemas.ServiceAreaOut])
 def list_service_areas(db: Session = Depends(get_db)):
-    stmt = select(ServiceArea).order_by(ServiceArea.name)
-    areas = db.execute(stmt).scalars().all()
-    return areas
+    return Response(content=refdata_service.service_areas_json(db), media_type="application/json")
 
 @router.get("/categories", response_model=list[schemas.CategoryOut])
 def list_categories(db: Session = Depends(get_db)):
-    stmt = select(Category).order_by(Category.name)
-    categories = db.execute(stmt).scalars().all()
-    return categories
+    return Response(content=refdata_service.categories_json(db), media_type="application/json")
 
 @router.get("/severities", response_model=list[schemas.SeverityOut])
 def list_severities(db: Session = Depends(get_db)):
-    stmt = select(Severity).order_by(Severity.weight.desc())
-    severities = db.execute(stmt).scalars().all()
-    return severities
+    return Response(content=refdata_service.severities_json(db), media_type="application/json")
 
 @router.get("/statuses", response_model=list[str])
 def list_statuses():
-    return [
-        "SUBMITTED",
-        "TRIAGED",
-        "IN_PROGRESS",
-        "ON_HOLD",
-        "RESOLVED",
-        "CLOSED",
-        "MERGED"
-    ]
+    return list(REPORT_STATUSES)
+
+@router.get("/statuses/transitions", response_model=dict[str, list[str]])
+def list_status_transitions():
+    # allowed next statuses per status, in REPORT_STATUSES order
+    return {
+        current: [s for s in REPORT_STATUSES if s in TRANSITIONS[current]]
+        for current in REPORT_STATUSES
+    }
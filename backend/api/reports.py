@@ -1,34 +1,182 @@
 # backend/api/reports.py
+import tempfile
+import time
+from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from backend.core.cache import etag_matches, make_etag, query_fingerprint
+from backend.core.columnar import ARROW_STREAM, wants_arrow
+from backend.core.metrics import InstrumentedRoute
 from backend.db.session import get_db
 from backend.schemas import reports as schemas
 from backend.services import report_service
 
-router = APIRouter(prefix="/reports", tags=["reports"])
+router = APIRouter(prefix="/reports", tags=["reports"], route_class=InstrumentedRoute)
+
+# clients may reuse a cached body but must revalidate it (cheap: one version lookup)
+_REVALIDATE = "no-cache"
+
+# breaching= and the facet toggle counts move with the clock, not only with
+# writes; their ETags also carry the current period of this many seconds
+_CLOCK_ETAG_SECONDS = 60
+
+# GET /reports/export spools its CSV in memory up to this size, then on disk
+_EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    # a 304 repeats the Vary the 200 would carry, or shared caches may mix variants
+    headers = {"ETag": etag, "Cache-Control": _REVALIDATE}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
 
 # -----------
 # READ: list
 # -----------
 
-@router.get("/", response_model=List[schemas.ReportSummary])
+@router.get(
+    "/",
+    response_model=List[schemas.ReportSummary],
+    responses={200: {"content": {ARROW_STREAM: {}}, "description": "JSON, or Arrow IPC stream when requested via Accept"}}
+)
 def list_reports(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(None, description="Search by title substring"),
     area_id: Optional[int] = Query(None),
     category_id: Optional[int] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
+    severity_id: Optional[int] = Query(None),
+    created_after: Optional[datetime] = Query(None, description="Only reports created at or after this time"),
+    open_only: bool = Query(False, alias="open", description="Only open reports (SUBMITTED, TRIAGED, IN_PROGRESS, ON_HOLD)"),
+    breaching: bool = Query(False, description="Only open reports older than their category's SLA"),
+    include_archived: bool = Query(False, description="Also list archived reports (always on for status=CLOSED / RESOLVED)"),
+    facets: bool = Query(False, description="Return one ReportPage (JSON): a page of results, the total and counts per status / area / category / severity"),
+    cursor: Optional[str] = Query(None, description="With facets: next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500, description="With facets: page size"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return (e.g. report_id,latitude,longitude,current_status); default: the ReportSummary fields"),
     db: Session = Depends(get_db)
 ):
-    return report_service.list_reports(
-        db=db,
+    fieldset = report_service.parse_fieldset(fields, list(report_service.LIST_FIELDS), "fields")
+    if fieldset and facets:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="fields= cannot be combined with facets=true"
+        )
+
+    # ETag = global report-table version + normalized query + representation
+    as_arrow = wants_arrow(request) and not facets
+    table_version = report_service.get_report_table_version(db)
+    clock_parts = ()
+    if breaching or (facets and not cursor):
+        clock_parts = (int(time.time() // _CLOCK_ETAG_SECONDS),)
+    etag = make_etag(
+        "reports",
+        table_version,
+        query_fingerprint(request.query_params.multi_items()),
+        "arrow" if as_arrow else "json",
+        *clock_parts
+    )
+    if etag_matches(request, etag):
+        return _not_modified(etag, vary="Accept")
+
+    headers = {"ETag": etag, "Cache-Control": _REVALIDATE, "Vary": "Accept"}
+    filters = dict(
         search=search,
         area_id=area_id,
         category_id=category_id,
-        status_filter=status_filter
+        status_filter=status_filter,
+        include_archived=include_archived,
+        severity_id=severity_id,
+        created_after=created_after,
+        open_only=open_only,
+        breaching=breaching
+    )
+
+    if facets:
+        page = report_service.list_report_page(db=db, cursor=cursor, limit=limit, **filters)
+        return Response(
+            content=page.model_dump_json(),
+            media_type="application/json",
+            headers=headers
+        )
+
+    if fieldset:
+        rows = report_service.list_report_field_rows(db=db, fields=fieldset, **filters)
+        if as_arrow:
+            return Response(content=report_service.report_fields_arrow(fieldset, rows), media_type=ARROW_STREAM, headers=headers)
+        return Response(content=report_service.report_fields_json(fieldset, rows), media_type="application/json", headers=headers)
+
+    if as_arrow:
+        return Response(
+            content=report_service.list_reports_arrow(db=db, **filters),
+            media_type=ARROW_STREAM,
+            headers=headers
+        )
+
+    response.headers.update(headers)
+    return report_service.list_reports(db=db, **filters)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}}, "description": "The filtered report list as CSV"}}
+)
+def export_reports(
+    search: Optional[str] = Query(None, description="Search by title substring"),
+    area_id: Optional[int] = Query(None),
+    category_id: Optional[int] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    severity_id: Optional[int] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    open_only: bool = Query(False, alias="open"),
+    breaching: bool = Query(False),
+    include_archived: bool = Query(False),
+    fields: Optional[str] = Query(None, description="Comma-separated columns; default: all list fields"),
+    db: Session = Depends(get_db)
+):
+    """
+    The export-reports job's CSV, written inside the request: the fallback
+    when no job worker picks the job up. Runs in the analytics lane, so its
+    statement timeout bounds it; large exports belong in the job.
+    """
+    fieldset = report_service.parse_fieldset(fields, list(report_service.LIST_FIELDS), "fields") or tuple(report_service.LIST_FIELDS)
+    out = tempfile.SpooledTemporaryFile(max_size=_EXPORT_SPOOL_BYTES)
+    try:
+        report_service.export_report_csv(
+            db, out, fieldset,
+            search=search,
+            area_id=area_id,
+            category_id=category_id,
+            status_filter=status_filter,
+            include_archived=include_archived,
+            severity_id=severity_id,
+            created_after=created_after,
+            open_only=open_only,
+            breaching=breaching
+        )
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
+
+    def chunks():
+        with out:
+            while chunk := out.read(_EXPORT_CHUNK_BYTES):
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="reports.csv"'}
     )
 
 
@@ -39,9 +187,62 @@ def list_reports(
 @router.get("/{report_id}", response_model=schemas.ReportDetail)
 def get_report(
     report_id: int,
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated top-level fields to return; default: all"),
+    include: Optional[str] = Query(None, description="Comma-separated embeds: category, service_area, severity, status_history; default: all, but none when fields= is given"),
+    db: Session = Depends(get_db)
+):
+    fieldset = report_service.parse_fieldset(fields, report_service.DETAIL_FIELDS, "fields")
+    embeds = report_service.parse_fieldset(include, report_service.DETAIL_INCLUDES, "include")
+
+    # ETag = per-report row_version; a match costs one PK lookup and no joins
+    version = report_service.get_report_version(db=db, report_id=report_id)
+    # either parameter selects the sparse shape: a missing fields= means all
+    # fields, a missing include= means no embeds (fields= alone stays lean)
+    if fieldset is not None or embeds is not None:
+        return _sparse_report(db, request, report_id, version, fieldset or report_service.DETAIL_FIELDS, embeds or ())
+
+    if etag_matches(request, make_etag("report", report_id, version)):
+        return _not_modified(make_etag("report", report_id, version))
+
+    body, version = report_service.get_report_detail_json(db=db, report_id=report_id, version=version)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": make_etag("report", report_id, version), "Cache-Control": _REVALIDATE}
+    )
+
+
+def _sparse_report(db: Session, request: Request, report_id: int, version: int, fieldset, embeds) -> Response:
+    # same row_version validator, qualified by the selected shape
+    etag = make_etag("report", report_id, version, query_fingerprint([("fields", ",".join(fieldset)), ("include", ",".join(embeds))]))
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+
+    return Response(
+        content=report_service.get_report_sparse_json(db=db, report_id=report_id, fields=fieldset, include=embeds),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": _REVALIDATE}
+    )
+
+
+# ---------------
+# READ: history
+# ---------------
+
+@router.get("/{report_id}/history", response_model=schemas.StatusHistoryPage)
+def get_report_history(
+    report_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
-    return report_service.get_report_detail(db=db, report_id=report_id)
+    return report_service.get_report_history(
+        db=db,
+        report_id=report_id,
+        cursor=cursor,
+        limit=limit
+    )
 
 
 # ---------------
@@ -60,6 +261,14 @@ def create_report(
 # UPDATE: change report status
 # ----------------------------
 
+@router.put("/status", response_model=schemas.BulkStatusResult)
+def bulk_update_report_status(
+    payload: schemas.BulkStatusRequest,
+    db: Session = Depends(get_db)
+):
+    # per-item outcomes; rejected items do not fail the request
+    return report_service.bulk_update_status(db=db, payload=payload)
+
 @router.put("/{report_id}/status", response_model=schemas.StatusUpdateOut)
 def update_report_status(
     report_id: int,
@@ -73,6 +282,39 @@ def update_report_status(
     )
 
 
+# ------------------------------------
+# CREATE / DELETE: comments, subscribers
+# ------------------------------------
+
+@router.post("/{report_id}/comments", response_model=schemas.CommentOut, status_code=status.HTTP_201_CREATED)
+def add_report_comment(
+    report_id: int,
+    payload: schemas.CommentCreate,
+    db: Session = Depends(get_db)
+):
+    return report_service.add_comment(db=db, report_id=report_id, payload=payload)
+
+
+@router.post("/{report_id}/subscriptions", status_code=status.HTTP_204_NO_CONTENT)
+def subscribe_to_report(
+    report_id: int,
+    payload: schemas.SubscriptionRequest,
+    db: Session = Depends(get_db)
+):
+    report_service.subscribe(db=db, report_id=report_id, user_id=payload.user_id)
+    return
+
+
+@router.delete("/{report_id}/subscriptions/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def unsubscribe_from_report(
+    report_id: int,
+    user_id: int,
+    db: Session = Depends(get_db)
+):
+    report_service.unsubscribe(db=db, report_id=report_id, user_id=user_id)
+    return
+
+
 # ---------------
 # DELETE: report
 # ---------------
@@ -0,0 +1,27 @@
+# backend/api/users.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from backend.core.metrics import InstrumentedRoute
+from backend.db.session import get_db
+from backend.schemas import feed as schemas
+from backend.services import feed_service
+
+router = APIRouter(prefix="/users", tags=["users"], route_class=InstrumentedRoute)
+
+
+# ----------------------
+# READ: activity feed
+# ----------------------
+
+@router.get("/{user_id}/feed", response_model=schemas.FeedPage)
+def get_user_feed(
+    user_id: int,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    # status changes and comments on the reports this user subscribes to
+    return feed_service.get_user_feed(db=db, user_id=user_id, cursor=cursor, limit=limit)
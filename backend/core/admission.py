@@ -0,0 +1,199 @@
+# backend/core/admission.py
+"""
+Admission control: per-lane concurrency limits with queue-timeout shedding.
+
+Every HTTP request is put in one lane:
+  write       : POST / PUT / PATCH / DELETE
+  analytics   : GET /analytics/*, GET /reports/ with no filter (the full
+                listing, megabytes per call), and the first page of
+                GET /reports/?facets=true (its facet pass reads every row that
+                fails at most one filter, so all of them with one filter),
+                GET /reports/export (the CSV fallback for the export job)
+  interactive : every other GET (detail, filtered lists, later ?facets=true
+                pages with cursor=, history, feeds, refdata)
+/health, /ready and /metrics bypass admission so probes keep answering under
+load.
+
+AdmissionMiddleware (pure ASGI) lets at most `limit` requests per lane run
+at once; the rest wait up to ADMISSION_QUEUE_TIMEOUT_SECONDS for a slot and
+are then answered 503 with Retry-After, without touching the threadpool or
+the database. The lane is stored in a ContextVar (copied into the threadpool
+like metrics' RequestStats), and backend/db/session.py gives each lane its
+own engine: pool_size = limit, and a Postgres statement_timeout for the lane.
+A burst of analytics calls therefore holds at most the analytics limit of
+threads and connections, and writes keep their own.
+
+ADMISSION_CONTROL=0 disables the middleware and the lane engines.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from backend.core.config import settings
+from backend.core.metrics import ADMISSION, ADMISSION_WAIT, Gauge, register
+
+_BYPASS = {"/health", "/ready", "/metrics"}
+_LIST_FILTERS = {"search", "area_id", "category_id", "status", "severity_id", "created_after", "open", "breaching"}
+# what FastAPI parses as a true bool query parameter
+_TRUE = {b"1", b"true", b"on", b"yes", b"t", b"y"}
+
+# Retry-After for shed requests and statement timeouts
+RETRY_AFTER = str(max(1, math.ceil(settings.admission_queue_timeout_seconds)))
+
+
+class _Slots:
+    """
+    FIFO counting semaphore that works across event loops and threads
+    (uvicorn runs one loop, but TestClient may run one per request). A
+    released slot is handed straight to the oldest waiter, so new arrivals
+    cannot overtake the queue.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to `timeout` seconds; False if none came free."""
+        with self._lock:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter[1]), timeout)
+            return True
+        except BaseException as exc:
+            with self._lock:
+                handed = waiter not in self._waiters
+                if not handed:
+                    self._waiters.remove(waiter)
+            if isinstance(exc, TimeoutError):
+                # a slot handed over just as the wait timed out is still ours
+                return handed
+            if handed:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if self._waiters:
+                loop, fut = self._waiters.popleft()
+                loop.call_soon_threadsafe(_grant, fut)
+            else:
+                self.active -= 1
+
+
+def _grant(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
+@dataclass
+class Lane:
+    name: str
+    limit: int
+    statement_timeout_ms: int
+    slots: _Slots = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.slots = _Slots(self.limit)
+
+
+LANES: Dict[str, Lane] = {
+    "write": Lane("write", settings.admission_write_limit, settings.write_statement_timeout_ms),
+    "interactive": Lane("interactive", settings.admission_interactive_limit, settings.interactive_statement_timeout_ms),
+    "analytics": Lane("analytics", settings.admission_analytics_limit, settings.analytics_statement_timeout_ms),
+}
+
+# lane of the request being handled; None outside requests or when disabled
+current_lane: ContextVar[Optional[str]] = ContextVar("gridwatch_lane", default=None)
+
+
+def classify(method: str, path: str, query_string: bytes) -> Optional[str]:
+    """Lane name for a request, or None for paths that bypass admission."""
+    if path in _BYPASS:
+        return None
+    if method not in ("GET", "HEAD", "OPTIONS"):
+        return "write"
+    if path.startswith("/analytics/") or path == "/reports/export":
+        return "analytics"
+    if path == "/reports/":
+        params = dict(
+            (part.split(b"=", 1) + [b""])[:2] for part in query_string.split(b"&") if part
+        )
+        names = {name.decode("latin-1") for name in params}
+        if params.get(b"facets", b"").lower() in _TRUE:
+            # keyset pages after the first run no facet pass: limit + 1 rows per tier
+            return "interactive" if params.get(b"cursor") else "analytics"
+        if not names & _LIST_FILTERS:
+            return "analytics"
+    return "interactive"
+
+
+def _lane_samples(attr: str):
+    def collect():
+        for lane in LANES.values():
+            yield (lane.name,), float(getattr(lane.slots, attr))
+    return collect
+
+
+register(Gauge("gridwatch_admission_active", "Requests running per admission lane.", ("lane",), _lane_samples("active")))
+register(Gauge("gridwatch_admission_waiting", "Requests queued for a slot per admission lane.", ("lane",), _lane_samples("waiting")))
+register(Gauge("gridwatch_admission_limit", "Concurrent requests allowed per admission lane.", ("lane",), _lane_samples("limit")))
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware: waits for a lane slot or sheds the request with 503."""
+
+    def __init__(self, app):
+        self.app = app
+        self.queue_timeout = settings.admission_queue_timeout_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = classify(scope["method"], scope["path"], scope.get("query_string", b""))
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        slots = LANES[name].slots
+        t0 = time.perf_counter()
+        admitted = await slots.acquire(self.queue_timeout)
+        ADMISSION_WAIT.observe(time.perf_counter() - t0, name)
+        if not admitted:
+            ADMISSION.inc(name, "shed")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Server busy ({name} requests); retry shortly"},
+                headers={"Retry-After": RETRY_AFTER}
+            )
+            await response(scope, receive, send)
+            return
+
+        ADMISSION.inc(name, "admitted")
+        token = current_lane.set(name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_lane.reset(token)
+            slots.release()
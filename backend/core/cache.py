@@ -0,0 +1,172 @@
+# backend/core/cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Request
+
+
+# ----------
+# LRU cache
+# ----------
+
+class LRUCache:
+    """
+    Small thread-safe LRU map.
+
+    Sync endpoints run in the threadpool, so every access takes the lock.
+    Entries are never invalidated explicitly: callers put a version in the
+    key, so stale entries simply stop being asked for and age out.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# -----------------------------
+# Single-flight cache (with TTL)
+# -----------------------------
+
+class _Flight:
+    """One in-progress computation that other callers wait on."""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class FlightTimeout(Exception):
+    """A coalesced caller gave up waiting for the computation it joined."""
+
+
+class SingleFlightCache:
+    """
+    LRU of results that expire `ttl` seconds after their computation started,
+    where a miss is computed once no matter how many threads ask for it.
+
+    get_or_compute() returns (value, outcome):
+      hit       : a fresh cached value
+      miss      : this caller ran compute()
+      coalesced : another caller was already computing the key; this one
+                  waited and got the same value (or the same exception)
+
+    A coalesced caller waits at most `wait_timeout` seconds, then raises
+    FlightTimeout (the computation carries on for its own caller). Failures
+    are not cached. ttl <= 0 keeps coalescing but stores nothing.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 5.0, wait_timeout: Optional[float] = None):
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._lru = LRUCache(maxsize)       # key -> (expires_at, value)
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        before_wait: Optional[Callable[[], None]] = None
+    ) -> Tuple[Any, str]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1], "hit"
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            # e.g. hand a pooled DB connection back while waiting
+            if before_wait is not None:
+                before_wait()
+            if not flight.done.wait(self.wait_timeout):
+                raise FlightTimeout()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "coalesced"
+
+        started = time.monotonic()
+        try:
+            flight.value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and self.ttl > 0:
+                    self._lru.put(key, (started + self.ttl, flight.value))
+            flight.done.set()
+        return flight.value, "miss"
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+
+# ----------------------
+# ETag / conditional GET
+# ----------------------
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from version parts, e.g. make_etag("report", 7, 3) -> '"report-7-3"'."""
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def query_fingerprint(items: Iterable[tuple[str, str]]) -> str:
+    """Order-independent short hash of query params, so ?a=1&b=2 and ?b=2&a=1 share an ETag."""
+    normalized = "&".join(f"{k}={v}" for k, v in sorted(items))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header covers this ETag (weak comparison, per RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
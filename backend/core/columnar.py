@@ -0,0 +1,87 @@
+# backend/core/columnar.py
+"""
+Apache Arrow IPC output for bulk endpoints.
+
+Clients opt in with `Accept: application/vnd.apache.arrow.stream`. Tables are
+built column-wise straight from DB result rows (no per-row Pydantic objects);
+low-cardinality text columns (category / area / status names) are
+dictionary-encoded so repeated names cost one int32 each.
+
+pyarrow is optional: it is imported lazily and requests for Arrow get a 406
+when it is not installed, JSON keeps working either way.
+"""
+from typing import Any, List, NamedTuple, Sequence
+
+from fastapi import HTTPException, Request, Response, status
+
+from backend.core.metrics import timed_serialization
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+class ArrowColumn(NamedTuple):
+    name: str
+    type: str                   # "int64" | "float64" | "string" | "timestamp" | "date"
+    dictionary: bool = False    # dictionary-encode (only meaningful for "string")
+
+
+def wants_arrow(request: Request) -> bool:
+    """True if the Accept header asks for Arrow IPC (stream format)."""
+    accept = request.headers.get("accept", "")
+    return any(
+        part.split(";")[0].strip().lower() == ARROW_STREAM
+        for part in accept.split(",")
+    )
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail="Arrow output is not available on this server (pyarrow not installed)"
+        ) from exc
+    return pyarrow
+
+
+def _arrow_type(pa, name: str):
+    return {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "date": pa.date32(),
+    }[name]
+
+
+def rows_to_arrow(columns: Sequence[ArrowColumn], rows: Sequence[Sequence[Any]]) -> bytes:
+    """Serialize positional DB rows (tuples / Row objects) to an Arrow IPC stream."""
+    pa = _pyarrow()
+
+    with timed_serialization():
+        # transpose once in C; each column is then converted by pyarrow in bulk
+        values: List[Sequence[Any]] = list(zip(*rows)) if rows else [() for _ in columns]
+
+        arrays = []
+        for spec, col in zip(columns, values):
+            arr = pa.array(col, type=_arrow_type(pa, spec.type))
+            if spec.dictionary:
+                arr = arr.dictionary_encode()
+            arrays.append(arr)
+
+        table = pa.Table.from_arrays(arrays, names=[c.name for c in columns])
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def arrow_response(columns: Sequence[ArrowColumn], rows: Sequence[Sequence[Any]], headers: dict | None = None) -> Response:
+    return Response(
+        content=rows_to_arrow(columns, rows),
+        media_type=ARROW_STREAM,
+        headers=headers
+    )
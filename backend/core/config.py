@@ -1,12 +1,81 @@
 # backend/core/config.py
 import os
 from functools import lru_cache
+from typing import Dict
+
 from pydantic import BaseModel
 
 
 class Settings(BaseModel):
     database_url: str
 
+    # number of serialized ReportDetail bodies kept per worker, keyed by (report_id, row_version)
+    report_detail_cache_size: int = 1024
+
+    # a request running the same SELECT this many times is flagged as a likely N+1
+    n_plus_one_threshold: int = 5
+
+    # status entries embedded in ReportDetail; older ones via /reports/{id}/history
+    report_history_embed_limit: int = 20
+
+    # /analytics responses kept per worker, and for how long; identical
+    # concurrent requests share one query either way (ttl 0 = coalesce only,
+    # size 0 = neither)
+    analytics_cache_size: int = 256
+    analytics_cache_ttl_seconds: float = 5.0
+
+    # admission lanes (backend/core/admission.py): concurrent requests and
+    # pooled connections per lane, how long a request may queue for a slot
+    # before a 503, and each lane's Postgres statement_timeout
+    admission_control: bool = True
+    admission_write_limit: int = 8
+    admission_interactive_limit: int = 8
+    admission_analytics_limit: int = 2
+    admission_queue_timeout_seconds: float = 2.0
+    write_statement_timeout_ms: int = 5000
+    interactive_statement_timeout_ms: int = 10000
+    analytics_statement_timeout_ms: int = 30000
+
+    # Parquet copy of the analytics tables behind ?source=columnar
+    # (backend/services/columnar_store.py), and how far back each sync re-exports
+    columnar_dir: str = "var/columnar"
+    columnar_lookback_days: int = 31
+
+    # startup warmup (backend/services/warmup.py): run it before /ready
+    # answers 200, and how many pooled connections to open per engine
+    warmup: bool = True
+    warmup_connections: int = 2
+
+    # service areas / categories / severities kept per worker (0 = no cache)
+    refdata_cache_ttl_seconds: float = 300.0
+
+    # /analytics/spikes (backend/services/spike_detector.py): bucket width,
+    # EWMA half-life, geohash cell size, history the baselines are rebuilt
+    # from (and how often), and how often new reports are read in
+    spikes: bool = True
+    spikes_bucket_minutes: int = 60
+    spikes_halflife_days: float = 7.0
+    spikes_geohash_precision: int = 6
+    spikes_backfill_days: int = 56
+    spikes_rebuild_hours: float = 24.0
+    spikes_poll_seconds: float = 10.0
+
+    # background jobs (backend/services/job_service.py, job_worker.py): worker
+    # processes per `manage worker`, idle poll interval, heartbeat period and
+    # the silence after which a RUNNING job counts as abandoned, claims per
+    # job before it is failed, per-type concurrency overrides
+    # (JOB_LIMITS="export-reports=4,purge-archive=1"), and where result files go
+    job_worker_processes: int = 2
+    job_poll_seconds: float = 1.0
+    job_heartbeat_seconds: float = 5.0
+    job_stale_seconds: float = 60.0
+    job_max_attempts: int = 3
+    job_limits: Dict[str, int] = {}
+    job_result_dir: str = "var/jobs"
+
+    # CLOSED / RESOLVED reports untouched this many days move to the archive tables
+    archive_after_days: int = 365
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -15,7 +84,43 @@ def get_settings() -> Settings:
     default_url = "postgresql+psycopg2://kash@localhost:5432/gridwatch"
 
     return Settings(
-        database_url=os.getenv("DATABASE_URL", default_url)
+        database_url=os.getenv("DATABASE_URL", default_url),
+        report_detail_cache_size=int(os.getenv("REPORT_DETAIL_CACHE_SIZE", "1024")),
+        n_plus_one_threshold=int(os.getenv("N_PLUS_ONE_THRESHOLD", "5")),
+        report_history_embed_limit=int(os.getenv("REPORT_HISTORY_EMBED_LIMIT", "20")),
+        analytics_cache_size=int(os.getenv("ANALYTICS_CACHE_SIZE", "256")),
+        analytics_cache_ttl_seconds=float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "5")),
+        admission_control=os.getenv("ADMISSION_CONTROL", "1") not in ("0", "false", "no", "off"),
+        admission_write_limit=int(os.getenv("ADMISSION_WRITE_LIMIT", "8")),
+        admission_interactive_limit=int(os.getenv("ADMISSION_INTERACTIVE_LIMIT", "8")),
+        admission_analytics_limit=int(os.getenv("ADMISSION_ANALYTICS_LIMIT", "2")),
+        admission_queue_timeout_seconds=float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2")),
+        write_statement_timeout_ms=int(os.getenv("WRITE_STATEMENT_TIMEOUT_MS", "5000")),
+        interactive_statement_timeout_ms=int(os.getenv("INTERACTIVE_STATEMENT_TIMEOUT_MS", "10000")),
+        analytics_statement_timeout_ms=int(os.getenv("ANALYTICS_STATEMENT_TIMEOUT_MS", "30000")),
+        columnar_dir=os.getenv("COLUMNAR_DIR", "var/columnar"),
+        columnar_lookback_days=int(os.getenv("COLUMNAR_LOOKBACK_DAYS", "31")),
+        warmup=os.getenv("WARMUP", "1") not in ("0", "false", "no", "off"),
+        warmup_connections=int(os.getenv("WARMUP_CONNECTIONS", "2")),
+        refdata_cache_ttl_seconds=float(os.getenv("REFDATA_CACHE_TTL_SECONDS", "300")),
+        spikes=os.getenv("SPIKES", "1") not in ("0", "false", "no", "off"),
+        spikes_bucket_minutes=int(os.getenv("SPIKES_BUCKET_MINUTES", "60")),
+        spikes_halflife_days=float(os.getenv("SPIKES_HALFLIFE_DAYS", "7")),
+        spikes_geohash_precision=int(os.getenv("SPIKES_GEOHASH_PRECISION", "6")),
+        spikes_backfill_days=int(os.getenv("SPIKES_BACKFILL_DAYS", "56")),
+        spikes_rebuild_hours=float(os.getenv("SPIKES_REBUILD_HOURS", "24")),
+        spikes_poll_seconds=float(os.getenv("SPIKES_POLL_SECONDS", "10")),
+        job_worker_processes=int(os.getenv("JOB_WORKER_PROCESSES", "2")),
+        job_poll_seconds=float(os.getenv("JOB_POLL_SECONDS", "1")),
+        job_heartbeat_seconds=float(os.getenv("JOB_HEARTBEAT_SECONDS", "5")),
+        job_stale_seconds=float(os.getenv("JOB_STALE_SECONDS", "60")),
+        job_max_attempts=int(os.getenv("JOB_MAX_ATTEMPTS", "3")),
+        job_limits={
+            name.strip(): int(limit)
+            for name, _, limit in (part.partition("=") for part in os.getenv("JOB_LIMITS", "").split(",") if part.strip())
+        },
+        job_result_dir=os.getenv("JOB_RESULT_DIR", "var/jobs"),
+        archive_after_days=int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
     )
 
 
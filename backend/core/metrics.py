@@ -0,0 +1,389 @@
+# backend/core/metrics.py
+"""
+Per-request DB / serialization instrumentation and a Prometheus text exporter.
+
+How it fits together:
+  - MetricsMiddleware (pure ASGI) opens a RequestStats for every HTTP request
+    and stores it in a ContextVar. Starlette copies the context into the
+    threadpool that runs our sync endpoints, so the same (mutable) object is
+    visible to SQLAlchemy hooks running in that thread.
+  - instrument_engine() adds cursor-execute hooks (query count, DB time, rows
+    fetched, statement repeats for N+1 detection) and pool hooks (checkouts,
+    new connections, time spent waiting for a pooled connection).
+  - InstrumentedRoute stamps the moment the endpoint function returns; the
+    time from there to the first response byte is FastAPI's response_model
+    validation + JSON encoding, recorded as serialization time.
+  - render() produces the Prometheus exposition format served at /metrics.
+
+Everything is in-process and per worker; with several uvicorn/gunicorn
+workers, each one is scraped separately (label by instance in Prometheus).
+The hot path is a handful of dict increments and perf_counter() calls.
+"""
+import functools
+import hashlib
+import inspect
+import logging
+import threading
+import time
+from collections import Counter as _Tally
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from backend.core.config import settings
+
+log = logging.getLogger("gridwatch.metrics")
+
+
+# -----------------
+# Metric primitives
+# -----------------
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    row[i] += 1
+                    break
+            else:
+                row[len(self.buckets)] += 1
+            row[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for labels, row in items:
+            cumulative = 0.0
+            for upper, n in zip(self.buckets, row):
+                cumulative += n
+                le = 'le="%g"' % upper
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative:g}")
+            cumulative += row[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative:g}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {row[-1]:g}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative:g}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], collect: Callable[[], Iterable[Tuple[LabelValues, float]]]):
+        self.name, self.help, self.labelnames, self.collect = name, help, tuple(labelnames), collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value:g}")
+        return lines
+
+
+REGISTRY: List = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -----------------
+# GridWatch metrics
+# -----------------
+
+HTTP_REQUESTS = register(Counter(
+    "gridwatch_http_requests_total", "HTTP requests handled.", ("route", "method", "status")))
+HTTP_DURATION = register(Histogram(
+    "gridwatch_http_request_duration_seconds", "Wall time from request start to response end.", ("route", "method")))
+DB_QUERIES = register(Histogram(
+    "gridwatch_db_queries_per_request", "SQL statements executed per request.", ("route",), COUNT_BUCKETS))
+DB_TIME = register(Histogram(
+    "gridwatch_db_time_seconds", "Time spent in cursor.execute per request.", ("route",)))
+DB_ROWS = register(Histogram(
+    "gridwatch_db_rows_per_request", "Rows returned/affected by SQL per request.", ("route",), ROW_BUCKETS))
+SERIALIZATION_TIME = register(Histogram(
+    "gridwatch_serialization_seconds", "Response model validation + encoding time per request.", ("route",)))
+POOL_WAIT = register(Histogram(
+    "gridwatch_db_pool_wait_seconds", "Time to obtain a pooled connection (includes connect when the pool grows).", ("pool",)))
+POOL_CHECKOUTS = register(Counter(
+    "gridwatch_db_pool_checkouts_total", "Pooled connection checkouts.", ("pool",)))
+POOL_CONNECTS = register(Counter(
+    "gridwatch_db_pool_connects_total", "New DBAPI connections opened.", ("pool",)))
+N_PLUS_ONE = register(Counter(
+    "gridwatch_n_plus_one_total",
+    "Requests that repeated one identical SELECT at least n_plus_one_threshold times (statement = sha1 prefix; SQL is logged).",
+    ("route", "statement")))
+ANALYTICS_CACHE = register(Counter(
+    "gridwatch_analytics_cache_total",
+    "Analytics responses by cache outcome (hit = cached, miss = queried, coalesced = shared another request's query, timeout = gave up waiting for it).",
+    ("route", "result")))
+ADMISSION = register(Counter(
+    "gridwatch_admission_total", "Requests per admission lane, admitted or shed with 503.", ("lane", "result")))
+ADMISSION_WAIT = register(Histogram(
+    "gridwatch_admission_wait_seconds", "Time spent queued for an admission lane slot.", ("lane",)))
+
+_pools: Dict[str, QueuePool] = {}
+
+
+def _pool_samples(attr: str) -> Callable[[], Iterable[Tuple[LabelValues, float]]]:
+    def collect():
+        for name, pool in list(_pools.items()):
+            yield (name,), float(getattr(pool, attr)())
+    return collect
+
+
+register(Gauge("gridwatch_db_pool_checked_out", "Connections currently checked out.", ("pool",), _pool_samples("checkedout")))
+register(Gauge("gridwatch_db_pool_size", "Configured pool size.", ("pool",), _pool_samples("size")))
+register(Gauge("gridwatch_db_pool_overflow", "Connections open beyond pool_size (negative = unopened slots).", ("pool",), _pool_samples("overflow")))
+
+
+# -------------------
+# Per-request context
+# -------------------
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    serialize_seconds: float = 0.0
+    handler_done: Optional[float] = None
+    statements: _Tally = field(default_factory=_Tally)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("gridwatch_request_stats", default=None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+class timed_serialization:
+    """Count a block as serialization time (for endpoints that encode their own body)."""
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stats = _current.get()
+        if stats is not None:
+            stats.serialize_seconds += time.perf_counter() - self._t0
+        return False
+
+
+# ------------------
+# SQLAlchemy hooks
+# ------------------
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long callers wait for a connection."""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - t0, getattr(self, "_gridwatch_name", "default"))
+
+
+def instrument_engine(engine: Engine, name: str = "default") -> Engine:
+    """Attach query/pool hooks to an engine (idempotent per engine)."""
+    if getattr(engine, "_gridwatch_instrumented", False):
+        return engine
+    engine._gridwatch_instrumented = True
+    engine.pool._gridwatch_name = name
+    _pools[name] = engine.pool
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_gw_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["_gw_t0"].pop()
+        stats = _current.get()
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        if cursor.rowcount and cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+        if not executemany:
+            stats.statements[statement] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        stack = exception_context.connection.info.get("_gw_t0") if exception_context.connection is not None else None
+        if stack:
+            stack.pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_conn, record, proxy):
+        POOL_CHECKOUTS.inc(name)
+
+    @event.listens_for(engine.pool, "connect")
+    def _connect(dbapi_conn, record):
+        POOL_CONNECTS.inc(name)
+
+    return engine
+
+
+# -------------
+# FastAPI glue
+# -------------
+
+def _stamp_handler_done(endpoint: Callable) -> Callable:
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stats = _current.get()
+                if stats is not None:
+                    stats.handler_done = time.perf_counter()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                stats.handler_done = time.perf_counter()
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute that marks when the endpoint returns, so serialization time can be split out."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _stamp_handler_done(endpoint), **kwargs)
+
+
+_reported_n_plus_one: set = set()
+
+
+def _record(route: str, method: str, status: int, stats: RequestStats, response_started: Optional[float]) -> None:
+    end = time.perf_counter()
+    HTTP_REQUESTS.inc(route, method, str(status))
+    HTTP_DURATION.observe(end - stats.started, route, method)
+    DB_QUERIES.observe(stats.queries, route)
+    DB_TIME.observe(stats.db_seconds, route)
+    DB_ROWS.observe(stats.rows, route)
+
+    serialize = stats.serialize_seconds
+    if stats.handler_done is not None and response_started is not None:
+        serialize += max(0.0, response_started - stats.handler_done)
+    SERIALIZATION_TIME.observe(serialize, route)
+
+    threshold = settings.n_plus_one_threshold
+    for statement, count in stats.statements.items():
+        if count < threshold or not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        fingerprint = hashlib.sha1(statement.encode("utf-8")).hexdigest()[:12]
+        N_PLUS_ONE.inc(route, fingerprint)
+        if (route, fingerprint) not in _reported_n_plus_one:
+            _reported_n_plus_one.add((route, fingerprint))
+            log.warning("possible N+1 on %s: statement %s ran %d times in one request: %s",
+                        route, fingerprint, count, " ".join(statement.split())[:500])
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: opens RequestStats per request and records it on completion."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+        response_started: Optional[float] = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            # route templates (/reports/{report_id}) keep label cardinality bounded
+            route_label = route.path if route is not None else "unmatched"
+            _record(route_label, scope.get("method", ""), status_code, stats, response_started)
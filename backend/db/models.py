@@ -7,8 +7,11 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     DateTime,
+    Float,
     ForeignKey,
+    Integer,
     Numeric,
+    SmallInteger,
     String,
     Text,
     func
@@ -234,6 +237,7 @@ class Report(Base):
       - severity_id (FK to severity.severity_id)
       - area_id (FK to service_area.area_id)
       - current_status (report_status enum in DB, mapped as string)
+      - row_version (bumped by trigger on every UPDATE, see db/Versioning.sql)
     """
     __tablename__ = "report"
 
@@ -254,6 +258,11 @@ class Report(Base):
         nullable=False,
         default="SUBMITTED"
     )
+    row_version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default="1"
+    )
     created_by: Mapped[int] = mapped_column(
         BigInteger, 
         ForeignKey("user.user_id"), 
@@ -305,6 +314,36 @@ class Report(Base):
 
 
 
+class ReportTableVersion(Base):
+    """
+    Maps to table: report_table_version
+
+    Counter slots: a statement trigger bumps one (a free one, see
+    db/Versioning.sql) on every write to report; the table version is the
+    sum over all slots. Versioning.sql creates all 64 rows and the trigger
+    picks the slot, so id has no default and rows are never inserted here.
+
+    Columns:
+      - id (PK, slot 0..63)
+      - version
+      - changed_at
+    """
+    __tablename__ = "report_table_version"
+    __table_args__ = (
+        CheckConstraint(
+            "id BETWEEN 0 AND 63",
+            name="slot_range"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+
+
 class StatusUpdate(Base):
     """
     Maps to table: status_update
@@ -410,3 +449,242 @@ class Assignment(Base):
         "User",
         back_populates="assignments",
     )
+
+
+class Subscription(Base):
+    """
+    Maps to table: subscription
+
+    Columns:
+      - sub_id (PK)
+      - report_id (FK → report.report_id)
+      - user_id (FK → user.user_id)
+      - created_at (default now())
+
+    (report_id, user_id) is unique (uq_subscription_report_user).
+    """
+    __tablename__ = "subscription"
+
+    sub_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    report_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("report.report_id"),
+        nullable=False
+    )
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.user_id"),
+        nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=func.now()
+    )
+
+
+class Comment(Base):
+    """
+    Maps to table: comment
+
+    Columns:
+      - comment_id (PK)
+      - report_id (FK → report.report_id)
+      - user_id (FK → user.user_id)
+      - body
+      - created_at (default now())
+    """
+    __tablename__ = "comment"
+
+    comment_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    report_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("report.report_id"),
+        nullable=False
+    )
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("user.user_id"),
+        nullable=False
+    )
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=func.now()
+    )
+
+
+
+# ----------------------
+# Archive tier
+# ----------------------
+# Same columns as the hot tables (copied from their Table definitions); rows
+# are moved here by archive_reports() in db/Archive.sql. The archive tables
+# have no FKs in the DB, so relationships are view-only; history is queried
+# directly (report_service._history_page).
+
+class ReportArchive(Base):
+    """Maps to table: report_archive (CLOSED / RESOLVED reports past the archive age)"""
+    __table__ = Report.__table__.to_metadata(Base.metadata, name="report_archive")
+
+    # relationships
+    category: Mapped["Category"] = relationship("Category", viewonly=True)
+    severity: Mapped["Severity"] = relationship("Severity", viewonly=True)
+    service_area: Mapped["ServiceArea"] = relationship("ServiceArea", viewonly=True)
+
+
+class StatusUpdateArchive(Base):
+    """Maps to table: status_update_archive"""
+    __table__ = StatusUpdate.__table__.to_metadata(Base.metadata, name="status_update_archive")
+
+
+class AssignmentArchive(Base):
+    """Maps to table: assignment_archive"""
+    __table__ = Assignment.__table__.to_metadata(Base.metadata, name="assignment_archive")
+
+# ----------------------
+# Analytics rollups
+# ----------------------
+
+class _ReportActivityBucket:
+    """
+    Shared shape of the report_activity_* tables (db/Timeseries.sql).
+
+    Columns:
+      - dimension (PK, 'category' | 'area' | 'status')
+      - bucket_start (PK, UTC-truncated)
+      - group_id (PK, category_id / area_id; 0 for status rows)
+      - status (PK, report_status enum in DB, mapped as string; SUBMITTED for category/area rows)
+      - count (reports created, or status_update rows entering status)
+    """
+    dimension: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    group_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    status: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class ReportActivityHourly(_ReportActivityBucket, Base):
+    """Maps to table: report_activity_hourly (maintained by triggers)"""
+    __tablename__ = "report_activity_hourly"
+
+
+class ReportActivityDaily(_ReportActivityBucket, Base):
+    """Maps to table: report_activity_daily (rolled up from hourly, for days before daily_until)"""
+    __tablename__ = "report_activity_daily"
+
+
+class ReportActivityRollup(Base):
+    """
+    Maps to table: report_activity_rollup
+
+    Single row: daily_until, the first UTC day whose hourly buckets are not
+    summed into report_activity_daily yet (moved on by
+    roll_up_report_activity()).
+    """
+    __tablename__ = "report_activity_rollup"
+
+    id: Mapped[int] = mapped_column(primary_key=True, default=1)
+    daily_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class WorkOrderCostMonthly(Base):
+    """
+    Maps to table: work_order_cost_monthly (db/Costs.sql, maintained by triggers)
+
+    Columns:
+      - month_start, dept_id, category_id, area_id (PK; UTC month of work_order.opened_at)
+      - work_orders, actual_orders, resolved_orders (counts)
+      - estimate_total, actual_total, parts_total (sums)
+      - estimate_on_actual (estimates of the orders that have an actual cost)
+    """
+    __tablename__ = "work_order_cost_monthly"
+
+    month_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    dept_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    category_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    area_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    work_orders: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    estimate_total: Mapped[float] = mapped_column(Numeric, nullable=False, default=0)
+    actual_total: Mapped[float] = mapped_column(Numeric, nullable=False, default=0)
+    estimate_on_actual: Mapped[float] = mapped_column(Numeric, nullable=False, default=0)
+    actual_orders: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    resolved_orders: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    parts_total: Mapped[float] = mapped_column(Numeric, nullable=False, default=0)
+
+
+# ----------------------
+# Activity feeds
+# ----------------------
+
+class FeedEvent(Base):
+    """
+    Maps to table: feed_event (written by triggers, db/Feed.sql)
+
+    Columns:
+      - event_id (PK, identity; feed order)
+      - report_id, report_title (title when the event happened)
+      - kind ('status' | 'comment'), source_id (status_id / comment_id)
+      - actor_id (changed_by / comment author)
+      - status (report_status enum in DB, mapped as string; status events only)
+      - excerpt (note / comment body, first 280 chars)
+      - occurred_at
+      - fanned_out (copied to user_feed; false for reports over feed_fanout_limit())
+    """
+    __tablename__ = "feed_event"
+
+    event_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    report_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    report_title: Mapped[str] = mapped_column(Text, nullable=False)
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    source_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    actor_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    status: Mapped[Optional[str]] = mapped_column(String)
+    excerpt: Mapped[Optional[str]] = mapped_column(Text)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    fanned_out: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+
+class UserFeed(Base):
+    """Maps to table: user_feed (user_id, event_id) timeline rows"""
+    __tablename__ = "user_feed"
+
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+
+# ----------------------
+# Background jobs
+# ----------------------
+
+class Job(Base):
+    """
+    Maps to table: job (db/Jobs.sql; backend/services/job_service.py)
+
+    Columns:
+      - job_id (PK, identity; queue order)
+      - job_type, params (JSONB, validated per type on submit)
+      - status ('QUEUED' | 'RUNNING' | 'SUCCEEDED' | 'FAILED' | 'CANCELLED')
+      - progress (0..1), progress_note
+      - result (JSONB summary), error
+      - cancel_requested, attempts, worker
+      - submitted_at, started_at, heartbeat_at, finished_at
+    """
+    __tablename__ = "job"
+
+    job_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    job_type: Mapped[str] = mapped_column(Text, nullable=False)
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(Text, nullable=False, default="QUEUED")
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    progress_note: Mapped[Optional[str]] = mapped_column(Text)
+    result: Mapped[Optional[dict]] = mapped_column(JSONB)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    worker: Mapped[Optional[str]] = mapped_column(Text)
+    submitted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
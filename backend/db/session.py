@@ -1,16 +1,43 @@
 # backend/db/session.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
-from typing import Generator
+from typing import Dict, Generator
 
+from backend.core.admission import LANES, current_lane
 from backend.core.config import settings
+from backend.core.metrics import InstrumentedQueuePool, instrument_engine
 
 
+# scripts, /health, and every request when admission control is off
 engine = create_engine(
     settings.database_url,
     echo=False,
-    future=True
+    future=True,
+    poolclass=InstrumentedQueuePool
 )
+instrument_engine(engine)
+
+
+def _lane_engine(name: str, pool_size: int, statement_timeout_ms: int) -> Engine:
+    # a lane never runs more than `pool_size` requests, so no overflow
+    lane_engine = create_engine(
+        settings.database_url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+        connect_args={"options": f"-c statement_timeout={statement_timeout_ms}"}
+    )
+    return instrument_engine(lane_engine, name)
+
+
+# one pool per admission lane (backend/core/admission.py); connections open lazily
+lane_engines: Dict[str, Engine] = {
+    lane.name: _lane_engine(lane.name, lane.limit, lane.statement_timeout_ms)
+    for lane in LANES.values()
+} if settings.admission_control else {}
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -20,8 +47,9 @@ SessionLocal = sessionmaker(
 )
 
 def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+    lane_engine = lane_engines.get(current_lane.get())
+    db = SessionLocal(bind=lane_engine) if lane_engine is not None else SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
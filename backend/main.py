@@ -1,20 +1,48 @@
 # backend/main.py
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 from fastapi.middleware.cors import CORSMiddleware  # 🔹 add this
 
-from backend.db.session import SessionLocal
-from backend.api import reports, refdata, analytics
+from backend.core import metrics
+from backend.core.admission import RETRY_AFTER, AdmissionMiddleware
+from backend.core.config import settings
+from backend.db.session import SessionLocal, engine
+from backend.api import reports, refdata, analytics, users, jobs
+from backend.services import spike_detector, warmup
+
+log = logging.getLogger("gridwatch.api")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # warm pools / compiled statements / caches in the background; /ready waits for it
+    warmup.start()
+    # /analytics/spikes baselines, then polling for new reports
+    spike_detector.start(engine)
+    yield
+    spike_detector.stop()
+    warmup.dispose()
+
 
 app = FastAPI(
     title="CSE 412 GridWatch Reporting API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# per-lane concurrency limits + 503 shedding; innermost, so shed responses
+# still get CORS headers and are counted in /metrics
+if settings.admission_control:
+    app.add_middleware(AdmissionMiddleware)
+
 # 🔹 CORS so Vite (5173) can call FastAPI (8000)
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +52,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# per-request query count / DB time / rows / serialization time, see /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 @app.get("/health")
 def health_check():
     """
@@ -39,10 +70,37 @@ def health_check():
         return {"status": "ok"}
     except Exception as exc:
         raise HTTPException(status_code=500, detail="Database connection failed") from exc
-    
+
+
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness, distinct from /health (liveness).
+
+    Returns 503 until this worker's startup warmup has finished (see
+    backend/services/warmup.py), and while the DB does not answer SELECT 1;
+    then 200 with the warmup step timings.
+    """
+    if not warmup.state.finished:
+        return JSONResponse(status_code=503, content={"status": "warming", "warmup": warmup.state.as_dict()})
+    try:
+        with SessionLocal() as session:
+            session.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse(status_code=503, content={"status": "database unavailable", "warmup": warmup.state.as_dict()})
+    return {"status": "ready", "warmup": warmup.state.as_dict()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text exposition of this worker's request / DB / pool metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 app.include_router(refdata.router)
 app.include_router(reports.router)
 app.include_router(analytics.router)
+app.include_router(users.router)
+app.include_router(jobs.router)
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -53,7 +111,23 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         )
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None)
+    )
+
+@app.exception_handler(OperationalError)
+async def db_operational_error_handler(request: Request, exc: OperationalError):
+    # query_canceled: the lane's statement_timeout fired (see backend/db/session.py)
+    if getattr(exc.orig, "pgcode", None) == "57014":
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Query took too long; retry shortly"},
+            headers={"Retry-After": RETRY_AFTER}
+        )
+    log.error("%s %s failed", request.method, request.url.path, exc_info=exc)
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Database error"}
     )
 
 @app.exception_handler(RequestValidationError)
@@ -0,0 +1,130 @@
+# backend/manage.py
+"""
+Maintenance commands that run against DATABASE_URL.
+
+    python -m backend.manage rebuild-timeseries
+    python -m backend.manage rollup-timeseries
+    python -m backend.manage rebuild-costs
+    python -m backend.manage ensure-partitions [--months-ahead 3]
+    python -m backend.manage archive [--older-than-days N] [--batch-size 1000]
+    python -m backend.manage rebuild-feeds [--days 90]
+    python -m backend.manage columnar-sync [--full] [--lookback-days N]
+    python -m backend.manage worker [--processes N]
+
+ensure-partitions is meant to run from cron monthly, archive and
+rollup-timeseries nightly; columnar-sync as often as ?source=columnar
+answers should be fresh. worker runs until SIGINT / SIGTERM, executing jobs
+submitted to POST /jobs/.
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from backend.core.config import settings
+from backend.db.session import SessionLocal, engine
+from backend.services import analytics_service, columnar_store, feed_service, report_service
+
+
+def rebuild_timeseries(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    with SessionLocal() as db:
+        analytics_service.rebuild_timeseries(db)
+    print(f"rebuilt report activity buckets in {time.perf_counter() - t0:.1f}s")
+
+
+def rollup_timeseries(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    with SessionLocal() as db:
+        daily_until = analytics_service.roll_up_timeseries(db)
+    print(f"daily report activity buckets rolled up to {daily_until:%Y-%m-%d} in {time.perf_counter() - t0:.1f}s")
+
+
+def rebuild_costs(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    with SessionLocal() as db:
+        analytics_service.rebuild_costs(db)
+    print(f"rebuilt work order cost rollup in {time.perf_counter() - t0:.1f}s")
+
+
+def ensure_partitions(args: argparse.Namespace) -> None:
+    with SessionLocal() as db:
+        created = db.execute(
+            text("SELECT maintain_status_update_partitions(:months)"),
+            {"months": args.months_ahead}
+        ).scalar()
+        db.commit()
+    print(f"created {created} status_update partition(s)")
+
+
+def archive(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    # archive_reports commits per batch, which needs an autocommit connection
+    with SessionLocal(bind=engine.execution_options(isolation_level="AUTOCOMMIT")) as db:
+        moved = report_service.archive_reports(db, args.older_than_days, args.batch_size)
+    print(f"archived {moved} report(s) in {time.perf_counter() - t0:.1f}s")
+
+
+def rebuild_feeds(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    with SessionLocal() as db:
+        events = feed_service.rebuild_feeds(db, args.days)
+    print(f"rebuilt user feeds from {events} event(s) in {time.perf_counter() - t0:.1f}s")
+
+
+def columnar_sync(args: argparse.Namespace) -> None:
+    t0 = time.perf_counter()
+    summary = columnar_store.sync(engine, full=args.full, lookback_days=args.lookback_days)
+    for table, info in summary.items():
+        older = f" (+{info['older_months']} older, for status changes)" if info["older_months"] else ""
+        print(f"{table:<14} {info['rows']:>10} row(s) in {info['parts']:>3} month(s) since {info['since'] or 'the beginning'}{older}")
+    print(f"synced {settings.columnar_dir} in {time.perf_counter() - t0:.1f}s")
+
+
+def worker(args: argparse.Namespace) -> None:
+    # imported here: the pool spawns processes that re-import this module
+    from backend.services import job_worker
+    job_worker.serve(args.processes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("rebuild-timeseries", help="recompute /analytics/timeseries buckets from the base tables")
+    cmd.set_defaults(func=rebuild_timeseries)
+
+    cmd = commands.add_parser("rollup-timeseries", help="sum finished days of hourly activity buckets into the daily ones")
+    cmd.set_defaults(func=rollup_timeseries)
+
+    cmd = commands.add_parser("rebuild-costs", help="recompute the /analytics/costs rollup from work_order / work_part")
+    cmd.set_defaults(func=rebuild_costs)
+
+    cmd = commands.add_parser("ensure-partitions", help="create monthly status_update partitions and drain the default one")
+    cmd.add_argument("--months-ahead", type=int, default=3)
+    cmd.set_defaults(func=ensure_partitions)
+
+    cmd = commands.add_parser("archive", help="move idle CLOSED / RESOLVED reports to the archive tables")
+    cmd.add_argument("--older-than-days", type=int, default=settings.archive_after_days)
+    cmd.add_argument("--batch-size", type=int, default=1000)
+    cmd.set_defaults(func=archive)
+
+    cmd = commands.add_parser("rebuild-feeds", help="recompute user feeds from recent status changes and comments")
+    cmd.add_argument("--days", type=int, default=90)
+    cmd.set_defaults(func=rebuild_feeds)
+
+    cmd = commands.add_parser("columnar-sync", help="refresh the Parquet copy behind /analytics ?source=columnar")
+    cmd.add_argument("--full", action="store_true", help="re-export every month instead of the recent ones")
+    cmd.add_argument("--lookback-days", type=int, default=None, help=f"re-export window before the last watermark (default COLUMNAR_LOOKBACK_DAYS={settings.columnar_lookback_days})")
+    cmd.set_defaults(func=columnar_sync)
+
+    cmd = commands.add_parser("worker", help="run background jobs submitted to POST /jobs/")
+    cmd.add_argument("--processes", type=int, default=settings.job_worker_processes)
+    cmd.set_defaults(func=worker)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,4 +26,58 @@ class HotSpots(BaseModel):
 class ResolutionTimes(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    avg_resolution_days: float
\ No newline at end of file
+    avg_resolution_days: float
+
+class TimeSeriesPoint(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    bucket_start: datetime
+    group_id: Optional[int] = None      # category_id / area_id; None when grouped by status
+    group_label: str                    # category name, area name or status
+    count: int
+
+class TimeSeries(BaseModel):
+    interval: str
+    group_by: str
+    since: datetime
+    until: datetime
+    points: List[TimeSeriesPoint]
+
+class CostRow(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    month_start: Optional[datetime] = None          # None when interval=total
+    group_id: Optional[int] = None                  # dept / category / area id; None when group_by=none
+    group_label: Optional[str] = None
+    work_orders: int
+    estimate_total: float
+    actual_total: float
+    estimate_on_actual: float                       # estimates of the orders that have an actual cost
+    variance: float                                 # actual_total - estimate_on_actual
+    variance_pct: Optional[float] = None
+    parts_total: float
+    resolved_orders: int
+    cost_per_resolved_report: Optional[float] = None
+
+class CostBreakdown(BaseModel):
+    group_by: str
+    interval: str
+    since: datetime
+    until: datetime
+    rows: List[CostRow]
+
+class Spike(BaseModel):
+    dimension: str                  # area_category | area | cell
+    area_id: Optional[int] = None
+    category_id: Optional[int] = None
+    cell: Optional[str] = None      # geohash
+    count: int                      # reports in the window
+    expected: float                 # seasonal baseline for the window
+    z: float
+
+class Spikes(BaseModel):
+    as_of: datetime
+    window_start: datetime          # start of the previous bucket; the window runs to as_of
+    baseline_since: datetime
+    last_report_id: int             # newest report fed to the detector
+    spikes: List[Spike]
@@ -0,0 +1,22 @@
+# backend/schemas/feed.py
+from datetime import datetime
+from typing import Optional, List
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FeedItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    event_id: int
+    report_id: int
+    report_title: str
+    kind: str                           # status | comment
+    status: Optional[str] = None        # new status, for status events
+    excerpt: Optional[str] = None       # note / comment body, first 280 chars
+    actor_id: int
+    occurred_at: datetime
+
+class FeedPage(BaseModel):
+    items: List[FeedItem]               # newest first
+    next_cursor: Optional[str] = None   # pass as ?cursor= for the next (older) page
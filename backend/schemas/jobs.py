@@ -0,0 +1,84 @@
+# backend/schemas/jobs.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: Dict[str, Any] = {}         # validated against the type's params model
+
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    job_id: int
+    job_type: str
+    params: Dict[str, Any]
+    status: str                         # QUEUED | RUNNING | SUCCEEDED | FAILED | CANCELLED
+    progress: float                     # 0..1
+    progress_note: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_requested: bool
+    attempts: int
+    worker: Optional[str] = None
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class JobTypeOut(BaseModel):
+    job_type: str
+    description: str
+    limit: int                          # jobs of this type running at once, across all workers
+    params: Dict[str, Any]              # JSON schema
+
+# ----------
+# Params per job type (unknown keys are rejected)
+# ----------
+
+class NoParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+class RebuildFeedsParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    days: int = Field(90, ge=1)
+
+class ArchiveParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    older_than_days: Optional[int] = Field(None, ge=1)     # default ARCHIVE_AFTER_DAYS
+    batch_size: int = Field(1000, ge=1, le=100000)
+
+class ColumnarSyncParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    full: bool = False
+    lookback_days: Optional[int] = Field(None, ge=0)       # default COLUMNAR_LOOKBACK_DAYS
+
+class SlaParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    batch_size: int = Field(5000, ge=1, le=100000)
+
+class ExportReportsParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    fields: Optional[List[str]] = None  # LIST_FIELDS names; all of them by default
+    search: Optional[str] = None
+    area_id: Optional[int] = None
+    category_id: Optional[int] = None
+    status: Optional[str] = None
+    severity_id: Optional[int] = None
+    include_archived: bool = False
+    created_after: Optional[datetime] = None
+    open: bool = False
+    breaching: bool = False
+
+class PurgeArchiveParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    older_than_days: int = Field(..., ge=1)
+    batch_size: int = Field(1000, ge=1, le=100000)
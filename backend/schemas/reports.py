@@ -2,7 +2,7 @@
 from datetime import datetime
 from typing import Optional, List
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ----------------------
@@ -43,11 +43,54 @@ class StatusUpdateOut(BaseModel):
     note: Optional[str] = None
     changed_at: datetime
 
+class StatusHistoryPage(BaseModel):
+    items: List[StatusUpdateOut]        # newest first
+    next_cursor: Optional[str] = None   # pass as ?cursor= for the next (older) page
+
 class StatusUpdateRequest(BaseModel):
     new_status: str
     note: Optional[str] = None
     changed_by: int
 
+class CommentCreate(BaseModel):
+    user_id: int
+    body: str = Field(..., min_length=1, max_length=5000)
+
+class CommentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    comment_id: int
+    report_id: int
+    user_id: int
+    body: str
+    created_at: datetime
+
+class SubscriptionRequest(BaseModel):
+    user_id: int
+
+class BulkStatusItem(BaseModel):
+    report_id: int
+    new_status: str
+    note: Optional[str] = None
+
+class BulkStatusRequest(BaseModel):
+    changed_by: int                     # applied to every item
+    items: List[BulkStatusItem] = Field(..., min_length=1, max_length=5000)
+
+class BulkStatusOutcome(BaseModel):
+    report_id: int
+    # updated | not_found | archived | invalid_status | illegal_transition | duplicate
+    outcome: str
+    status_code: int                    # what the single-report endpoint would return
+    detail: Optional[str] = None
+    previous_status: Optional[str] = None
+    status_id: Optional[int] = None     # new status_update row, when updated
+
+class BulkStatusResult(BaseModel):
+    updated: int
+    rejected: int
+    results: List[BulkStatusOutcome]    # one per item, in request order
+
 
 # ----------------------
 # Report models
@@ -77,6 +120,31 @@ class ReportSummary(BaseModel):
     area_name: str
     severity_label: str
 
+class FacetCount(BaseModel):
+    value: str | int                    # status name, or area / category / severity id
+    label: str
+    count: int
+
+class ReportFacets(BaseModel):
+    # matching reports per value, most first, under every filter of the list but
+    # the facet's own (the status counts ignore status=, and so on), so each
+    # count is what choosing that value would list
+    status: List[FacetCount]
+    area: List[FacetCount]
+    category: List[FacetCount]
+    severity: List[FacetCount]
+    # what the list would hold with open=true, breaching=true, or
+    # created_after= 24 hours ago, under every other filter
+    open: int
+    breaching: int
+    last_24h: int
+
+class ReportPage(BaseModel):
+    items: List[ReportSummary]          # newest first
+    next_cursor: Optional[str] = None   # pass as ?cursor= for the next (older) page
+    total: Optional[int] = None         # reports matching the filters; first page (no cursor) only
+    facets: Optional[ReportFacets] = None   # first page only
+
 class ReportDetail(BaseModel):
     report_id: int
     title: str
@@ -91,4 +159,7 @@ class ReportDetail(BaseModel):
     service_area: ServiceAreaOut
     severity: SeverityOut
 
+    # most recent entries only (oldest first); when more exist, page through
+    # GET /reports/{id}/history?cursor=<status_history_next_cursor>
     status_history: List[StatusUpdateOut]
+    status_history_next_cursor: Optional[str] = None
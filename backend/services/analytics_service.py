@@ -0,0 +1,363 @@
+# backend/services/analytics_service.py
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import BigInteger, DateTime, Float, Row, Text, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from backend.core.admission import RETRY_AFTER
+from backend.core.cache import FlightTimeout, SingleFlightCache, query_fingerprint
+from backend.core.columnar import ArrowColumn, wants_arrow
+from backend.core.config import settings
+from backend.core.metrics import ANALYTICS_CACHE
+from backend.db.models import (
+    Category,
+    Department,
+    ReportActivityDaily,
+    ReportActivityHourly,
+    ReportActivityRollup,
+    ServiceArea,
+    WorkOrderCostMonthly
+)
+from backend.services import report_service
+
+# waiters give up when the leader's query would have hit its own statement_timeout
+_response_cache = SingleFlightCache(
+    maxsize=settings.analytics_cache_size,
+    ttl=settings.analytics_cache_ttl_seconds,
+    wait_timeout=settings.analytics_statement_timeout_ms / 1000
+)
+
+# ----------
+# Time series
+# ----------
+
+_STEP = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+DEFAULT_WINDOW = timedelta(days=30)
+
+# upper bound on buckets per request: ~90 days hourly, ~6 years daily or
+# weekly (day and week both read daily rows, so the same span)
+MAX_BUCKETS = {
+    "hour": 2200,
+    "day": 2200,
+    "week": 315,
+}
+
+TIMESERIES_COLUMNS = [
+    ArrowColumn("bucket_start", "timestamp"),
+    ArrowColumn("group_id", "int64"),
+    ArrowColumn("group_label", "string", dictionary=True),
+    ArrowColumn("count", "int64"),
+]
+
+
+def _align(ts: datetime, interval: str) -> datetime:
+    """Truncate a UTC timestamp to the start of its bucket (weeks start Monday)."""
+    if interval == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        day -= timedelta(days=day.weekday())
+    return day
+
+
+def resolve_window(
+    interval: str,
+    since: Optional[datetime],
+    until: Optional[datetime]
+) -> Tuple[datetime, datetime]:
+    """
+    Normalise the [since, until) window to UTC, default it to the last 30 days
+    and align `since` down to a bucket boundary so the first bucket is whole.
+    """
+    if until is None:
+        until = datetime.now(timezone.utc)
+    if since is None:
+        since = until - DEFAULT_WINDOW
+    # naive timestamps are taken as UTC
+    since = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+    until = until if until.tzinfo else until.replace(tzinfo=timezone.utc)
+    since = _align(since.astimezone(timezone.utc), interval)
+    until = until.astimezone(timezone.utc)
+
+    if since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'since' must be earlier than 'until'"
+        )
+    if (until - since) / _STEP[interval] > MAX_BUCKETS[interval]:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Window spans more than {MAX_BUCKETS[interval]} {interval} buckets; use a shorter window"
+                   + (" or a coarser interval" if interval != "week" else "")
+        )
+    return since, until
+
+
+def _buckets(interval: str, dimension: str, since: datetime, until: datetime):
+    """
+    One dimension's activity buckets in [since, until): hourly rows for
+    hour; for day and week, daily rows before daily_until plus the hourly
+    rows of the days not rolled up yet, truncated to their day.
+    """
+    h = ReportActivityHourly
+    hourly = select(h.dimension, h.bucket_start, h.group_id, h.status, h.count).where(
+        h.dimension == dimension, h.bucket_start >= since, h.bucket_start < until
+    )
+    if interval == "hour":
+        return hourly.subquery("b")
+
+    d = ReportActivityDaily
+    daily_until = select(ReportActivityRollup.daily_until).scalar_subquery()
+    rolled_up = select(d.dimension, d.bucket_start, d.group_id, d.status, d.count).where(
+        d.dimension == dimension, d.bucket_start >= since, d.bucket_start < until, d.bucket_start < daily_until
+    )
+    recent = select(
+        h.dimension, func.date_trunc("day", h.bucket_start, "UTC").label("bucket_start"), h.group_id, h.status, h.count
+    ).where(h.dimension == dimension, h.bucket_start >= since, h.bucket_start < until, h.bucket_start >= daily_until)
+    return union_all(rolled_up, recent).subquery("b")
+
+
+def timeseries_rows(
+    db: Session,
+    interval: str,
+    group_by: str,
+    since: datetime,
+    until: datetime
+) -> List[Row]:
+    """
+    Return (bucket_start, group_id, group_label, count) rows, ordered by
+    bucket then label. Buckets with no activity are omitted.
+
+    category / area count reports created; status counts transitions into
+    each status.
+    """
+    t = _buckets(interval, group_by, since, until)
+    bucket = func.date_trunc("week", t.c.bucket_start, "UTC") if interval == "week" else t.c.bucket_start
+    count = func.sum(t.c.count)
+
+    if group_by == "status":
+        stmt = select(
+            bucket.label("bucket_start"),
+            literal(None, BigInteger).label("group_id"),
+            t.c.status.label("group_label"),
+            count.label("count")
+        )
+        group_cols = (bucket, t.c.status)
+    else:
+        ref = Category if group_by == "category" else ServiceArea
+        ref_id = Category.category_id if group_by == "category" else ServiceArea.area_id
+        stmt = (
+            select(
+                bucket.label("bucket_start"),
+                t.c.group_id.label("group_id"),
+                ref.name.label("group_label"),
+                count.label("count")
+            )
+            .select_from(t)
+            .join(ref, ref_id == t.c.group_id)
+        )
+        group_cols = (bucket, t.c.group_id, ref.name)
+
+    stmt = (
+        stmt.group_by(*group_cols)
+        .order_by(bucket, group_cols[-1])
+    )
+    return db.execute(stmt).all()
+
+
+def rebuild_timeseries(db: Session) -> None:
+    """Recompute every activity bucket from report / status_update."""
+    db.execute(select(func.rebuild_report_activity()))
+    db.commit()
+
+
+def roll_up_timeseries(db: Session) -> datetime:
+    """Sum finished days of hourly buckets into daily; returns the new daily_until."""
+    daily_until = db.execute(select(func.roll_up_report_activity())).scalar()
+    db.commit()
+    return daily_until
+
+
+# ----------
+# Repair costs
+# ----------
+
+DEFAULT_COST_MONTHS = 12
+
+COST_COLUMNS = [
+    ArrowColumn("month_start", "timestamp"),
+    ArrowColumn("group_id", "int64"),
+    ArrowColumn("group_label", "string", dictionary=True),
+    ArrowColumn("work_orders", "int64"),
+    ArrowColumn("estimate_total", "float64"),
+    ArrowColumn("actual_total", "float64"),
+    ArrowColumn("estimate_on_actual", "float64"),
+    ArrowColumn("variance", "float64"),
+    ArrowColumn("variance_pct", "float64"),
+    ArrowColumn("parts_total", "float64"),
+    ArrowColumn("resolved_orders", "int64"),
+    ArrowColumn("cost_per_resolved_report", "float64"),
+]
+
+_COST_GROUP = {
+    "department": (Department, Department.dept_id, WorkOrderCostMonthly.dept_id),
+    "category": (Category, Category.category_id, WorkOrderCostMonthly.category_id),
+    "area": (ServiceArea, ServiceArea.area_id, WorkOrderCostMonthly.area_id),
+}
+
+
+def _month_start(ts: datetime) -> datetime:
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def resolve_cost_window(
+    since: Optional[datetime],
+    until: Optional[datetime]
+) -> Tuple[datetime, datetime]:
+    """
+    Normalise [since, until) to UTC month boundaries: `since` is aligned down
+    to its month (default: 11 months before the current one), `until`
+    defaults to now.
+    """
+    if until is None:
+        until = datetime.now(timezone.utc)
+    until = until if until.tzinfo else until.replace(tzinfo=timezone.utc)
+    until = until.astimezone(timezone.utc)
+    if since is None:
+        start = _month_start(until)
+        months_back = DEFAULT_COST_MONTHS - 1
+        year, month = divmod(start.year * 12 + start.month - 1 - months_back, 12)
+        since = start.replace(year=year, month=month + 1)
+    since = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+    since = _month_start(since.astimezone(timezone.utc))
+
+    if since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'since' must be earlier than 'until'"
+        )
+    return since, until
+
+
+def _money(expr):
+    return cast(func.round(expr, 2), Float)
+
+
+def cost_rows(
+    db: Session,
+    group_by: str,
+    interval: str,
+    since: datetime,
+    until: datetime
+) -> List[Row]:
+    """
+    Return one row per (month, group) -- or per group when interval is
+    "total" -- with the COST_COLUMNS fields, read from the
+    work_order_cost_monthly rollup (db/Costs.sql). Work orders are bucketed
+    by the month they were opened.
+
+    variance is actual minus estimate over orders that have an actual cost;
+    cost_per_resolved_report is actual spend over closed work orders.
+    """
+    t = WorkOrderCostMonthly
+    actual = func.sum(t.actual_total)
+    on_actual = func.sum(t.estimate_on_actual)
+    resolved = func.sum(t.resolved_orders)
+
+    if group_by == "none":
+        group_id, group_label = literal(None, BigInteger), literal(None, Text)
+    else:
+        ref, _, key = _COST_GROUP[group_by]
+        group_id, group_label = key, ref.name
+    month = t.month_start if interval == "month" else literal(None, DateTime(timezone=True))
+
+    stmt = (
+        select(
+            month.label("month_start"),
+            group_id.label("group_id"),
+            group_label.label("group_label"),
+            cast(func.sum(t.work_orders), BigInteger).label("work_orders"),
+            _money(func.sum(t.estimate_total)).label("estimate_total"),
+            _money(actual).label("actual_total"),
+            _money(on_actual).label("estimate_on_actual"),
+            _money(actual - on_actual).label("variance"),
+            _money((actual - on_actual) * 100 / func.nullif(on_actual, 0)).label("variance_pct"),
+            _money(func.sum(t.parts_total)).label("parts_total"),
+            cast(resolved, BigInteger).label("resolved_orders"),
+            _money(actual / func.nullif(resolved, 0)).label("cost_per_resolved_report")
+        )
+        .select_from(t)
+        .where(t.month_start >= since, t.month_start < until)
+        .having(func.sum(t.work_orders) > 0)
+    )
+
+    group_cols, order_cols = [], []
+    if interval == "month":
+        group_cols.append(t.month_start)
+        order_cols.append(t.month_start)
+    if group_by != "none":
+        ref, ref_id, key = _COST_GROUP[group_by]
+        stmt = stmt.join(ref, ref_id == key)
+        group_cols += [key, ref.name]
+        order_cols.append(ref.name)
+    if group_cols:
+        stmt = stmt.group_by(*group_cols).order_by(*order_cols)
+    return db.execute(stmt).all()
+
+
+def rebuild_costs(db: Session) -> None:
+    """Recompute work_order_cost_monthly from work_order / work_part (both tiers)."""
+    db.execute(select(func.rebuild_work_order_costs()))
+    db.commit()
+
+
+# ----------
+# Response cache
+# ----------
+
+def shared_response(db: Session, request: Request, build: Callable[[], Response]) -> Response:
+    """
+    Serve an analytics response through the per-worker single-flight cache.
+
+    The key is (route, normalized query, JSON or Arrow, report_table_version),
+    so identical requests arriving together run `build` once and share its
+    body, later ones reuse it for ANALYTICS_CACHE_TTL_SECONDS, and any report
+    write moves every key on. Work-order and assignment changes that do not
+    touch report are picked up when the entry expires. Waiting requests give
+    their DB connection back to the pool first. ANALYTICS_CACHE_SIZE=0 turns
+    all of this off.
+    """
+    if settings.analytics_cache_size <= 0:
+        return build()
+
+    route = request.scope["route"].path
+    key = (
+        route,
+        query_fingerprint(request.query_params.multi_items()),
+        "arrow" if wants_arrow(request) else "json",
+        report_service.get_report_table_version(db)
+    )
+
+    def render() -> Tuple[bytes, str, dict]:
+        response = build()
+        headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+        return response.body, response.media_type, headers
+
+    try:
+        (body, media_type, headers), outcome = _response_cache.get_or_compute(key, render, before_wait=db.rollback)
+    except FlightTimeout:
+        ANALYTICS_CACHE.inc(route, "timeout")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Query took too long; retry shortly",
+            headers={"Retry-After": RETRY_AFTER}
+        )
+    ANALYTICS_CACHE.inc(route, outcome)
+    return Response(content=body, media_type=media_type, headers={**headers, "X-Cache": outcome})
@@ -0,0 +1,402 @@
+# backend/services/columnar_store.py
+"""
+Columnar copy of the analytics tables, for `source=columnar` on /analytics.
+
+Layout: one directory per table under COLUMNAR_DIR, one Parquet file per UTC
+month of the table's watermark column (report/2025-06.parquet, ...), rows from
+the hot and archive tiers together, and _watermarks.json with the newest
+watermark value and sync time per table. Queries run in an in-process DuckDB
+over read_parquet() scans, so each request sees whatever files exist when it
+starts; files are replaced with os.replace(), never edited.
+
+sync() is incremental: for every table it re-exports the months from the
+stored watermark minus COLUMNAR_LOOKBACK_DAYS up to the newest row, with one
+COPY per table. Re-exporting whole recent months picks up inserts, updates
+and deletes within the lookback. Report rows change long after they were
+inserted (a report resolved two months after it was created flips
+current_status, its assignment's is_active / accepted_at, its work order's
+closed_at / cost_actual), and those changes always come with a status_update
+row: so the tables keyed by report_id also re-export the older months that
+hold rows of any report with a status_update newer than the previous sync's
+status_update watermark (less _STATUS_SLACK for transactions that committed
+after that sync read). status_update is append-only, so its watermark is
+reliable; the window is the changes since the last sync, not the lookback,
+which keeps the re-exported months to the ones actually touched. Other changes
+to rows older than the lookback, and rows inserted with back-dated
+timestamps, need a full sync (`--full`).
+
+duckdb and pyarrow are optional: they are imported lazily, and columnar
+requests get a 501 when either is missing or a 503 before the first sync.
+"""
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.engine import Engine
+
+from backend.core.config import settings
+
+# (column, type) with type in int64 | float64 | string | bool | timestamp
+Columns = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class ColumnarTable:
+    name: str
+    watermark: str              # timestamp column the files are partitioned by
+    columns: Columns
+    follows_status: bool = True     # has report_id; re-export months of reports with new status_update rows
+
+
+TABLES: Tuple[ColumnarTable, ...] = (
+    ColumnarTable("report", "created_at", (
+        ("report_id", "int64"), ("created_at", "timestamp"), ("created_by", "int64"),
+        ("category_id", "int64"), ("severity_id", "int64"), ("area_id", "int64"),
+        ("current_status", "string"),
+    )),
+    ColumnarTable("status_update", "changed_at", (
+        ("status_id", "int64"), ("report_id", "int64"), ("status", "string"),
+        ("changed_by", "int64"), ("changed_at", "timestamp"),
+    ), follows_status=False),
+    ColumnarTable("assignment", "assigned_at", (
+        ("assignment_id", "int64"), ("report_id", "int64"), ("dept_id", "int64"),
+        ("assignee_user_id", "int64"), ("assigned_at", "timestamp"), ("accepted_at", "timestamp"),
+        ("is_active", "bool"),
+    )),
+    ColumnarTable("sla_clock", "target_due_at", (
+        ("sla_id", "int64"), ("report_id", "int64"), ("target_due_at", "timestamp"),
+        ("breached", "bool"), ("breached_at", "timestamp"),
+    )),
+    ColumnarTable("work_order", "opened_at", (
+        ("wo_id", "int64"), ("report_id", "int64"), ("dept_id", "int64"),
+        ("opened_at", "timestamp"), ("closed_at", "timestamp"),
+        ("cost_estimate", "float64"), ("cost_actual", "float64"),
+    )),
+)
+
+_STATE_FILE = "_watermarks.json"
+# a status_update committed after a sync read can carry a changed_at up to one
+# transaction's length older than that sync's watermark
+_STATUS_SLACK = timedelta(hours=1)
+
+
+def _store_dir() -> str:
+    return settings.columnar_dir
+
+
+def _duckdb():
+    try:
+        import duckdb
+        import pyarrow  # noqa: F401  (read_parquet results, sync)
+    except ImportError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Columnar analytics are not available on this server (duckdb / pyarrow not installed)"
+        ) from exc
+    return duckdb
+
+
+# ----------
+# Sync
+# ----------
+
+def _month(ts: datetime) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _part_name(month: datetime) -> str:
+    return month.strftime("%Y-%m")
+
+
+def _next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _both_tiers(table: str, columns: str, where: str = "") -> str:
+    return f"SELECT {columns} FROM {table}{where} UNION ALL SELECT {columns} FROM {table}_archive{where}"
+
+
+def _status_months_sql(table: ColumnarTable, since: datetime, status_since: datetime) -> str:
+    """Months before `since` holding rows of reports with a status_update since `status_since`."""
+    changed = _both_tiers("status_update", "report_id", f" WHERE changed_at >= '{status_since.isoformat()}'")
+    rows = _both_tiers(
+        table.name, table.watermark,
+        f" WHERE {table.watermark} < '{since.isoformat()}' AND report_id IN (SELECT report_id FROM changed)"
+    )
+    return f"WITH changed AS ({changed}) SELECT DISTINCT date_trunc('month', {table.watermark}, 'UTC') FROM ({rows}) t"
+
+
+def _select_sql(table: ColumnarTable, since: Optional[datetime], months: Sequence[datetime] = ()) -> str:
+    """COPY source: both tiers, timestamps as epoch microseconds, plus the partition key."""
+    cols = ", ".join(
+        f"(extract(epoch FROM {name}) * 1000000)::bigint" if kind == "timestamp" else name
+        for name, kind in table.columns
+    )
+    part = f"to_char({table.watermark} AT TIME ZONE 'UTC', 'YYYY-MM')"
+    ranges = [f"{table.watermark} >= '{since.isoformat()}'"] if since is not None else []
+    ranges += [
+        f"({table.watermark} >= '{m.isoformat()}' AND {table.watermark} < '{_next_month(m).isoformat()}')"
+        for m in months
+    ]
+    where = f" WHERE {' OR '.join(ranges)}" if ranges else ""
+    return (
+        f"SELECT {cols}, {part} FROM {table.name}{where} "
+        f"UNION ALL SELECT {cols}, {part} FROM {table.name}_archive{where}"
+    )
+
+
+_ARROW_TYPES = {"int64": "int64", "float64": "float64", "string": "string", "bool": "bool_"}
+
+
+def _csv_schema(pa, table: ColumnarTable):
+    """Columns as COPY emits them: timestamps are epoch microseconds, then _part."""
+    return pa.schema(
+        [(name, pa.int64() if kind == "timestamp" else getattr(pa, _ARROW_TYPES[kind])()) for name, kind in table.columns]
+        + [("_part", pa.string())]
+    )
+
+
+def _parquet_schema(pa, table: ColumnarTable):
+    return pa.schema([
+        (name, pa.timestamp("us", tz="UTC") if kind == "timestamp" else getattr(pa, _ARROW_TYPES[kind])())
+        for name, kind in table.columns
+    ])
+
+
+def _write_parts(table: ColumnarTable, csv_path: str, table_dir: str) -> Dict[str, int]:
+    """Split a COPY csv into one Parquet file per month; returns {part: rows}."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    schema = _csv_schema(pa, table)
+    out_schema = _parquet_schema(pa, table)
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(column_names=schema.names, block_size=16 << 20),
+        convert_options=pacsv.ConvertOptions(
+            column_types=schema, true_values=["t"], false_values=["f"], strings_can_be_null=True
+        )
+    )
+    writers: Dict[str, Any] = {}
+    counts: Dict[str, int] = {}
+    try:
+        for batch in reader:
+            batch = pa.Table.from_batches([batch])
+            parts = batch.column("_part")
+            data = pa.Table.from_arrays(
+                [batch.column(name).cast(out_schema.field(name).type) for name, _ in table.columns],
+                schema=out_schema
+            )
+            for part in pc.unique(parts).to_pylist():
+                if part not in writers:
+                    writers[part] = pq.ParquetWriter(os.path.join(table_dir, f".{part}.parquet.tmp"), out_schema)
+                    counts[part] = 0
+                chunk = data.filter(pc.equal(parts, part))
+                writers[part].write_table(chunk)
+                counts[part] += chunk.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    for part in writers:
+        os.replace(
+            os.path.join(table_dir, f".{part}.parquet.tmp"),
+            os.path.join(table_dir, f"{part}.parquet")
+        )
+    return counts
+
+
+def _write_empty(table: ColumnarTable, table_dir: str) -> None:
+    # read_parquet() needs at least one file; "empty" sorts after every
+    # month, so the next sync that writes rows removes it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pq.write_table(_parquet_schema(pa, table).empty_table(), os.path.join(table_dir, "empty.parquet"))
+
+
+def _load_state(root: str) -> Dict[str, Dict[str, str]]:
+    try:
+        with open(os.path.join(root, _STATE_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _save_state(root: str, state: Dict[str, Dict[str, str]]) -> None:
+    tmp = os.path.join(root, f".{_STATE_FILE}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, os.path.join(root, _STATE_FILE))
+
+
+def sync(engine: Engine, full: bool = False, lookback_days: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Bring the Parquet copy up to date; returns per-table {since, parts, rows}.
+
+    Holds a Postgres advisory lock for the duration, so concurrent syncs
+    against one store wait for each other.
+    """
+    _duckdb()
+    root = _store_dir()
+    os.makedirs(root, exist_ok=True)
+    lookback = timedelta(days=settings.columnar_lookback_days if lookback_days is None else lookback_days)
+    state = _load_state(root)
+    summary: Dict[str, Dict[str, Any]] = {}
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("SELECT pg_advisory_lock(hashtext('gridwatch.columnar_sync'))")
+        status_previous = state.get("status_update", {}).get("watermark")
+        try:
+            for table in TABLES:
+                table_dir = os.path.join(root, table.name)
+                os.makedirs(table_dir, exist_ok=True)
+
+                cur.execute(
+                    f"SELECT max(m) FROM (SELECT max({table.watermark}) AS m FROM {table.name} "
+                    f"UNION ALL SELECT max({table.watermark}) FROM {table.name}_archive) t"
+                )
+                newest = cur.fetchone()[0]
+                previous = state.get(table.name, {}).get("watermark")
+                since = None
+                if not full and previous is not None:
+                    since = _month(datetime.fromisoformat(previous) - lookback)
+                    if newest is not None:
+                        since = min(since, _month(newest))
+
+                months: List[datetime] = []
+                if since is not None and table.follows_status and status_previous is not None:
+                    # status changes since the previous sync, not since the lookback: the
+                    # previous sync already exported everything committed before it
+                    status_since = datetime.fromisoformat(status_previous) - _STATUS_SLACK
+                    cur.execute(_status_months_sql(table, since, status_since))
+                    months = sorted(_month(m) for (m,) in cur.fetchall())
+
+                with tempfile.NamedTemporaryFile(dir=table_dir, prefix=".copy-", suffix=".csv") as csv_file:
+                    cur.copy_expert(f"COPY ({_select_sql(table, since, months)}) TO STDOUT WITH (FORMAT csv)", csv_file)
+                    csv_file.flush()
+                    counts = _write_parts(table, csv_file.name, table_dir)
+
+                # months in the re-exported range that no longer have rows
+                reexported = {_part_name(m) for m in months}
+                for fname in os.listdir(table_dir):
+                    if not fname.endswith(".parquet") or fname[:-8] in counts:
+                        continue
+                    if since is None or fname[:-8] >= _part_name(since) or fname[:-8] in reexported:
+                        os.remove(os.path.join(table_dir, fname))
+
+                if not any(f.endswith(".parquet") for f in os.listdir(table_dir)):
+                    _write_empty(table, table_dir)
+
+                if newest is not None:
+                    watermark = newest
+                elif previous is not None:
+                    watermark = datetime.fromisoformat(previous)
+                else:
+                    watermark = datetime.now(timezone.utc)
+                state[table.name] = {
+                    "watermark": watermark.isoformat(),
+                    "synced_at": datetime.now(timezone.utc).isoformat(),
+                }
+                summary[table.name] = {
+                    "since": since.isoformat() if since else None,
+                    "older_months": len(months),
+                    "parts": len(counts),
+                    "rows": sum(counts.values()),
+                }
+                _save_state(root, state)
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(hashtext('gridwatch.columnar_sync'))")
+            raw.commit()
+    finally:
+        raw.close()
+    return summary
+
+
+# ----------
+# Queries
+# ----------
+
+_conn = None
+_conn_lock = threading.Lock()
+
+
+def _cursor():
+    global _conn
+    duckdb = _duckdb()
+    with _conn_lock:
+        if _conn is None:
+            _conn = duckdb.connect(":memory:")
+    return _conn.cursor()
+
+
+def _scan(table: str) -> str:
+    # globbed per query, so new and replaced month files are picked up
+    pattern = os.path.join(_store_dir(), table, "*.parquet").replace("'", "''")
+    return f"read_parquet('{pattern}')"
+
+
+def synced_at(tables: Sequence[str]) -> str:
+    """Oldest sync time among `tables` (ISO 8601), or 503 if any was never synced."""
+    state = _load_state(_store_dir())
+    missing = [t for t in tables if t not in state]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Columnar store has no {', '.join(missing)} yet; run python -m backend.manage columnar-sync"
+        )
+    return min(state[t]["synced_at"] for t in tables)
+
+
+def fetch(sql: str, tables: Sequence[str], params: Sequence[Any] = ()) -> Tuple[List[tuple], str]:
+    """
+    Run DuckDB SQL over the Parquet copy; `{table}` placeholders in `sql`
+    become scans of that table's files. Returns (rows, synced_at).
+    """
+    as_of = synced_at(tables)
+    # via Arrow: DuckDB's own fetchall() needs pytz for TIMESTAMPTZ values
+    result = _cursor().execute(sql.format(**{t: _scan(t) for t in tables}), list(params)).to_arrow_table()
+    return list(zip(*(column.to_pylist() for column in result.columns))), as_of
+
+
+def hotspots() -> Tuple[List[tuple], str]:
+    """(area_id, category_id, report_count) over both tiers, as /analytics/hotspots."""
+    return fetch(
+        """
+        SELECT area_id, category_id, count(*) AS report_count
+        FROM {report}
+        GROUP BY area_id, category_id
+        ORDER BY area_id, category_id
+        """,
+        ("report",)
+    )
+
+
+def avg_resolution_days() -> Tuple[Optional[float], str]:
+    """Mean accepted -> last RESOLVED / CLOSED time in days, as /analytics/resolution-times."""
+    rows, as_of = fetch(
+        """
+        WITH resolved AS (
+            SELECT a.report_id, a.accepted_at, max(s.changed_at) AS resolved_at
+            FROM {assignment} a
+            JOIN {status_update} s ON s.report_id = a.report_id
+            WHERE NOT a.is_active
+              AND a.accepted_at IS NOT NULL
+              AND s.status IN ('RESOLVED', 'CLOSED')
+            GROUP BY a.report_id, a.accepted_at
+        )
+        SELECT avg(date_diff('microsecond', accepted_at, resolved_at) / 86400e6) FROM resolved
+        """,
+        ("assignment", "status_update")
+    )
+    return rows[0][0], as_of
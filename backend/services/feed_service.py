@@ -0,0 +1,171 @@
+# backend/services/feed_service.py
+"""
+Per-user activity feeds (db/Feed.sql).
+
+Most events reach a user through user_feed rows written by the fan-out
+trigger, so a page is one range scan on user_feed's primary key. Events on
+reports with feed_fanout_limit() or more subscribers are not copied; they
+are read from feed_event by report and merged in here (only for reports the
+user subscribes to, from when they subscribed): a LATERAL subquery per
+subscription reads at most limit + 1 of that report's events below the
+cursor, so each followed report costs one bounded range scan however much
+history it has. Both halves page by event_id, so the merge stays a keyset
+scan on each side.
+"""
+import base64
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select, text, true, union_all
+from sqlalchemy.orm import Session
+
+from backend.db.models import FeedEvent, Subscription, User, UserFeed
+from backend.schemas import feed as schemas
+
+
+def _encode_cursor(event_id: int) -> str:
+    return base64.urlsafe_b64encode(str(event_id).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor"
+        )
+
+
+def page_query(user_id: int, before: Optional[int], limit: int) -> Select:
+    """Feed events for one page (limit + 1 rows, to detect a next page)."""
+    # fanned out on write: range scan on user_feed (user_id, event_id)
+    pushed = (
+        select(UserFeed.event_id)
+        .where(UserFeed.user_id == user_id)
+        .order_by(UserFeed.event_id.desc())
+        .limit(limit + 1)
+    )
+    # fanned out on read: for each report the user follows, its newest
+    # not-fanned-out events since they subscribed, one bounded range scan per
+    # report on the partial index idx_feed_event_pulled (report_id, event_id)
+    subs = (
+        select(Subscription.report_id, Subscription.created_at)
+        .where(Subscription.user_id == user_id)
+        .subquery("subs")
+    )
+    per_report = (
+        select(FeedEvent.event_id)
+        .where(
+            FeedEvent.report_id == subs.c.report_id,
+            ~FeedEvent.fanned_out,
+            FeedEvent.occurred_at >= subs.c.created_at
+        )
+        .order_by(FeedEvent.event_id.desc())
+        .limit(limit + 1)
+    )
+    if before is not None:
+        pushed = pushed.where(UserFeed.event_id < before)
+        per_report = per_report.where(FeedEvent.event_id < before)
+    per_report = per_report.lateral("per_report")
+    pulled = (
+        select(per_report.c.event_id)
+        .select_from(subs)
+        .join(per_report, true())
+        .order_by(per_report.c.event_id.desc())
+        .limit(limit + 1)
+    )
+
+    page_ids = union_all(pushed, pulled).subquery()
+    return (
+        select(FeedEvent)
+        .join(page_ids, page_ids.c.event_id == FeedEvent.event_id)
+        .order_by(FeedEvent.event_id.desc())
+        .limit(limit + 1)
+    )
+
+
+def get_user_feed(
+    db: Session,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> schemas.FeedPage:
+    """One page of a user's feed, newest first, or 404 for an unknown user."""
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    before = _decode_cursor(cursor) if cursor else None
+    rows = db.execute(page_query(user_id, before, limit)).scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].event_id)
+
+    return schemas.FeedPage(
+        items=[schemas.FeedItem.model_validate(ev) for ev in rows],
+        next_cursor=next_cursor
+    )
+
+
+def delete_report_events(db: Session, report_id: int) -> None:
+    """
+    Remove a report's feed events and its subscribers' user_feed rows (both
+    by primary key). Call before the report's subscriptions are deleted;
+    rows of users who unsubscribed earlier are left behind but never
+    returned, since pages join feed_event.
+    """
+    db.execute(
+        text(
+            """
+            DELETE FROM user_feed
+            WHERE user_id IN (
+                SELECT user_id FROM subscription WHERE report_id = :rid
+                UNION
+                SELECT user_id FROM subscription_archive WHERE report_id = :rid
+            )
+              AND event_id IN (SELECT event_id FROM feed_event WHERE report_id = :rid)
+            """
+        ),
+        {"rid": report_id}
+    )
+    db.execute(
+        text("DELETE FROM feed_event WHERE report_id = :rid"),
+        {"rid": report_id}
+    )
+
+
+def delete_reports_events(db: Session, report_ids: Sequence[int]) -> None:
+    """delete_report_events for a batch of (archived) reports."""
+    db.execute(
+        text(
+            """
+            DELETE FROM user_feed
+            WHERE user_id IN (
+                SELECT user_id FROM subscription WHERE report_id = ANY(:rids)
+                UNION
+                SELECT user_id FROM subscription_archive WHERE report_id = ANY(:rids)
+            )
+              AND event_id IN (SELECT event_id FROM feed_event WHERE report_id = ANY(:rids))
+            """
+        ),
+        {"rids": list(report_ids)}
+    )
+    db.execute(
+        text("DELETE FROM feed_event WHERE report_id = ANY(:rids)"),
+        {"rids": list(report_ids)}
+    )
+
+
+def rebuild_feeds(db: Session, days: int) -> int:
+    """Recompute every feed from the last `days` of history; returns the event count."""
+    events = db.execute(
+        text("SELECT rebuild_user_feeds(make_interval(days => :days))"),
+        {"days": days}
+    ).scalar()
+    db.commit()
+    return events
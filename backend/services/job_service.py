@@ -0,0 +1,327 @@
+# backend/services/job_service.py
+"""
+Background jobs: heavy maintenance and export work, off the request path.
+
+A job is a row in `job` (db/Jobs.sql). The API submits it (QUEUED) and
+polls or cancels it (backend/api/jobs.py); worker processes started with
+`python -m backend.manage worker` claim and run it
+(backend/services/job_worker.py). Each type in JOB_TYPES has:
+
+  run     : fn(ctx, params) -> result dict, with ctx.db a Session of its own,
+            ctx.progress(fraction, note) to report progress (it raises
+            JobCancelled once a cancel was requested)
+  params  : Pydantic model the submitted params are validated against
+  limit   : how many jobs of the type may run at once across all workers
+            (JOB_LIMITS overrides it, e.g. "export-reports=4")
+
+Cancelling a queued job removes it from the queue; a running one is asked
+to stop: the worker's heartbeat sees cancel_requested, cancels the job's
+current statement (pg_cancel_backend) and the next progress() call raises.
+Batched jobs therefore stop within a batch; work already committed stays.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+from backend.db.models import Job
+from backend.schemas import jobs as schemas
+from backend.services import analytics_service, columnar_store, feed_service, report_service
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """What a running job sees: its id, a Session, and progress / cancellation."""
+
+    def __init__(self, job_id: int, db: Session, report: Callable[[float, Optional[str]], bool]):
+        self.job_id = job_id
+        self.db = db
+        self.cancel_requested = False
+        self._report = report
+
+    def progress(self, fraction: float, note: Optional[str] = None) -> None:
+        if self._report(max(0.0, min(fraction, 1.0)), note) or self.cancel_requested:
+            self.cancel_requested = True
+            raise JobCancelled()
+
+
+class JobType(NamedTuple):
+    run: Callable[[JobContext, BaseModel], Dict[str, Any]]
+    params: type[BaseModel]
+    limit: int
+    description: str
+    autocommit: bool = False                            # ctx.db on an AUTOCOMMIT connection
+    check: Optional[Callable[[BaseModel], None]] = None  # extra validation on submit (422)
+
+
+# ----------
+# Job types
+# ----------
+
+def _rebuild_timeseries(ctx: JobContext, params: schemas.NoParams) -> Dict[str, Any]:
+    analytics_service.rebuild_timeseries(ctx.db)
+    return {}
+
+
+def _rollup_timeseries(ctx: JobContext, params: schemas.NoParams) -> Dict[str, Any]:
+    return {"daily_until": analytics_service.roll_up_timeseries(ctx.db).isoformat()}
+
+
+def _rebuild_costs(ctx: JobContext, params: schemas.NoParams) -> Dict[str, Any]:
+    analytics_service.rebuild_costs(ctx.db)
+    return {}
+
+
+def _rebuild_feeds(ctx: JobContext, params: schemas.RebuildFeedsParams) -> Dict[str, Any]:
+    return {"events": feed_service.rebuild_feeds(ctx.db, params.days)}
+
+
+def _archive(ctx: JobContext, params: schemas.ArchiveParams) -> Dict[str, Any]:
+    days = params.older_than_days or settings.archive_after_days
+    return {"archived": report_service.archive_reports(ctx.db, days, params.batch_size)}
+
+
+def _columnar_sync(ctx: JobContext, params: schemas.ColumnarSyncParams) -> Dict[str, Any]:
+    summary = columnar_store.sync(ctx.db.get_bind(), full=params.full, lookback_days=params.lookback_days)
+    return {table: {"rows": info["rows"], "parts": info["parts"]} for table, info in summary.items()}
+
+
+def _recompute_sla(ctx: JobContext, params: schemas.SlaParams) -> Dict[str, Any]:
+    return {"changed": report_service.recompute_sla_clocks(ctx.db, params.batch_size, ctx.progress)}
+
+
+def _purge_archive(ctx: JobContext, params: schemas.PurgeArchiveParams) -> Dict[str, Any]:
+    return {"deleted": report_service.purge_archived_reports(ctx.db, params.older_than_days, params.batch_size, ctx.progress)}
+
+
+def _export_fields(params: schemas.ExportReportsParams) -> tuple:
+    if params.fields is None:
+        return tuple(report_service.LIST_FIELDS)
+    return report_service.parse_fieldset(",".join(params.fields), list(report_service.LIST_FIELDS), "fields")
+
+
+def _check_export(params: schemas.ExportReportsParams) -> None:
+    _export_fields(params)
+
+
+def result_path(job_id: int) -> str:
+    return os.path.join(settings.job_result_dir, f"job-{job_id}.csv")
+
+
+def _export_reports(ctx: JobContext, params: schemas.ExportReportsParams) -> Dict[str, Any]:
+    fields = _export_fields(params)
+    path = result_path(ctx.job_id)
+    os.makedirs(settings.job_result_dir, exist_ok=True)
+    partial = path + ".partial"
+    with open(partial, "wb") as out:
+        rows = report_service.export_report_csv(
+            ctx.db, out, fields,
+            search=params.search,
+            area_id=params.area_id,
+            category_id=params.category_id,
+            status_filter=params.status,
+            include_archived=params.include_archived,
+            severity_id=params.severity_id,
+            created_after=params.created_after,
+            open_only=params.open,
+            breaching=params.breaching
+        )
+    os.replace(partial, path)
+    return {"file": os.path.basename(path), "rows": rows, "bytes": os.path.getsize(path), "fields": list(fields)}
+
+
+JOB_TYPES: Dict[str, JobType] = {
+    "rebuild-timeseries": JobType(_rebuild_timeseries, schemas.NoParams, 1, "recompute /analytics/timeseries buckets"),
+    "rollup-timeseries": JobType(_rollup_timeseries, schemas.NoParams, 1, "sum finished days of hourly activity buckets into daily"),
+    "rebuild-costs": JobType(_rebuild_costs, schemas.NoParams, 1, "recompute the /analytics/costs rollup"),
+    "rebuild-feeds": JobType(_rebuild_feeds, schemas.RebuildFeedsParams, 1, "recompute user feeds from recent history"),
+    "archive": JobType(_archive, schemas.ArchiveParams, 1, "move idle CLOSED / RESOLVED reports to the archive", autocommit=True),
+    "columnar-sync": JobType(_columnar_sync, schemas.ColumnarSyncParams, 1, "refresh the Parquet copy behind ?source=columnar"),
+    "recompute-sla": JobType(_recompute_sla, schemas.SlaParams, 1, "recompute SLA breach state of hot reports"),
+    "export-reports": JobType(_export_reports, schemas.ExportReportsParams, 2, "CSV of the report list (GET /jobs/{id}/result)", check=_check_export),
+    "purge-archive": JobType(_purge_archive, schemas.PurgeArchiveParams, 1, "delete archived reports older than N days"),
+}
+
+
+def type_limit(job_type: str) -> int:
+    return settings.job_limits.get(job_type, JOB_TYPES[job_type].limit)
+
+
+def validate_params(job_type: str, params: Dict[str, Any]) -> BaseModel:
+    if job_type not in JOB_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown job_type {job_type!r}; choose from {', '.join(JOB_TYPES)}"
+        )
+    spec = JOB_TYPES[job_type]
+    try:
+        model = spec.params.model_validate(params)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=json.loads(exc.json(include_url=False))
+        ) from exc
+    if spec.check:
+        spec.check(model)
+    return model
+
+
+# ----------
+# API side
+# ----------
+
+def list_job_types() -> List[schemas.JobTypeOut]:
+    return [
+        schemas.JobTypeOut(job_type=name, description=jt.description, limit=type_limit(name), params=jt.params.model_json_schema())
+        for name, jt in JOB_TYPES.items()
+    ]
+
+
+def submit_job(db: Session, payload: schemas.JobCreate) -> schemas.JobOut:
+    params = validate_params(payload.job_type, payload.params)
+    job = Job(job_type=payload.job_type, params=params.model_dump(mode="json"), status="QUEUED")
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return schemas.JobOut.model_validate(job)
+
+
+def _get(db: Session, job_id: int) -> Job:
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+def get_job(db: Session, job_id: int) -> schemas.JobOut:
+    return schemas.JobOut.model_validate(_get(db, job_id))
+
+
+def list_jobs(
+    db: Session,
+    status_filter: Optional[str] = None,
+    job_type: Optional[str] = None,
+    before: Optional[int] = None,
+    limit: int = 50
+) -> List[schemas.JobOut]:
+    """Newest first; pass the last job_id as `before` for the next page."""
+    stmt = select(Job).order_by(Job.job_id.desc()).limit(limit)
+    if status_filter:
+        stmt = stmt.where(Job.status == status_filter)
+    if job_type:
+        stmt = stmt.where(Job.job_type == job_type)
+    if before:
+        stmt = stmt.where(Job.job_id < before)
+    return [schemas.JobOut.model_validate(job) for job in db.execute(stmt).scalars()]
+
+
+def cancel_job(db: Session, job_id: int) -> schemas.JobOut:
+    """Dequeue a queued job, or ask a running one to stop; 409 once finished."""
+    # SET expressions see the old row, so QUEUED ones are cancelled outright
+    cancelled = db.execute(
+        text(
+            """
+            UPDATE job
+            SET status = CASE WHEN status = 'QUEUED' THEN 'CANCELLED' ELSE status END,
+                finished_at = CASE WHEN status = 'QUEUED' THEN now() ELSE finished_at END,
+                cancel_requested = true
+            WHERE job_id = :id AND status IN ('QUEUED', 'RUNNING')
+            RETURNING job_id
+            """
+        ),
+        {"id": job_id}
+    ).first()
+    db.commit()
+    job = _get(db, job_id)
+    if cancelled is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already {job.status.lower()}"
+        )
+    return schemas.JobOut.model_validate(job)
+
+
+def result_file(db: Session, job_id: int) -> str:
+    """Path of a finished job's result file; 409 until it succeeded, 404 if it has none."""
+    job = _get(db, job_id)
+    if job.status != "SUCCEEDED":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.lower()}"
+        )
+    path = result_path(job_id)
+    if not (job.result or {}).get("file") or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job has no result file"
+        )
+    return path
+
+
+# ----------
+# Worker side (statements run on the worker's AUTOCOMMIT control connection)
+# ----------
+
+# job types with queued work, the type with the oldest job first
+QUEUED_TYPES = text("SELECT job_type FROM job WHERE status = 'QUEUED' GROUP BY job_type ORDER BY min(job_id)")
+
+TAKE_SLOT = text("SELECT pg_try_advisory_lock(hashtext('gridwatch.job:' || :job_type), :slot)")
+RELEASE_SLOT = text("SELECT pg_advisory_unlock(hashtext('gridwatch.job:' || :job_type), :slot)")
+
+CLAIM = text("""
+    UPDATE job
+    SET status = 'RUNNING', worker = :worker, attempts = attempts + 1,
+        started_at = now(), heartbeat_at = now(), progress = 0, progress_note = NULL
+    WHERE job_id = (
+        SELECT job_id FROM job
+        WHERE status = 'QUEUED' AND job_type = :job_type
+        ORDER BY job_id
+        FOR UPDATE SKIP LOCKED
+        LIMIT 1
+    )
+    RETURNING job_id, params
+""")
+
+HEARTBEAT = text("""
+    UPDATE job SET heartbeat_at = now()
+    WHERE job_id = :id AND worker = :worker
+    RETURNING cancel_requested
+""")
+
+PROGRESS = text("""
+    UPDATE job SET progress = :progress, progress_note = coalesce(:note, progress_note), heartbeat_at = now()
+    WHERE job_id = :id AND worker = :worker
+    RETURNING cancel_requested
+""")
+
+FINISH = text("""
+    UPDATE job
+    SET status = :status, finished_at = now(), result = CAST(:result AS jsonb), error = :error,
+        progress = CASE WHEN :status = 'SUCCEEDED' THEN 1 ELSE progress END
+    WHERE job_id = :id AND worker = :worker AND status = 'RUNNING'
+""")
+
+# RUNNING jobs nobody has heartbeaten for JOB_STALE_SECONDS: the worker died
+REQUEUE_STALE = text("""
+    UPDATE job
+    SET status = CASE WHEN cancel_requested THEN 'CANCELLED'
+                      WHEN attempts >= :max_attempts THEN 'FAILED'
+                      ELSE 'QUEUED' END,
+        error = CASE WHEN NOT cancel_requested AND attempts >= :max_attempts
+                     THEN 'worker lost (no heartbeat for ' || :stale || ' s)' ELSE error END,
+        finished_at = CASE WHEN cancel_requested OR attempts >= :max_attempts THEN now() END,
+        worker = NULL
+    WHERE status = 'RUNNING' AND heartbeat_at < now() - make_interval(secs => :stale)
+    RETURNING job_id, status
+""")
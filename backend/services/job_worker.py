@@ -0,0 +1,224 @@
+# backend/services/job_worker.py
+"""
+Job worker processes (`python -m backend.manage worker [--processes N]`).
+
+serve() starts N spawned processes and restarts any that die. Each one
+loops: requeue stale jobs (at most every JOB_STALE_SECONDS / 2), take a
+concurrency slot of the type with the oldest queued job, claim that job
+(FOR UPDATE SKIP LOCKED, see job_service.CLAIM), run it, record the
+outcome, release the slot; with nothing claimable it sleeps
+JOB_POLL_SECONDS.
+
+A process uses two connections: the control connection (AUTOCOMMIT) holds
+the slot's advisory lock and writes claim / heartbeat / progress / finish,
+so they are visible at once and never part of the job's own transaction;
+the job runs in a Session of its own. A heartbeat thread touches the job
+every JOB_HEARTBEAT_SECONDS and, when a cancel was requested, cancels the
+job connection's current statement.
+
+SIGINT / SIGTERM stop the pool: each process finishes the job in hand, then
+exits.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+from backend.db.session import engine
+from backend.services import job_service
+from backend.services.job_service import JOB_TYPES, JobCancelled, JobContext
+
+log = logging.getLogger("gridwatch.jobs")
+
+
+class Worker:
+    def __init__(self, engine: Engine, name: Optional[str] = None):
+        self.engine = engine
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.control: Connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        self._lock = threading.Lock()       # control connection: main loop vs heartbeat thread
+        self._last_sweep = 0.0
+
+    def _control(self, stmt, params: Dict[str, Any]):
+        with self._lock:
+            return self.control.execute(stmt, params)
+
+    # ----------
+    # Claiming
+    # ----------
+
+    def _take_slot(self, job_type: str) -> Optional[int]:
+        for slot in range(job_service.type_limit(job_type)):
+            if self._control(job_service.TAKE_SLOT, {"job_type": job_type, "slot": slot}).scalar():
+                return slot
+        return None
+
+    def _release_slot(self, job_type: str, slot: int) -> None:
+        self._control(job_service.RELEASE_SLOT, {"job_type": job_type, "slot": slot})
+
+    def sweep(self) -> None:
+        if time.monotonic() - self._last_sweep < settings.job_stale_seconds / 2:
+            return
+        self._last_sweep = time.monotonic()
+        for job_id, new_status in self._control(
+            job_service.REQUEUE_STALE,
+            {"stale": settings.job_stale_seconds, "max_attempts": settings.job_max_attempts}
+        ).all():
+            log.warning("job %s lost its worker; now %s", job_id, new_status)
+
+    def claim(self) -> Optional[Tuple[int, str, Dict[str, Any], int]]:
+        """(job_id, job_type, params, slot) of a claimed job, holding the slot; or None."""
+        for job_type in self._control(job_service.QUEUED_TYPES, {}).scalars().all():
+            if job_type not in JOB_TYPES:
+                continue        # submitted by a newer deploy; leave it queued
+            slot = self._take_slot(job_type)
+            if slot is None:
+                continue
+            row = self._control(job_service.CLAIM, {"job_type": job_type, "worker": self.name}).first()
+            if row is not None:
+                return row.job_id, job_type, row.params, slot
+            self._release_slot(job_type, slot)
+        return None
+
+    # ----------
+    # Running
+    # ----------
+
+    def finish(self, job_id: int, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self._control(job_service.FINISH, {
+            "id": job_id, "worker": self.name, "status": status,
+            "result": json.dumps(result) if result is not None else None, "error": error,
+        })
+
+    def _heartbeat(self, ctx: JobContext, pid: int, done: threading.Event) -> None:
+        while not done.wait(settings.job_heartbeat_seconds):
+            try:
+                row = self._control(job_service.HEARTBEAT, {"id": ctx.job_id, "worker": self.name}).first()
+                # no row: the job was requeued as stale and is not ours any more
+                if (row is None or row.cancel_requested) and not ctx.cancel_requested:
+                    ctx.cancel_requested = True
+                    self._control(text("SELECT pg_cancel_backend(:pid)"), {"pid": pid})
+            except Exception as exc:
+                log.warning("heartbeat for job %s failed: %s", ctx.job_id, exc)
+
+    def run(self, job_id: int, job_type: str, params: Dict[str, Any]) -> str:
+        """Run a claimed job to completion; returns its final status."""
+        spec = JOB_TYPES[job_type]
+        engine = self.engine.execution_options(isolation_level="AUTOCOMMIT") if spec.autocommit else self.engine
+
+        def report(fraction: float, note: Optional[str]) -> bool:
+            row = self._control(job_service.PROGRESS, {"id": job_id, "worker": self.name, "progress": fraction, "note": note}).first()
+            return bool(row and row.cancel_requested)
+
+        with Session(bind=engine) as db:
+            pid = db.execute(text("SELECT pg_backend_pid()")).scalar()
+            ctx = JobContext(job_id, db, report)
+            done = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(ctx, pid, done), daemon=True)
+            heartbeat.start()
+            t0 = time.perf_counter()
+            try:
+                result = spec.run(ctx, spec.params.model_validate(params))
+                status, error = "SUCCEEDED", None
+            except JobCancelled:
+                result, status, error = None, "CANCELLED", None
+            except OperationalError as exc:
+                # 57014 = query_canceled, i.e. our own pg_cancel_backend
+                db.rollback()
+                if ctx.cancel_requested and getattr(exc.orig, "pgcode", None) == "57014":
+                    result, status, error = None, "CANCELLED", None
+                else:
+                    result, status, error = None, "FAILED", f"{type(exc).__name__}: {exc}"[:2000]
+            except Exception as exc:
+                db.rollback()
+                log.exception("job %s (%s) failed", job_id, job_type)
+                result, status, error = None, "FAILED", f"{type(exc).__name__}: {exc}"[:2000]
+            finally:
+                done.set()
+                heartbeat.join()
+        self.finish(job_id, status, result, error)
+        log.info("job %s (%s) %s in %.1f s", job_id, job_type, status.lower(), time.perf_counter() - t0)
+        return status
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False when there was nothing to claim."""
+        self.sweep()
+        claimed = self.claim()
+        if claimed is None:
+            return False
+        job_id, job_type, params, slot = claimed
+        try:
+            self.run(job_id, job_type, params)
+        finally:
+            self._release_slot(job_type, slot)
+        return True
+
+    def close(self) -> None:
+        self.control.close()
+
+
+# ----------
+# Process pool
+# ----------
+
+def _process_main(stop, parent: int) -> None:
+    # the pool's parent handles SIGINT / SIGTERM and sets `stop`
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+    worker = Worker(engine)
+    log.info("worker %s ready (%s)", worker.name, ", ".join(f"{t}={job_service.type_limit(t)}" for t in JOB_TYPES))
+    try:
+        # a parent killed outright never sets `stop`
+        while not stop.is_set() and os.getppid() == parent:
+            try:
+                if not worker.run_once():
+                    stop.wait(settings.job_poll_seconds)
+            except OperationalError as exc:
+                log.warning("database unavailable: %s", exc)
+                stop.wait(max(settings.job_poll_seconds, 5.0))
+                worker.close()
+                worker = Worker(engine)
+    finally:
+        worker.close()
+
+
+def serve(processes: int) -> None:
+    """Run `processes` worker processes until SIGINT / SIGTERM, restarting any that die."""
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    signals = []
+
+    # only note it here: setting `stop` inside the handler can deadlock on
+    # the Event's lock if the signal lands while this process holds it
+    def shutdown(signum, frame):
+        signals.append(signum)
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    pool = {}
+    while not signals:
+        for i in range(processes):
+            proc = pool.get(i)
+            if proc is not None and proc.is_alive():
+                continue
+            if proc is not None:
+                log.warning("worker process %s exited with %s; restarting", proc.name, proc.exitcode)
+            pool[i] = ctx.Process(target=_process_main, args=(stop, os.getpid()), name=f"gridwatch-worker-{i}")
+            pool[i].start()
+        time.sleep(1.0)
+    stop.set()
+    for proc in pool.values():
+        proc.join()
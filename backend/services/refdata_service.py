@@ -0,0 +1,61 @@
+# backend/services/refdata_service.py
+"""
+Reference data (service areas, categories, severities) as serialized JSON.
+
+These tables only change through the SQL scripts, so each list is kept per
+worker for REFDATA_CACHE_TTL_SECONDS (0 = read every time) and loaded once
+however many requests miss together. The startup warmup fills the cache.
+"""
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.core.cache import SingleFlightCache
+from backend.core.config import settings
+from backend.db.models import Category, ServiceArea, Severity
+from backend.schemas import reports as schemas
+
+_cache = SingleFlightCache(maxsize=8, ttl=settings.refdata_cache_ttl_seconds)
+
+_AREAS = TypeAdapter(List[schemas.ServiceAreaOut])
+_CATEGORIES = TypeAdapter(List[schemas.CategoryOut])
+_SEVERITIES = TypeAdapter(List[schemas.SeverityOut])
+
+
+def _cached(db: Session, key: str, load: Callable[[], bytes]) -> bytes:
+    body, _ = _cache.get_or_compute(key, load, before_wait=db.rollback)
+    return body
+
+
+def service_areas_json(db: Session) -> bytes:
+    def load() -> bytes:
+        areas = db.execute(select(ServiceArea).order_by(ServiceArea.name)).scalars().all()
+        return _AREAS.dump_json(_AREAS.validate_python(areas, from_attributes=True))
+    return _cached(db, "service_areas", load)
+
+
+def categories_json(db: Session) -> bytes:
+    def load() -> bytes:
+        categories = db.execute(select(Category).order_by(Category.name)).scalars().all()
+        return _CATEGORIES.dump_json(_CATEGORIES.validate_python(categories, from_attributes=True))
+    return _cached(db, "categories", load)
+
+
+def severities_json(db: Session) -> bytes:
+    def load() -> bytes:
+        severities = db.execute(select(Severity).order_by(Severity.weight.desc())).scalars().all()
+        return _SEVERITIES.dump_json(_SEVERITIES.validate_python(severities, from_attributes=True))
+    return _cached(db, "severities", load)
+
+
+def warm(db: Session) -> None:
+    """Load every reference list into the cache."""
+    service_areas_json(db)
+    categories_json(db)
+    severities_json(db)
+
+
+def clear() -> None:
+    _cache.clear()
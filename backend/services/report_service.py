@@ -1,24 +1,53 @@
 # backend/services/report_service.py
-from typing import List, Optional
+import base64
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, and_, text
+from pydantic import TypeAdapter
+from sqlalchemy import ColumnElement, Float, Row, select, and_, or_, case, cast, delete, desc, func, text, tuple_, union_all
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.exc import DataError, IntegrityError
 
-from backend.db.models import Report, ServiceArea, Category, Severity, StatusUpdate
+from backend.core.cache import LRUCache
+from backend.core.columnar import ArrowColumn, rows_to_arrow
+from backend.core.config import settings
+from backend.core.metrics import timed_serialization
+from backend.db.models import (
+    Report,
+    ReportArchive,
+    ReportTableVersion,
+    ServiceArea,
+    Category,
+    Comment,
+    Severity,
+    StatusUpdate,
+    Subscription,
+    StatusUpdateArchive
+)
 from backend.schemas import reports as schemas
+from backend.services import feed_service
+from backend.services.status_machine import OPEN_STATUSES, transition_problem
+
+
+# serialized ReportDetail bodies keyed by (report_id, row_version)
+_detail_cache = LRUCache(maxsize=settings.report_detail_cache_size)
 
 
 # ----------
 # Helpers
 # ----------
 
-def _build_report_detail(report: Report) -> schemas.ReportDetail:
-    """Return a full ReportDetail (joins + status history) for a given Report row."""
-    # sort status history by changed_at
-    history_sorted = sorted(report.status_updates, key=lambda s: s.changed_at)
-
+def _build_report_detail(
+    report: Report | ReportArchive,
+    history: Sequence[Row],
+    history_next_cursor: Optional[str] = None
+) -> schemas.ReportDetail:
+    """
+    Return a ReportDetail for a Report row plus its most recent history
+    (`history` newest first, as returned by _history_page).
+    """
     return schemas.ReportDetail(
         report_id=report.report_id,
         title=report.title,
@@ -31,86 +60,754 @@ def _build_report_detail(report: Report) -> schemas.ReportDetail:
         service_area=schemas.ServiceAreaOut.model_validate(report.service_area),
         category=schemas.CategoryOut.model_validate(report.category),
         severity=schemas.SeverityOut.model_validate(report.severity),
+        # embedded history stays oldest -> newest
         status_history=[
-            schemas.StatusUpdateOut.model_validate(su) for su in history_sorted
-        ]
+            schemas.StatusUpdateOut.model_validate(su) for su in reversed(history)
+        ],
+        status_history_next_cursor=history_next_cursor
+    )
+
+
+def _encode_cursor(ts: datetime, row_id: int) -> str:
+    raw = f"{ts.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, what: str = "history") -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        ts, row_id = raw.split("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid {what} cursor"
+        ) from e
+
+
+def _history_page(
+    db: Session,
+    model: type[StatusUpdate] | type[StatusUpdateArchive],
+    report_id: int,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Row], Optional[str]]:
+    """
+    Return (up to `limit` StatusUpdateOut-shaped rows newest first, cursor
+    for the next older page or None).
+
+    Keyset pagination on (changed_at, status_id) descending; served by the
+    (report_id, changed_at) index, so a page costs the same at any depth.
+    """
+    stmt = (
+        select(model.status_id, model.status, model.note, model.changed_at)
+        .where(model.report_id == report_id)
+    )
+    if cursor:
+        changed_at, status_id = _decode_cursor(cursor)
+        stmt = stmt.where(tuple_(model.changed_at, model.status_id) < tuple_(changed_at, status_id))
+
+    stmt = stmt.order_by(model.changed_at.desc(), model.status_id.desc()).limit(limit + 1)
+    rows = db.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].changed_at, rows[-1].status_id)
+    return rows, next_cursor
+
+
+def _history_model(report: Report | ReportArchive) -> type[StatusUpdate] | type[StatusUpdateArchive]:
+    return StatusUpdateArchive if isinstance(report, ReportArchive) else StatusUpdate
+
+
+def _detail_for(db: Session, report: Report | ReportArchive) -> schemas.ReportDetail:
+    """ReportDetail with the most recent `report_history_embed_limit` status entries."""
+    history, next_cursor = _history_page(
+        db, _history_model(report), report.report_id, settings.report_history_embed_limit
     )
+    return _build_report_detail(report, history, next_cursor)
 
 
 # ----------------
 # Domain functions 
 # ----------------
 
+# ReportSummary column order; shared by the JSON and Arrow list paths
+REPORT_SUMMARY_COLUMNS = [
+    ArrowColumn("report_id", "int64"),
+    ArrowColumn("title", "string"),
+    ArrowColumn("current_status", "string", dictionary=True),
+    ArrowColumn("created_at", "timestamp"),
+    ArrowColumn("category_name", "string", dictionary=True),
+    ArrowColumn("area_name", "string", dictionary=True),
+    ArrowColumn("severity_label", "string", dictionary=True),
+]
+
+
+# statuses whose reports can be moved to the archive tier (db/Archive.sql)
+ARCHIVED_STATUSES = ("CLOSED", "RESOLVED")
+
+
+# window of the facet count behind the reports page's "Last 24h" toggle
+RECENT_HOURS = 24
+
+
+# Predicates of the list's open= / breaching= filters and the matching facet
+# counts. `c` is a report model or a subquery's columns; "now" is the
+# database's transaction time, so a page and its counts agree.
+
+def _is_open(c) -> ColumnElement:
+    return c.current_status.in_(OPEN_STATUSES)
+
+
+def _is_breaching(c) -> ColumnElement:
+    # open and older than its category's SLA (one category PK probe per open row)
+    sla_hours = (
+        select(Category.default_sla_hours)
+        .where(Category.category_id == c.category_id)
+        .correlate_except(Category)
+        .scalar_subquery()
+    )
+    return and_(_is_open(c), c.created_at < func.now() - func.make_interval(0, 0, 0, 0, sla_hours))
+
+
+def _is_recent(c) -> ColumnElement:
+    return c.created_at >= func.now() - timedelta(hours=RECENT_HOURS)
+
+
+def _report_conditions(
+    model: type[Report] | type[ReportArchive],
+    search: Optional[str],
+    area_id: Optional[int],
+    category_id: Optional[int],
+    status_filter: Optional[str],
+    severity_id: Optional[int],
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
+) -> list:
+    conditions = []
+    if search:
+        conditions.append(model.title.ilike(f"%{search}%"))
+    if area_id:
+        conditions.append(model.area_id == area_id)
+    if category_id:
+        conditions.append(model.category_id == category_id)
+    if status_filter:
+        conditions.append(model.current_status == status_filter)
+    if severity_id:
+        conditions.append(model.severity_id == severity_id)
+    if created_after:
+        conditions.append(model.created_at >= created_after)
+    if open_only:
+        conditions.append(_is_open(model))
+    if breaching:
+        conditions.append(_is_breaching(model))
+    return conditions
+
+
+def _report_summary_select(
+    model: type[Report] | type[ReportArchive],
+    search: Optional[str],
+    area_id: Optional[int],
+    category_id: Optional[int],
+    status_filter: Optional[str],
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
+):
+    stmt = (
+        select(
+            model.report_id,
+            model.title,
+            model.current_status,
+            model.created_at,
+            Category.name.label("category_name"),
+            ServiceArea.name.label("area_name"),
+            Severity.label.label("severity_label")
+        )
+        .join(ServiceArea, model.area_id == ServiceArea.area_id)
+        .join(Category, model.category_id == Category.category_id)
+        .join(Severity, model.severity_id == Severity.severity_id)
+    )
+
+    conditions = _report_conditions(
+        model, search, area_id, category_id, status_filter, severity_id, created_after, open_only, breaching
+    )
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+
+    return stmt
+
+
+def _list_tiers(
+    status_filter: Optional[str],
+    include_archived: bool,
+    open_only: bool = False
+) -> List[type[Report] | type[ReportArchive]]:
+    # the archive holds finished reports only, so open lists never read it
+    if open_only:
+        return [Report]
+    if include_archived or status_filter in ARCHIVED_STATUSES:
+        return [Report, ReportArchive]
+    return [Report]
+
+
+def list_report_rows(
+    db: Session,
+    search: Optional[str] = None,
+    area_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    include_archived: bool = False,
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
+) -> List[Row]:
+    """
+    Return ReportSummary-shaped rows (see REPORT_SUMMARY_COLUMNS), newest first.
+
+    Only the summary columns are selected, so no Report / ServiceArea /
+    Category / Severity entities are hydrated. Archived reports are included
+    when asked for, or when filtering on a status that can be archived.
+    """
+    tiers = _list_tiers(status_filter, include_archived, open_only or breaching)
+    selects = [
+        _report_summary_select(
+            model, search, area_id, category_id, status_filter, severity_id, created_after, open_only, breaching
+        )
+        for model in tiers
+    ]
+
+    if len(selects) > 1:
+        stmt = union_all(*selects).order_by(desc("created_at"))
+    else:
+        stmt = selects[0].order_by(Report.created_at.desc())
+
+    return db.execute(stmt).all()
+
+
 def list_reports(
     db: Session,
     search: Optional[str] = None,
     area_id: Optional[int] = None,
     category_id: Optional[int] = None,
-    status_filter: Optional[str] = None
+    status_filter: Optional[str] = None,
+    include_archived: bool = False,
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
 ) -> List[schemas.ReportSummary]:
     """List reports with optional filters and joined area/category/severity names."""
+    rows = list_report_rows(
+        db,
+        search=search,
+        area_id=area_id,
+        category_id=category_id,
+        status_filter=status_filter,
+        include_archived=include_archived,
+        severity_id=severity_id,
+        created_after=created_after,
+        open_only=open_only,
+        breaching=breaching
+    )
+
+    return [schemas.ReportSummary.model_validate(row) for row in rows]
+
+
+def list_reports_arrow(
+    db: Session,
+    search: Optional[str] = None,
+    area_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    include_archived: bool = False,
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
+) -> bytes:
+    """Same rows as list_reports, encoded column-wise as an Arrow IPC stream."""
+    rows = list_report_rows(
+        db,
+        search=search,
+        area_id=area_id,
+        category_id=category_id,
+        status_filter=status_filter,
+        include_archived=include_archived,
+        severity_id=severity_id,
+        created_after=created_after,
+        open_only=open_only,
+        breaching=breaching
+    )
+    return rows_to_arrow(REPORT_SUMMARY_COLUMNS, rows)
+
+
+# GROUPING(current_status, area_id, category_id, severity_id) of each facet's
+# grouping set: a bit is set for every column the set does not group by
+_FACET_MASKS = {0b0111: "status", 0b1011: "area", 0b1101: "category", 0b1110: "severity"}
+_TOTAL_MASK = 0b1111
+
+# single counts of the page's toggles: (filter each replaces, its predicate)
+_FLAG_FACETS = {
+    "open": ("open", _is_open),
+    "breaching": ("breaching", _is_breaching),
+    "last_24h": ("created_after", _is_recent),
+}
+
+
+def _report_facets(
+    db: Session,
+    tiers: List[type[Report] | type[ReportArchive]],
+    search: Optional[str],
+    filters: Dict[str, Optional[Callable[[Any], ColumnElement]]]
+) -> Tuple[int, schemas.ReportFacets]:
+    """
+    (matching reports, counts per status / area / category / severity and of
+    the open / breaching / last-24h toggles) in one grouped pass over the rows
+    of every tier.
+
+    `filters` maps each filter (the four facets, "open", "breaching" and
+    "created_after") to its predicate on report columns, or None when unset.
+    A facet's counts apply every filter but its own, so they are what the list
+    would hold with that facet's filter set to each value (or, for a toggle,
+    turned on): the rows read are the ones that fail at most one filter, and
+    each count is taken under its own FILTER clause.
+    """
+    active = {name: predicate for name, predicate in filters.items() if predicate is not None}
+
+    def matching(c, skip: Optional[str] = None) -> list:
+        return [predicate(c) for name, predicate in active.items() if name != skip]
+
+    selects = []
+    for model in tiers:
+        conditions = _report_conditions(model, search, None, None, None, None)
+        if len(active) > 1:
+            conditions.append(or_(*[and_(*matching(model, skip=name)) for name in active]))
+        selects.append(
+            select(
+                model.current_status, model.area_id, model.category_id, model.severity_id, model.created_at
+            ).where(*conditions)
+        )
+    filtered = union_all(*selects).subquery("filtered")
+
+    def count(skip: Optional[str] = None, *extra: ColumnElement):
+        conditions = matching(filtered.c, skip) + list(extra)
+        return func.count().filter(and_(*conditions)) if conditions else func.count()
+
+    keys = (filtered.c.current_status, filtered.c.area_id, filtered.c.category_id, filtered.c.severity_id)
+    grouped = (
+        select(
+            *keys,
+            func.grouping(*keys).label("grouping"),
+            *[count(facet).label(facet) for facet in _FACET_MASKS.values()],
+            # read from the total row only
+            *[count(name, predicate(filtered.c)).label(flag) for flag, (name, predicate) in _FLAG_FACETS.items()],
+            count().label("total")
+        )
+        .group_by(func.grouping_sets(*[tuple_(key) for key in keys], tuple_()))
+        .subquery("grouped")
+    )
+    counted = case(
+        *[(grouped.c.grouping == mask, grouped.c[facet]) for mask, facet in _FACET_MASKS.items()],
+        else_=grouped.c.total
+    ).label("count")
     stmt = (
-        select(Report, ServiceArea, Category, Severity)
-        .join(ServiceArea, Report.area_id == ServiceArea.area_id)
-        .join(Category, Report.category_id == Category.category_id)
-        .join(Severity, Report.severity_id == Severity.severity_id)
+        select(grouped, counted, ServiceArea.name.label("area_name"), Category.name.label("category_name"), Severity.label.label("severity_label"))
+        .outerjoin(ServiceArea, ServiceArea.area_id == grouped.c.area_id)
+        .outerjoin(Category, Category.category_id == grouped.c.category_id)
+        .outerjoin(Severity, Severity.severity_id == grouped.c.severity_id)
+        .order_by(counted.desc())
     )
 
-    conditions = []
-    if search:
-        conditions.append(Report.title.ilike(f"%{search}%"))
-    if area_id:
-        conditions.append(Report.area_id == area_id)
-    if category_id:
-        conditions.append(Report.category_id == category_id)
-    if status_filter:
-        conditions.append(Report.current_status == status_filter)
+    total = 0
+    flags = dict.fromkeys(_FLAG_FACETS, 0)
+    facets = {name: [] for name in _FACET_MASKS.values()}
+    for row in db.execute(stmt):
+        if row.grouping == _TOTAL_MASK:
+            total = row.count
+            flags = {flag: row._mapping[flag] for flag in _FLAG_FACETS}
+            continue
+        if not row.count:
+            # read for another facet only
+            continue
+        facet = _FACET_MASKS[row.grouping]
+        if facet == "status":
+            value, label = row.current_status, row.current_status
+        elif facet == "area":
+            value, label = row.area_id, row.area_name
+        elif facet == "category":
+            value, label = row.category_id, row.category_name
+        else:
+            value, label = row.severity_id, row.severity_label
+        facets[facet].append(schemas.FacetCount(value=value, label=label, count=row.count))
+
+    return total, schemas.ReportFacets(**facets, **flags)
+
+
+def _equals(column: str, value: Any) -> Optional[Callable[[Any], ColumnElement]]:
+    return (lambda c: getattr(c, column) == value) if value else None
+
+
+def report_list_cursor(created_at: datetime, report_id: int) -> str:
+    """A list_report_page cursor: the page starts below (created_at, report_id)."""
+    return _encode_cursor(created_at, report_id)
+
+
+def list_report_page(
+    db: Session,
+    search: Optional[str] = None,
+    area_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    include_archived: bool = False,
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> schemas.ReportPage:
+    """
+    One page of list_reports (newest first). The first page (no cursor) also
+    carries the total and facet counts under the same filters, so a browser
+    can show filter counts without fetching every row; later pages only read
+    their own rows.
+
+    Keyset pagination on (created_at, report_id) descending; each tier
+    contributes at most limit + 1 rows, read in index order.
+    """
+    after = _decode_cursor(cursor, "report list") if cursor else None
+
+    selects = []
+    for model in _list_tiers(status_filter, include_archived, open_only or breaching):
+        stmt = _report_summary_select(
+            model, search, area_id, category_id, status_filter, severity_id, created_after, open_only, breaching
+        )
+        if after:
+            stmt = stmt.where(tuple_(model.created_at, model.report_id) < tuple_(*after))
+        selects.append(
+            stmt.order_by(model.created_at.desc(), model.report_id.desc()).limit(limit + 1)
+        )
+
+    page = union_all(*selects).subquery("page") if len(selects) > 1 else selects[0].subquery("page")
+    rows = db.execute(
+        select(page).order_by(page.c.created_at.desc(), page.c.report_id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].report_id)
+
+    total = facets = None
+    if after is None:
+        # the toggles' counts are taken without them, so the archive is read
+        # whenever the list could include it
+        total, facets = _report_facets(db, _list_tiers(status_filter, include_archived), search, {
+            "status": _equals("current_status", status_filter),
+            "area": _equals("area_id", area_id),
+            "category": _equals("category_id", category_id),
+            "severity": _equals("severity_id", severity_id),
+            "created_after": (lambda c: c.created_at >= created_after) if created_after else None,
+            "open": _is_open if open_only else None,
+            "breaching": _is_breaching if breaching else None,
+        })
+    return schemas.ReportPage(
+        items=[schemas.ReportSummary.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+        total=total,
+        facets=facets
+    )
+
+
+class ListField(NamedTuple):
+    column: Callable[[type[Report] | type[ReportArchive]], ColumnElement]
+    arrow: ArrowColumn
+    join: Optional[str] = None          # reference table the column needs
+
+
+# ?fields= on the list: the ReportSummary columns plus map / id columns;
+# reference tables are joined only for the names that are asked for
+LIST_FIELDS: Dict[str, ListField] = {
+    "report_id": ListField(lambda m: m.report_id, ArrowColumn("report_id", "int64")),
+    "title": ListField(lambda m: m.title, ArrowColumn("title", "string")),
+    "current_status": ListField(lambda m: m.current_status, ArrowColumn("current_status", "string", dictionary=True)),
+    "created_at": ListField(lambda m: m.created_at, ArrowColumn("created_at", "timestamp")),
+    "latitude": ListField(lambda m: cast(m.latitude, Float), ArrowColumn("latitude", "float64")),
+    "longitude": ListField(lambda m: cast(m.longitude, Float), ArrowColumn("longitude", "float64")),
+    "address": ListField(lambda m: m.address, ArrowColumn("address", "string")),
+    "area_id": ListField(lambda m: m.area_id, ArrowColumn("area_id", "int64")),
+    "category_id": ListField(lambda m: m.category_id, ArrowColumn("category_id", "int64")),
+    "severity_id": ListField(lambda m: m.severity_id, ArrowColumn("severity_id", "int64")),
+    "category_name": ListField(lambda m: Category.name, ArrowColumn("category_name", "string", dictionary=True), "category"),
+    "area_name": ListField(lambda m: ServiceArea.name, ArrowColumn("area_name", "string", dictionary=True), "area"),
+    "severity_label": ListField(lambda m: Severity.label, ArrowColumn("severity_label", "string", dictionary=True), "severity"),
+}
+
+# ?fields= / ?include= on the detail: scalar columns, and embedded objects
+DETAIL_FIELDS = ("report_id", "title", "description", "latitude", "longitude", "address", "current_status", "created_at")
+DETAIL_INCLUDES = ("category", "service_area", "severity", "status_history")
 
+# embedded reference objects: table, output schema (its fields are selected), key
+_DETAIL_EMBEDS = {
+    "category": (Category, schemas.CategoryOut, "category_id"),
+    "service_area": (ServiceArea, schemas.ServiceAreaOut, "area_id"),
+    "severity": (Severity, schemas.SeverityOut, "severity_id"),
+}
+
+_SPARSE_ROWS = TypeAdapter(List[Dict[str, Any]])
+_SPARSE_DETAIL = TypeAdapter(Dict[str, Any])
+
+
+def parse_fieldset(raw: Optional[str], allowed: Sequence[str], param: str) -> Optional[Tuple[str, ...]]:
+    """Comma-separated names -> tuple in request order (duplicates dropped), None if absent; 422 on unknown names."""
+    if raw is None:
+        return None
+    names = tuple(dict.fromkeys(part.strip() for part in raw.split(",") if part.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown {param}: {', '.join(unknown) or '(empty)'}; choose from {', '.join(allowed)}"
+        )
+    return names
+
+
+def _report_fields_select(
+    model: type[Report] | type[ReportArchive],
+    fields: Sequence[str],
+    conditions: list
+):
+    # created_at always rides along last so tiers can be merged newest first;
+    # callers read the requested columns positionally
+    stmt = select(
+        *[LIST_FIELDS[name].column(model).label(name) for name in fields],
+        model.created_at.label("_created_at")
+    )
+    joins = {LIST_FIELDS[name].join for name in fields}
+    if "area" in joins:
+        stmt = stmt.join(ServiceArea, model.area_id == ServiceArea.area_id)
+    if "category" in joins:
+        stmt = stmt.join(Category, model.category_id == Category.category_id)
+    if "severity" in joins:
+        stmt = stmt.join(Severity, model.severity_id == Severity.severity_id)
     if conditions:
         stmt = stmt.where(and_(*conditions))
+    return stmt
 
-    stmt = stmt.order_by(Report.created_at.desc())
-
-    rows = db.execute(stmt).all()
 
-    summaries: List[schemas.ReportSummary] = []
-    for report, area, category, severity in rows:
-        summaries.append(
-            schemas.ReportSummary(
-                report_id=report.report_id,
-                title=report.title,
-                current_status=report.current_status,
-                created_at=report.created_at,
-                area_name=area.name,
-                category_name=category.name,
-                severity_label=severity.label
+def list_report_field_rows(
+    db: Session,
+    fields: Sequence[str],
+    search: Optional[str] = None,
+    area_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    include_archived: bool = False,
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
+) -> List[Row]:
+    """
+    list_report_rows with only `fields` selected (names from LIST_FIELDS),
+    newest first. Area / category / severity are joined only when one of
+    their names is requested, so e.g. a map layer of id / lat / lon /
+    status reads the report table alone.
+    """
+    selects = [
+        _report_fields_select(
+            model, fields, _report_conditions(
+                model, search, area_id, category_id, status_filter, severity_id, created_after, open_only, breaching
             )
         )
+        for model in _list_tiers(status_filter, include_archived, open_only or breaching)
+    ]
+    stmt = union_all(*selects) if len(selects) > 1 else selects[0]
+    return db.execute(stmt.order_by(desc("_created_at"))).all()
 
-    return summaries
 
+def report_fields_json(fields: Sequence[str], rows: Sequence[Row]) -> bytes:
+    with timed_serialization():
+        return _SPARSE_ROWS.dump_json([dict(zip(fields, row)) for row in rows])
 
-def get_report_detail(db: Session, report_id: int) -> schemas.ReportDetail:
-    """Load a single report with joins + history, or 404."""
-    stmt = (
-        select(Report)
-        .where(Report.report_id == report_id)
-        .options(
-            joinedload(Report.service_area),
-            joinedload(Report.category),
-            joinedload(Report.severity),
-            joinedload(Report.status_updates)
+
+def report_fields_arrow(fields: Sequence[str], rows: Sequence[Row]) -> bytes:
+    return rows_to_arrow([LIST_FIELDS[name].arrow for name in fields], rows)
+
+
+def _load_report(db: Session, report_id: int) -> Report | ReportArchive:
+    """
+    Load a single report with area/category/severity, or 404. History is
+    read separately (_history_page) so it can be capped and ordered in SQL.
+
+    Falls back to the archive tier when the report is not in the hot table.
+    """
+    for model in (Report, ReportArchive):
+        stmt = (
+            select(model)
+            .where(model.report_id == report_id)
+            .options(
+                joinedload(model.service_area),
+                joinedload(model.category),
+                joinedload(model.severity)
+            )
         )
+        report = db.execute(stmt).scalars().first()
+        if report:
+            return report
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Report not found"
     )
 
-    report: Report | None = db.execute(stmt).scalars().first()
+
+def _is_archived(db: Session, report_id: int) -> bool:
+    return db.get(ReportArchive, report_id) is not None
+
+
+def _writable_report(db: Session, report_id: int, lock: bool = False) -> Report:
+    """Return the hot Report row, or raise 409 if it is archived / 404 if missing."""
+    report = db.get(Report, report_id, with_for_update=lock)
+    if not report and _is_archived(db, report_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Report is archived and read-only"
+        )
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found"
         )
+    return report
+
+
+def get_report_detail(db: Session, report_id: int) -> schemas.ReportDetail:
+    """Load a single report with joins + recent history, or 404."""
+    return _detail_for(db, _load_report(db, report_id))
+
+
+def get_report_version(db: Session, report_id: int) -> int:
+    """Return report.row_version (one PK lookup, two for archived reports), or 404."""
+    version = db.execute(
+        select(Report.row_version).where(Report.report_id == report_id)
+    ).scalar()
+    if version is None:
+        version = db.execute(
+            select(ReportArchive.row_version).where(ReportArchive.report_id == report_id)
+        ).scalar()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    return version
+
+
+def get_report_table_version(db: Session) -> int:
+    """Return the global report-table version (moves on any committed report write)."""
+    return int(db.execute(select(func.sum(ReportTableVersion.version))).scalar() or 0)
+
 
-    return _build_report_detail(report)
+def get_report_detail_json(db: Session, report_id: int, version: int) -> Tuple[bytes, int]:
+    """
+    Return (serialized ReportDetail, row_version it was built from).
+
+    Served from the LRU when (report_id, version) is cached. On a miss the
+    report is loaded and cached under the row_version read with it, which can
+    be newer than `version` if the report changed in between.
+    """
+    body = _detail_cache.get((report_id, version))
+    if body is not None:
+        return body, version
+
+    report = _load_report(db, report_id)
+    with timed_serialization():
+        body = _detail_for(db, report).model_dump_json().encode("utf-8")
+    _detail_cache.put((report_id, report.row_version), body)
+    return body, report.row_version
+
+
+def get_report_sparse_json(
+    db: Session,
+    report_id: int,
+    fields: Sequence[str],
+    include: Sequence[str]
+) -> bytes:
+    """
+    The ReportDetail subset named by `fields` (DETAIL_FIELDS) and `include`
+    (DETAIL_INCLUDES), or 404. Selects only those columns, joins only the
+    included reference tables and reads history only when it is included.
+    Not cached: the full shape is what the detail LRU holds.
+    """
+    for model in (Report, ReportArchive):
+        columns = [
+            (cast(getattr(model, name), Float) if name in ("latitude", "longitude") else getattr(model, name)).label(name)
+            for name in fields
+        ]
+        stmt = select(model.report_id.label("_report_id"), *columns)
+        for embed, (table, out, fk) in _DETAIL_EMBEDS.items():
+            if embed in include:
+                stmt = stmt.add_columns(
+                    *[getattr(table, name).label(f"{embed}.{name}") for name in out.model_fields]
+                ).join(table, getattr(model, fk) == getattr(table, fk))
+
+        row = db.execute(stmt.where(model.report_id == report_id)).mappings().first()
+        if row is not None:
+            break
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+
+    body: Dict[str, Any] = {name: row[name] for name in fields}
+    for embed, (_, out, _) in _DETAIL_EMBEDS.items():
+        if embed in include:
+            prefix = f"{embed}."
+            body[embed] = out.model_validate({key[len(prefix):]: value for key, value in row.items() if key.startswith(prefix)})
+    if "status_history" in include:
+        history, next_cursor = _history_page(
+            db,
+            StatusUpdate if model is Report else StatusUpdateArchive,
+            report_id,
+            settings.report_history_embed_limit
+        )
+        body["status_history"] = [schemas.StatusUpdateOut.model_validate(su) for su in reversed(history)]
+        body["status_history_next_cursor"] = next_cursor
+
+    with timed_serialization():
+        return _SPARSE_DETAIL.dump_json(body)
+
+
+def get_report_history(
+    db: Session,
+    report_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> schemas.StatusHistoryPage:
+    """One page of a report's status history, newest first, or 404."""
+    if db.execute(select(Report.report_id).where(Report.report_id == report_id)).first():
+        model = StatusUpdate
+    elif _is_archived(db, report_id):
+        model = StatusUpdateArchive
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+
+    rows, next_cursor = _history_page(db, model, report_id, limit, cursor)
+    return schemas.StatusHistoryPage(
+        items=[schemas.StatusUpdateOut.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
 
 
 def create_report(
@@ -144,22 +841,12 @@ def create_report(
     db.add(initial_status)
     db.flush()
 
-    stmt = (
-        select(Report)
-        .where(Report.report_id == report.report_id)
-        .options(
-            joinedload(Report.service_area),
-            joinedload(Report.category),
-            joinedload(Report.severity),
-            joinedload(Report.status_updates)
-        )
-    )
-    report = db.execute(stmt).scalars().first()
-    assert report is not None
+    report = _load_report(db, report.report_id)
 
+    detail = _detail_for(db, report)
     db.commit()
 
-    return _build_report_detail(report)
+    return detail
 
 
 def update_status(
@@ -168,17 +855,22 @@ def update_status(
     payload: schemas.StatusUpdateRequest
 ) -> schemas.StatusUpdateOut:
     """Update report.current_status and insert a StatusUpdate row."""
-    report = db.get(Report, report_id)
-    if not report:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Report not found"
-        )
+    # lock the row so the transition is checked against the status it replaces
+    report = _writable_report(db, report_id, lock=True)
 
     old_status = report.current_status
     new_status = payload.new_status
 
+    problem = transition_problem(old_status, new_status, payload.note)
+    if problem:
+        db.rollback()
+        raise HTTPException(status_code=problem[0], detail=problem[1])
+
     report.current_status = new_status
+    if new_status == old_status:
+        # a note without a status change: still UPDATE the row, so row_version
+        # (and the detail ETag, whose history gains the note) moves
+        flag_modified(report, "current_status")
     note = payload.note or f"Status changed from {old_status} to {new_status}"
 
     su = StatusUpdate(
@@ -194,27 +886,253 @@ def update_status(
         db.refresh(su)
     except (DataError, IntegrityError) as e:
         db.rollback()
-        # Invalid enum value (or other DB constraint issue)
+        # the status was validated above, so this is changed_by
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=(
-                "Invalid status value; must be one of: "
-                "SUBMITTED, TRIAGED, IN_PROGRESS, ON_HOLD, RESOLVED, CLOSED, MERGED"
-            ),
+            detail="Invalid status update; changed_by must be an existing user",
         ) from e
 
     return schemas.StatusUpdateOut.model_validate(su)
 
 
+# rows per UPDATE ... FROM (VALUES ...) / INSERT statement in bulk_update_status
+BULK_STATUS_BATCH = 1000
+
+
+def _rejected(
+    item: schemas.BulkStatusItem,
+    outcome: str,
+    code: int,
+    detail: str,
+    previous_status: Optional[str] = None
+) -> schemas.BulkStatusOutcome:
+    return schemas.BulkStatusOutcome(
+        report_id=item.report_id,
+        outcome=outcome,
+        status_code=code,
+        detail=detail,
+        previous_status=previous_status
+    )
+
+
+def _check_bulk_status(
+    items: Sequence[schemas.BulkStatusItem],
+    current: Dict[int, str],
+    archived: set
+) -> Tuple[List[Optional[schemas.BulkStatusOutcome]], List[Tuple[int, schemas.BulkStatusItem]]]:
+    """
+    Check every item against the status machine, given the current status of
+    each hot report and the ids found in the archive. Return the results list
+    with rejected items filled in (None for the rest) and the accepted
+    (position, item) pairs, in request order.
+    """
+    results: List[Optional[schemas.BulkStatusOutcome]] = [None] * len(items)
+    accepted: List[Tuple[int, schemas.BulkStatusItem]] = []
+    seen = set()
+    for pos, item in enumerate(items):
+        rid = item.report_id
+        if rid in seen:
+            results[pos] = _rejected(
+                item, "duplicate", status.HTTP_409_CONFLICT,
+                "Report appears more than once in this request"
+            )
+            continue
+        seen.add(rid)
+
+        if rid not in current:
+            results[pos] = (
+                _rejected(item, "archived", status.HTTP_409_CONFLICT, "Report is archived and read-only")
+                if rid in archived else
+                _rejected(item, "not_found", status.HTTP_404_NOT_FOUND, "Report not found")
+            )
+            continue
+
+        problem = transition_problem(current[rid], item.new_status, item.note)
+        if problem:
+            outcome = (
+                "invalid_status" if problem[0] == status.HTTP_422_UNPROCESSABLE_ENTITY
+                else "illegal_transition"
+            )
+            results[pos] = _rejected(item, outcome, problem[0], problem[1], current[rid])
+            continue
+
+        accepted.append((pos, item))
+
+    return results, accepted
+
+
+def bulk_update_status(
+    db: Session,
+    payload: schemas.BulkStatusRequest
+) -> schemas.BulkStatusResult:
+    """
+    Apply many status transitions in one transaction.
+
+    Every item is checked in memory against the status machine using the
+    current statuses of all referenced reports (read with one locking
+    SELECT). The accepted items are then written with one
+    UPDATE report ... FROM (VALUES ...) and one multi-row status_update
+    INSERT per BULK_STATUS_BATCH items. Rejected items do not block the
+    others; each gets the outcome the single-report endpoint would give.
+    """
+    items = payload.items
+    ids = sorted({item.report_id for item in items})
+
+    # ids in ascending order, so concurrent bulk calls lock in the same order
+    current = dict(db.execute(
+        text("""
+            SELECT report_id, current_status::text
+            FROM report
+            WHERE report_id = ANY(:ids)
+            ORDER BY report_id
+            FOR UPDATE
+        """),
+        {"ids": ids}
+    ).all())
+    missing = [i for i in ids if i not in current]
+    archived = set(
+        db.execute(
+            select(ReportArchive.report_id).where(ReportArchive.report_id.in_(missing))
+        ).scalars().all()
+    ) if missing else set()
+
+    results, accepted = _check_bulk_status(items, current, archived)
+
+    try:
+        for start in range(0, len(accepted), BULK_STATUS_BATCH):
+            batch = accepted[start:start + BULK_STATUS_BATCH]
+            params = {"changed_by": payload.changed_by}
+            rows = []
+            for n, (_, item) in enumerate(batch):
+                params[f"id{n}"] = item.report_id
+                params[f"st{n}"] = item.new_status
+                params[f"note{n}"] = (
+                    item.note
+                    or f"Status changed from {current[item.report_id]} to {item.new_status}"
+                )
+                rows.append(f"(CAST(:id{n} AS BIGINT), CAST(:st{n} AS report_status), CAST(:note{n} AS TEXT))")
+            values = ", ".join(rows)
+
+            db.execute(
+                text(f"""
+                    UPDATE report r
+                    SET current_status = v.new_status
+                    FROM (VALUES {values}) AS v(report_id, new_status, note)
+                    WHERE r.report_id = v.report_id
+                """),
+                params
+            )
+            inserted = db.execute(
+                text(f"""
+                    INSERT INTO status_update (report_id, status, note, changed_by)
+                    SELECT v.report_id, v.new_status, v.note, :changed_by
+                    FROM (VALUES {values}) AS v(report_id, new_status, note)
+                    RETURNING report_id, status_id
+                """),
+                params
+            ).all()
+            status_ids = dict(inserted)
+
+            for pos, item in batch:
+                results[pos] = schemas.BulkStatusOutcome(
+                    report_id=item.report_id,
+                    outcome="updated",
+                    status_code=status.HTTP_200_OK,
+                    previous_status=current[item.report_id],
+                    status_id=status_ids[item.report_id]
+                )
+        db.commit()
+    except (DataError, IntegrityError) as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid status update; changed_by must be an existing user",
+        ) from e
+
+    return schemas.BulkStatusResult(
+        updated=len(accepted),
+        rejected=len(items) - len(accepted),
+        results=results
+    )
+
+
+# --------------------------
+# Comments and subscriptions
+# --------------------------
+# Both feed the activity feeds: comment inserts fan out to subscribers
+# through the triggers in db/Feed.sql.
+
+def add_comment(
+    db: Session,
+    report_id: int,
+    payload: schemas.CommentCreate
+) -> schemas.CommentOut:
+    """Insert a comment on a (hot) report."""
+    _writable_report(db, report_id)
+    comment = Comment(report_id=report_id, user_id=payload.user_id, body=payload.body)
+    try:
+        db.add(comment)
+        db.commit()
+        db.refresh(comment)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="user_id must be an existing user",
+        ) from e
+    return schemas.CommentOut.model_validate(comment)
+
+
+def subscribe(db: Session, report_id: int, user_id: int) -> None:
+    """Subscribe a user to a report's updates (idempotent)."""
+    _writable_report(db, report_id)
+    try:
+        db.execute(
+            text(
+                """
+                INSERT INTO subscription (report_id, user_id)
+                VALUES (:rid, :uid)
+                ON CONFLICT (report_id, user_id) DO NOTHING
+                """
+            ),
+            {"rid": report_id, "uid": user_id}
+        )
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="user_id must be an existing user",
+        ) from e
+
+
+def unsubscribe(db: Session, report_id: int, user_id: int) -> None:
+    """Remove a subscription; past feed entries stay in the user's feed."""
+    _writable_report(db, report_id)
+    db.execute(
+        delete(Subscription).where(
+            Subscription.report_id == report_id,
+            Subscription.user_id == user_id
+        )
+    )
+    db.commit()
+
+
 def delete_report(db: Session, report_id: int) -> None:
     """Delete a report and its dependent rows (manual cascade)."""
     report = db.get(Report, report_id)
+    if not report and _is_archived(db, report_id):
+        _delete_archived_report(db, report_id)
+        return
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found"
         )
 
+    # 0) feed rows (looked up through the subscriptions deleted below)
+    feed_service.delete_report_events(db, report_id)
+
     # 1) delete work_part rows linked via work_order -> report
     db.execute(
         text(
@@ -261,3 +1179,212 @@ def delete_report(db: Session, report_id: int) -> None:
 
     db.delete(report)
     db.commit()
+
+
+# archive tables keyed by report_id, children before the report itself
+_ARCHIVE_CHILD_TABLES = [
+    "report_media_archive",
+    "assignment_archive",
+    "sla_clock_archive",
+    "subscription_archive",
+    "upvote_archive",
+    "comment_archive",
+    "notification_archive",
+    "status_update_archive",
+    "work_order_archive",
+    "report_archive"
+]
+
+
+def _delete_archived_report(db: Session, report_id: int) -> None:
+    """Delete an archived report from the *_archive tables (no FKs there)."""
+    feed_service.delete_report_events(db, report_id)
+    db.execute(
+        text(
+            """
+            DELETE FROM work_part_archive
+            WHERE wo_id IN (
+                SELECT wo_id FROM work_order_archive WHERE report_id = :rid
+            )
+            """
+        ),
+        {"rid": report_id}
+    )
+    db.execute(
+        text(
+            """
+            DELETE FROM duplicate_link_archive
+            WHERE primary_report_id = :rid
+               OR duplicate_report_id = :rid
+            """
+        ),
+        {"rid": report_id}
+    )
+
+    for table in _ARCHIVE_CHILD_TABLES:
+        db.execute(
+            text(f"DELETE FROM {table} WHERE report_id = :rid"),
+            {"rid": report_id}
+        )
+
+    db.commit()
+
+
+def archive_reports(db: Session, older_than_days: int, batch_size: int = 1000) -> int:
+    """
+    Move CLOSED / RESOLVED reports idle for `older_than_days` into the archive
+    tables (CALL archive_reports, db/Archive.sql). Returns the number moved.
+
+    The procedure commits per batch, so `db` must be bound to an AUTOCOMMIT
+    engine (see backend/manage.py).
+    """
+    return db.execute(
+        text("CALL archive_reports(make_interval(days => :days), :batch, 0)"),
+        {"days": older_than_days, "batch": batch_size}
+    ).scalar()
+
+
+# --------------------------
+# Bulk maintenance (background jobs, backend/services/job_service.py)
+# --------------------------
+
+# progress(fraction done, note); may raise to stop the work between batches
+Progress = Callable[[float, str], None]
+
+
+def _no_progress(fraction: float, note: str) -> None:
+    pass
+
+
+def purge_archived_reports(
+    db: Session,
+    older_than_days: int,
+    batch_size: int = 1000,
+    progress: Progress = _no_progress
+) -> int:
+    """
+    Delete archived reports created more than `older_than_days` ago, with
+    their archived child rows and feed rows, `batch_size` reports per
+    transaction. Returns the number deleted.
+    """
+    cutoff = db.execute(text("SELECT now() - make_interval(days => :days)"), {"days": older_than_days}).scalar()
+    total = db.execute(text("SELECT count(*) FROM report_archive WHERE created_at < :cutoff"), {"cutoff": cutoff}).scalar()
+    deleted = 0
+    while True:
+        ids = db.execute(
+            text("SELECT report_id FROM report_archive WHERE created_at < :cutoff ORDER BY report_id LIMIT :batch"),
+            {"cutoff": cutoff, "batch": batch_size}
+        ).scalars().all()
+        if not ids:
+            break
+
+        feed_service.delete_reports_events(db, ids)
+        db.execute(
+            text(
+                """
+                DELETE FROM work_part_archive
+                WHERE wo_id IN (
+                    SELECT wo_id FROM work_order_archive WHERE report_id = ANY(:rids)
+                )
+                """
+            ),
+            {"rids": ids}
+        )
+        db.execute(
+            text(
+                """
+                DELETE FROM duplicate_link_archive
+                WHERE primary_report_id = ANY(:rids)
+                   OR duplicate_report_id = ANY(:rids)
+                """
+            ),
+            {"rids": ids}
+        )
+        for table in _ARCHIVE_CHILD_TABLES:
+            db.execute(text(f"DELETE FROM {table} WHERE report_id = ANY(:rids)"), {"rids": ids})
+        db.commit()
+
+        deleted += len(ids)
+        progress(min(deleted / max(total, 1), 1.0), f"{deleted} of {total} report(s) deleted")
+    return deleted
+
+
+def recompute_sla_clocks(db: Session, batch_size: int = 5000, progress: Progress = _no_progress) -> int:
+    """
+    Recompute sla_clock.breached / breached_at for the hot tier: a clock is
+    breached when its report was first RESOLVED / CLOSED after target_due_at,
+    or is still open past it, and breached_at is then target_due_at. Walks
+    sla_id ranges of `batch_size`, committing each. Returns rows changed.
+    """
+    low, high = db.execute(text("SELECT min(sla_id), max(sla_id) FROM sla_clock")).one()
+    if low is None:
+        return 0
+    changed = 0
+    for start in range(low, high + 1, batch_size):
+        changed += db.execute(
+            text(
+                """
+                UPDATE sla_clock s
+                SET breached = v.breached,
+                    breached_at = CASE WHEN v.breached THEN s.target_due_at END
+                FROM (
+                    SELECT c.sla_id, coalesce(r.resolved_at, now()) > c.target_due_at AS breached
+                    FROM sla_clock c
+                    LEFT JOIN LATERAL (
+                        SELECT min(u.changed_at) AS resolved_at
+                        FROM status_update u
+                        WHERE u.report_id = c.report_id AND u.status IN ('RESOLVED', 'CLOSED')
+                    ) r ON true
+                    WHERE c.sla_id >= :start AND c.sla_id < :stop
+                ) v
+                WHERE s.sla_id = v.sla_id
+                  AND (s.breached IS DISTINCT FROM v.breached
+                       OR s.breached_at IS DISTINCT FROM CASE WHEN v.breached THEN s.target_due_at END)
+                """
+            ),
+            {"start": start, "stop": start + batch_size}
+        ).rowcount
+        db.commit()
+        progress(min((start + batch_size - low) / (high - low + 1), 1.0), f"{changed} clock(s) changed")
+    return changed
+
+
+def export_report_csv(
+    db: Session,
+    out,
+    fields: Sequence[str],
+    search: Optional[str] = None,
+    area_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    status_filter: Optional[str] = None,
+    include_archived: bool = False,
+    severity_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    open_only: bool = False,
+    breaching: bool = False
+) -> int:
+    """
+    Write list_report_field_rows(...) as CSV with a header row to the binary
+    file `out`, streamed by Postgres COPY (no rows in Python). Returns the
+    row count.
+    """
+    selects = [
+        _report_fields_select(
+            model, fields, _report_conditions(
+                model, search, area_id, category_id, status_filter, severity_id, created_after, open_only, breaching
+            )
+        )
+        for model in _list_tiers(status_filter, include_archived, open_only or breaching)
+    ]
+    rows = (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+    stmt = select(*[rows.c[name] for name in fields]).order_by(rows.c._created_at.desc())
+
+    dbapi_conn = db.connection().connection.dbapi_connection
+    compiled = stmt.compile(dialect=db.get_bind().dialect)
+    cur = dbapi_conn.cursor()
+    try:
+        query = cur.mogrify(str(compiled), compiled.params).decode()
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)", out)
+        return cur.rowcount
+    finally:
+        cur.close()
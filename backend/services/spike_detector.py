@@ -0,0 +1,434 @@
+# backend/services/spike_detector.py
+"""
+Streaming spike detection behind GET /analytics/spikes.
+
+Reports are counted per time bucket (SPIKES_BUCKET_MINUTES) for three
+dimensions: (area, category), area, and geohash cell of the report's
+coordinates (SPIKES_GEOHASH_PRECISION characters; stored geohash values are
+not used, the 311 import leaves them NULL). Every key keeps an EWMA of its
+per-bucket count (half-life SPIKES_HALFLIFE_DAYS, empty buckets count as
+zero) after dividing out a shared hour-of-week profile, so 3 a.m. Sunday is
+not compared with Monday morning.
+
+Per event the work is O(1) per dimension: bump the key's open bucket, or
+fold it into the EWMA when the event opens a new one (skipped empty buckets
+are one multiplication). A back-dated event (e.g. a 311 import of last
+week's complaints) only updates the baseline.
+
+A key is flagged when its count over the previous and the current (partial)
+bucket is significantly above the baseline:
+
+    z = 2 * (sqrt(count + 3/8) - sqrt(expected + 3/8))
+
+(Anscombe's variance-stabilised Poisson deviation, ~N(0, 1) under the
+baseline) is at least `z` and the count at least `min_count`.
+
+Feeding: rows are read from the report table past the highest report_id
+seen, so reports created through the API on any worker, the 311 import and
+other bulk inserts all arrive, one indexed range read per poll
+(SPIKES_POLL_SECONDS, and before every /analytics/spikes answer). A report
+committed after a higher-numbered one was read is missed; the estimates are
+statistical, so that is tolerated rather than tracked.
+
+Baselines are rebuilt from the last SPIKES_BACKFILL_DAYS of reports (hot and
+archive tiers) at startup and every SPIKES_REBUILD_HOURS, vectorised with
+NumPy, which also re-estimates the hour-of-week profile. State is per
+worker. NumPy is imported lazily: without it /analytics/spikes answers 501,
+and 503 until the first backfill has finished.
+"""
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend.core.config import settings
+from backend.db.session import SessionLocal
+
+log = logging.getLogger("gridwatch.spikes")
+
+DIMENSIONS = ("area_category", "area", "cell")
+
+DEFAULT_Z = 4.0
+DEFAULT_MIN_COUNT = 5
+
+# pseudo-events pulling each hour-of-week factor towards 1, so a slot seen a
+# handful of times in a short history does not get a near-zero baseline
+SEASON_PRIOR = 20.0
+
+WEEK_SECONDS = 7 * 24 * 3600
+CATCH_UP_BATCH = 10000
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# (dimension, id, id): ("area_category", area_id, category_id), ("area", area_id, 0),
+# ("cell", integer geohash, 0)
+Key = Tuple[str, int, int]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Spike detection is not available on this server (numpy not installed)"
+        ) from exc
+    return numpy
+
+
+# ----------
+# Geohash cells
+# ----------
+
+def cell_codes(np, lat, lon, precision: int):
+    """Integer geohashes (5 bits per character) of coordinate arrays; -1 where NaN."""
+    bits = 5 * precision
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    lat = np.where(valid, lat, 0.0)
+    lon = np.where(valid, lon, 0.0)
+    lon_i = np.clip(np.floor((lon + 180.0) / 360.0 * (1 << lon_bits)), 0, (1 << lon_bits) - 1).astype(np.int64)
+    lat_i = np.clip(np.floor((lat + 90.0) / 180.0 * (1 << lat_bits)), 0, (1 << lat_bits) - 1).astype(np.int64)
+    code = np.zeros(lat.shape, dtype=np.int64)
+    # bits alternate longitude / latitude, longitude first
+    for i in range(bits):
+        src, shift = (lon_i, lon_bits - 1 - i // 2) if i % 2 == 0 else (lat_i, lat_bits - 1 - i // 2)
+        code = (code << 1) | ((src >> shift) & 1)
+    return np.where(valid, code, -1)
+
+
+def cell_name(code: int, precision: int) -> str:
+    return "".join(_GEOHASH_ALPHABET[(code >> 5 * (precision - 1 - i)) & 31] for i in range(precision))
+
+
+# ----------
+# Detector
+# ----------
+
+class _Rate:
+    """EWMA state of one key; `level` is as of the start of bucket `level_at`."""
+    __slots__ = ("level", "level_at", "bucket", "count", "prev")
+
+    def __init__(self, level: float, level_at: int, bucket: int, count: int, prev: int):
+        self.level = level
+        self.level_at = level_at
+        self.bucket = bucket        # newest bucket with events (still open)
+        self.count = count          # events in `bucket`
+        self.prev = prev            # events in bucket - 1 (already folded)
+
+
+class SpikeDetector:
+    def __init__(self, bucket_seconds: int, halflife_seconds: float, precision: int, origin: int, season: Sequence[float]):
+        self.bucket_seconds = bucket_seconds
+        self.precision = precision
+        self.decay = 0.5 ** (bucket_seconds / halflife_seconds)
+        self.alpha = 1.0 - self.decay
+        self.origin = origin                        # first bucket of the baseline history
+        self.season = list(season)                  # multiplicative factor per bucket-of-week
+        self.rates: Dict[Key, _Rate] = {}
+        self.newest = origin                        # newest bucket seen
+        self.touched: Dict[int, Set[Key]] = {}      # bucket -> keys with events in it (newest two)
+        self.last_report_id = 0
+        self.events = 0
+        self.built_at = time.time()
+        self._lock = threading.Lock()
+
+    def _factor(self, bucket: int) -> float:
+        return self.season[bucket % len(self.season)]
+
+    def _observe(self, key: Key, bucket: int) -> None:
+        rate = self.rates.get(key)
+        if rate is None:
+            self.rates[key] = _Rate(0.0, bucket, bucket, 1, 0)
+        elif bucket == rate.bucket:
+            rate.count += 1
+        elif bucket > rate.bucket:
+            # fold the open bucket, and the empty ones since the last fold
+            level = rate.level * self.decay ** (rate.bucket - rate.level_at)
+            rate.level = self.decay * level + self.alpha * rate.count / self._factor(rate.bucket)
+            rate.level_at = rate.bucket + 1
+            rate.prev = rate.count if bucket == rate.bucket + 1 else 0
+            rate.bucket, rate.count = bucket, 1
+        else:
+            # back-dated: baseline only (a negative exponent is fine, the
+            # pending decay to `bucket` cancels it)
+            rate.level += self.alpha * self.decay ** (rate.level_at - 1 - bucket) / self._factor(bucket)
+            return
+        if bucket >= self.newest - 1:
+            self.touched.setdefault(bucket, set()).add(key)
+
+    def ingest(self, np, rows) -> None:
+        """rows: float64 array of (report_id, epoch, area_id, category_id, lat, lon)."""
+        if not len(rows):
+            return
+        buckets = (rows[:, 1] // self.bucket_seconds).astype(np.int64).tolist()
+        areas = rows[:, 2].astype(np.int64).tolist()
+        categories = rows[:, 3].astype(np.int64).tolist()
+        cells = cell_codes(np, rows[:, 4], rows[:, 5], self.precision).tolist()
+        with self._lock:
+            for bucket, area_id, category_id, cell in zip(buckets, areas, categories, cells):
+                if bucket > self.newest:
+                    self.newest = bucket
+                    for old in [b for b in self.touched if b < bucket - 1]:
+                        del self.touched[old]
+                self._observe(("area_category", area_id, category_id), bucket)
+                self._observe(("area", area_id, 0), bucket)
+                if cell >= 0:
+                    self._observe(("cell", cell, 0), bucket)
+            self.events += len(buckets)
+            self.last_report_id = max(self.last_report_id, int(rows[:, 0].max()))
+
+    def spikes(
+        self,
+        now: float,
+        min_z: float = DEFAULT_Z,
+        min_count: int = DEFAULT_MIN_COUNT,
+        dimension: Optional[str] = None
+    ) -> List[dict]:
+        """Keys whose count over the previous + current bucket is a spike, highest z first."""
+        current = int(now // self.bucket_seconds)
+        elapsed = (now - current * self.bucket_seconds) / self.bucket_seconds
+        window = self._factor(current - 1) + elapsed * self._factor(current)
+        found = []
+        with self._lock:
+            candidates = set().union(*(keys for b, keys in self.touched.items() if b >= current - 1))
+            for key in candidates:
+                if dimension is not None and key[0] != dimension:
+                    continue
+                rate = self.rates[key]
+                count = rate.count + rate.prev if rate.bucket >= current else rate.count
+                if count < min_count:
+                    continue
+                # bias-corrected EWMA: history before `origin` counts as unknown, not zero
+                weight = max(1.0 - self.decay ** (rate.bucket - self.origin), self.alpha)
+                baseline = rate.level * self.decay ** (rate.bucket - rate.level_at) / weight
+                expected = baseline * window
+                z = 2.0 * (math.sqrt(count + 0.375) - math.sqrt(expected + 0.375))
+                if z >= min_z:
+                    found.append({"key": key, "count": count, "expected": expected, "z": z})
+        found.sort(key=lambda s: s["z"], reverse=True)
+        return found
+
+
+# ----------
+# Backfill
+# ----------
+
+_HISTORY_SQL = """
+    SELECT report_id::float8, extract(epoch FROM created_at)::float8, area_id::float8, category_id::float8,
+           COALESCE(latitude::float8, 'NaN'), COALESCE(longitude::float8, 'NaN')
+    FROM report WHERE created_at >= to_timestamp(%(since)s) AND report_id <= %(upto)s
+    UNION ALL
+    SELECT report_id::float8, extract(epoch FROM created_at)::float8, area_id::float8, category_id::float8,
+           COALESCE(latitude::float8, 'NaN'), COALESCE(longitude::float8, 'NaN')
+    FROM report_archive WHERE created_at >= to_timestamp(%(since)s)
+"""
+
+_NEW_SQL = text("""
+    SELECT report_id::float8, extract(epoch FROM created_at)::float8, area_id::float8, category_id::float8,
+           COALESCE(latitude::float8, 'NaN'), COALESCE(longitude::float8, 'NaN')
+    FROM report WHERE report_id > :after
+    ORDER BY report_id
+    LIMIT :batch
+""")
+
+
+def _history(np, engine: Engine, since: float):
+    """(upto report_id, float64 rows as in SpikeDetector.ingest) since epoch `since`."""
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("SELECT coalesce(max(report_id), 0) FROM report")
+        upto = cur.fetchone()[0]
+        cur.close()
+        # server-side cursor: the history arrives in batches, not as one fetchall
+        cur = raw.cursor(name="spike_backfill")
+        cur.itersize = 100000
+        cur.execute(_HISTORY_SQL, {"since": since, "upto": upto})
+        chunks = []
+        while True:
+            batch = cur.fetchmany(100000)
+            if not batch:
+                break
+            chunks.append(np.array(batch, dtype=np.float64))
+        cur.close()
+        raw.rollback()
+    finally:
+        raw.close()
+    rows = np.concatenate(chunks) if chunks else np.empty((0, 6), dtype=np.float64)
+    return upto, rows
+
+
+def build(np, rows, now: float, upto: int = 0) -> SpikeDetector:
+    """
+    A detector whose state equals replaying `rows` one by one, computed with
+    array operations: every historic event contributes
+    alpha * decay ** (buckets before now) / factor to its key's level.
+    """
+    bucket_seconds = settings.spikes_bucket_minutes * 60
+    slots = max(1, WEEK_SECONDS // bucket_seconds)
+    current = int(now // bucket_seconds)
+    origin = current - int(settings.spikes_backfill_days * 86400 // bucket_seconds)
+
+    buckets = np.minimum((rows[:, 1] // bucket_seconds).astype(np.int64), current)
+    keep = buckets >= origin
+    rows, buckets = rows[keep], buckets[keep]
+    past = buckets < current
+
+    # hour-of-week profile: events per slot vs what a flat rate would give it
+    totals = np.bincount(buckets[past] % slots, minlength=slots).astype(np.float64)
+    cover = np.bincount(np.arange(origin, current) % slots, minlength=slots).astype(np.float64)
+    flat = totals.sum() / max(current - origin, 1)
+    season = (totals + SEASON_PRIOR) / (cover * flat + SEASON_PRIOR)
+
+    detector = SpikeDetector(bucket_seconds, settings.spikes_halflife_days * 86400, settings.spikes_geohash_precision, origin, season.tolist())
+    weights = np.where(past, detector.alpha * detector.decay ** (current - 1 - buckets) / season[buckets % slots], 0.0)
+    in_current = buckets == current
+    in_previous = buckets == current - 1
+
+    areas = rows[:, 2].astype(np.int64)
+    categories = rows[:, 3].astype(np.int64)
+    cells = cell_codes(np, rows[:, 4], rows[:, 5], detector.precision)
+    # one int64 per key (area_id << 32 | category_id for pairs), so np.unique
+    # sorts plain integers
+    everything = np.ones(len(rows), dtype=bool)
+    dimensions = (
+        ("area_category", (areas << 32) | categories, everything, True),
+        ("area", areas, everything, False),
+        ("cell", cells, cells >= 0, False),
+    )
+    for name, packed, valid, pair in dimensions:
+        keys, inverse = np.unique(packed[valid], return_inverse=True)
+        levels = np.bincount(inverse, weights=weights[valid], minlength=len(keys))
+        counts = np.bincount(inverse[in_current[valid]], minlength=len(keys))
+        prevs = np.bincount(inverse[in_previous[valid]], minlength=len(keys))
+        for packed_key, level, count, prev in zip(keys.tolist(), levels.tolist(), counts.tolist(), prevs.tolist()):
+            key = (name, packed_key >> 32, packed_key & 0xFFFFFFFF) if pair else (name, packed_key, 0)
+            detector.rates[key] = _Rate(level, current, current, count, prev)
+            if count or prev:
+                detector.touched.setdefault(current, set()).add(key)
+
+    detector.newest = current
+    detector.events = len(rows)
+    detector.last_report_id = upto
+    return detector
+
+
+# ----------
+# Worker state
+# ----------
+
+_detector: Optional[SpikeDetector] = None
+_rebuild_lock = threading.Lock()
+_catch_up_lock = threading.Lock()
+_stop = threading.Event()
+
+
+def backfill(engine: Engine) -> SpikeDetector:
+    """Rebuild this worker's detector from history and swap it in."""
+    global _detector
+    np = _numpy()
+    with _rebuild_lock:
+        t0 = time.perf_counter()
+        now = time.time()
+        upto, rows = _history(np, engine, now - settings.spikes_backfill_days * 86400)
+        detector = build(np, rows, now, upto)
+        _detector = detector
+        log.info("spike baselines rebuilt from %d report(s) in %.2f s (%d keys)", len(rows), time.perf_counter() - t0, len(detector.rates))
+    return detector
+
+
+def catch_up(db: Session) -> int:
+    """Feed reports newer than the last one seen; returns how many."""
+    detector = _detector
+    if detector is None:
+        return 0
+    np = _numpy()
+    fed = 0
+    with _catch_up_lock:
+        while True:
+            rows = db.execute(_NEW_SQL, {"after": detector.last_report_id, "batch": CATCH_UP_BATCH}).all()
+            if not rows:
+                break
+            detector.ingest(np, np.array(rows, dtype=np.float64))
+            fed += len(rows)
+            if len(rows) < CATCH_UP_BATCH:
+                break
+    return fed
+
+
+def detect(db: Session, min_z: float, min_count: int, dimension: Optional[str]) -> Tuple[SpikeDetector, List[dict], float]:
+    """Catch up, then (detector, spikes, now) for GET /analytics/spikes."""
+    _numpy()
+    detector = _detector
+    if detector is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Spike baselines are still being built"
+        )
+    catch_up(db)
+    now = time.time()
+    return detector, detector.spikes(now, min_z, min_count, dimension), now
+
+
+def describe(detector: SpikeDetector, found: List[dict], now: float) -> dict:
+    """Field values for schemas.Spikes."""
+    def ts(bucket: int) -> datetime:
+        return datetime.fromtimestamp(bucket * detector.bucket_seconds, timezone.utc)
+
+    spikes = []
+    for s in found:
+        dimension, a, b = s["key"]
+        spikes.append({
+            "dimension": dimension,
+            "area_id": a if dimension != "cell" else None,
+            "category_id": b if dimension == "area_category" else None,
+            "cell": cell_name(a, detector.precision) if dimension == "cell" else None,
+            "count": s["count"],
+            "expected": round(s["expected"], 2),
+            "z": round(s["z"], 2),
+        })
+    return {
+        "as_of": datetime.fromtimestamp(now, timezone.utc),
+        "window_start": ts(int(now // detector.bucket_seconds) - 1),
+        "baseline_since": ts(detector.origin),
+        "last_report_id": detector.last_report_id,
+        "spikes": spikes,
+    }
+
+
+def _run(engine: Engine) -> None:
+    while not _stop.is_set():
+        try:
+            detector = _detector
+            if detector is None or time.time() - detector.built_at >= settings.spikes_rebuild_hours * 3600:
+                backfill(engine)
+            with SessionLocal() as db:
+                catch_up(db)
+        except HTTPException as exc:
+            log.warning("spike detection disabled: %s", exc.detail)
+            return
+        except Exception as exc:
+            log.warning("spike detector update failed: %s", exc)
+        _stop.wait(settings.spikes_poll_seconds)
+
+
+def start(engine: Engine) -> Optional[threading.Thread]:
+    """Backfill, then poll for new reports, on a daemon thread (SPIKES=0: never)."""
+    if not settings.spikes:
+        return None
+    _stop.clear()
+    thread = threading.Thread(target=_run, args=(engine,), name="gridwatch-spikes", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop() -> None:
+    _stop.set()
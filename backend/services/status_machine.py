@@ -0,0 +1,88 @@
+# backend/services/status_machine.py
+"""
+Report status lifecycle.
+
+REPORT_STATUSES mirrors the report_status enum in db/ProjectSchema.sql (same
+order). TRANSITIONS lists, for each status, the statuses a report may move
+to next; anything else is rejected before touching the database.
+
+    SUBMITTED -> TRIAGED -> IN_PROGRESS <-> ON_HOLD
+        |                    ^   |
+        +--------------------+   |
+                                 |
+                             RESOLVED -> CLOSED
+                                 ^          |
+                                 +-- reopen-+ (CLOSED -> TRIAGED, RESOLVED -> IN_PROGRESS)
+
+Any open report can be MERGED into another (terminal). Crews may skip triage
+(SUBMITTED -> IN_PROGRESS) and close work outright (IN_PROGRESS -> CLOSED),
+and SUBMITTED / TRIAGED / ON_HOLD reports can be CLOSED without work
+(duplicates, invalid).
+
+Setting the current status again is allowed with a note: the note is
+recorded as a status_update row and the status stays as it is. Without a
+note there is nothing to record, so it is rejected.
+
+The moves that stay forbidden, and why:
+  * back to SUBMITTED (e.g. CLOSED -> SUBMITTED): SUBMITTED means nobody has
+    looked at the report yet; a reopened report goes to TRIAGED.
+  * into RESOLVED from anything but IN_PROGRESS: resolution-time analytics
+    count resolved work, so the work has to be recorded as started; reports
+    nobody worked on are CLOSED instead.
+  * SUBMITTED -> ON_HOLD: a report is held once it is triaged.
+  * out of RESOLVED to anything but CLOSED / IN_PROGRESS, and out of CLOSED
+    to anything but TRIAGED: finished reports are reopened, not parked or
+    merged after the fact.
+  * out of MERGED: the report lives on as the one it was merged into.
+"""
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from fastapi import status
+
+REPORT_STATUSES: Tuple[str, ...] = (
+    "SUBMITTED",
+    "TRIAGED",
+    "IN_PROGRESS",
+    "ON_HOLD",
+    "RESOLVED",
+    "CLOSED",
+    "MERGED",
+)
+
+# statuses of reports still waiting on work (the list's open=true); RESOLVED,
+# CLOSED and MERGED reports are finished
+OPEN_STATUSES: Tuple[str, ...] = ("SUBMITTED", "TRIAGED", "IN_PROGRESS", "ON_HOLD")
+
+TRANSITIONS: Dict[str, FrozenSet[str]] = {
+    "SUBMITTED":   frozenset({"TRIAGED", "IN_PROGRESS", "CLOSED", "MERGED"}),
+    "TRIAGED":     frozenset({"IN_PROGRESS", "ON_HOLD", "CLOSED", "MERGED"}),
+    "IN_PROGRESS": frozenset({"ON_HOLD", "RESOLVED", "CLOSED", "MERGED"}),
+    "ON_HOLD":     frozenset({"IN_PROGRESS", "CLOSED", "MERGED"}),
+    "RESOLVED":    frozenset({"CLOSED", "IN_PROGRESS"}),
+    "CLOSED":      frozenset({"TRIAGED"}),
+    "MERGED":      frozenset(),
+}
+
+
+def transition_problem(current: str, new: str, note: Optional[str] = None) -> Optional[Tuple[int, str]]:
+    """
+    Return None if `current -> new` is allowed, else (HTTP status code, detail):
+    422 for a status that does not exist, 409 for an illegal move or for the
+    current status again without a note.
+    """
+    if new not in TRANSITIONS:
+        return (
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            f"Invalid status value; must be one of: {', '.join(REPORT_STATUSES)}"
+        )
+    if new == current:
+        if note and note.strip():
+            return None
+        return status.HTTP_409_CONFLICT, f"Report is already {current}; send a note to record one"
+    if new not in TRANSITIONS.get(current, frozenset()):
+        allowed = ", ".join(s for s in REPORT_STATUSES if s in TRANSITIONS.get(current, ())) or "none"
+        return (
+            status.HTTP_409_CONFLICT,
+            f"Illegal transition {current} -> {new} (allowed: {allowed})"
+        )
+    return None
@@ -0,0 +1,194 @@
+# backend/services/warmup.py
+"""
+Startup warmup, so a new worker's first requests run at steady-state speed.
+
+Started from the app lifespan (backend/main.py) on a background thread;
+GET /ready answers 503 until it has finished. Steps, each timed:
+
+  mappers     : configure the ORM mappers (otherwise the first query does)
+  connections : open WARMUP_CONNECTIONS pooled connections per engine
+                (default engine and every admission lane)
+  statements  : run the hot read paths of report_service, feed_service and
+                the rollup-backed analytics once on the engine that will
+                serve them, filling each engine's compiled-statement cache,
+                psycopg2's type setup and the detail LRU
+  refdata     : load service areas / categories / severities into the cache
+
+The whole-table analytics (hotspots, resolution-times), the facet pass of
+the first GET /reports/?facets=true page and the writes are not run: for
+them the query or the write itself, not compilation, is the first-request
+cost, and running them on every worker start would load the database on
+each deploy. A failed step is logged and recorded; the
+remaining steps still run and the worker still becomes ready.
+
+WARMUP=0 skips all of it (/ready then only checks the database).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, configure_mappers
+
+from backend.core.config import settings
+from backend.db.session import engine, lane_engines
+from backend.services import analytics_service, feed_service, refdata_service, report_service
+
+log = logging.getLogger("gridwatch.warmup")
+
+# one report / user / area to aim the read paths at
+Sample = Dict[str, int]
+
+
+class WarmupState:
+    def __init__(self):
+        self.status = "pending"             # pending | running | done | skipped
+        self.steps: Dict[str, float] = {}   # step -> milliseconds
+        self.errors: Dict[str, str] = {}
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def as_dict(self) -> dict:
+        return {"status": self.status, "steps_ms": dict(self.steps), "errors": dict(self.errors)}
+
+
+state = WarmupState()
+
+
+# -----------
+# Read paths
+# -----------
+
+def _report_reads(db: Session, sample: Sample) -> None:
+    rid = sample["report_id"]
+    report_service.get_report_table_version(db)
+    version = report_service.get_report_version(db, rid)
+    report_service.get_report_detail_json(db, rid, version)
+    report_service.get_report_sparse_json(db, rid, report_service.DETAIL_FIELDS, ())
+    report_service.get_report_history(db, rid, limit=1)
+    # no rows match, but the statements compile and run. The cursor makes
+    # list_report_page a later keyset page: one empty idx_report_area_keyset
+    # probe. A first page would also run the facet pass, which scans every
+    # report whenever fewer than two filters are set (and is analytics-lane
+    # work anyway)
+    cursor = report_service.report_list_cursor(datetime.now(timezone.utc), 0)
+    report_service.list_report_page(db, area_id=-1, cursor=cursor, limit=1)
+    report_service.list_report_rows(db, area_id=-1)
+    report_service.list_report_field_rows(db, ("report_id", "latitude", "longitude", "current_status"), area_id=-1)
+
+
+def _feed_reads(db: Session, sample: Sample) -> None:
+    feed_service.get_user_feed(db, sample["user_id"], limit=1)
+
+
+def _analytics_reads(db: Session, sample: Sample) -> None:
+    since, until = analytics_service.resolve_window("day", None, None)
+    for group_by in ("category", "area", "status"):
+        analytics_service.timeseries_rows(db, "day", group_by, since, until)
+    since, until = analytics_service.resolve_cost_window(None, None)
+    analytics_service.cost_rows(db, "department", "month", since, until)
+
+
+_INTERACTIVE = [_report_reads, _feed_reads]
+_ANALYTICS = [_analytics_reads]
+
+
+def _engines() -> List[Engine]:
+    return [engine, *lane_engines.values()]
+
+
+def _statement_plan() -> List[Tuple[Engine, List[Callable[[Session, Sample], None]]]]:
+    # warm each statement on the engine (and compiled cache) that serves it
+    if lane_engines:
+        return [(lane_engines["interactive"], _INTERACTIVE), (lane_engines["analytics"], _ANALYTICS)]
+    return [(engine, _INTERACTIVE + _ANALYTICS)]
+
+
+# -----------
+# Steps
+# -----------
+
+def _open_connections() -> None:
+    for eng in _engines():
+        conns = [eng.connect() for _ in range(min(settings.warmup_connections, eng.pool.size()))]
+        for conn in conns:
+            conn.execute(text("SELECT 1"))
+        for conn in conns:
+            conn.close()
+
+
+def _sample() -> Optional[Sample]:
+    with Session(engine) as db:
+        row = db.execute(text(
+            'SELECT (SELECT max(report_id) FROM report), (SELECT min(user_id) FROM "user"), '
+            "(SELECT min(area_id) FROM service_area)"
+        )).one()
+    if None in row:
+        return None     # empty database: nothing to aim the read paths at
+    return {"report_id": row[0], "user_id": row[1], "area_id": row[2]}
+
+
+def _run_statements() -> None:
+    sample = _sample()
+    if sample is None:
+        return
+    for eng, reads in _statement_plan():
+        with Session(eng) as db:
+            for read in reads:
+                read(db, sample)
+                db.rollback()
+
+
+def _warm_refdata() -> None:
+    with Session(engine) as db:
+        refdata_service.warm(db)
+
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("mappers", configure_mappers),
+    ("connections", _open_connections),
+    ("statements", _run_statements),
+    ("refdata", _warm_refdata),
+]
+
+
+def run() -> None:
+    """Run every step once, recording timings and errors in `state`."""
+    state.status = "running"
+    for name, step in STEPS:
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:
+            state.errors[name] = f"{type(exc).__name__}: {exc}"
+            log.warning("warmup step %s failed: %s", name, exc)
+        state.steps[name] = round((time.perf_counter() - t0) * 1000, 1)
+    state.status = "done"
+    state._done.set()
+    log.info("warmup finished in %.0f ms: %s", sum(state.steps.values()), state.steps)
+
+
+def start() -> Optional[threading.Thread]:
+    """Run the warmup on a daemon thread (or mark it skipped when WARMUP=0)."""
+    if not settings.warmup:
+        state.status = "skipped"
+        state._done.set()
+        return None
+    thread = threading.Thread(target=run, name="gridwatch-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def dispose() -> None:
+    """Close every pooled connection (lifespan shutdown)."""
+    for eng in _engines():
+        eng.dispose()
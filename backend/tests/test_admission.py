@@ -0,0 +1,228 @@
+# backend/tests/test_admission.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.core import admission
+from backend.core.admission import _Slots, classify
+
+
+def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def _acquire_in_thread(slots, timeout):
+    """acquire() on its own event loop in a new thread; returns (thread, result)."""
+    result = {}
+
+    def run():
+        result["admitted"] = asyncio.run(slots.acquire(timeout))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+@pytest.fixture
+def grant_held(monkeypatch):
+    """
+    Keep handed-over slots from reaching their waiter: release() still takes
+    the waiter off the queue, but its future is never resolved. That is the
+    window where a timeout or cancellation lands during a hand-off.
+    """
+    monkeypatch.setattr(admission, "_grant", lambda fut: None)
+
+
+# ----------------------
+# _Slots
+# ----------------------
+
+def test_acquire_within_limit_and_release():
+    slots = _Slots(2)
+
+    async def run():
+        assert await slots.acquire(0.01)
+        assert await slots.acquire(0.01)
+        assert slots.active == 2
+        slots.release()
+        slots.release()
+
+    asyncio.run(run())
+    assert (slots.active, slots.waiting) == (0, 0)
+
+
+def test_full_lane_times_out_and_leaves_the_queue():
+    slots = _Slots(1)
+
+    async def run():
+        assert await slots.acquire(0.01)
+        assert not await slots.acquire(0.01)
+        assert slots.waiting == 0
+        slots.release()
+
+    asyncio.run(run())
+    assert slots.active == 0
+
+
+def test_release_hands_the_slot_to_a_waiter_on_another_thread():
+    slots = _Slots(1)
+    asyncio.run(slots.acquire(0.01))
+
+    thread, result = _acquire_in_thread(slots, 5.0)
+    _until(lambda: slots.waiting == 1)
+    slots.release()
+    thread.join(5)
+
+    # handed over, not freed: the waiter now holds it
+    assert result["admitted"] is True
+    assert (slots.active, slots.waiting) == (1, 0)
+    slots.release()
+    assert slots.active == 0
+
+
+def test_waiters_are_served_in_arrival_order():
+    slots = _Slots(1)
+    order = []
+
+    async def waiter(name):
+        assert await slots.acquire(5.0)
+        order.append(name)
+
+    async def run():
+        assert await slots.acquire(0.01)
+        first = asyncio.create_task(waiter("first"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(waiter("second"))
+        await asyncio.sleep(0)
+        assert slots.waiting == 2
+
+        slots.release()
+        await first
+        assert order == ["first"] and slots.waiting == 1
+        # an arrival while "second" waits queues behind it
+        assert not await slots.acquire(0.01)
+        slots.release()
+        await second
+        slots.release()
+
+    asyncio.run(run())
+    assert order == ["first", "second"]
+    assert (slots.active, slots.waiting) == (0, 0)
+
+
+def test_timeout_during_hand_off_keeps_the_slot(grant_held):
+    slots = _Slots(1)
+
+    async def run():
+        assert await slots.acquire(0.01)
+        task = asyncio.create_task(slots.acquire(0.05))
+        await asyncio.sleep(0)
+        assert slots.waiting == 1
+        slots.release()                 # handed over, but the grant never arrives
+        assert await task is True       # the wait times out, yet the slot is its
+        assert (slots.active, slots.waiting) == (1, 0)
+        slots.release()
+
+    asyncio.run(run())
+    assert slots.active == 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    slots = _Slots(1)
+
+    async def run():
+        assert await slots.acquire(0.01)
+        task = asyncio.create_task(slots.acquire(5.0))
+        await asyncio.sleep(0)
+        assert slots.waiting == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert (slots.active, slots.waiting) == (1, 0)
+        slots.release()
+
+    asyncio.run(run())
+    assert slots.active == 0
+
+
+def test_cancellation_during_hand_off_passes_the_slot_on(monkeypatch):
+    slots = _Slots(1)
+    grant = admission._grant
+
+    async def run():
+        assert await slots.acquire(0.01)
+        cancelled = asyncio.create_task(slots.acquire(5.0))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(slots.acquire(5.0))
+        await asyncio.sleep(0)
+        assert slots.waiting == 2
+
+        monkeypatch.setattr(admission, "_grant", lambda fut: None)
+        slots.release()                 # handed to `cancelled`, grant held back
+        monkeypatch.setattr(admission, "_grant", grant)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        # its slot went to the next waiter instead of leaking or being freed twice
+        assert await queued is True
+        assert (slots.active, slots.waiting) == (1, 0)
+        slots.release()
+
+    asyncio.run(run())
+    assert slots.active == 0
+
+
+# ----------------------
+# classify
+# ----------------------
+
+@pytest.mark.parametrize("method, path, query, lane", [
+    ("GET", "/health", b"", None),
+    ("GET", "/ready", b"", None),
+    ("GET", "/metrics", b"", None),
+    ("POST", "/reports/", b"", "write"),
+    ("PUT", "/reports/status", b"", "write"),
+    ("PATCH", "/reports/7/status", b"", "write"),
+    ("DELETE", "/reports/7", b"", "write"),
+    ("GET", "/analytics/hotspots", b"", "analytics"),
+    ("GET", "/reports/", b"", "analytics"),
+    ("GET", "/reports/", b"limit=50&fields=report_id", "analytics"),
+    ("GET", "/reports/", b"status=CLOSED", "interactive"),
+    ("GET", "/reports/", b"area_id=3&search=pothole", "interactive"),
+    ("GET", "/reports/", b"search", "interactive"),
+    ("GET", "/reports/", b"open=true", "interactive"),
+    ("GET", "/reports/", b"breaching=true", "interactive"),
+    ("GET", "/reports/", b"created_after=2026-10-18T00:00:00Z", "interactive"),
+    ("GET", "/reports/export", b"status=CLOSED", "analytics"),
+    ("GET", "/reports/7", b"", "interactive"),
+    ("GET", "/reports/7/history", b"", "interactive"),
+    ("GET", "/users/1/feed", b"", "interactive"),
+    ("HEAD", "/analytics/costs", b"", "analytics"),
+])
+def test_classify(method, path, query, lane):
+    assert classify(method, path, query) == lane
+
+
+@pytest.mark.parametrize("query, lane", [
+    # the first page runs the facet pass, filtered or not
+    (b"facets=true", "analytics"),
+    (b"facets=true&limit=50", "analytics"),
+    (b"facets=true&status=CLOSED", "analytics"),
+    (b"facets=1&area_id=2", "analytics"),
+    (b"facets=TRUE", "analytics"),
+    (b"facets=yes&cursor=", "analytics"),
+    # later pages only read their own rows
+    (b"facets=true&cursor=abc", "interactive"),
+    (b"cursor=abc&facets=on&status=OPEN", "interactive"),
+    # facets off: the plain listing rules apply
+    (b"facets=false", "analytics"),
+    (b"facets=0&status=CLOSED", "interactive"),
+    (b"facets", "analytics"),
+])
+def test_classify_faceted_pages(query, lane):
+    assert classify("GET", "/reports/", query) == lane
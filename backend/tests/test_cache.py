@@ -0,0 +1,177 @@
+# backend/tests/test_cache.py
+import threading
+import types
+
+import pytest
+
+from backend.core import cache
+from backend.core.cache import FlightTimeout, SingleFlightCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the clock SingleFlightCache reads; advance it with clock.now += s."""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    monkeypatch.setattr(cache, "time", fake)
+    return fake
+
+
+def _counter(value="v"):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+    return compute, calls
+
+
+def _in_flight(sf, key, value="v"):
+    """
+    Start a leader computing `key` in a thread and return (thread, release,
+    result) once it is inside compute(); release() lets it finish.
+    """
+    entered, gate, result = threading.Event(), threading.Event(), {}
+
+    def compute():
+        entered.set()
+        assert gate.wait(5)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    def run():
+        try:
+            result["value"] = sf.get_or_compute(key, compute)
+        except BaseException as exc:
+            result["error"] = exc
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    assert entered.wait(5)
+    return leader, gate.set, result
+
+
+def _follow(sf, key, compute=None):
+    """Start a caller for `key` in a thread; return (thread, result) once it waits on the flight."""
+    waiting, result = threading.Event(), {}
+
+    def run():
+        try:
+            result["value"] = sf.get_or_compute(key, compute or (lambda: "own"), before_wait=waiting.set)
+        except BaseException as exc:
+            result["error"] = exc
+
+    follower = threading.Thread(target=run)
+    follower.start()
+    assert waiting.wait(5)
+    return follower, result
+
+
+def test_hit_within_ttl(clock):
+    sf = SingleFlightCache(ttl=5.0)
+    compute, calls = _counter()
+
+    assert sf.get_or_compute("k", compute) == ("v", "miss")
+    clock.now += 4.9
+    assert sf.get_or_compute("k", compute) == ("v", "hit")
+    assert len(calls) == 1
+
+
+def test_miss_after_ttl(clock):
+    sf = SingleFlightCache(ttl=5.0)
+    compute, calls = _counter()
+
+    sf.get_or_compute("k", compute)
+    clock.now += 5.0
+    assert sf.get_or_compute("k", compute) == ("v", "miss")
+    assert len(calls) == 2
+
+
+def test_ttl_counts_from_the_start_of_the_computation(clock):
+    sf = SingleFlightCache(ttl=5.0)
+
+    def slow():
+        clock.now += 3.0
+        return "v"
+
+    sf.get_or_compute("k", slow)
+    clock.now += 2.0
+    assert sf.get_or_compute("k", slow)[1] == "miss"
+
+
+def test_zero_ttl_stores_nothing(clock):
+    sf = SingleFlightCache(ttl=0)
+    compute, calls = _counter()
+
+    sf.get_or_compute("k", compute)
+    assert sf.get_or_compute("k", compute)[1] == "miss"
+    assert len(sf) == 0
+
+
+def test_keys_are_independent(clock):
+    sf = SingleFlightCache(ttl=5.0)
+    sf.get_or_compute("a", lambda: 1)
+    assert sf.get_or_compute("b", lambda: 2) == (2, "miss")
+    assert sf.get_or_compute("a", lambda: 3) == (1, "hit")
+
+
+def test_coalesced_caller_gets_the_leaders_value():
+    sf = SingleFlightCache(ttl=5.0)
+    leader, release, led = _in_flight(sf, "k", "shared")
+    follower, followed = _follow(sf, "k")
+
+    release()
+    leader.join(5)
+    follower.join(5)
+    assert led["value"] == ("shared", "miss")
+    assert followed["value"] == ("shared", "coalesced")
+
+
+def test_coalesced_caller_gets_the_leaders_exception():
+    sf = SingleFlightCache(ttl=5.0)
+    boom = RuntimeError("boom")
+    leader, release, led = _in_flight(sf, "k", boom)
+    follower, followed = _follow(sf, "k")
+
+    release()
+    leader.join(5)
+    follower.join(5)
+    assert led["error"] is boom
+    assert followed["error"] is boom
+
+
+def test_failures_are_not_cached(clock):
+    sf = SingleFlightCache(ttl=5.0)
+
+    def fail():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError):
+        sf.get_or_compute("k", fail)
+    assert len(sf) == 0
+    assert sf.get_or_compute("k", lambda: "ok") == ("ok", "miss")
+    assert sf.get_or_compute("k", lambda: "other") == ("ok", "hit")
+
+
+def test_wait_timeout_raises_flight_timeout():
+    sf = SingleFlightCache(ttl=5.0, wait_timeout=0.05)
+    leader, release, led = _in_flight(sf, "k", "late")
+    try:
+        with pytest.raises(FlightTimeout):
+            sf.get_or_compute("k", lambda: "own")
+    finally:
+        release()
+        leader.join(5)
+
+    # the computation carried on for its own caller, and was cached
+    assert led["value"] == ("late", "miss")
+    assert sf.get_or_compute("k", lambda: "own") == ("late", "hit")
+
+
+def test_before_wait_runs_only_for_coalesced_callers():
+    sf = SingleFlightCache(ttl=5.0)
+    called = []
+    sf.get_or_compute("k", lambda: "v", before_wait=lambda: called.append("miss"))
+    sf.get_or_compute("k", lambda: "v", before_wait=lambda: called.append("hit"))
+    assert called == []
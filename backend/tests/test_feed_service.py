@@ -0,0 +1,32 @@
+# backend/tests/test_feed_service.py
+from sqlalchemy.dialects import postgresql
+
+from backend.services.feed_service import _decode_cursor, _encode_cursor, page_query
+
+
+def _sql(user_id=5, before=None, limit=50):
+    compiled = page_query(user_id, before, limit).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return " ".join(str(compiled).split())
+
+
+def test_pulled_events_are_read_per_subscription_with_a_bound():
+    sql = _sql(limit=50)
+    lateral = sql.split("JOIN LATERAL", 1)[1]
+    # the per-report scan is keyed by the subscription and limited inside the LATERAL
+    assert "feed_event.report_id = subs.report_id" in lateral
+    assert "NOT feed_event.fanned_out" in lateral
+    assert "feed_event.occurred_at >= subs.created_at" in lateral
+    assert lateral.split(") AS per_report", 1)[0].endswith("ORDER BY feed_event.event_id DESC LIMIT 51")
+
+
+def test_cursor_bounds_both_halves():
+    sql = _sql(before=1234)
+    pushed, pulled = sql.split("UNION ALL", 1)
+    assert "user_feed.event_id < 1234" in pushed
+    assert "feed_event.event_id < 1234" in pulled.split("JOIN LATERAL", 1)[1]
+
+
+def test_cursor_round_trip():
+    assert _decode_cursor(_encode_cursor(987654321)) == 987654321
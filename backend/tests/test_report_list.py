@@ -0,0 +1,124 @@
+# backend/tests/test_report_list.py
+import types
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from backend.db.models import Report, ReportArchive
+from backend.services import report_service
+from backend.services.status_machine import OPEN_STATUSES
+
+
+def _sql(stmt) -> str:
+    compiled = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True})
+    return " ".join(str(compiled).split())
+
+
+def _where(**filters) -> str:
+    args = dict(search=None, area_id=None, category_id=None, status_filter=None, severity_id=None)
+    args.update(filters)
+    conditions = report_service._report_conditions(Report, **args)
+    return _sql(select(Report.report_id).where(*conditions))
+
+
+def test_open_keeps_unfinished_statuses():
+    sql = _where(open_only=True)
+    assert "report.current_status IN" in sql
+    assert sql.count("%(current_status_1_") == len(OPEN_STATUSES)
+
+
+def test_breaching_is_open_and_past_the_category_sla():
+    sql = _where(breaching=True)
+    assert "report.current_status IN" in sql
+    assert "report.created_at < now() - make_interval(" in sql
+    # the report's own category, even when the list joins category itself
+    assert "(SELECT category.default_sla_hours FROM category WHERE category.category_id = report.category_id)" in sql
+
+
+def test_breaching_sla_subquery_is_not_correlated_to_a_joined_category():
+    stmt = report_service._report_summary_select(Report, None, None, None, None, None, breaching=True)
+    assert "(SELECT category.default_sla_hours FROM category WHERE" in _sql(stmt)
+
+
+def test_created_after():
+    assert "report.created_at >= %(created_at_1)s" in _where(created_after=datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+
+def test_open_lists_skip_the_archive():
+    assert report_service._list_tiers("CLOSED", True) == [Report, ReportArchive]
+    assert report_service._list_tiers(None, True, open_only=True) == [Report]
+
+
+class _RecordingSession:
+    """Returns `rows` for the one statement _report_facets runs, and keeps it."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.stmt = None
+
+    def execute(self, stmt):
+        self.stmt = stmt
+        return self.rows
+
+
+def _row(grouping, count, **values):
+    fields = dict(current_status=None, area_id=None, category_id=None, severity_id=None,
+                  area_name=None, category_name=None, severity_label=None, open=0, breaching=0, last_24h=0)
+    fields.update(values)
+    return types.SimpleNamespace(grouping=grouping, count=count, _mapping=fields, **fields)
+
+
+def _facets(rows, **active):
+    filters = dict.fromkeys(("status", "area", "category", "severity", "created_after", "open", "breaching"))
+    filters.update(active)
+    db = _RecordingSession(rows)
+    return db, report_service._report_facets(db, [Report], None, filters)
+
+
+def test_toggle_counts_come_from_the_total_row():
+    _, (total, facets) = _facets([
+        _row(0b1111, 40, open=25, breaching=7, last_24h=3),
+        _row(0b0111, 25, current_status="IN_PROGRESS"),
+        _row(0b0111, 0, current_status="CLOSED"),
+    ])
+    assert total == 40
+    assert (facets.open, facets.breaching, facets.last_24h) == (25, 7, 3)
+    assert [(f.value, f.count) for f in facets.status] == [("IN_PROGRESS", 25)]
+
+
+def test_toggle_counts_skip_only_their_own_filter():
+    db, _ = _facets([], status=report_service._equals("current_status", "ON_HOLD"), open=report_service._is_open)
+    sql = _sql(db.stmt)
+
+    def counted(label):
+        head = sql.split(f" AS {label},", 1)[0]
+        return head.rsplit("count(*) FILTER (WHERE ", 1)[1]
+
+    # open= is counted under status=, with its own predicate once
+    assert "filtered.current_status = %(" in counted("open")
+    assert counted("open").count("filtered.current_status IN") == 1
+    # breaching= and the last-24h count keep open= on
+    assert counted("breaching").count("filtered.current_status IN") == 2
+    assert "filtered.created_at >= now() -" in counted("last_24h")
+    assert "filtered.current_status IN" in counted("last_24h")
+
+
+class _PageSession:
+    """Returns no rows for every statement, and keeps them all."""
+
+    def __init__(self):
+        self.stmts = []
+
+    def execute(self, stmt):
+        self.stmts.append(stmt)
+        return types.SimpleNamespace(all=lambda: [])
+
+
+def test_later_pages_skip_the_facet_pass():
+    db = _PageSession()
+    cursor = report_service.report_list_cursor(datetime(2026, 10, 19, tzinfo=timezone.utc), 0)
+    page = report_service.list_report_page(db, area_id=-1, cursor=cursor, limit=1)
+    assert len(db.stmts) == 1
+    assert "GROUPING SETS" not in _sql(db.stmts[0])
+    assert (page.items, page.total, page.facets) == ([], None, None)
@@ -0,0 +1,209 @@
+# backend/tests/test_status_machine.py
+import itertools
+import re
+
+import pytest
+
+from backend.schemas import reports as schemas
+from backend.services import report_service
+from backend.services.status_machine import REPORT_STATUSES, TRANSITIONS, transition_problem
+
+
+# ----------------------
+# transition_problem
+# ----------------------
+
+@pytest.mark.parametrize("current, new", [
+    ("SUBMITTED", "TRIAGED"),
+    ("SUBMITTED", "IN_PROGRESS"),      # skip triage
+    ("TRIAGED", "IN_PROGRESS"),
+    ("IN_PROGRESS", "ON_HOLD"),
+    ("ON_HOLD", "IN_PROGRESS"),
+    ("IN_PROGRESS", "RESOLVED"),
+    ("IN_PROGRESS", "CLOSED"),         # close work outright
+    ("RESOLVED", "CLOSED"),
+    ("RESOLVED", "IN_PROGRESS"),       # reopen
+    ("CLOSED", "TRIAGED"),             # reopen
+    ("ON_HOLD", "MERGED"),
+])
+def test_allowed_moves(current, new):
+    assert transition_problem(current, new) is None
+
+
+@pytest.mark.parametrize("current, new", [
+    ("CLOSED", "SUBMITTED"),
+    ("TRIAGED", "SUBMITTED"),
+    ("SUBMITTED", "RESOLVED"),
+    ("ON_HOLD", "RESOLVED"),
+    ("SUBMITTED", "ON_HOLD"),
+    ("CLOSED", "IN_PROGRESS"),
+    ("RESOLVED", "MERGED"),
+    ("MERGED", "TRIAGED"),
+])
+def test_forbidden_moves_are_409(current, new):
+    code, detail = transition_problem(current, new)
+    assert code == 409
+    assert f"{current} -> {new}" in detail
+
+
+def test_unknown_status_is_422():
+    code, detail = transition_problem("SUBMITTED", "DONE")
+    assert code == 422
+    assert "SUBMITTED" in detail
+
+
+def test_unknown_status_is_422_even_with_a_note():
+    assert transition_problem("SUBMITTED", "DONE", "note")[0] == 422
+
+
+@pytest.mark.parametrize("current", REPORT_STATUSES)
+def test_same_status_needs_a_note(current):
+    assert transition_problem(current, current, "Crew on site") is None
+    assert transition_problem(current, current)[0] == 409
+    assert transition_problem(current, current, "   ")[0] == 409
+
+
+def test_transitions_cover_every_status():
+    assert set(TRANSITIONS) == set(REPORT_STATUSES)
+    for targets in TRANSITIONS.values():
+        assert targets <= set(REPORT_STATUSES)
+
+
+def test_no_move_back_to_submitted_or_out_of_merged():
+    for current, new in itertools.product(REPORT_STATUSES, REPORT_STATUSES):
+        if current != new and (new == "SUBMITTED" or current == "MERGED"):
+            assert transition_problem(current, new)[0] == 409
+
+
+# ----------------------
+# bulk_update_status
+# ----------------------
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return _Result([row[0] for row in self.rows])
+
+
+class FakeSession:
+    """Answers the statements bulk_update_status runs, from in-memory tables."""
+
+    def __init__(self, hot, archived=()):
+        self.hot = dict(hot)
+        self.archived = set(archived)
+        self.inserted = []
+        self.committed = False
+        self.next_status_id = 100
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt)
+        if "FOR UPDATE" in sql:
+            return _Result([(rid, self.hot[rid]) for rid in sorted(params["ids"]) if rid in self.hot])
+        if "report_archive" in sql:
+            # select(ReportArchive.report_id).where(... IN (...)); ids compiled as literal binds
+            wanted = stmt.compile(compile_kwargs={"literal_binds": True}).string
+            ids = {int(i) for i in re.findall(r"\d+", wanted.split(" IN ", 1)[1])}
+            return _Result([(rid,) for rid in sorted(self.archived & ids)])
+        rows = self._rows(params)
+        if sql.lstrip().startswith("UPDATE report"):
+            for rid, new_status, _ in rows:
+                self.hot[rid] = new_status
+            return _Result([])
+        if "INSERT INTO status_update" in sql:
+            out = []
+            for rid, new_status, note in rows:
+                self.inserted.append((rid, new_status, note, params["changed_by"]))
+                out.append((rid, self.next_status_id))
+                self.next_status_id += 1
+            return _Result(out)
+        raise AssertionError(f"unexpected statement: {sql}")
+
+    @staticmethod
+    def _rows(params):
+        rows = []
+        n = 0
+        while f"id{n}" in params:
+            rows.append((params[f"id{n}"], params[f"st{n}"], params[f"note{n}"]))
+            n += 1
+        return rows
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+def _bulk(db, *items):
+    payload = schemas.BulkStatusRequest(
+        changed_by=7,
+        items=[schemas.BulkStatusItem(report_id=rid, new_status=st, note=note) for rid, st, note in items]
+    )
+    return report_service.bulk_update_status(db, payload)
+
+
+def test_bulk_per_item_outcomes():
+    db = FakeSession(
+        hot={1: "SUBMITTED", 2: "CLOSED", 3: "IN_PROGRESS", 4: "TRIAGED", 6: "IN_PROGRESS"},
+        archived={9}
+    )
+    result = _bulk(
+        db,
+        (1, "TRIAGED", None),
+        (2, "SUBMITTED", None),        # illegal
+        (3, "BOGUS", None),            # unknown status
+        (1, "CLOSED", None),           # second item for report 1
+        (8, "CLOSED", None),           # nowhere
+        (9, "CLOSED", None),           # archived
+        (4, "TRIAGED", "Waiting on parts"),  # same status with a note
+        (6, "CLOSED", None),
+    )
+
+    outcomes = [(r.report_id, r.outcome, r.status_code) for r in result.results]
+    assert outcomes == [
+        (1, "updated", 200),
+        (2, "illegal_transition", 409),
+        (3, "invalid_status", 422),
+        (1, "duplicate", 409),
+        (8, "not_found", 404),
+        (9, "archived", 409),
+        (4, "updated", 200),
+        (6, "updated", 200),
+    ]
+    assert (result.updated, result.rejected) == (3, 5)
+
+    assert result.results[0].previous_status == "SUBMITTED"
+    assert result.results[1].previous_status == "CLOSED"
+    assert result.results[4].previous_status is None
+    assert [r.status_id for r in result.results if r.outcome == "updated"] == [100, 101, 102]
+
+    # only the accepted items are written, in request order
+    assert db.committed
+    assert db.hot == {1: "TRIAGED", 2: "CLOSED", 3: "IN_PROGRESS", 4: "TRIAGED", 6: "CLOSED"}
+    assert db.inserted == [
+        (1, "TRIAGED", "Status changed from SUBMITTED to TRIAGED", 7),
+        (4, "TRIAGED", "Waiting on parts", 7),
+        (6, "CLOSED", "Status changed from IN_PROGRESS to CLOSED", 7),
+    ]
+
+
+def test_bulk_same_status_without_note_is_rejected():
+    db = FakeSession(hot={5: "ON_HOLD"})
+    result = _bulk(db, (5, "ON_HOLD", None))
+    assert result.results[0].outcome == "illegal_transition"
+    assert result.results[0].status_code == 409
+    assert db.inserted == []
+
+
+def test_bulk_writes_in_batches(monkeypatch):
+    monkeypatch.setattr(report_service, "BULK_STATUS_BATCH", 2)
+    db = FakeSession(hot={i: "SUBMITTED" for i in range(1, 6)})
+    result = _bulk(db, *[(i, "TRIAGED", None) for i in range(1, 6)])
+    assert result.updated == 5
+    assert [row[0] for row in db.inserted] == [1, 2, 3, 4, 5]
+    assert all(status == "TRIAGED" for status in db.hot.values())
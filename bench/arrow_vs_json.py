@@ -0,0 +1,121 @@
+# bench/arrow_vs_json.py
+"""
+Payload size and encode/decode time: JSON vs Arrow IPC for the /reports/ list shape.
+
+Rows are synthesized in memory with the same columns list_report_rows()
+returns, so this needs no database. JSON is produced the way FastAPI does it
+for response_model=List[ReportSummary] (Pydantic per row, then dump), and
+decoded the way a consumer would (json.loads + datetime parsing). Arrow goes
+through backend.core.columnar.rows_to_arrow and pyarrow's IPC reader.
+
+    python -m bench.arrow_vs_json --rows 100000
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from backend.core.columnar import rows_to_arrow
+from backend.schemas.reports import ReportSummary
+from backend.services.report_service import REPORT_SUMMARY_COLUMNS
+
+STATUSES = ["SUBMITTED", "TRIAGED", "IN_PROGRESS", "ON_HOLD", "RESOLVED", "CLOSED", "MERGED"]
+CATEGORIES = ["Pothole", "Streetlight Out", "Graffiti", "Water Leak", "Illegal Dumping", "Sidewalk Crack", "Noise", "Other"]
+AREAS = ["Downtown", "Riverside", "Campus North", "Campus South", "Greenbelt", "Eastworks", "River Islands"]
+SEVERITIES = ["Low", "Normal", "High", "Critical"]
+
+
+def make_rows(n: int, seed: int = 412) -> List[tuple]:
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            i,
+            f"{rnd.choice(CATEGORIES)} report #{i}",
+            rnd.choice(STATUSES),
+            now - timedelta(seconds=rnd.randint(0, 365 * 86400)),
+            rnd.choice(CATEGORIES),
+            rnd.choice(AREAS),
+            rnd.choice(SEVERITIES),
+        )
+        for i in range(n, 0, -1)
+    ]
+
+
+def timed(fn: Callable, repeat: int) -> tuple[float, object]:
+    samples = []
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+
+    rows = make_rows(args.rows)
+    adapter = TypeAdapter(List[ReportSummary])
+    names = [c.name for c in REPORT_SUMMARY_COLUMNS]
+
+    def json_encode():
+        summaries = [ReportSummary(**dict(zip(names, r))) for r in rows]
+        return adapter.dump_json(summaries)
+
+    def json_decode(body: bytes):
+        items = json.loads(body)
+        for item in items:
+            item["created_at"] = datetime.fromisoformat(item["created_at"])
+        return items
+
+    def arrow_decode(body: bytes):
+        return pa.ipc.open_stream(body).read_all()
+
+    json_enc_s, json_body = timed(json_encode, args.repeat)
+    json_dec_s, _ = timed(lambda: json_decode(json_body), args.repeat)
+    arrow_enc_s, arrow_body = timed(lambda: rows_to_arrow(REPORT_SUMMARY_COLUMNS, rows), args.repeat)
+    arrow_dec_s, _ = timed(lambda: arrow_decode(arrow_body), args.repeat)
+
+    results = {
+        "rows": args.rows,
+        "json": {
+            "bytes": len(json_body),
+            "gzip_bytes": len(gzip.compress(json_body, 6)),
+            "encode_ms": round(json_enc_s * 1000, 2),
+            "decode_ms": round(json_dec_s * 1000, 2),
+        },
+        "arrow": {
+            "bytes": len(arrow_body),
+            "gzip_bytes": len(gzip.compress(arrow_body, 6)),
+            "encode_ms": round(arrow_enc_s * 1000, 2),
+            "decode_ms": round(arrow_dec_s * 1000, 2),
+        },
+    }
+
+    print(f"{args.rows:,} rows (median of {args.repeat})")
+    print(f"{'format':<8}{'bytes':>14}{'gzip bytes':>14}{'encode ms':>12}{'decode ms':>12}")
+    for fmt in ("json", "arrow"):
+        r = results[fmt]
+        print(f"{fmt:<8}{r['bytes']:>14,}{r['gzip_bytes']:>14,}{r['encode_ms']:>12}{r['decode_ms']:>12}")
+
+    if args.json_out:
+        with open(args.json_out, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# bench/coalesce.py
+"""
+Wallboard refresh bursts against the analytics endpoints.
+
+Starts the API twice against the benchmark database, once with the analytics
+response cache off (ANALYTICS_CACHE_SIZE=0) and once with the defaults. For
+each endpoint it fires --rounds bursts of --burst identical requests released
+together. Before every burst one report is touched (a no-op title update),
+which bumps report_table_version, so each burst starts cold: with the cache
+on, one request per burst queries Postgres and the rest wait for it.
+
+Reported per endpoint and mode: median burst wall time, median / max request
+latency, and how many requests actually queried (X-Cache: miss; every
+request when the cache is off).
+
+    python -m bench.coalesce --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench --burst 32
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from bench.suite import _start_server
+
+ENDPOINTS: List[Tuple[str, Dict[str, str]]] = [
+    ("/analytics/hotspots", {}),
+    ("/analytics/resolution-times", {}),
+    ("/analytics/timeseries", {"interval": "day", "group_by": "category"}),
+    ("/analytics/costs", {"group_by": "department"}),
+]
+
+
+def _touch_report(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE report SET title = title WHERE report_id = (SELECT min(report_id) FROM report)"))
+
+
+def _burst(base_url: str, path: str, params: Dict[str, str], size: int, timeout: float):
+    barrier = threading.Barrier(size)
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    lock = threading.Lock()
+
+    def worker(client: httpx.Client) -> None:
+        barrier.wait()
+        t0 = time.perf_counter()
+        r = client.get(path, params=params)
+        elapsed = time.perf_counter() - t0
+        r.raise_for_status()
+        with lock:
+            latencies.append(elapsed * 1000)
+            outcomes[r.headers.get("x-cache", "off")] += 1
+
+    clients = [httpx.Client(base_url=base_url, timeout=timeout) for _ in range(size)]
+    threads = [threading.Thread(target=worker, args=(c,)) for c in clients]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = (time.perf_counter() - t0) * 1000
+    for c in clients:
+        c.close()
+    return wall, latencies, outcomes
+
+
+def _run_mode(args, engine, env: Dict[str, str]) -> Dict[str, Dict]:
+    server = _start_server(args.database_url, args.port, args.workers, env)
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    try:
+        for path, params in ENDPOINTS:
+            httpx.get(base_url + path, params=params, timeout=args.timeout).raise_for_status()
+            walls, lats, outcomes = [], [], Counter()
+            for _ in range(args.rounds):
+                _touch_report(engine)
+                wall, latencies, tally = _burst(base_url, path, params, args.burst, args.timeout)
+                walls.append(wall)
+                lats.extend(latencies)
+                outcomes.update(tally)
+            queried = outcomes["miss"] if "off" not in outcomes else outcomes["off"]
+            results[path] = {
+                "wall": statistics.median(walls),
+                "p50": statistics.median(lats),
+                "max": max(lats),
+                "queried": queried,
+                "requests": sum(outcomes.values()),
+            }
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--burst", type=int, default=32, help="identical requests per burst")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    modes = {
+        "off": _run_mode(args, engine, {"ANALYTICS_CACHE_SIZE": "0"}),
+        "on": _run_mode(args, engine, {}),
+    }
+
+    print(f"{'endpoint':<30} {'mode':>4} | {'burst ms':>9} {'p50 ms':>9} {'max ms':>9} | {'queried':>9}")
+    for path, _ in ENDPOINTS:
+        for mode, results in modes.items():
+            r = results[path]
+            print(
+                f"{path:<30} {mode:>4} | {r['wall']:>9.1f} {r['p50']:>9.1f} {r['max']:>9.1f} | "
+                f"{r['queried']:>4}/{r['requests']:<4}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# bench/cold_start.py
+"""
+Time-to-first-fast-request of a freshly started API worker, startup warmup
+off vs on.
+
+Each run spawns `uvicorn backend.main:app` against the benchmark database
+and polls /ready (falling back to /health on builds without it) until it
+answers 200. Then, once per endpoint in ENDPOINTS, it times the first
+request and the median of --repeat further ones (steady state):
+
+  off : WARMUP=0 -- the first request on each endpoint pays for connection
+        setup, mapper configuration, statement compilation and empty caches
+  on  : default lifespan warmup (backend/services/warmup.py) before /ready
+
+Reported per mode (median over --runs fresh processes): seconds until
+ready, the first / steady latency of every endpoint, and `first fast`:
+seconds from spawn until every endpoint has answered once within
+max(2 x steady, steady + 5 ms).
+
+    python -m bench.cold_start --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from bench import meta
+
+# (label, path, params); {report_id} / {user_id} / {area_id} come from the DB
+ENDPOINTS: List[Tuple[str, str, dict]] = [
+    ("detail", "/reports/{report_id}", {}),
+    ("history", "/reports/{report_id}/history", {"limit": 20}),
+    ("list.page", "/reports/", {"facets": "true", "area_id": "{area_id}", "limit": 20}),
+    ("list.map", "/reports/", {"fields": "report_id,latitude,longitude,current_status", "area_id": "{area_id}"}),
+    ("feed", "/users/{user_id}/feed", {"limit": 20}),
+    ("categories", "/categories", {}),
+    ("service_areas", "/service-areas", {}),
+    ("severities", "/severities", {}),
+    ("timeseries", "/analytics/timeseries", {"interval": "day"}),
+    ("costs", "/analytics/costs", {}),
+]
+
+
+def _fixtures(database_url: str) -> Dict:
+    engine = create_engine(database_url, future=True)
+    with engine.connect() as conn:
+        fx = {
+            "report_id": conn.execute(text("SELECT max(report_id) FROM report")).scalar(),
+            "user_id": conn.execute(text("SELECT user_id FROM user_feed GROUP BY user_id ORDER BY count(*) DESC LIMIT 1")).scalar(),
+            "area_id": conn.execute(text("SELECT area_id FROM report GROUP BY area_id ORDER BY count(*) DESC LIMIT 1")).scalar(),
+        }
+    engine.dispose()
+    return fx
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen, timeout: float) -> None:
+    path = "/ready"
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            res = httpx.get(base_url + path, timeout=2)
+            if res.status_code == 404 and path == "/ready":
+                path = "/health"
+                continue
+            if res.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        time.sleep(0.02)
+    raise RuntimeError(f"API server not ready within {timeout}s")
+
+
+def _run(args, fx: Dict, env_overrides: Dict) -> Dict:
+    env = {**os.environ, "DATABASE_URL": args.database_url, "ANALYTICS_CACHE_SIZE": "0", **env_overrides}
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=meta.REPO_ROOT,
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        _wait_ready(base_url, proc, args.timeout)
+        ready = time.perf_counter() - t0
+
+        first, steady, fast_at = {}, {}, 0.0
+        with httpx.Client(base_url=base_url, timeout=args.timeout) as client:
+            for label, path, params in ENDPOINTS:
+                url = path.format(**fx)
+                query = {k: str(v).format(**fx) for k, v in params.items()}
+                samples = []
+                for _ in range(args.repeat + 1):
+                    ts = time.perf_counter()
+                    client.get(url, params=query).raise_for_status()
+                    samples.append(((time.perf_counter() - ts) * 1000, time.perf_counter() - t0))
+                first[label] = samples[0][0]
+                steady[label] = statistics.median(ms for ms, _ in samples[1:])
+                limit = max(2 * steady[label], steady[label] + 5)
+                fast_at = max(fast_at, next(done for ms, done in samples if ms <= limit))
+        return {"ready": ready, "fast": fast_at, "first": first, "steady": steady}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per mode")
+    parser.add_argument("--repeat", type=int, default=5, help="steady-state requests per endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    fx = _fixtures(args.database_url)
+    modes = {"off": {"WARMUP": "0"}, "on": {"WARMUP": "1"}}
+    results: Dict[str, List[Dict]] = {mode: [] for mode in modes}
+    for run in range(args.runs):
+        for mode, env in modes.items():
+            print(f"== run {run + 1}/{args.runs}, warmup {mode}", flush=True)
+            results[mode].append(_run(args, fx, env))
+
+    def med(mode: str, *keys: str) -> float:
+        values = []
+        for r in results[mode]:
+            value = r
+            for key in keys:
+                value = value[key]
+            values.append(value)
+        return statistics.median(values)
+
+    print(f"\n{'endpoint':<15}" + "".join(f" {mode + ' first':>11} {mode + ' steady':>11}" for mode in modes) + "  (ms)")
+    for label, _, _ in ENDPOINTS:
+        print(f"{label:<15}" + "".join(f" {med(m, 'first', label):>11.1f} {med(m, 'steady', label):>11.1f}" for m in modes))
+    print(f"\n{'warmup':<8} {'ready s':>8} {'first fast s':>13} {'sum first ms':>13}")
+    for mode in modes:
+        total_first = statistics.median(sum(r["first"].values()) for r in results[mode])
+        print(f"{mode:<8} {med(mode, 'ready'):>8.2f} {med(mode, 'fast'):>13.2f} {total_first:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
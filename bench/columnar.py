@@ -0,0 +1,162 @@
+# bench/columnar.py
+"""
+Postgres vs the columnar (Parquet + DuckDB) analytics path.
+
+1. Sync: a full export into --columnar-dir, then an incremental one after
+   --late-reopens closed reports created before the lookback window are
+   reopened (status_update, report.current_status and the assignment
+   flipped in one transaction, as a department taking a ticket back
+   would); both endpoints must then agree with Postgres.
+2. Endpoints: /analytics/hotspots and /analytics/resolution-times with
+   source=postgres and source=columnar, in process (TestClient, response
+   cache off), JSON.
+3. Ad-hoc group-bys with no rollup behind them, as raw SQL on each engine:
+     area_severity_month : reports per area x severity x month (both tiers)
+     dept_status         : status changes per department x status, via each
+                           report's assignments
+
+Medians of --repeat runs after one warm-up run. Run it after
+`bench.datagen --reports 10000000` for the 10M-report comparison.
+
+    python -m bench.columnar --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, text
+
+AD_HOC = {
+    "area_severity_month": (
+        """
+        SELECT area_id, severity_id, date_trunc('month', created_at) AS month, count(*)
+        FROM (SELECT area_id, severity_id, created_at FROM report
+              UNION ALL SELECT area_id, severity_id, created_at FROM report_archive) r
+        GROUP BY 1, 2, 3
+        """,
+        """
+        SELECT area_id, severity_id, date_trunc('month', created_at) AS month, count(*)
+        FROM {report}
+        GROUP BY 1, 2, 3
+        """,
+        ("report",),
+    ),
+    "dept_status": (
+        """
+        SELECT a.dept_id, s.status, count(*)
+        FROM (SELECT report_id, dept_id FROM assignment
+              UNION ALL SELECT report_id, dept_id FROM assignment_archive) a
+        JOIN (SELECT report_id, status FROM status_update
+              UNION ALL SELECT report_id, status FROM status_update_archive) s
+          ON s.report_id = a.report_id
+        GROUP BY 1, 2
+        """,
+        """
+        SELECT a.dept_id, s.status, count(*)
+        FROM {assignment} a
+        JOIN {status_update} s ON s.report_id = a.report_id
+        GROUP BY 1, 2
+        """,
+        ("assignment", "status_update"),
+    ),
+}
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _reopen_late(conn, n: int, lookback_days: int) -> int:
+    """Reopen up to n closed reports whose month is before the incremental window."""
+    # datagen closes everything older than a few weeks, so the late change is a
+    # reopen: the report's last assignment goes active again, which drops it
+    # from /analytics/resolution-times
+    conn.execute(text("""
+        CREATE TEMP TABLE late ON COMMIT DROP AS
+        SELECT report_id, assignment_id FROM (
+            SELECT DISTINCT ON (r.report_id) r.report_id, a.assignment_id, r.created_at FROM report r
+            JOIN assignment a ON a.report_id = r.report_id AND NOT a.is_active AND a.accepted_at IS NOT NULL
+            WHERE r.current_status IN ('RESOLVED', 'CLOSED')
+              AND r.created_at < now() - make_interval(days => :days) - interval '31 days'
+            ORDER BY r.report_id, a.assigned_at DESC
+        ) t
+        ORDER BY created_at DESC     -- reopens are mostly of recently closed tickets
+        LIMIT :n
+    """), {"days": lookback_days, "n": n})
+    conn.execute(text("UPDATE assignment a SET is_active = true FROM late WHERE a.assignment_id = late.assignment_id"))
+    conn.execute(text("""
+        INSERT INTO status_update (report_id, status, changed_by, changed_at)
+        SELECT report_id, 'IN_PROGRESS', (SELECT min(user_id) FROM "user"), now() FROM late
+    """))
+    conn.execute(text("UPDATE report r SET current_status = 'IN_PROGRESS' FROM late WHERE r.report_id = late.report_id"))
+    return conn.execute(text("SELECT count(*) FROM late")).scalar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--columnar-dir", default="bench/results/columnar")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--late-reopens", type=int, default=1000, help="old closed reports to reopen between the syncs (changes the bench DB)")
+    args = parser.parse_args()
+
+    # settings are read at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["COLUMNAR_DIR"] = args.columnar_dir
+    os.environ["ANALYTICS_CACHE_SIZE"] = "0"
+    from fastapi.testclient import TestClient
+
+    from backend.core.config import settings
+    from backend.main import app
+    from backend.services import columnar_store
+
+    engine = create_engine(args.database_url, future=True)
+    with engine.connect() as conn:
+        reports = conn.execute(text("SELECT (SELECT count(*) FROM report) + (SELECT count(*) FROM report_archive)")).scalar()
+    print(f"{reports:,} reports (hot + archive)\n")
+
+    for label, full in (("full sync", True), ("incremental sync", False)):
+        if not full and args.late_reopens:
+            with engine.begin() as conn:
+                reopened = _reopen_late(conn, args.late_reopens, settings.columnar_lookback_days)
+            print(f"  reopened {reopened:,} closed reports created over {settings.columnar_lookback_days} days ago")
+        t0 = time.perf_counter()
+        summary = columnar_store.sync(engine, full=full)
+        rows = sum(info["rows"] for info in summary.values())
+        older = sum(info["older_months"] for info in summary.values())
+        print(f"{label:<17} {time.perf_counter() - t0:>7.1f} s  ({rows:,} rows exported"
+              + (f", {older} older month file(s) for status changes)" if older else ")"))
+
+    client = TestClient(app)
+    for path in ("/analytics/hotspots", "/analytics/resolution-times"):
+        pg = client.get(path, params={"source": "postgres"}).json()
+        duck = client.get(path, params={"source": "columnar"}).json()
+        print(f"{path:<30} columnar {'matches' if pg == duck else 'DIFFERS FROM'} postgres" + ("" if pg == duck or isinstance(pg, list) else f": {duck} vs {pg}"))
+    results: List[Dict] = []
+    for path in ("/analytics/hotspots", "/analytics/resolution-times"):
+        row = {"query": path}
+        for source in ("postgres", "columnar"):
+            row[source] = _median_ms(lambda: client.get(path, params={"source": source}).raise_for_status(), args.repeat)
+        results.append(row)
+
+    for name, (pg_sql, duck_sql, tables) in AD_HOC.items():
+        with engine.connect() as conn:
+            pg = _median_ms(lambda: conn.execute(text(pg_sql)).all(), args.repeat)
+        duck = _median_ms(lambda: columnar_store.fetch(duck_sql, tables), args.repeat)
+        results.append({"query": name, "postgres": pg, "columnar": duck})
+
+    print(f"\n{'query':<30} {'postgres ms':>12} {'columnar ms':>12} {'speedup':>8}")
+    for r in results:
+        print(f"{r['query']:<30} {r['postgres']:>12.1f} {r['columnar']:>12.1f} {r['postgres'] / r['columnar']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench/compare.py
+"""
+Compare two benchmark result files (e.g. from two commits).
+
+Rows are matched on (scale, scenario, concurrency). Prints throughput and
+p50/p99 deltas; with --fail-over N exits 1 if any p99 regressed by more
+than N percent, so it can gate CI.
+
+    python -m bench.compare bench/results/<before>.json bench/results/<after>.json --fail-over 20
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Optional, Tuple
+
+Key = Tuple[int, str, int]
+
+
+def _index(path: str) -> Tuple[Dict, Dict[Key, Dict]]:
+    with open(path) as fh:
+        doc = json.load(fh)
+    rows = {}
+    for run in doc.get("runs", []):
+        for res in run["results"]:
+            rows[(run["scale"], res["scenario"], res["concurrency"])] = res
+    return doc.get("meta", {}), rows
+
+
+def _pct(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def _fmt(p: Optional[float]) -> str:
+    return "     n/a" if p is None else f"{p:+7.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--fail-over", type=float, help="exit 1 if any p99 regresses by more than this percent")
+    args = parser.parse_args()
+
+    meta_a, a = _index(args.before)
+    meta_b, b = _index(args.after)
+    print(f"before: {meta_a.get('git_commit', '?')[:10]}  {meta_a.get('git_subject', '')}")
+    print(f"after:  {meta_b.get('git_commit', '?')[:10]}  {meta_b.get('git_subject', '')}")
+    print(f"{'scale':>10} {'scenario':<32}{'c':>4} {'rps':>9} {'p50':>9} {'p99':>9}")
+
+    regressions = []
+    for key in sorted(set(a) & set(b)):
+        ra, rb = a[key], b[key]
+        d_rps = _pct(ra["throughput_rps"], rb["throughput_rps"])
+        d_p50 = _pct(ra["p50_ms"], rb["p50_ms"])
+        d_p99 = _pct(ra["p99_ms"], rb["p99_ms"])
+        print(f"{key[0]:>10,} {key[1]:<32}{key[2]:>4} {_fmt(d_rps)} {_fmt(d_p50)} {_fmt(d_p99)}")
+        if args.fail_over is not None and d_p99 is not None and d_p99 > args.fail_over:
+            regressions.append((key, d_p99))
+
+    missing = sorted(set(a) ^ set(b))
+    if missing:
+        print(f"\n{len(missing)} row(s) present in only one file (skipped)")
+
+    if regressions:
+        print(f"\n{len(regressions)} p99 regression(s) over {args.fail_over}%:")
+        for key, d in regressions:
+            print(f"  {key[1]} c={key[2]} scale={key[0]:,}: {d:+.1f}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
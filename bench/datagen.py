@@ -0,0 +1,448 @@
+# bench/datagen.py
+"""
+Synthetic city-scale data for benchmarks.
+
+Generates N reports (10k .. 10M) with status histories, assignments, SLA
+clocks, work orders/parts and engagement rows (subscriptions, upvotes,
+comments) entirely server-side with generate_series, in batches.
+
+Every random choice is a hash of (report_id, salt) via hashint8extended, so
+the same --seed and --reports always produce the same rows, independent of
+batch size or PG version.
+
+    python -m bench.datagen --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench \\
+        --reports 1000000 --reset
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, make_url
+
+DB_DIR = Path(__file__).resolve().parent.parent / "db"
+
+# schema scripts applied (in order) by --reset; keep in step with db/Initialize.sql
+SCHEMA_SCRIPTS = [
+    "ProjectSchema.sql",
+    "Versioning.sql",
+    "Partitioning.sql",
+    "Archive.sql",
+    "Timeseries.sql",
+    "Feed.sql",
+    "Costs.sql",
+    "Indexes.sql",
+    "Jobs.sql",
+]
+
+N_AREAS = 60
+CATEGORIES = [
+    ("Pothole", "Street surface defect", 72),
+    ("Streetlight Out", "Non-functioning streetlight", 48),
+    ("Graffiti", "Vandalism on public property", 72),
+    ("Trash Overflow", "Public trash overflow or missed pickup", 24),
+    ("Water Leak", "Suspected potable/wastewater leak", 12),
+    ("Sidewalk Crack", "Trip hazard on sidewalk", 96),
+    ("Illegal Dumping", "Bulk items left on public property", 48),
+    ("Noise", "Noise complaint", 24),
+    ("Tree Damage", "Fallen or hazardous tree", 48),
+    ("Traffic Signal", "Signal malfunction", 8),
+    ("Abandoned Vehicle", "Vehicle left on street", 120),
+    ("Other", "Unmapped/Other", 72),
+]
+SEVERITIES = [("Low", 0.75), ("Normal", 1.00), ("High", 1.50), ("Critical", 2.00)]
+DEPARTMENTS = ["Operations", "Parks", "Streets", "Water", "Sanitation", "Traffic"]
+
+# lifecycle used for generated histories; stage k means path[0..k] happened
+PATH = ["SUBMITTED", "TRIAGED", "IN_PROGRESS", "RESOLVED", "CLOSED"]
+
+
+# session-local helpers; pg_temp keeps them out of the schema
+_HELPERS = """
+CREATE OR REPLACE FUNCTION pg_temp.rnd(id bigint, salt int) RETURNS float8
+  LANGUAGE sql IMMUTABLE AS
+$$ SELECT (hashint8extended(id, salt) & 2147483647)::float8 / 2147483647.0 $$;
+
+CREATE OR REPLACE FUNCTION pg_temp.stage(id bigint, created timestamptz) RETURNS int
+  LANGUAGE sql STABLE AS
+$$ SELECT least(4, floor(pg_temp.rnd(id, 1) * 5
+                         + least(1.0, extract(epoch FROM now() - created) / (30 * 86400.0)) * 3))::int $$;
+
+-- per-report pace p of 2..48h; step k lands in [k*p, k*p + 0.9p) so steps stay ordered
+CREATE OR REPLACE FUNCTION pg_temp.step_at(id bigint, created timestamptz, k int) RETURNS timestamptz
+  LANGUAGE sql STABLE AS
+$$ SELECT least(now(), created + make_interval(secs => 3600 * (2 + 46 * pg_temp.rnd(id, 10))
+                                                      * (k + CASE WHEN k = 0 THEN 0 ELSE 0.9 * pg_temp.rnd(id, 10 + k) END))) $$;
+"""
+
+
+def _seed_salt(seed: int, salt: int) -> int:
+    return seed * 1000 + salt
+
+
+def apply_schema(engine: Engine) -> None:
+    """Drop everything in public and apply SCHEMA_SCRIPTS (no psql needed)."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP SCHEMA public CASCADE; CREATE SCHEMA public;")
+    for script in SCHEMA_SCRIPTS:
+        sql = (DB_DIR / script).read_text()
+        # psql meta-commands (\\set, \\connect) are not valid through the driver
+        sql = "\n".join(line for line in sql.splitlines() if not line.lstrip().startswith("\\"))
+        raw = engine.raw_connection()
+        try:
+            cur = raw.cursor()
+            cur.execute(sql)
+            raw.commit()
+        finally:
+            raw.close()
+
+
+def create_database(url: str) -> None:
+    """CREATE DATABASE for url's database if it does not exist."""
+    target = make_url(url)
+    admin = create_engine(target.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :n"), {"n": target.database}
+        ).scalar()
+        if not exists:
+            conn.exec_driver_sql(f'CREATE DATABASE "{target.database}"')
+    admin.dispose()
+
+
+def _dimensions(conn, n_users: int) -> dict:
+    conn.execute(
+        text("INSERT INTO department(name) SELECT unnest(CAST(:names AS text[])) ON CONFLICT (name) DO NOTHING"),
+        {"names": DEPARTMENTS}
+    )
+    for name, desc, sla in CATEGORIES:
+        conn.execute(
+            text(
+                "INSERT INTO category(name, description, default_sla_hours) VALUES (:n, :d, :s) "
+                "ON CONFLICT (name) DO NOTHING"
+            ),
+            {"n": name, "d": desc, "s": sla}
+        )
+    for label, weight in SEVERITIES:
+        conn.execute(
+            text(
+                "INSERT INTO severity(label, weight) SELECT :l, :w "
+                "WHERE NOT EXISTS (SELECT 1 FROM severity WHERE label = :l)"
+            ),
+            {"l": label, "w": weight}
+        )
+    conn.execute(
+        text(
+            """
+            INSERT INTO service_area(name, geojson, dept_id)
+            SELECT 'Bench Area ' || g,
+                   '{"type":"Polygon","coordinates":[]}'::jsonb,
+                   d.dept_ids[1 + (g % array_length(d.dept_ids, 1))]
+            FROM generate_series(1, :n) g,
+                 (SELECT array_agg(dept_id ORDER BY dept_id) AS dept_ids FROM department) d
+            ON CONFLICT (name) DO NOTHING
+            """
+        ),
+        {"n": N_AREAS}
+    )
+    # first 5% are staff, the rest residents
+    conn.execute(
+        text(
+            """
+            INSERT INTO "user"(name, email, password_hash, role)
+            SELECT 'Bench User ' || g, 'bench.user.' || g || '@example.com', 'x',
+                   CASE WHEN g <= greatest(5, :n / 20) THEN 'STAFF' ELSE 'RESIDENT' END::user_role
+            FROM generate_series(1, :n) g
+            ON CONFLICT (email) DO NOTHING
+            """
+        ),
+        {"n": n_users}
+    )
+
+    row = conn.execute(
+        text(
+            """
+            SELECT
+              (SELECT array_agg(area_id ORDER BY area_id) FROM service_area)              AS areas,
+              (SELECT array_agg(category_id ORDER BY category_id) FROM category)          AS categories,
+              (SELECT array_agg(severity_id ORDER BY severity_id) FROM severity)          AS severities,
+              (SELECT array_agg(user_id ORDER BY user_id) FROM "user" WHERE role = 'STAFF')    AS staff,
+              (SELECT array_agg(user_id ORDER BY user_id) FROM "user" WHERE role = 'RESIDENT') AS residents
+            """
+        )
+    ).mappings().one()
+    return dict(row)
+
+
+def _insert_batch(conn, lo: int, hi: int, dims: dict, days: int, seed: int, noisy_fraction: float) -> None:
+    s = lambda salt: _seed_salt(seed, salt)  # noqa: E731
+    params = {"lo": lo, "hi": hi, "days": days, **dims}
+
+    # reports: skewed area/category choice (rnd^2) so hotspots exist
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO report (report_id, title, description, latitude, longitude, address,
+                                created_at, created_by, category_id, severity_id, area_id, current_status)
+            OVERRIDING SYSTEM VALUE
+            SELECT g,
+                   'Bench report #' || g,
+                   'Synthetic report generated for benchmarks.',
+                   round((33.30 + 0.25 * pg_temp.rnd(g, {s(2)}))::numeric, 6),
+                   round((-112.05 + 0.25 * pg_temp.rnd(g, {s(3)}))::numeric, 6),
+                   (1 + floor(pg_temp.rnd(g, {s(4)}) * 9999))::int || ' Bench St',
+                   c.created_at,
+                   (CAST(:residents AS bigint[]))[1 + floor(pg_temp.rnd(g, {s(5)}) * array_length(CAST(:residents AS bigint[]), 1))::int],
+                   (CAST(:categories AS bigint[]))[1 + floor(pg_temp.rnd(g, {s(6)}) ^ 2 * array_length(CAST(:categories AS bigint[]), 1))::int],
+                   (CAST(:severities AS bigint[]))[1 + floor(pg_temp.rnd(g, {s(7)}) * array_length(CAST(:severities AS bigint[]), 1))::int],
+                   (CAST(:areas AS bigint[]))[1 + floor(pg_temp.rnd(g, {s(8)}) ^ 2 * array_length(CAST(:areas AS bigint[]), 1))::int],
+                   (CAST(:path AS text[]))[1 + pg_temp.stage(g, c.created_at)]::report_status
+            FROM generate_series(CAST(:lo AS bigint), CAST(:hi AS bigint)) g
+            CROSS JOIN LATERAL (
+              SELECT now() - make_interval(secs => :days * 86400 * pg_temp.rnd(g, {s(9)})) AS created_at
+            ) c
+            """
+        ),
+        {**params, "path": PATH}
+    )
+
+    # status history: one row per reached stage
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO status_update (report_id, status, note, changed_by, changed_at)
+            SELECT r.report_id,
+                   (CAST(:path AS text[]))[k + 1]::report_status,
+                   CASE WHEN k = 0 THEN 'Report submitted' ELSE 'Bench transition' END,
+                   CASE WHEN k = 0 THEN r.created_by
+                        ELSE (CAST(:staff AS bigint[]))[1 + floor(pg_temp.rnd(r.report_id, {s(20)} + k) * array_length(CAST(:staff AS bigint[]), 1))::int]
+                   END,
+                   pg_temp.step_at(r.report_id, r.created_at, k)
+            FROM report r
+            CROSS JOIN LATERAL generate_series(0, pg_temp.stage(r.report_id, r.created_at)) k
+            WHERE r.report_id BETWEEN :lo AND :hi
+            """
+        ),
+        {**params, "path": PATH}
+    )
+
+    # noisy tickets: a small fraction flap IN_PROGRESS <-> ON_HOLD 50..1500 times
+    if noisy_fraction > 0:
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO status_update (report_id, status, note, changed_by, changed_at)
+                SELECT r.report_id,
+                       CASE WHEN k % 2 = 0 THEN 'ON_HOLD' ELSE 'IN_PROGRESS' END::report_status,
+                       'Bench flap ' || k,
+                       (CAST(:staff AS bigint[]))[1],
+                       r.created_at + (now() - r.created_at) * (k::float8 / (n + 1))
+                FROM report r
+                CROSS JOIN LATERAL (SELECT 50 + floor(pg_temp.rnd(r.report_id, {s(31)}) * 1450)::int AS n) c
+                CROSS JOIN LATERAL generate_series(1, c.n) k
+                WHERE r.report_id BETWEEN :lo AND :hi
+                  AND pg_temp.rnd(r.report_id, {s(30)}) < :noisy
+                """
+            ),
+            {**params, "noisy": noisy_fraction}
+        )
+
+    # assignments: triaged and beyond; inactive once resolved
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO assignment (report_id, dept_id, assignee_user_id, assigned_at, accepted_at, is_active)
+            SELECT r.report_id, sa.dept_id,
+                   (CAST(:staff AS bigint[]))[1 + floor(pg_temp.rnd(r.report_id, {s(40)}) * array_length(CAST(:staff AS bigint[]), 1))::int],
+                   pg_temp.step_at(r.report_id, r.created_at, 1),
+                   pg_temp.step_at(r.report_id, r.created_at, 1) + interval '30 minutes',
+                   pg_temp.stage(r.report_id, r.created_at) < 3
+            FROM report r
+            JOIN service_area sa ON sa.area_id = r.area_id
+            WHERE r.report_id BETWEEN :lo AND :hi
+              AND pg_temp.stage(r.report_id, r.created_at) >= 1
+            """
+        ),
+        params
+    )
+
+    # SLA clocks: due = created + category SLA * severity weight
+    conn.execute(
+        text(
+            """
+            INSERT INTO sla_clock (report_id, target_due_at, breached, breached_at)
+            SELECT r.report_id, d.due,
+                   d.done_at > d.due,
+                   CASE WHEN d.done_at > d.due THEN d.due END
+            FROM report r
+            JOIN category c ON c.category_id = r.category_id
+            JOIN severity s ON s.severity_id = r.severity_id
+            CROSS JOIN LATERAL (
+              SELECT r.created_at + make_interval(secs => c.default_sla_hours * 3600 / s.weight) AS due,
+                     CASE WHEN pg_temp.stage(r.report_id, r.created_at) >= 3
+                          THEN pg_temp.step_at(r.report_id, r.created_at, 3)
+                          ELSE now() END AS done_at
+            ) d
+            WHERE r.report_id BETWEEN :lo AND :hi
+            """
+        ),
+        params
+    )
+
+    # work orders for ~40% of reports that reached IN_PROGRESS, 1-4 parts each
+    params["wo_floor"] = conn.execute(text("SELECT coalesce(max(wo_id), 0) FROM work_order")).scalar()
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO work_order (report_id, dept_id, opened_at, closed_at, cost_estimate, cost_actual)
+            SELECT r.report_id, sa.dept_id,
+                   pg_temp.step_at(r.report_id, r.created_at, 2),
+                   CASE WHEN pg_temp.stage(r.report_id, r.created_at) >= 3
+                        THEN pg_temp.step_at(r.report_id, r.created_at, 3) END,
+                   round((100 + 4900 * pg_temp.rnd(r.report_id, {s(50)}))::numeric, 2),
+                   CASE WHEN pg_temp.stage(r.report_id, r.created_at) >= 3
+                        THEN round(((100 + 4900 * pg_temp.rnd(r.report_id, {s(50)})) * (0.7 + 0.7 * pg_temp.rnd(r.report_id, {s(51)})))::numeric, 2)
+                   END
+            FROM report r
+            JOIN service_area sa ON sa.area_id = r.area_id
+            WHERE r.report_id BETWEEN :lo AND :hi
+              AND pg_temp.stage(r.report_id, r.created_at) >= 2
+              AND pg_temp.rnd(r.report_id, {s(52)}) < 0.4
+            """
+        ),
+        params
+    )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO work_part (wo_id, sku, description, qty, unit_cost)
+            SELECT wo.wo_id, 'SKU-' || (1 + floor(pg_temp.rnd(wo.wo_id, {s(60)} + k) * 500))::int,
+                   'Bench part', 1 + floor(pg_temp.rnd(wo.wo_id, {s(61)} + k) * 10)::int,
+                   round((5 + 495 * pg_temp.rnd(wo.wo_id, {s(62)} + k))::numeric, 2)
+            FROM work_order wo
+            CROSS JOIN LATERAL generate_series(1, 1 + floor(pg_temp.rnd(wo.wo_id, {s(63)}) * 4)::int) k
+            WHERE wo.wo_id > :wo_floor
+            """
+        ),
+        params
+    )
+
+    # engagement: 0-3 subscribers, 0-5 upvotes, 0-2 comments per report
+    for table, salt, max_n in (("subscription", 70, 3), ("upvote", 80, 5)):
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {table} (report_id, user_id, created_at)
+                SELECT r.report_id,
+                       (CAST(:residents AS bigint[]))[1 + floor(pg_temp.rnd(r.report_id, {s(salt)} + k) * array_length(CAST(:residents AS bigint[]), 1))::int],
+                       least(now(), r.created_at + make_interval(secs => 86400 * pg_temp.rnd(r.report_id, {s(salt + 9)} + k)))
+                FROM report r
+                CROSS JOIN LATERAL generate_series(1, floor(pg_temp.rnd(r.report_id, {s(salt + 8)}) * ({max_n} + 1))::int) k
+                WHERE r.report_id BETWEEN :lo AND :hi
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            params
+        )
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO comment (report_id, user_id, body, created_at)
+            SELECT r.report_id,
+                   (CAST(:residents AS bigint[]))[1 + floor(pg_temp.rnd(r.report_id, {s(90)} + k) * array_length(CAST(:residents AS bigint[]), 1))::int],
+                   'Bench comment ' || k,
+                   least(now(), r.created_at + make_interval(secs => 172800 * pg_temp.rnd(r.report_id, {s(91)} + k)))
+            FROM report r
+            CROSS JOIN LATERAL generate_series(1, floor(pg_temp.rnd(r.report_id, {s(92)}) * 3)::int) k
+            WHERE r.report_id BETWEEN :lo AND :hi
+            """
+        ),
+        params
+    )
+
+
+def generate(
+    engine: Engine,
+    reports: int,
+    days: int = 365,
+    seed: int = 412,
+    batch_size: int = 250_000,
+    noisy_fraction: float = 0.001,
+    verbose: bool = True
+) -> dict:
+    """Append `reports` synthetic reports (plus child rows) and ANALYZE. Returns a summary."""
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(_HELPERS)
+        dims = _dimensions(conn, n_users=max(200, reports // 20))
+        start = conn.execute(text("SELECT coalesce(max(report_id), 0) + 1 FROM report")).scalar()
+
+    end = start + reports - 1
+    lo = start
+    while lo <= end:
+        hi = min(end, lo + batch_size - 1)
+        tb = time.perf_counter()
+        with engine.begin() as conn:
+            conn.exec_driver_sql(_HELPERS)
+            _insert_batch(conn, lo, hi, dims, days=days, seed=seed, noisy_fraction=noisy_fraction)
+        if verbose:
+            print(f"  reports {lo:,}..{hi:,} in {time.perf_counter() - tb:.1f}s", flush=True)
+        lo = hi + 1
+
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT setval(pg_get_serial_sequence('report', 'report_id'), (SELECT max(report_id) FROM report))")
+        )
+    _after_load(engine)
+
+    with engine.connect() as conn:
+        counts = {
+            t: conn.execute(text(f'SELECT count(*) FROM "{t}"')).scalar()
+            for t in ("report", "status_update", "assignment", "sla_clock", "work_order",
+                      "work_part", "subscription", "upvote", "comment", "user")
+        }
+    counts["seconds"] = round(time.perf_counter() - t0, 1)
+    return counts
+
+
+def _after_load(engine: Engine) -> None:
+    """Move generated history out of the default partition, fan out feeds, then refresh planner stats."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("SELECT maintain_status_update_partitions()")
+        # history is generated before the subscriptions, so the feed triggers saw nobody
+        conn.exec_driver_sql("SELECT rebuild_user_feeds()")
+        conn.exec_driver_sql("ANALYZE")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--reports", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365, help="spread created_at over this many days")
+    parser.add_argument("--seed", type=int, default=412)
+    parser.add_argument("--batch-size", type=int, default=250_000)
+    parser.add_argument("--noisy-fraction", type=float, default=0.001, help="share of reports with 50-1500 status flaps")
+    parser.add_argument("--reset", action="store_true", help="create the DB if needed, drop all objects and re-apply the schema first")
+    args = parser.parse_args()
+
+    if args.reset:
+        create_database(args.database_url)
+    engine = create_engine(args.database_url, future=True)
+    if args.reset:
+        apply_schema(engine)
+
+    summary = generate(
+        engine,
+        reports=args.reports,
+        days=args.days,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        noisy_fraction=args.noisy_fraction
+    )
+    for key, value in summary.items():
+        print(f"{key:>14}: {value:,}" if isinstance(value, int) else f"{key:>14}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# bench/feed.py
+"""
+Activity feed reads and fan-out writes.
+
+Reads, for the --users users whose subscribed reports have the longest
+histories (datagen's noisy tickets):
+
+  naive    : subscription x (status_update UNION ALL comment), newest 50 --
+             what a feed query costs without timelines
+  page sql : feed_service.page_query for the first page (same row count)
+  page     : feed_service.get_user_feed end to end (ORM + Pydantic + JSON),
+             first page and --depth pages in
+
+Writes (--hot-subscribers > 0): subscribes that many users to one open
+report (over feed_fanout_limit(), so its events are merged on read), then
+times single status_update inserts on it and on an ordinary subscribed
+report, and a feed page for one of the hot report's subscribers.
+
+The write phase adds rows (subscriptions, status changes) to the benchmark
+database; regenerate it with bench.datagen --reset afterwards if that
+matters.
+
+    python -m bench.feed --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from backend.services import feed_service
+
+_NAIVE = text(
+    """
+    SELECT e.*
+    FROM subscription s
+    JOIN LATERAL (
+        SELECT su.report_id, 'status' AS kind, su.status_id AS source_id, su.changed_at AS occurred_at
+        FROM status_update su WHERE su.report_id = s.report_id
+        UNION ALL
+        SELECT c.report_id, 'comment', c.comment_id, c.created_at
+        FROM comment c WHERE c.report_id = s.report_id
+    ) e ON TRUE
+    WHERE s.user_id = :uid
+    ORDER BY e.occurred_at DESC
+    LIMIT :limit
+    """
+)
+
+
+def _timed(engine, fn: Callable[[Session], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        with Session(engine) as db:
+            t0 = time.perf_counter()
+            fn(db)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _cursor_at(engine, user_id: int, depth: int, page_size: int) -> str | None:
+    cursor = None
+    with Session(engine) as db:
+        for _ in range(depth):
+            page = feed_service.get_user_feed(db, user_id, cursor, page_size)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+    return cursor
+
+
+def _reads(engine, args) -> None:
+    with engine.connect() as conn:
+        users = conn.execute(
+            text(
+                """
+                SELECT s.user_id, sum(h.n)::bigint
+                FROM subscription s
+                JOIN (SELECT report_id, count(*) AS n FROM status_update GROUP BY report_id) h
+                  ON h.report_id = s.report_id
+                GROUP BY s.user_id ORDER BY 2 DESC LIMIT :n
+                """
+            ),
+            {"n": args.users}
+        ).all()
+
+    rows: List[Dict] = []
+    print(f"{'user':>8} {'history':>8} | {'naive ms':>9} {'sql ms':>9} | {'page1 ms':>9} {'deep ms':>9}")
+    for user_id, history in users:
+        naive = _timed(
+            engine,
+            lambda db: db.execute(_NAIVE, {"uid": user_id, "limit": args.page_size}).all(),
+            args.repeat
+        )
+        sql = _timed(
+            engine,
+            lambda db: db.execute(feed_service.page_query(user_id, None, args.page_size)).all(),
+            args.repeat
+        )
+        first = _timed(
+            engine,
+            lambda db: feed_service.get_user_feed(db, user_id, None, args.page_size).model_dump_json(),
+            args.repeat
+        )
+        cursor = _cursor_at(engine, user_id, args.depth, args.page_size)
+        deep = _timed(
+            engine,
+            lambda db: feed_service.get_user_feed(db, user_id, cursor, args.page_size).model_dump_json(),
+            args.repeat
+        )
+        rows.append({"naive": naive, "sql": sql, "first": first, "deep": deep})
+        print(f"{user_id:>8} {history:>8} | {naive:>9.2f} {sql:>9.2f} | {first:>9.2f} {deep:>9.2f}")
+
+    med = lambda key: statistics.median(r[key] for r in rows)
+    print(
+        f"\nmedian over {len(rows)} users: naive {med('naive'):.2f} ms vs feed sql {med('sql'):.2f} ms; "
+        f"feed page {med('first'):.2f} ms (first) / {med('deep'):.2f} ms ({args.depth} pages in)"
+    )
+
+
+def _status_insert(engine, report_id: int, repeat: int) -> float:
+    samples = []
+    for i in range(repeat):
+        with engine.begin() as conn:
+            t0 = time.perf_counter()
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO status_update (report_id, status, note, changed_by)
+                    VALUES (:rid, CAST(:st AS report_status), 'bench.feed', 1)
+                    """
+                ),
+                {"rid": report_id, "st": "ON_HOLD" if i % 2 else "IN_PROGRESS"}
+            )
+            samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _writes(engine, args) -> None:
+    with engine.begin() as conn:
+        limit = conn.execute(text("SELECT feed_fanout_limit()")).scalar()
+        hot, normal = conn.execute(
+            text(
+                """
+                SELECT r.report_id FROM report r
+                WHERE r.current_status IN ('IN_PROGRESS', 'ON_HOLD')
+                  AND EXISTS (SELECT 1 FROM subscription s WHERE s.report_id = r.report_id)
+                ORDER BY r.report_id LIMIT 2
+                """
+            )
+        ).scalars().all()
+        conn.execute(
+            text(
+                """
+                INSERT INTO subscription (report_id, user_id)
+                SELECT :rid, user_id FROM "user" ORDER BY user_id LIMIT :n
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {"rid": hot, "n": args.hot_subscribers}
+        )
+        subscribers = conn.execute(
+            text("SELECT count(*) FROM subscription WHERE report_id = :rid"), {"rid": hot}
+        ).scalar()
+        normal_subs = conn.execute(
+            text("SELECT count(*) FROM subscription WHERE report_id = :rid"), {"rid": normal}
+        ).scalar()
+        reader = conn.execute(
+            text("SELECT min(user_id) FROM subscription WHERE report_id = :rid"), {"rid": hot}
+        ).scalar()
+
+    normal_ms = _status_insert(engine, normal, args.repeat)
+    hot_ms = _status_insert(engine, hot, args.repeat)
+    page_ms = _timed(
+        engine,
+        lambda db: feed_service.get_user_feed(db, reader, None, args.page_size).model_dump_json(),
+        args.repeat
+    )
+    mode = "merged on read" if subscribers >= limit else "fanned out on write"
+    print(
+        f"\nstatus change on report {normal} ({normal_subs} subscribers): {normal_ms:.2f} ms\n"
+        f"status change on report {hot} ({subscribers} subscribers, {mode}): {hot_ms:.2f} ms\n"
+        f"feed page for subscriber {reader}: {page_ms:.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--users", type=int, default=10, help="how many users (longest subscribed histories first) to time")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=20, help="pages to follow for the deep-page timing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--hot-subscribers", type=int, default=0, help="also time writes on a report with this many subscribers")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    _reads(engine, args)
+    if args.hot_subscribers:
+        _writes(engine, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# bench/history.py
+"""
+Report detail and history paging on reports with long status histories.
+
+Picks reports with at least --min-updates status_update rows from the
+benchmark database (bench.datagen's noisy tickets flap 50..1500 times) and
+times, per report:
+
+  full     : the pre-pagination detail path -- joinedload every status
+             update, sort in Python, validate each into StatusUpdateOut
+  capped   : report_service.get_report_detail (most recent
+             REPORT_HISTORY_EMBED_LIMIT entries, ordered in SQL)
+  page     : one /history page of --page-size entries, first page and the
+             deepest page (reached by following cursors)
+
+Service functions are called in-process against --database-url, so the
+numbers are DB + ORM + Pydantic + JSON encode, without HTTP.
+
+    python -m bench.history --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench
+"""
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, joinedload
+
+from backend.db.models import Report, StatusUpdate
+from backend.schemas import reports as schemas
+from backend.services import report_service
+
+
+def _full_detail(db: Session, report_id: int) -> bytes:
+    """The detail path before history was capped, kept here for comparison."""
+    report = db.execute(
+        select(Report)
+        .where(Report.report_id == report_id)
+        .options(
+            joinedload(Report.service_area),
+            joinedload(Report.category),
+            joinedload(Report.severity),
+            joinedload(Report.status_updates)
+        )
+    ).unique().scalars().one()
+    history = sorted(report.status_updates, key=lambda s: s.changed_at)
+    detail = schemas.ReportDetail(
+        report_id=report.report_id,
+        title=report.title,
+        description=report.description,
+        latitude=float(report.latitude) if report.latitude is not None else None,
+        longitude=float(report.longitude) if report.longitude is not None else None,
+        address=report.address,
+        current_status=report.current_status,
+        created_at=report.created_at,
+        service_area=schemas.ServiceAreaOut.model_validate(report.service_area),
+        category=schemas.CategoryOut.model_validate(report.category),
+        severity=schemas.SeverityOut.model_validate(report.severity),
+        status_history=[schemas.StatusUpdateOut.model_validate(su) for su in history]
+    )
+    return detail.model_dump_json().encode("utf-8")
+
+
+def _capped_detail(db: Session, report_id: int) -> bytes:
+    return report_service.get_report_detail(db, report_id).model_dump_json().encode("utf-8")
+
+
+def _timed(engine, fn: Callable[[Session], bytes], repeat: int) -> Dict:
+    samples, size = [], 0
+    for _ in range(repeat):
+        # fresh session each time so the identity map does not help
+        with Session(engine) as db:
+            t0 = time.perf_counter()
+            size = len(fn(db))
+            samples.append((time.perf_counter() - t0) * 1000)
+    return {"ms": statistics.median(samples), "bytes": size}
+
+
+def _deepest_cursor(engine, report_id: int, page_size: int) -> str | None:
+    cursor, last = None, None
+    with Session(engine) as db:
+        while True:
+            page = report_service.get_report_history(db, report_id, cursor, page_size)
+            if not page.next_cursor:
+                return last
+            last, cursor = cursor, page.next_cursor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--min-updates", type=int, default=1000)
+    parser.add_argument("--reports", type=int, default=10, help="how many long-history reports to time")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, future=True)
+    with engine.connect() as conn:
+        targets = conn.execute(
+            select(StatusUpdate.report_id, func.count().label("n"))
+            .join(Report, Report.report_id == StatusUpdate.report_id)
+            .group_by(StatusUpdate.report_id)
+            .having(func.count() >= args.min_updates)
+            .order_by(func.count().desc())
+            .limit(args.reports)
+        ).all()
+    if not targets:
+        raise SystemExit(
+            f"no hot reports with >= {args.min_updates} status updates; "
+            "generate some with python -m bench.datagen --noisy-fraction 0.002"
+        )
+
+    rows: List[Dict] = []
+    print(f"{'report':>8} {'updates':>8} | {'full ms':>8} {'full KB':>8} | {'capped ms':>9} {'capped KB':>9} | {'page1 ms':>8} {'deep ms':>8}")
+    for report_id, n in targets:
+        full = _timed(engine, lambda db: _full_detail(db, report_id), args.repeat)
+        capped = _timed(engine, lambda db: _capped_detail(db, report_id), args.repeat)
+        first = _timed(
+            engine,
+            lambda db: report_service.get_report_history(db, report_id, None, args.page_size).model_dump_json().encode(),
+            args.repeat
+        )
+        deep_cursor = _deepest_cursor(engine, report_id, args.page_size)
+        deep = _timed(
+            engine,
+            lambda db: report_service.get_report_history(db, report_id, deep_cursor, args.page_size).model_dump_json().encode(),
+            args.repeat
+        )
+        rows.append({"full": full, "capped": capped, "first": first, "deep": deep})
+        print(
+            f"{report_id:>8} {n:>8} | {full['ms']:>8.1f} {full['bytes'] / 1024:>8.1f} | "
+            f"{capped['ms']:>9.1f} {capped['bytes'] / 1024:>9.1f} | {first['ms']:>8.1f} {deep['ms']:>8.1f}"
+        )
+
+    med = lambda key, field: statistics.median(r[key][field] for r in rows)
+    print(
+        f"\nmedian over {len(rows)} reports: full {med('full', 'ms'):.1f} ms / {med('full', 'bytes') / 1024:.0f} KB, "
+        f"capped {med('capped', 'ms'):.1f} ms / {med('capped', 'bytes') / 1024:.1f} KB, "
+        f"history page {med('first', 'ms'):.1f} ms (first) / {med('deep', 'ms'):.1f} ms (deepest)"
+    )
+
+
+if __name__ == "__main__":
+    main()
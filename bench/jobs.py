@@ -0,0 +1,202 @@
+# bench/jobs.py
+"""
+Throughput and guarantees of the background job queue
+(backend/services/job_service.py, job_worker.py).
+
+Registers two job types inside the spawned worker processes only:
+bench-noop (records its own run and returns) and bench-sleep (pg_sleep
+in the job's connection, limit 2).
+
+1. Claim throughput: --jobs no-op jobs drained by 1, 2 and 4 worker
+   processes; every job must have run exactly once.
+2. Per-type limit: 8 bench-sleep jobs on 4 processes; the most that ran at
+   once (from started_at / finished_at) must not exceed the limit.
+3. Cancel: time from POST .../cancel (job_service.cancel_job) to CANCELLED
+   for a running 60 s bench-sleep job.
+4. Request path: submit_job latency vs running the same maintenance inline.
+
+    python -m bench.jobs --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench --jobs 2000
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+
+BENCH_TYPES = ("bench-noop", "bench-sleep")
+
+
+def _ms(t0: float) -> float:
+    return (time.perf_counter() - t0) * 1000
+
+
+def _register(job_service) -> None:
+    from pydantic import BaseModel
+    from sqlalchemy import text
+
+    from backend.schemas.jobs import NoParams
+
+    class SleepParams(BaseModel):
+        seconds: float
+
+    def noop(ctx, params):
+        ctx.db.execute(text("INSERT INTO bench_job_run (job_id) VALUES (:id)"), {"id": ctx.job_id})
+        ctx.db.commit()
+        return {}
+
+    def sleep(ctx, params):
+        ctx.db.execute(text("SELECT pg_sleep(:s)"), {"s": params.seconds})
+        return {}
+
+    job_service.JOB_TYPES["bench-noop"] = job_service.JobType(noop, NoParams, 1000, "bench")
+    job_service.JOB_TYPES["bench-sleep"] = job_service.JobType(sleep, SleepParams, 2, "bench")
+
+
+def _drain(database_url: str, stop) -> None:
+    """Worker process: run jobs until `stop` is set."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JOB_HEARTBEAT_SECONDS", "0.2")
+    from backend.db.session import engine
+    from backend.services import job_service
+    from backend.services.job_worker import Worker
+
+    _register(job_service)
+    worker = Worker(engine)
+    try:
+        while not stop.is_set():
+            if not worker.run_once():
+                stop.wait(0.05)
+    finally:
+        worker.close()
+
+
+class Pool:
+    def __init__(self, database_url: str, processes: int):
+        ctx = multiprocessing.get_context("spawn")
+        self.stop = ctx.Event()
+        self.procs = [ctx.Process(target=_drain, args=(database_url, self.stop)) for _ in range(processes)]
+        for proc in self.procs:
+            proc.start()
+
+    def close(self) -> None:
+        self.stop.set()
+        for proc in self.procs:
+            proc.join()
+
+
+def _wait(db, text, job_type: str, timeout: float = 600) -> None:
+    deadline = time.monotonic() + timeout
+    while db.execute(text("SELECT count(*) FROM job WHERE job_type = :t AND status IN ('QUEUED', 'RUNNING')"), {"t": job_type}).scalar():
+        if time.monotonic() > deadline:
+            raise SystemExit(f"{job_type} jobs still pending after {timeout:.0f} s")
+        db.commit()
+        time.sleep(0.05)
+    db.commit()
+
+
+def _enqueue(db, text, job_type: str, n: int, params: str = "{}") -> None:
+    db.execute(
+        text("INSERT INTO job (job_type, params) SELECT :t, CAST(:p AS jsonb) FROM generate_series(1, :n)"),
+        {"t": job_type, "p": params, "n": n}
+    )
+    db.commit()
+
+
+def _max_overlap(intervals) -> int:
+    events = sorted([(s, 1) for s, _ in intervals] + [(f, -1) for _, f in intervals])
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--jobs", type=int, default=2000, help="no-op jobs per throughput run")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    # settings are read at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import text
+
+    from backend.db.session import SessionLocal
+    from backend.schemas.jobs import JobCreate
+    from backend.services import analytics_service, feed_service, job_service
+
+    _register(job_service)
+    with SessionLocal() as db:
+        db.execute(text("CREATE TABLE IF NOT EXISTS bench_job_run (job_id BIGINT NOT NULL)"))
+        db.execute(text("DELETE FROM job WHERE job_type = ANY(:types)"), {"types": list(BENCH_TYPES)})
+        db.commit()
+
+        print(f"claim throughput ({args.jobs} no-op jobs)")
+        print(f"{'processes':>9} {'jobs/s':>9} {'ran once':>9}")
+        for processes in args.processes:
+            db.execute(text("TRUNCATE bench_job_run"))
+            _enqueue(db, text, "bench-noop", args.jobs)
+            t0 = time.perf_counter()
+            pool = Pool(args.database_url, processes)
+            _wait(db, text, "bench-noop")
+            elapsed = time.perf_counter() - t0
+            pool.close()
+            runs, distinct, succeeded = db.execute(text("""
+                SELECT (SELECT count(*) FROM bench_job_run), (SELECT count(DISTINCT job_id) FROM bench_job_run),
+                       (SELECT count(*) FROM job WHERE job_type = 'bench-noop' AND status = 'SUCCEEDED' AND attempts = 1)
+            """)).one()
+            once = runs == distinct == succeeded == args.jobs
+            # elapsed includes process start-up (imports, first connection)
+            print(f"{processes:>9} {args.jobs / elapsed:>9.0f} {'yes' if once else f'NO ({runs} runs, {distinct} jobs)':>9}")
+            db.execute(text("DELETE FROM job WHERE job_type = 'bench-noop'"))
+            db.commit()
+
+        _enqueue(db, text, "bench-sleep", 8, '{"seconds": 0.5}')
+        pool = Pool(args.database_url, 4)
+        _wait(db, text, "bench-sleep")
+        pool.close()
+        intervals = db.execute(text("SELECT started_at, finished_at FROM job WHERE job_type = 'bench-sleep'")).all()
+        print(f"\nper-type limit: 8 x 0.5 s bench-sleep (limit {job_service.JOB_TYPES['bench-sleep'].limit}) on 4 processes: "
+              f"at most {_max_overlap(intervals)} ran at once")
+        db.execute(text("DELETE FROM job WHERE job_type = 'bench-sleep'"))
+        db.commit()
+
+        _enqueue(db, text, "bench-sleep", 1, '{"seconds": 60}')
+        job_id = db.execute(text("SELECT max(job_id) FROM job WHERE job_type = 'bench-sleep'")).scalar()
+        pool = Pool(args.database_url, 1)
+        while db.execute(text("SELECT status FROM job WHERE job_id = :id"), {"id": job_id}).scalar() != "RUNNING":
+            db.commit()
+            time.sleep(0.02)
+        time.sleep(0.5)
+        t0 = time.perf_counter()
+        job_service.cancel_job(db, job_id)
+        _wait(db, text, "bench-sleep")
+        cancel_ms = _ms(t0)
+        pool.close()
+        final = db.execute(text("SELECT status FROM job WHERE job_id = :id"), {"id": job_id}).scalar()
+        print(f"cancel of a running 60 s job: {final} after {cancel_ms:.0f} ms (heartbeat every 0.2 s)")
+        db.execute(text("DELETE FROM job WHERE job_type = 'bench-sleep'"))
+        db.execute(text("DROP TABLE bench_job_run"))
+        db.commit()
+
+        submit = []
+        for _ in range(50):
+            t0 = time.perf_counter()
+            job = job_service.submit_job(db, JobCreate(job_type="rebuild-timeseries"))
+            submit.append(_ms(t0))
+        db.execute(text("DELETE FROM job WHERE job_type = 'rebuild-timeseries' AND status = 'QUEUED' AND job_id > :id - 50"), {"id": job.job_id})
+        db.commit()
+        print(f"\nrequest path: submit_job p50 {statistics.median(submit):.1f} ms, max {max(submit):.1f} ms; inline instead:")
+        for label, run in (
+            ("rebuild-timeseries", lambda: analytics_service.rebuild_timeseries(db)),
+            ("rebuild-costs", lambda: analytics_service.rebuild_costs(db)),
+            ("rebuild-feeds", lambda: feed_service.rebuild_feeds(db, 90)),
+        ):
+            t0 = time.perf_counter()
+            run()
+            print(f"  {label:<20} {_ms(t0):>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
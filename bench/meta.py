@@ -0,0 +1,55 @@
+# bench/meta.py
+"""Run metadata (commit, host, server versions) and result-file helpers shared by bench scripts."""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, text
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "bench" / "results"
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", *args], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect(database_url: Optional[str] = None) -> Dict:
+    """Describe the code and environment a result was produced with."""
+    info = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_subject": _git("log", "-1", "--format=%s"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    if database_url:
+        engine = create_engine(database_url, future=True)
+        with engine.connect() as conn:
+            info["postgres"] = conn.execute(text("SHOW server_version")).scalar()
+        engine.dispose()
+    return info
+
+
+def default_path(tag: str = "") -> Path:
+    commit = (_git("rev-parse", "--short", "HEAD") or "nogit")
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return RESULTS_DIR / f"{stamp}-{commit}{('-' + tag) if tag else ''}.json"
+
+
+def write(doc: Dict, path: Optional[str] = None) -> Path:
+    out = Path(path) if path else default_path()
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2))
+    print(f"results written to {out}")
+    return out
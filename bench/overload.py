@@ -0,0 +1,184 @@
+# bench/overload.py
+"""
+Write latency under analytics overload, with admission control off vs on.
+
+Starts the API against the benchmark database once per mode (the analytics
+response cache is off in both, so every analytics call really queries):
+
+  off : ADMISSION_CONTROL=0 -- one shared threadpool and connection pool
+  on  : default admission lanes (backend/core/admission.py)
+
+In each mode, --writers threads create reports back to back (POST /reports/,
+as bench.runner's reports.create) for --duration seconds, first alone and
+then while --flood threads hammer /analytics/hotspots, /resolution-times and
+/costs plus the unfiltered GET /reports/ and the first ?facets=true page.
+Alongside the writers, --pagers threads page through the report list the
+way the Reports page does: ?facets=true&cursor= keyset pages, from cursors
+collected before the phases. Those are interactive requests and must not
+queue behind the flood. Reported: write p50 / p99 / max and errors, pager
+p50 / p99 and 503s, and how many analytics calls completed or were shed.
+
+Every write adds a report to the benchmark database.
+
+    python -m bench.overload --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench --flood 64
+"""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+from bench import runner
+from bench.suite import _start_server
+
+FLOOD_REQUESTS = [
+    ("/analytics/hotspots", {}),
+    ("/analytics/resolution-times", {}),
+    ("/analytics/costs", {"group_by": "category"}),
+    ("/reports/", {}),
+    ("/reports/", {"facets": "true"}),
+]
+
+PAGE_SIZE = 50
+
+
+def _pct(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _cursors(base_url: str, pages: int, timeout: float) -> List[str]:
+    """next_cursor of the first `pages` faceted list pages."""
+    cursors: List[str] = []
+    params = {"facets": "true", "limit": PAGE_SIZE}
+    with httpx.Client(base_url=base_url, timeout=timeout) as client:
+        while len(cursors) < pages:
+            cursor = client.get("/reports/", params=params).raise_for_status().json()["next_cursor"]
+            if cursor is None:
+                break
+            cursors.append(cursor)
+            params["cursor"] = cursor
+    return cursors
+
+
+def _phase(base_url: str, fx: runner.Fixtures, args, flood: int, cursors: List[str]) -> Dict:
+    stop = threading.Event()
+    write_ms: List[float] = []
+    write_status: Counter = Counter()
+    page_ms: List[float] = []
+    page_status: Counter = Counter()
+    flood_status: Counter = Counter()
+    lock = threading.Lock()
+
+    def writer(seed: int) -> None:
+        rnd = random.Random(seed)
+        with httpx.Client(base_url=base_url, timeout=args.timeout) as client:
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    code = runner._create(client, fx, rnd).status_code
+                except httpx.HTTPError:
+                    code = 0
+                elapsed = (time.perf_counter() - t0) * 1000
+                with lock:
+                    write_ms.append(elapsed)
+                    write_status[code] += 1
+
+    def pager(seed: int) -> None:
+        rnd = random.Random(seed)
+        with httpx.Client(base_url=base_url, timeout=args.timeout) as client:
+            while not stop.is_set():
+                params = {"facets": "true", "limit": PAGE_SIZE, "cursor": rnd.choice(cursors)}
+                t0 = time.perf_counter()
+                try:
+                    code = client.get("/reports/", params=params).status_code
+                except httpx.HTTPError:
+                    code = 0
+                elapsed = (time.perf_counter() - t0) * 1000
+                with lock:
+                    page_ms.append(elapsed)
+                    page_status[code] += 1
+
+    def flooder(seed: int) -> None:
+        rnd = random.Random(seed)
+        with httpx.Client(base_url=base_url, timeout=args.timeout) as client:
+            while not stop.is_set():
+                path, params = rnd.choice(FLOOD_REQUESTS)
+                try:
+                    code = client.get(path, params=params).status_code
+                except httpx.HTTPError:
+                    code = 0
+                with lock:
+                    flood_status[code] += 1
+                if code == 503:
+                    time.sleep(0.05)
+
+    threads = [threading.Thread(target=flooder, args=(1000 + i,)) for i in range(flood)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    threads += [threading.Thread(target=pager, args=(500 + i,)) for i in range(args.pagers if cursors else 0)]
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return {
+        "writes": len(write_ms),
+        "p50": statistics.median(write_ms) if write_ms else float("nan"),
+        "p99": _pct(write_ms, 0.99) if write_ms else float("nan"),
+        "max": max(write_ms) if write_ms else float("nan"),
+        "write_errors": sum(n for code, n in write_status.items() if code != 201),
+        "pages": len(page_ms),
+        "page_p50": statistics.median(page_ms) if page_ms else float("nan"),
+        "page_p99": _pct(page_ms, 0.99) if page_ms else float("nan"),
+        "page_shed": page_status[503],
+        "analytics_ok": flood_status[200],
+        "analytics_shed": flood_status[503],
+        "analytics_failed": sum(n for code, n in flood_status.items() if code not in (200, 503)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--flood", type=int, default=64, help="concurrent analytics clients")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent report creators")
+    parser.add_argument("--pagers", type=int, default=4, help="concurrent clients paging the report list by cursor")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per phase")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    fx = runner.load_fixtures(args.database_url)
+    rows = []
+    for mode, env in (("off", {"ADMISSION_CONTROL": "0"}), ("on", {})):
+        server = _start_server(args.database_url, args.port, args.workers, {"ANALYTICS_CACHE_SIZE": "0", **env})
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            cursors = _cursors(base_url, 20, args.timeout)
+            for flood in (0, args.flood):
+                print(f"== admission {mode}, {flood} analytics clients", flush=True)
+                rows.append((mode, flood, _phase(base_url, fx, args, flood, cursors)))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(f"\n{'admission':>9} {'flood':>5} | {'writes':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>6} | "
+          f"{'pages':>6} {'p50 ms':>8} {'p99 ms':>8} {'503':>5} | {'analytics ok':>12} {'shed 503':>8} {'failed':>6}")
+    for mode, flood, r in rows:
+        print(
+            f"{mode:>9} {flood:>5} | {r['writes']:>6} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f} {r['write_errors']:>6} | "
+            f"{r['pages']:>6} {r['page_p50']:>8.1f} {r['page_p99']:>8.1f} {r['page_shed']:>5} | "
+            f"{r['analytics_ok']:>12} {r['analytics_shed']:>8} {r['analytics_failed']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# bench/plans.py
+"""
+Query-plan regression suite: EXPLAIN (ANALYZE, BUFFERS) for every statement
+the API issues, with index-usage and buffer / row budgets.
+
+Drives each case below through the app in process (TestClient against
+--database-url, analytics response cache and report detail cache off, so
+every request really queries), records every SQL statement it sends, then
+re-runs each one as EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) inside a
+transaction that is rolled back. A case covers one endpoint and filter
+combination of report_service, the analytics routes or refdata.
+
+Checks, per statement:
+  seq scan : no Seq Scan on a relation the planner estimates at more than
+             --large-rows rows that keeps under --min-kept of the rows it
+             reads (a filter an index should have answered), unless the
+             case lists the table in `full_scan` (title search)
+  buffers  : shared blocks hit + read across the plan <= the case budget
+  rows     : rows the plan touched (emitted + removed by filter, over all
+             nodes and loops) <= the case budget
+
+Budgets are sized for the bench.datagen dataset at a few hundred thousand
+reports and do not grow with it for point lookups and single-report writes;
+list and aggregate cases only get the seq scan check. Exits 1 on any
+violation. Write cases create, update and finally delete one report of their
+own.
+
+    python -m bench.datagen --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench --reports 200000
+    python -m bench.plans --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+# partitions are checked as their parent table
+_PARTITION = re.compile(r"_(p\d{4}_\d{2}|default)$")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+_SCANS = ("Seq Scan", "Parallel Seq Scan")
+
+# point lookups and single-report writes
+POINT_BUFFERS = 2_000
+POINT_ROWS = 5_000
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    # formatted with the fixtures (report_id, archived_id, user_id, ...)
+    path: str
+    params: Dict[str, object] = field(default_factory=dict)
+    body: Optional[Callable[[Dict], dict]] = None
+    # tables a filtering Seq Scan is expected on
+    full_scan: Tuple[str, ...] = ()
+    max_buffers: Optional[int] = POINT_BUFFERS
+    max_rows: Optional[int] = POINT_ROWS
+    # budgets apply only to statements containing this (e.g. the page, not the facet counts)
+    budget_match: Optional[str] = None
+    # (fixtures, response) -> fixture updates, e.g. the id of a created report
+    after: Optional[Callable[[Dict, object], Dict]] = None
+
+
+_LIST = dict(max_buffers=None, max_rows=None)
+_AGGREGATE = dict(max_buffers=None, max_rows=None)
+
+CASES: List[Case] = [
+    # refdata: small tables, anything goes but the budget
+    Case("refdata.service_areas", "GET", "/service-areas"),
+    Case("refdata.categories", "GET", "/categories"),
+    Case("refdata.severities", "GET", "/severities"),
+    Case("refdata.statuses", "GET", "/statuses"),
+    Case("refdata.transitions", "GET", "/statuses/transitions"),
+
+    # list filter combinations
+    Case("reports.list", "GET", "/reports/", **_LIST),
+    Case("reports.list.archived", "GET", "/reports/", {"include_archived": "true"}, **_LIST),
+    Case("reports.list.search", "GET", "/reports/", {"search": "{search}"}, full_scan=("report",), **_LIST),
+    Case("reports.list.area", "GET", "/reports/", {"area_id": "{area_id}"}, **_LIST),
+    Case("reports.list.category", "GET", "/reports/", {"category_id": "{category_id}"}, **_LIST),
+    Case("reports.list.status", "GET", "/reports/", {"status": "IN_PROGRESS"}, **_LIST),
+    Case("reports.list.status_archived", "GET", "/reports/", {"status": "CLOSED"}, **_LIST),
+    Case("reports.list.area_category", "GET", "/reports/",
+         {"area_id": "{area_id}", "category_id": "{category_id}"}, max_buffers=POINT_BUFFERS, max_rows=None),
+    Case("reports.list.area_status", "GET", "/reports/",
+         {"area_id": "{area_id}", "status": "IN_PROGRESS"}, max_buffers=POINT_BUFFERS, max_rows=None),
+    Case("reports.list.area_archived", "GET", "/reports/",
+         {"area_id": "{area_id}", "include_archived": "true"}, **_LIST),
+    Case("reports.list.area_category_archived", "GET", "/reports/",
+         {"area_id": "{area_id}", "category_id": "{category_id}", "include_archived": "true"}, max_rows=None,
+         max_buffers=4 * POINT_BUFFERS),
+    # sparse fieldsets: no reference-table joins unless a name is asked for
+    Case("reports.list.map", "GET", "/reports/", {"fields": "report_id,latitude,longitude,current_status"}, **_LIST),
+    Case("reports.list.map_area", "GET", "/reports/",
+         {"fields": "report_id,latitude,longitude,current_status", "area_id": "{area_id}", "include_archived": "true"}, **_LIST),
+
+    # faceted first pages: the page is budgeted, the facet counts read every
+    # row that fails at most one filter; later pages run no facet pass, so the
+    # whole request is budgeted
+    Case("reports.page", "GET", "/reports/", {"facets": "true"}, budget_match="LIMIT",
+         after=lambda fx, res: {"page_cursor": res.json()["next_cursor"]}),
+    Case("reports.page.cursor", "GET", "/reports/", {"facets": "true", "cursor": "{page_cursor}"}),
+    Case("reports.page.status", "GET", "/reports/", {"facets": "true", "status": "IN_PROGRESS"}, budget_match="LIMIT",
+         after=lambda fx, res: {"status_cursor": res.json()["next_cursor"]}),
+    Case("reports.page.status.cursor", "GET", "/reports/", {"facets": "true", "status": "IN_PROGRESS", "cursor": "{status_cursor}"}),
+    Case("reports.page.area_severity", "GET", "/reports/",
+         {"facets": "true", "area_id": "{area_id}", "severity_id": "{severity_id}"}, budget_match="LIMIT"),
+    Case("reports.page.archived", "GET", "/reports/", {"facets": "true", "include_archived": "true"}, budget_match="LIMIT"),
+    Case("reports.page.status_archived", "GET", "/reports/", {"facets": "true", "status": "CLOSED"}, budget_match="LIMIT"),
+    Case("reports.page.open", "GET", "/reports/", {"facets": "true", "open": "true"}, budget_match="LIMIT"),
+    Case("reports.page.breaching", "GET", "/reports/", {"facets": "true", "breaching": "true"}, budget_match="LIMIT"),
+    Case("reports.page.last_24h", "GET", "/reports/", {"facets": "true", "created_after": "{day_ago}"}, budget_match="LIMIT"),
+
+    # single reports
+    Case("reports.detail", "GET", "/reports/{report_id}"),
+    Case("reports.detail.archived", "GET", "/reports/{archived_id}"),
+    Case("reports.detail.noisy", "GET", "/reports/{noisy_id}"),
+    Case("reports.detail.sparse", "GET", "/reports/{report_id}", {"fields": "report_id,current_status", "include": "severity"}),
+    Case("reports.detail.sparse_archived", "GET", "/reports/{archived_id}", {"fields": "title", "include": "status_history"}),
+    Case("reports.history", "GET", "/reports/{noisy_id}/history", {"limit": 50},
+         after=lambda fx, res: {"history_cursor": res.json()["next_cursor"]}),
+    Case("reports.history.page2", "GET", "/reports/{noisy_id}/history", {"limit": 50, "cursor": "{history_cursor}"}),
+    Case("reports.history.archived", "GET", "/reports/{archived_id}/history", {"limit": 50}),
+    Case("users.feed", "GET", "/users/{user_id}/feed", {"limit": 50},
+         after=lambda fx, res: {"feed_cursor": res.json()["next_cursor"]}),
+    Case("users.feed.page2", "GET", "/users/{user_id}/feed", {"limit": 50, "cursor": "{feed_cursor}"}),
+
+    # analytics
+    Case("analytics.hotspots", "GET", "/analytics/hotspots", **_AGGREGATE),
+    Case("analytics.resolution_times", "GET", "/analytics/resolution-times", **_AGGREGATE),
+    *[
+        Case(f"analytics.timeseries.{interval}.{group_by}", "GET", "/analytics/timeseries",
+             {"interval": interval, "group_by": group_by}, **_AGGREGATE)
+        for interval in ("hour", "day", "week")
+        for group_by in ("category", "area", "status")
+    ],
+    *[
+        Case(f"analytics.costs.{group_by}.{interval}", "GET", "/analytics/costs",
+             {"group_by": group_by, "interval": interval}, **_AGGREGATE)
+        for group_by in ("department", "category", "area", "none")
+        for interval in ("month", "total")
+    ],
+
+    # writes, on a report of our own
+    Case("reports.create", "POST", "/reports/", body=lambda fx: {
+        "title": "Plan check", "description": "Created by bench.plans",
+        "latitude": 33.45, "longitude": -111.9, "address": "1 Plan Way",
+        "category_id": fx["category_id"], "severity_id": fx["severity_id"],
+        "area_id": fx["area_id"], "created_by": fx["user_id"],
+    }, after=lambda fx, res: {"created_id": res.json()["report_id"]}),
+    Case("reports.status", "PUT", "/reports/{created_id}/status",
+         body=lambda fx: {"new_status": "TRIAGED", "note": "plan check", "changed_by": fx["user_id"]}),
+    Case("reports.bulk_status", "PUT", "/reports/status", body=lambda fx: {
+        "changed_by": fx["user_id"],
+        "items": [{"report_id": fx["created_id"], "new_status": "IN_PROGRESS"},
+                  {"report_id": fx["archived_id"], "new_status": "IN_PROGRESS"}],
+    }),
+    Case("reports.comment", "POST", "/reports/{created_id}/comments",
+         body=lambda fx: {"user_id": fx["user_id"], "body": "plan check"}),
+    Case("reports.subscribe", "POST", "/reports/{created_id}/subscriptions", body=lambda fx: {"user_id": fx["user_id"]}),
+    Case("reports.unsubscribe", "DELETE", "/reports/{created_id}/subscriptions/{user_id}"),
+    Case("reports.delete", "DELETE", "/reports/{created_id}"),
+]
+
+
+# ----------
+# Fixtures
+# ----------
+
+def load_fixtures(engine: Engine) -> Dict:
+    with engine.connect() as conn:
+        def one(sql: str):
+            return conn.execute(text(sql)).scalar()
+
+        return {
+            "report_id": one("SELECT report_id FROM report ORDER BY report_id DESC LIMIT 1"),
+            "archived_id": one("SELECT report_id FROM report_archive ORDER BY report_id DESC LIMIT 1"),
+            "noisy_id": one("SELECT report_id FROM status_update GROUP BY report_id ORDER BY count(*) DESC LIMIT 1"),
+            "user_id": one("SELECT user_id FROM user_feed GROUP BY user_id ORDER BY count(*) DESC LIMIT 1"),
+            "area_id": one("SELECT area_id FROM report GROUP BY area_id ORDER BY count(*) DESC LIMIT 1"),
+            "category_id": one("SELECT category_id FROM report GROUP BY category_id ORDER BY count(*) DESC LIMIT 1"),
+            "severity_id": one("SELECT min(severity_id) FROM severity"),
+            "day_ago": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat(),
+            "search": "leak",
+        }
+
+
+def _large_tables(engine: Engine, min_rows: int) -> Dict[str, int]:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT relname, reltuples::bigint FROM pg_class "
+                 "WHERE relkind IN ('r', 'p') AND relnamespace = 'public'::regnamespace AND reltuples > :n"),
+            {"n": min_rows}
+        ).all()
+    return dict(rows)
+
+
+# ----------
+# Capture
+# ----------
+
+# handlers run on TestClient's and the threadpool's threads, so one process-wide
+# recorder; cases run one at a time
+_capture: Dict[str, Optional[list]] = {"statements": None}
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record(conn, cursor, statement, parameters, context, executemany):
+    statements = _capture["statements"]
+    if statements is None:
+        return
+    if executemany:
+        parameters = parameters[0] if parameters else None
+    statements.append((statement, parameters))
+
+
+def _run_case(client, case: Case, fx: Dict) -> Tuple[object, List[Tuple[str, object]]]:
+    path = case.path.format(**fx)
+    params = {k: str(v).format(**fx) for k, v in case.params.items()}
+    _capture["statements"] = []
+    try:
+        res = client.request(case.method, path, params=params, json=case.body(fx) if case.body else None)
+    finally:
+        statements, _capture["statements"] = _capture["statements"], None
+    if res.status_code >= 400:
+        raise SystemExit(f"{case.name}: {case.method} {path} -> {res.status_code} {res.text[:200]}")
+
+    seen, unique = set(), []
+    for statement, parameters in statements:
+        if statement.lstrip().split(None, 1)[0].upper() not in _EXPLAINABLE or statement in seen:
+            continue
+        seen.add(statement)
+        unique.append((statement, parameters))
+    return res, unique
+
+
+# ----------
+# Explain
+# ----------
+
+def _explain(engine: Engine, statement: str, parameters) -> dict:
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters or None)
+        plan = cur.fetchone()[0]
+        cur.close()
+        return plan[0] if isinstance(plan, list) else json.loads(plan)[0]
+    finally:
+        raw.rollback()
+        raw.close()
+
+
+def _nodes(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _nodes(child)
+
+
+def _summarize(plan: dict) -> dict:
+    root = plan["Plan"]
+    seq_scans, rows = [], 0
+    for node in _nodes(root):
+        loops = node.get("Actual Loops", 1) or 1
+        kept, removed = node.get("Actual Rows", 0) * loops, node.get("Rows Removed by Filter", 0) * loops
+        rows += kept + removed
+        if node["Node Type"] in _SCANS:
+            seq_scans.append({"relation": node["Relation Name"], "read": int(kept + removed), "kept": int(kept)})
+    return {
+        # buffers of the root include every child's
+        "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "rows": int(rows),
+        "seq_scans": seq_scans,
+        "ms": plan.get("Execution Time", 0.0),
+    }
+
+
+def check(case: Case, statement: str, summary: dict, large: Dict[str, int], min_kept: float) -> List[str]:
+    problems = []
+    for scan in summary["seq_scans"]:
+        relation = scan["relation"]
+        if relation not in large or _PARTITION.sub("", relation) in case.full_scan:
+            continue
+        if scan["kept"] < min_kept * scan["read"]:
+            problems.append(f"Seq Scan on {relation} (~{large[relation]:,} rows) kept {scan['kept']:,} of {scan['read']:,}")
+    if case.budget_match and case.budget_match not in statement:
+        return problems
+    if case.max_buffers is not None and summary["buffers"] > case.max_buffers:
+        problems.append(f"{summary['buffers']:,} buffers > {case.max_buffers:,}")
+    if case.max_rows is not None and summary["rows"] > case.max_rows:
+        problems.append(f"{summary['rows']:,} rows touched > {case.max_rows:,}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--large-rows", type=int, default=10_000, help="only Seq Scans on tables estimated above this are checked")
+    parser.add_argument("--min-kept", type=float, default=0.10, help="a checked Seq Scan must keep at least this fraction of its rows")
+    parser.add_argument("--only", help="run cases whose name starts with this prefix")
+    parser.add_argument("--verbose", action="store_true", help="print every statement and its plan summary")
+    parser.add_argument("--json", help="also write per-statement results here")
+    args = parser.parse_args()
+
+    # settings are read at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["ANALYTICS_CACHE_SIZE"] = "0"
+    os.environ["REPORT_DETAIL_CACHE_SIZE"] = "0"
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    engine = create_engine(args.database_url, future=True)
+    fx = load_fixtures(engine)
+    large = _large_tables(engine, args.large_rows)
+    client = TestClient(app)
+
+    results, failures = [], 0
+    for case in CASES:
+        if args.only and not case.name.startswith(args.only):
+            continue
+        try:
+            res, statements = _run_case(client, case, fx)
+        except KeyError as missing:
+            print(f"skip {case.name:<40} needs {missing} from an earlier case")
+            continue
+        if case.after:
+            fx.update(case.after(fx, res))
+
+        worst = {"buffers": 0, "rows": 0, "ms": 0.0}
+        problems = []
+        for statement, parameters in statements:
+            summary = _summarize(_explain(engine, statement, parameters))
+            issues = check(case, statement, summary, large, args.min_kept)
+            problems += [(statement, issue) for issue in issues]
+            for key in worst:
+                worst[key] = max(worst[key], summary[key])
+            results.append({"case": case.name, "sql": statement, **summary, "problems": issues})
+            if args.verbose:
+                print(f"    {summary}  {' '.join(statement.split())[:140]}")
+
+        failures += bool(problems)
+        print(f"{'FAIL' if problems else 'ok':<4} {case.name:<40} {len(statements):>3} stmts "
+              f"{worst['buffers']:>9,} buf {worst['rows']:>10,} rows {worst['ms']:>9.1f} ms")
+        for statement, issue in problems:
+            print(f"       {issue}\n         {' '.join(statement.split())[:160]}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+    print(f"\n{failures} failing case(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
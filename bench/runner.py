@@ -0,0 +1,317 @@
+# bench/runner.py
+"""
+HTTP load runner for every endpoint in backend/api.
+
+Runs each scenario at each concurrency level against a running API server
+and records throughput, error count and p50/p90/p99 latency. Fixture ids
+(report, area, category, user ranges) are read from the benchmark database
+so requests hit real rows.
+
+    python -m bench.runner --base-url http://127.0.0.1:8000 \\
+        --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench \\
+        --concurrency 1 8 32 --duration 10 --out bench/results/run.json
+"""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from bench import meta
+
+
+# ----------
+# Fixtures
+# ----------
+
+@dataclass
+class Fixtures:
+    report_count: int
+    report_ids: Tuple[int, int]
+    area_ids: List[int]
+    category_ids: List[int]
+    severity_ids: List[int]
+    user_ids: List[int]
+    # (report_id, current_status) of reports created by the run itself;
+    # status/delete scenarios consume these
+    created: List[Tuple[int, str]] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def random_report(self, rnd: random.Random) -> int:
+        return rnd.randint(*self.report_ids)
+
+    def push_created(self, report_id: int, current_status: str = "SUBMITTED") -> None:
+        with self.lock:
+            self.created.append((report_id, current_status))
+
+    def pop_created(self) -> Optional[Tuple[int, str]]:
+        with self.lock:
+            return self.created.pop() if self.created else None
+
+
+def load_fixtures(database_url: str) -> Fixtures:
+    engine = create_engine(database_url, future=True)
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT min(report_id), max(report_id), count(*) FROM report")).one()
+        fx = Fixtures(
+            report_count=row[2],
+            report_ids=(row[0] or 1, row[1] or 1),
+            area_ids=list(conn.execute(text("SELECT area_id FROM service_area")).scalars()),
+            category_ids=list(conn.execute(text("SELECT category_id FROM category")).scalars()),
+            severity_ids=list(conn.execute(text("SELECT severity_id FROM severity")).scalars()),
+            user_ids=list(conn.execute(text('SELECT user_id FROM "user" LIMIT 1000')).scalars()),
+        )
+    engine.dispose()
+    return fx
+
+
+# ----------
+# Scenarios
+# ----------
+
+@dataclass
+class Scenario:
+    name: str
+    # (client, fixtures, rng) -> response, or None if the scenario has nothing to do
+    call: Callable[[httpx.Client, Fixtures, random.Random], Optional[httpx.Response]]
+    # heavy scenarios (full-table list) are skipped unless asked for
+    heavy: bool = False
+    ok_status: Tuple[int, ...] = (200,)
+
+
+def _create(c: httpx.Client, fx: Fixtures, rnd: random.Random) -> httpx.Response:
+    res = c.post("/reports/", json={
+        "title": "Bench create",
+        "description": "Created by bench.runner",
+        "latitude": 33.42 + rnd.random() / 10,
+        "longitude": -111.93 + rnd.random() / 10,
+        "address": "1 Bench Way",
+        "category_id": rnd.choice(fx.category_ids),
+        "severity_id": rnd.choice(fx.severity_ids),
+        "area_id": rnd.choice(fx.area_ids),
+        "created_by": rnd.choice(fx.user_ids),
+    })
+    if res.status_code == 201:
+        fx.push_created(res.json()["report_id"])
+    return res
+
+
+# legal, repeatable walk for reports the run created
+_NEXT_STATUS = {"SUBMITTED": "TRIAGED", "TRIAGED": "IN_PROGRESS", "IN_PROGRESS": "ON_HOLD", "ON_HOLD": "IN_PROGRESS"}
+
+
+def _status(c: httpx.Client, fx: Fixtures, rnd: random.Random) -> Optional[httpx.Response]:
+    item = fx.pop_created()
+    if item is None:
+        return None
+    rid, current = item
+    new_status = _NEXT_STATUS[current]
+    res = c.put(f"/reports/{rid}/status", json={"new_status": new_status, "note": "bench", "changed_by": rnd.choice(fx.user_ids)})
+    fx.push_created(rid, new_status if res.status_code == 200 else current)
+    return res
+
+
+def _bulk_status(c: httpx.Client, fx: Fixtures, rnd: random.Random) -> Optional[httpx.Response]:
+    items = [it for it in (fx.pop_created() for _ in range(50)) if it is not None]
+    if not items:
+        return None
+    res = c.put("/reports/status", json={
+        "changed_by": rnd.choice(fx.user_ids),
+        "items": [{"report_id": rid, "new_status": _NEXT_STATUS[cur], "note": "bench"} for rid, cur in items],
+    })
+    updated = (
+        {r["report_id"] for r in res.json()["results"] if r["outcome"] == "updated"}
+        if res.status_code == 200 else set()
+    )
+    for rid, cur in items:
+        fx.push_created(rid, _NEXT_STATUS[cur] if rid in updated else cur)
+    return res
+
+
+def _delete(c: httpx.Client, fx: Fixtures, rnd: random.Random) -> Optional[httpx.Response]:
+    item = fx.pop_created()
+    if item is None:
+        return None
+    return c.delete(f"/reports/{item[0]}")
+
+
+SCENARIOS: List[Scenario] = [
+    # refdata
+    Scenario("refdata.service_areas", lambda c, fx, r: c.get("/service-areas")),
+    Scenario("refdata.categories", lambda c, fx, r: c.get("/categories")),
+    Scenario("refdata.severities", lambda c, fx, r: c.get("/severities")),
+    Scenario("refdata.statuses", lambda c, fx, r: c.get("/statuses")),
+    # reports: reads
+    Scenario("reports.list_all", lambda c, fx, r: c.get("/reports/"), heavy=True),
+    Scenario("reports.list_by_area", lambda c, fx, r: c.get("/reports/", params={"area_id": r.choice(fx.area_ids)}), heavy=True),
+    Scenario("reports.list_by_status", lambda c, fx, r: c.get("/reports/", params={"status": "ON_HOLD"})),
+    Scenario("reports.list_by_area_status", lambda c, fx, r: c.get("/reports/", params={"area_id": r.choice(fx.area_ids), "status": "TRIAGED"})),
+    Scenario("reports.list_by_area_closed", lambda c, fx, r: c.get("/reports/", params={"area_id": r.choice(fx.area_ids), "status": "CLOSED"})),
+    Scenario("reports.search", lambda c, fx, r: c.get("/reports/", params={"search": f"#{r.randint(1, 999)}1"})),
+    Scenario("reports.detail", lambda c, fx, r: c.get(f"/reports/{fx.random_report(r)}"), ok_status=(200, 404)),
+    Scenario("users.feed", lambda c, fx, r: c.get(f"/users/{r.choice(fx.user_ids)}/feed")),
+    # reports: writes (create first so status/delete have rows to work on)
+    Scenario("reports.create", _create, ok_status=(201,)),
+    Scenario("reports.update_status", _status),
+    Scenario("reports.bulk_status_50", _bulk_status),
+    Scenario("reports.delete", _delete, ok_status=(204,)),
+    # analytics
+    Scenario("analytics.hotspots", lambda c, fx, r: c.get("/analytics/hotspots")),
+    Scenario("analytics.resolution_times", lambda c, fx, r: c.get("/analytics/resolution-times")),
+    Scenario("analytics.timeseries_hour", lambda c, fx, r: c.get("/analytics/timeseries", params={"interval": "hour", "group_by": "category"})),
+    Scenario("analytics.timeseries_week_year", lambda c, fx, r: c.get("/analytics/timeseries", params={
+        "interval": "week", "group_by": r.choice(["category", "area", "status"]),
+        "since": (datetime.now(timezone.utc) - timedelta(days=365)).isoformat()
+    })),
+    Scenario("analytics.costs_by_department", lambda c, fx, r: c.get("/analytics/costs", params={"group_by": "department"})),
+    Scenario("analytics.costs_by_category_total", lambda c, fx, r: c.get("/analytics/costs", params={
+        "group_by": "category", "interval": "total",
+        "since": (datetime.now(timezone.utc) - timedelta(days=365 * 3)).isoformat()
+    })),
+]
+
+
+# ----------
+# Runner
+# ----------
+
+def _percentile(sorted_ms: List[float], p: float) -> Optional[float]:
+    if not sorted_ms:
+        return None
+    idx = min(len(sorted_ms) - 1, max(0, int(round(p / 100 * len(sorted_ms))) - 1))
+    return round(sorted_ms[idx], 2)
+
+
+def run_scenario(
+    base_url: str,
+    scenario: Scenario,
+    fx: Fixtures,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    timeout: float,
+    max_requests: Optional[int] = None
+) -> Dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+    issued = [0]
+
+    def worker(n: int) -> None:
+        rnd = random.Random(f"{scenario.name}:{concurrency}:{n}")
+        with httpx.Client(base_url=base_url, timeout=timeout) as client:
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                if max_requests is not None:
+                    with lock:
+                        if issued[0] >= max_requests:
+                            return
+                        issued[0] += 1
+                t0 = time.perf_counter()
+                try:
+                    res = scenario.call(client, fx, rnd)
+                    if res is None:
+                        return
+                    outcome = None if res.status_code in scenario.ok_status else f"http_{res.status_code}"
+                except httpx.HTTPError as exc:
+                    outcome = type(exc).__name__
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                if t0 < start_at:
+                    continue  # warmup
+                with lock:
+                    if outcome:
+                        errors[outcome] = errors.get(outcome, 0) + 1
+                    else:
+                        latencies.append(elapsed_ms)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    wall0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = max(1e-9, min(time.perf_counter(), stop_at) - max(wall0, start_at))
+
+    latencies.sort()
+    return {
+        "scenario": scenario.name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+        "p50_ms": _percentile(latencies, 50),
+        "p90_ms": _percentile(latencies, 90),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": round(latencies[-1], 2) if latencies else None,
+    }
+
+
+def run(
+    base_url: str,
+    fx: Fixtures,
+    concurrency_levels: List[int],
+    duration: float,
+    warmup: float,
+    timeout: float,
+    include_heavy: bool,
+    only: Optional[List[str]] = None,
+    max_requests: Optional[int] = None,
+    verbose: bool = True
+) -> List[Dict]:
+    results = []
+    for scenario in SCENARIOS:
+        if only and not any(scenario.name.startswith(o) for o in only):
+            continue
+        if scenario.heavy and not include_heavy:
+            continue
+        for c in concurrency_levels:
+            res = run_scenario(base_url, scenario, fx, c, duration, warmup, timeout, max_requests)
+            results.append(res)
+            if verbose:
+                print(
+                    f"  {res['scenario']:<32} c={c:<4} {res['throughput_rps']:>9} rps"
+                    f"  p50 {res['p50_ms']} ms  p99 {res['p99_ms']} ms"
+                    + (f"  errors {res['errors']}" if res["errors"] else ""),
+                    flush=True
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario/concurrency")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout (s)")
+    parser.add_argument("--max-requests", type=int, help="cap requests per scenario/concurrency")
+    parser.add_argument("--heavy", action="store_true", help="include unfiltered list scenarios")
+    parser.add_argument("--only", nargs="+", help="scenario name prefixes to run")
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args()
+
+    fx = load_fixtures(args.database_url)
+    results = run(
+        args.base_url, fx, args.concurrency, args.duration, args.warmup, args.timeout,
+        include_heavy=args.heavy, only=args.only, max_requests=args.max_requests
+    )
+    doc = {"meta": meta.collect(args.database_url), "runs": [{"scale": fx.report_count, "results": results}]}
+    if args.out:
+        meta.write(doc, args.out)
+
+
+if __name__ == "__main__":
+    main()
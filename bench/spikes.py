@@ -0,0 +1,137 @@
+# bench/spikes.py
+"""
+Cost and sensitivity of the /analytics/spikes detector
+(backend/services/spike_detector.py).
+
+1. Backfill from the benchmark database: history read, vectorised build,
+   keys, and the same state computed by replaying every report through
+   the per-event path (checked to agree).
+2. Per-event cost of the streaming path (SpikeDetector.ingest).
+3. --synthetic N: the vectorised build on N random in-memory reports over
+   the backfill window (no database), for sizes datagen would take long
+   to produce.
+4. Sensitivity: the smallest burst of reports landing in one
+   (area, category) in an otherwise empty current window that the default
+   thresholds flag, for a quiet, a median and the busiest key.
+
+    python -m bench.spikes --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench --synthetic 10000000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+
+def _ms(t0: float) -> float:
+    return (time.perf_counter() - t0) * 1000
+
+
+def _blank(sd, detector):
+    """An empty detector with the same parameters, origin and profile."""
+    return sd.SpikeDetector(
+        detector.bucket_seconds, sd.settings.spikes_halflife_days * 86400,
+        detector.precision, detector.origin, detector.season
+    )
+
+
+def _replay(sd, detector, rows, now: float):
+    """The per-event path from empty state, with the backfill's origin and profile."""
+    replay = _blank(sd, detector)
+    current = int(now // detector.bucket_seconds)
+    rows = rows[np.argsort(rows[:, 1], kind="stable")]
+    rows = rows[rows[:, 1] // detector.bucket_seconds >= detector.origin]
+    t0 = time.perf_counter()
+    replay.ingest(np, rows)
+    return replay, _ms(t0), current
+
+
+def _level_now(detector, rate, current: int) -> float:
+    level = rate.level * detector.decay ** (rate.bucket - rate.level_at)
+    if rate.bucket < current:
+        level = (detector.decay * level + detector.alpha * rate.count / detector._factor(rate.bucket)) * detector.decay ** (current - rate.bucket - 1)
+    return level
+
+
+def _synthetic(n: int, now: float, days: int, rng) -> np.ndarray:
+    return np.column_stack([
+        np.arange(n, dtype=np.float64),
+        now - rng.random(n) * days * 86400,
+        rng.integers(1, 50, n),
+        rng.integers(1, 20, n),
+        33.3 + rng.random(n) * 0.25,
+        -112.05 + rng.random(n) * 0.25,
+    ]).astype(np.float64)
+
+
+def _smallest_burst(sd, detector, key, now: float) -> int:
+    _, area_id, category_id = key
+    for burst in range(1, 200):
+        probe = _blank(sd, detector)
+        rate = detector.rates[key]
+        # the burst lands in an otherwise empty window
+        probe.rates[key] = sd._Rate(rate.level, rate.level_at, rate.bucket, 0, 0)
+        probe.newest = detector.newest
+        rows = np.column_stack([
+            np.full(burst, -1.0), np.full(burst, now - 1.0), np.full(burst, float(area_id)),
+            np.full(burst, float(category_id)), np.full(burst, np.nan), np.full(burst, np.nan),
+        ])
+        probe.ingest(np, rows)
+        if any(s["key"] == key for s in probe.spikes(now, dimension="area_category")):
+            return burst
+    return -1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--synthetic", type=int, default=0, help="also time the build on this many in-memory reports")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # settings are read at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    from backend.core.config import settings
+    from backend.db.session import engine
+    from backend.services import spike_detector as sd
+
+    now = time.time()
+    t0 = time.perf_counter()
+    upto, rows = sd._history(np, engine, now - settings.spikes_backfill_days * 86400)
+    read_ms = _ms(t0)
+    t0 = time.perf_counter()
+    detector = sd.build(np, rows, now, upto)
+    build_ms = _ms(t0)
+    print(f"backfill: {len(rows):,} reports over {settings.spikes_backfill_days} days, {len(detector.rates):,} keys")
+    print(f"  read {read_ms:>9.1f} ms   build {build_ms:>7.1f} ms")
+
+    replay, replay_ms, current = _replay(sd, detector, rows, now)
+    drift = max(
+        (abs(_level_now(detector, r, current) - _level_now(replay, replay.rates[k], current)) / max(_level_now(detector, r, current), 1e-12)
+         for k, r in detector.rates.items() if r.level > 0),
+        default=0.0
+    )
+    per_event_us = replay_ms * 1000 / max(len(rows), 1)
+    print(f"  replay {replay_ms:>7.1f} ms ({per_event_us:.2f} us / report, 3 keys each); "
+          f"build is {replay_ms / build_ms:.1f}x faster; max relative level difference {drift:.1e}")
+
+    if args.synthetic:
+        rng = np.random.default_rng(args.seed)
+        fake = _synthetic(args.synthetic, now, settings.spikes_backfill_days, rng)
+        t0 = time.perf_counter()
+        big = sd.build(np, fake, now)
+        print(f"synthetic: {args.synthetic:,} reports -> {len(big.rates):,} keys in {_ms(t0) / 1000:.2f} s")
+
+    pairs = sorted((k for k in detector.rates if k[0] == "area_category"), key=lambda k: detector.rates[k].level)
+    if pairs:
+        print(f"\nflagged now (z >= {sd.DEFAULT_Z}, count >= {sd.DEFAULT_MIN_COUNT}): {len(detector.spikes(now))}")
+        print(f"{'key':<22} {'baseline / bucket':>18} {'smallest flagged burst':>23}")
+        for label, key in (("quiet", pairs[0]), ("median", pairs[len(pairs) // 2]), ("busiest", pairs[-1])):
+            rate = detector.rates[key]
+            weight = max(1.0 - detector.decay ** (rate.bucket - detector.origin), detector.alpha)
+            baseline = rate.level * detector.decay ** (rate.bucket - rate.level_at) / weight
+            print(f"{label + ' ' + str(key[1:]):<22} {baseline:>18.3f} {_smallest_burst(sd, detector, key, now):>23}")
+
+
+if __name__ == "__main__":
+    main()
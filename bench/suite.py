@@ -0,0 +1,103 @@
+# bench/suite.py
+"""
+Full benchmark suite: grow a synthetic dataset through several scales and run
+every endpoint scenario at several concurrency levels at each scale.
+
+For each scale the dataset is topped up with bench.datagen (no regeneration
+between scales), an API server is started against the benchmark database,
+and bench.runner is pointed at it. Everything ends up in one JSON file under
+bench/results/ named after the commit, for bench.compare.
+
+    python -m bench.suite --database-url postgresql+psycopg2://postgres@localhost/gridwatch_bench \\
+        --scales 10000 100000 1000000 --concurrency 1 8 32
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from bench import datagen, meta, runner
+
+
+def _start_server(database_url: str, port: int, workers: int, env_overrides: dict) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": database_url, **env_overrides}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=meta.REPO_ROOT,
+        env=env
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=2).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError("API server exited during startup")
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("API server did not become healthy within 60s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=os.getenv("BENCH_DATABASE_URL") is None)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-requests", type=int)
+    parser.add_argument("--heavy", action="store_true", help="include unfiltered list scenarios")
+    parser.add_argument("--only", nargs="+", help="scenario name prefixes to run")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=412)
+    parser.add_argument("--keep-data", action="store_true", help="reuse existing rows instead of resetting the benchmark DB")
+    parser.add_argument("--tag", default="", help="suffix for the result file name")
+    parser.add_argument("--out", help="result file (default bench/results/<time>-<commit>.json)")
+    args = parser.parse_args()
+
+    if not args.keep_data:
+        datagen.create_database(args.database_url)
+    engine = create_engine(args.database_url, future=True)
+    if not args.keep_data:
+        datagen.apply_schema(engine)
+
+    out = args.out or str(meta.default_path(args.tag))
+    doc = {"meta": meta.collect(args.database_url), "config": vars(args) | {"database_url": None}, "runs": []}
+
+    for scale in sorted(args.scales):
+        with engine.connect() as conn:
+            have = conn.execute(text("SELECT count(*) FROM report")).scalar()
+        if have < scale:
+            print(f"== generating {scale - have:,} reports (target {scale:,})", flush=True)
+            gen = datagen.generate(engine, reports=scale - have, seed=args.seed)
+        else:
+            gen = None
+
+        print(f"== scale {scale:,}: starting API on :{args.port}", flush=True)
+        server = _start_server(args.database_url, args.port, args.workers, {})
+        try:
+            fx = runner.load_fixtures(args.database_url)
+            results = runner.run(
+                f"http://127.0.0.1:{args.port}", fx, args.concurrency, args.duration, args.warmup,
+                args.timeout, include_heavy=args.heavy, only=args.only, max_requests=args.max_requests
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        doc["runs"].append({"scale": fx.report_count, "datagen": gen, "results": results})
+        # write after every scale so a long run that dies still leaves results
+        meta.write(doc, out)
+
+
+if __name__ == "__main__":
+    main()
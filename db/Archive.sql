@@ -0,0 +1,133 @@
+-- Archive.sql — cold tier for finished reports
+--
+-- CALL archive_reports(older_than, batch_size) moves CLOSED / RESOLVED
+-- reports whose last status change is older than `older_than`, together
+-- with every child row, from the hot tables into *_archive tables with the
+-- same columns. Each batch is one transaction (the procedure COMMITs between
+-- batches, so CALL it outside an explicit transaction block), and rows
+-- locked by concurrent writers are skipped until the next run.
+--
+-- Archive tables carry no foreign keys; they are indexed by report_id for
+-- the transparent fallbacks in backend/services/report_service.py.
+--
+-- The moves name their columns (RETURNING and INSERT), so they do not
+-- depend on a hot table and its archive copy keeping the same column order.
+-- A column added to a hot table later needs the same ALTER TABLE ... ADD
+-- COLUMN on its archive table and an entry in both lists below; until then
+-- its values are not archived.
+--
+-- While a batch moves, the transaction-local setting gridwatch.archiving
+-- is 'on' so triggers that maintain derived data can treat the moves as
+-- no-ops (the rows still exist, just in a different table).
+--
+-- Run after Versioning.sql and Partitioning.sql. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS report_archive        (LIKE report,        PRIMARY KEY (report_id));
+CREATE TABLE IF NOT EXISTS status_update_archive (LIKE status_update, PRIMARY KEY (status_id));
+CREATE TABLE IF NOT EXISTS assignment_archive    (LIKE assignment,    PRIMARY KEY (assignment_id));
+CREATE TABLE IF NOT EXISTS sla_clock_archive     (LIKE sla_clock,     PRIMARY KEY (sla_id));
+CREATE TABLE IF NOT EXISTS report_media_archive  (LIKE report_media,  PRIMARY KEY (media_id));
+CREATE TABLE IF NOT EXISTS subscription_archive  (LIKE subscription);
+CREATE TABLE IF NOT EXISTS upvote_archive        (LIKE upvote);
+CREATE TABLE IF NOT EXISTS comment_archive       (LIKE comment);
+CREATE TABLE IF NOT EXISTS notification_archive  (LIKE notification);
+CREATE TABLE IF NOT EXISTS duplicate_link_archive(LIKE duplicate_link);
+CREATE TABLE IF NOT EXISTS work_order_archive    (LIKE work_order,    PRIMARY KEY (wo_id));
+CREATE TABLE IF NOT EXISTS work_part_archive     (LIKE work_part);
+
+CREATE INDEX IF NOT EXISTS idx_status_update_archive_report ON status_update_archive (report_id, changed_at);
+CREATE INDEX IF NOT EXISTS idx_assignment_archive_report    ON assignment_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_sla_clock_archive_report     ON sla_clock_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_report_media_archive_report  ON report_media_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_subscription_archive_report  ON subscription_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_upvote_archive_report        ON upvote_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_comment_archive_report       ON comment_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_notification_archive_report  ON notification_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_work_order_archive_report    ON work_order_archive (report_id);
+CREATE INDEX IF NOT EXISTS idx_work_part_archive_wo         ON work_part_archive (wo_id);
+CREATE INDEX IF NOT EXISTS idx_report_archive_created       ON report_archive (created_at);
+CREATE INDEX IF NOT EXISTS idx_report_archive_status        ON report_archive (current_status);
+
+-- Moving a batch deletes from every child table by report_id, and deleting
+-- from report / work_order checks each FK that points at them; without an
+-- index on the referencing column every one of those is a sequential scan.
+CREATE INDEX IF NOT EXISTS idx_assignment_report     ON assignment (report_id);
+CREATE INDEX IF NOT EXISTS idx_report_media_report   ON report_media (report_id);
+CREATE INDEX IF NOT EXISTS idx_comment_report        ON comment (report_id);
+CREATE INDEX IF NOT EXISTS idx_notification_report   ON notification (report_id);
+CREATE INDEX IF NOT EXISTS idx_work_order_report     ON work_order (report_id);
+CREATE INDEX IF NOT EXISTS idx_work_part_wo          ON work_part (wo_id);
+CREATE INDEX IF NOT EXISTS idx_duplicate_link_primary ON duplicate_link (primary_report_id);
+
+-- archived reports are still listed, so writes to them invalidate list ETags
+-- the same way writes to report do (db/Versioning.sql)
+DROP TRIGGER IF EXISTS trg_report_archive_table_version ON report_archive;
+CREATE TRIGGER trg_report_archive_table_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON report_archive
+  FOR EACH STATEMENT EXECUTE FUNCTION report_bump_table_version();
+
+CREATE OR REPLACE PROCEDURE archive_reports(
+  older_than  INTERVAL,
+  batch_size  INT DEFAULT 1000,
+  INOUT archived BIGINT DEFAULT 0
+) AS $$
+DECLARE
+  ids     BIGINT[];
+  last_id BIGINT := 0;
+BEGIN
+  LOOP
+    PERFORM set_config('gridwatch.archiving', 'on', true);
+
+    SELECT array_agg(report_id ORDER BY report_id) INTO ids
+    FROM (
+      SELECT r.report_id
+      FROM report r
+      WHERE r.current_status IN ('CLOSED', 'RESOLVED')
+        AND r.report_id > last_id
+        AND coalesce(
+              (SELECT max(s.changed_at) FROM status_update s WHERE s.report_id = r.report_id),
+              r.created_at
+            ) < now() - older_than
+      ORDER BY r.report_id
+      LIMIT batch_size
+      FOR UPDATE SKIP LOCKED
+    ) batch;
+
+    EXIT WHEN ids IS NULL;
+    last_id := ids[cardinality(ids)];
+
+    -- children first (FKs point at report / work_order)
+    WITH m AS (DELETE FROM work_part WHERE wo_id IN (SELECT wo_id FROM work_order WHERE report_id = ANY (ids)) RETURNING part_id, wo_id, sku, description, qty, unit_cost)
+    INSERT INTO work_part_archive (part_id, wo_id, sku, description, qty, unit_cost) SELECT * FROM m;
+    WITH m AS (DELETE FROM duplicate_link WHERE primary_report_id = ANY (ids) OR duplicate_report_id = ANY (ids) RETURNING dup_id, primary_report_id, duplicate_report_id, merged_by, merged_at)
+    INSERT INTO duplicate_link_archive (dup_id, primary_report_id, duplicate_report_id, merged_by, merged_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM report_media WHERE report_id = ANY (ids) RETURNING media_id, report_id, url, media_type, created_at)
+    INSERT INTO report_media_archive (media_id, report_id, url, media_type, created_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM assignment WHERE report_id = ANY (ids) RETURNING assignment_id, report_id, dept_id, assignee_user_id, assigned_at, accepted_at, is_active)
+    INSERT INTO assignment_archive (assignment_id, report_id, dept_id, assignee_user_id, assigned_at, accepted_at, is_active) SELECT * FROM m;
+    WITH m AS (DELETE FROM sla_clock WHERE report_id = ANY (ids) RETURNING sla_id, report_id, target_due_at, breached, breached_at)
+    INSERT INTO sla_clock_archive (sla_id, report_id, target_due_at, breached, breached_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM subscription WHERE report_id = ANY (ids) RETURNING sub_id, report_id, user_id, created_at)
+    INSERT INTO subscription_archive (sub_id, report_id, user_id, created_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM upvote WHERE report_id = ANY (ids) RETURNING upvote_id, report_id, user_id, created_at)
+    INSERT INTO upvote_archive (upvote_id, report_id, user_id, created_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM comment WHERE report_id = ANY (ids) RETURNING comment_id, report_id, user_id, body, created_at)
+    INSERT INTO comment_archive (comment_id, report_id, user_id, body, created_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM notification WHERE report_id = ANY (ids) RETURNING notif_id, report_id, recipient_user_id, channel, payload, sent_at, status)
+    INSERT INTO notification_archive (notif_id, report_id, recipient_user_id, channel, payload, sent_at, status) SELECT * FROM m;
+    WITH m AS (DELETE FROM status_update WHERE report_id = ANY (ids) RETURNING status_id, report_id, status, note, changed_by, changed_at)
+    INSERT INTO status_update_archive (status_id, report_id, status, note, changed_by, changed_at) SELECT * FROM m;
+    WITH m AS (DELETE FROM work_order WHERE report_id = ANY (ids) RETURNING wo_id, report_id, dept_id, opened_at, closed_at, cost_estimate, cost_actual)
+    INSERT INTO work_order_archive (wo_id, report_id, dept_id, opened_at, closed_at, cost_estimate, cost_actual) SELECT * FROM m;
+    WITH m AS (DELETE FROM report WHERE report_id = ANY (ids) RETURNING
+      report_id, title, description, latitude, longitude, geohash, address, created_at, created_by,
+      category_id, severity_id, area_id, current_status, row_version)
+    INSERT INTO report_archive (
+      report_id, title, description, latitude, longitude, geohash, address, created_at, created_by,
+      category_id, severity_id, area_id, current_status, row_version
+    ) SELECT * FROM m;
+
+    archived := archived + cardinality(ids);
+    COMMIT;
+  END LOOP;
+END $$ LANGUAGE plpgsql;
@@ -0,0 +1,203 @@
+-- Costs.sql — repair-cost rollup for /analytics/costs
+--
+-- work_order_cost_monthly : one row per (UTC month of work_order.opened_at,
+-- work_order.dept_id, report.category_id, report.area_id) with
+--
+--   work_orders        work orders opened
+--   estimate_total     sum(cost_estimate)
+--   actual_total       sum(cost_actual)
+--   estimate_on_actual sum(cost_estimate) over orders that have cost_actual,
+--                      so estimate-vs-actual compares like with like
+--   actual_orders      orders with cost_actual
+--   resolved_orders    orders with closed_at (one work order per report in
+--                      practice, so this is the resolved-report count)
+--   parts_total        sum(work_part.qty * unit_cost)
+--
+-- Statement-level triggers on work_order / work_part (and their *_archive
+-- copies) apply signed deltas: +new rows, -old rows, summed per bucket and
+-- upserted, so an INSERT / UPDATE / DELETE statement costs one upsert per
+-- touched bucket. A work order's parts move with it when its month or
+-- department changes. Rows moved by archive_reports() are skipped
+-- (gridwatch.archiving = 'on'); they stay counted, as they still exist in
+-- the archive tier. TRUNCATE and rebuild_work_order_costs() recompute from
+-- the hot + archive tables. Buckets whose orders were all deleted keep a
+-- zero row.
+--
+-- Run after Archive.sql. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS work_order_cost_monthly (
+    month_start         TIMESTAMPTZ NOT NULL,
+    dept_id             BIGINT NOT NULL,
+    category_id         BIGINT NOT NULL,
+    area_id             BIGINT NOT NULL,
+    work_orders         BIGINT NOT NULL DEFAULT 0,
+    estimate_total      NUMERIC NOT NULL DEFAULT 0,
+    actual_total        NUMERIC NOT NULL DEFAULT 0,
+    estimate_on_actual  NUMERIC NOT NULL DEFAULT 0,
+    actual_orders       BIGINT NOT NULL DEFAULT 0,
+    resolved_orders     BIGINT NOT NULL DEFAULT 0,
+    parts_total         NUMERIC NOT NULL DEFAULT 0,
+    PRIMARY KEY (month_start, dept_id, category_id, area_id)
+);
+
+-- report dimensions across both tiers (work orders of archived reports
+-- live in work_order_archive and still change when the report is deleted)
+CREATE OR REPLACE VIEW report_dims AS
+  SELECT report_id, category_id, area_id FROM report
+  UNION ALL
+  SELECT report_id, category_id, area_id FROM report_archive;
+
+-- `src` is a query over the transition tables yielding work_order columns
+-- plus `sign`; the same function serves work_order and work_order_archive
+CREATE OR REPLACE FUNCTION work_order_cost_on_change() RETURNS trigger AS $$
+DECLARE
+  src TEXT := CASE TG_OP
+    WHEN 'INSERT' THEN 'SELECT n.*, 1 AS sign FROM new_rows n'
+    WHEN 'DELETE' THEN 'SELECT o.*, -1 AS sign FROM old_rows o'
+    ELSE 'SELECT n.*, 1 AS sign FROM new_rows n UNION ALL SELECT o.*, -1 FROM old_rows o'
+  END;
+BEGIN
+  IF current_setting('gridwatch.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  EXECUTE format($q$
+    INSERT INTO work_order_cost_monthly AS c
+      (month_start, dept_id, category_id, area_id, work_orders, estimate_total, actual_total,
+       estimate_on_actual, actual_orders, resolved_orders, parts_total)
+    SELECT date_trunc('month', w.opened_at, 'UTC'), w.dept_id, r.category_id, r.area_id,
+           sum(w.sign),
+           sum(w.sign * coalesce(w.cost_estimate, 0)),
+           sum(w.sign * coalesce(w.cost_actual, 0)),
+           sum(w.sign * CASE WHEN w.cost_actual IS NOT NULL THEN coalesce(w.cost_estimate, 0) ELSE 0 END),
+           sum(w.sign * (w.cost_actual IS NOT NULL)::int),
+           sum(w.sign * (w.closed_at IS NOT NULL)::int),
+           sum(w.sign * coalesce(p.total, 0))
+    FROM (%s) w
+    JOIN report_dims r ON r.report_id = w.report_id
+    LEFT JOIN LATERAL (
+      SELECT sum(x.qty * x.unit_cost) AS total
+      FROM (
+        SELECT qty, unit_cost FROM work_part WHERE wo_id = w.wo_id
+        UNION ALL
+        SELECT qty, unit_cost FROM work_part_archive WHERE wo_id = w.wo_id
+      ) x
+    ) p ON TRUE
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (month_start, dept_id, category_id, area_id) DO UPDATE SET
+      work_orders        = c.work_orders        + EXCLUDED.work_orders,
+      estimate_total     = c.estimate_total     + EXCLUDED.estimate_total,
+      actual_total       = c.actual_total       + EXCLUDED.actual_total,
+      estimate_on_actual = c.estimate_on_actual + EXCLUDED.estimate_on_actual,
+      actual_orders      = c.actual_orders      + EXCLUDED.actual_orders,
+      resolved_orders    = c.resolved_orders    + EXCLUDED.resolved_orders,
+      parts_total        = c.parts_total        + EXCLUDED.parts_total
+  $q$, src);
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION work_part_cost_on_change() RETURNS trigger AS $$
+DECLARE
+  src TEXT := CASE TG_OP
+    WHEN 'INSERT' THEN 'SELECT n.wo_id, n.qty * n.unit_cost FROM new_rows n'
+    WHEN 'DELETE' THEN 'SELECT o.wo_id, -(o.qty * o.unit_cost) FROM old_rows o'
+    ELSE 'SELECT n.wo_id, n.qty * n.unit_cost FROM new_rows n UNION ALL SELECT o.wo_id, -(o.qty * o.unit_cost) FROM old_rows o'
+  END;
+BEGIN
+  IF current_setting('gridwatch.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  EXECUTE format($q$
+    INSERT INTO work_order_cost_monthly AS c (month_start, dept_id, category_id, area_id, parts_total)
+    SELECT date_trunc('month', w.opened_at, 'UTC'), w.dept_id, r.category_id, r.area_id, sum(p.amount)
+    FROM (%s) p(wo_id, amount)
+    JOIN (
+      SELECT wo_id, report_id, dept_id, opened_at FROM work_order
+      UNION ALL
+      SELECT wo_id, report_id, dept_id, opened_at FROM work_order_archive
+    ) w ON w.wo_id = p.wo_id
+    JOIN report_dims r ON r.report_id = w.report_id
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (month_start, dept_id, category_id, area_id) DO UPDATE SET
+      parts_total = c.parts_total + EXCLUDED.parts_total
+  $q$, src);
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  t   TEXT;
+  fn  TEXT;
+  op  TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['work_order', 'work_order_archive', 'work_part', 'work_part_archive'] LOOP
+    fn := CASE WHEN t LIKE 'work_order%' THEN 'work_order_cost_on_change' ELSE 'work_part_cost_on_change' END;
+    -- a trigger with transition tables fires on a single event type
+    FOREACH op IN ARRAY ARRAY['insert', 'update', 'delete'] LOOP
+      EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', format('trg_%s_cost_%s', t, op), t);
+      EXECUTE format(
+        'CREATE TRIGGER %I AFTER %s ON %I REFERENCING %s FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+        format('trg_%s_cost_%s', t, op), upper(op), t,
+        CASE op
+          WHEN 'insert' THEN 'NEW TABLE AS new_rows'
+          WHEN 'delete' THEN 'OLD TABLE AS old_rows'
+          ELSE 'OLD TABLE AS old_rows NEW TABLE AS new_rows'
+        END,
+        fn
+      );
+    END LOOP;
+  END LOOP;
+END $$;
+
+-- Full recompute from the hot + archive tables.
+CREATE OR REPLACE FUNCTION rebuild_work_order_costs() RETURNS void AS $$
+BEGIN
+  TRUNCATE work_order_cost_monthly;
+
+  INSERT INTO work_order_cost_monthly
+    (month_start, dept_id, category_id, area_id, work_orders, estimate_total, actual_total,
+     estimate_on_actual, actual_orders, resolved_orders, parts_total)
+  SELECT date_trunc('month', w.opened_at, 'UTC'), w.dept_id, r.category_id, r.area_id,
+         count(*),
+         coalesce(sum(w.cost_estimate), 0),
+         coalesce(sum(w.cost_actual), 0),
+         coalesce(sum(w.cost_estimate) FILTER (WHERE w.cost_actual IS NOT NULL), 0),
+         count(w.cost_actual),
+         count(w.closed_at),
+         coalesce(sum(p.total), 0)
+  FROM (
+    SELECT * FROM work_order
+    UNION ALL
+    SELECT * FROM work_order_archive
+  ) w
+  JOIN report_dims r ON r.report_id = w.report_id
+  LEFT JOIN (
+    SELECT wo_id, sum(qty * unit_cost) AS total
+    FROM (
+      SELECT wo_id, qty, unit_cost FROM work_part
+      UNION ALL
+      SELECT wo_id, qty, unit_cost FROM work_part_archive
+    ) x
+    GROUP BY wo_id
+  ) p ON p.wo_id = w.wo_id
+  GROUP BY 1, 2, 3, 4;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION work_order_cost_on_truncate() RETURNS trigger AS $$
+BEGIN
+  PERFORM rebuild_work_order_costs();
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_work_order_cost_truncate ON work_order;
+CREATE TRIGGER trg_work_order_cost_truncate
+  AFTER TRUNCATE ON work_order
+  FOR EACH STATEMENT EXECUTE FUNCTION work_order_cost_on_truncate();
+
+DROP TRIGGER IF EXISTS trg_work_part_cost_truncate ON work_part;
+CREATE TRIGGER trg_work_part_cost_truncate
+  AFTER TRUNCATE ON work_part
+  FOR EACH STATEMENT EXECUTE FUNCTION work_order_cost_on_truncate();
+
+SELECT rebuild_work_order_costs();
@@ -0,0 +1,175 @@
+-- Feed.sql — per-user activity feeds for GET /users/{id}/feed
+--
+-- feed_event : one row per status change / comment on a report that has
+--              subscribers, with what a feed item displays (report title,
+--              status, note or comment excerpt) copied in
+-- user_feed  : (user_id, event_id) timeline rows, one per subscriber
+--
+-- Fan-out on write: statement-level triggers on status_update and comment
+-- turn each INSERT statement into one feed_event insert, and a trigger on
+-- feed_event copies the new events to every subscriber with one set-based
+-- INSERT ... SELECT from subscription. A feed page is then an index range
+-- scan on user_feed's primary key (user_id, event_id) plus primary-key
+-- probes into feed_event.
+--
+-- Fan-out on read: events on reports with feed_fanout_limit() or more
+-- subscribers are stored with fanned_out = false and copied to nobody;
+-- backend/services/feed_service.py merges them into each subscriber's page
+-- with a LATERAL subquery per subscription: one idx_feed_event_pulled range
+-- scan per followed report, stopping after the page's limit + 1 rows. The
+-- flag is fixed per event, so a report crossing the limit never produces
+-- duplicates or gaps.
+--
+-- Events on reports without subscribers are not recorded (a later
+-- subscriber only sees what happens after subscribing), and bulk loads that
+-- insert history before subscriptions can call rebuild_user_feeds(window).
+-- Archiving leaves feed rows in place; deleting a report removes them.
+-- Run after Timeseries.sql. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS feed_event (
+    event_id            BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    report_id           BIGINT NOT NULL,
+    report_title        TEXT NOT NULL,
+    kind                TEXT NOT NULL CHECK (kind IN ('status', 'comment')),
+    source_id           BIGINT NOT NULL,        -- status_update.status_id / comment.comment_id
+    actor_id            BIGINT NOT NULL,
+    status              report_status,          -- status events only
+    excerpt             TEXT,                   -- note / comment body, first 280 chars
+    occurred_at         TIMESTAMPTZ NOT NULL,
+    fanned_out          BOOLEAN NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_feed (
+    user_id             BIGINT NOT NULL,
+    event_id            BIGINT NOT NULL,
+    PRIMARY KEY (user_id, event_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_feed_event_report  ON feed_event (report_id);
+-- fan-out-on-read events only, so probing an ordinary report finds nothing
+CREATE INDEX IF NOT EXISTS idx_feed_event_pulled  ON feed_event (report_id, event_id) WHERE NOT fanned_out;
+CREATE INDEX IF NOT EXISTS idx_subscription_user  ON subscription (user_id);
+
+-- subscriber count at which a report's events stop being copied per user
+CREATE OR REPLACE FUNCTION feed_fanout_limit() RETURNS INT
+AS $$ SELECT 1000 $$ LANGUAGE sql IMMUTABLE;
+
+-- subscribers of a report, counted up to feed_fanout_limit()
+CREATE OR REPLACE FUNCTION feed_reach(rid BIGINT) RETURNS INT AS $$
+  SELECT count(*)::int
+  FROM (SELECT 1 FROM subscription WHERE report_id = rid LIMIT feed_fanout_limit()) s
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION feed_on_status_insert() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO feed_event (report_id, report_title, kind, source_id, actor_id, status, excerpt, occurred_at, fanned_out)
+  SELECT n.report_id, r.title, 'status', n.status_id, n.changed_by, n.status, left(n.note, 280), n.changed_at,
+         reach.subscribers < feed_fanout_limit()
+  FROM new_rows n
+  JOIN report r ON r.report_id = n.report_id
+  JOIN (
+    SELECT report_id, feed_reach(report_id) AS subscribers
+    FROM (SELECT DISTINCT report_id FROM new_rows) d
+  ) reach ON reach.report_id = n.report_id
+  WHERE reach.subscribers > 0
+  ORDER BY n.status_id;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION feed_on_comment_insert() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO feed_event (report_id, report_title, kind, source_id, actor_id, status, excerpt, occurred_at, fanned_out)
+  SELECT n.report_id, r.title, 'comment', n.comment_id, n.user_id, NULL, left(n.body, 280), n.created_at,
+         reach.subscribers < feed_fanout_limit()
+  FROM new_rows n
+  JOIN report r ON r.report_id = n.report_id
+  JOIN (
+    SELECT report_id, feed_reach(report_id) AS subscribers
+    FROM (SELECT DISTINCT report_id FROM new_rows) d
+  ) reach ON reach.report_id = n.report_id
+  WHERE reach.subscribers > 0
+  ORDER BY n.comment_id;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION feed_fan_out() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO user_feed (user_id, event_id)
+  SELECT s.user_id, n.event_id
+  FROM new_rows n
+  JOIN subscription s ON s.report_id = n.report_id
+  WHERE n.fanned_out
+  ON CONFLICT DO NOTHING;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_status_update_feed ON status_update;
+CREATE TRIGGER trg_status_update_feed
+  AFTER INSERT ON status_update
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION feed_on_status_insert();
+
+DROP TRIGGER IF EXISTS trg_comment_feed ON comment;
+CREATE TRIGGER trg_comment_feed
+  AFTER INSERT ON comment
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION feed_on_comment_insert();
+
+DROP TRIGGER IF EXISTS trg_feed_event_fan_out ON feed_event;
+CREATE TRIGGER trg_feed_event_fan_out
+  AFTER INSERT ON feed_event
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION feed_fan_out();
+
+-- Recompute feeds from the hot tables' history inside `since`, treating
+-- current subscribers as subscribed throughout (seed / bench loads insert
+-- history before subscriptions, so the triggers see nobody to notify).
+CREATE OR REPLACE FUNCTION rebuild_user_feeds(since INTERVAL DEFAULT INTERVAL '90 days') RETURNS BIGINT AS $$
+DECLARE
+  events BIGINT;
+BEGIN
+  TRUNCATE user_feed, feed_event RESTART IDENTITY;
+
+  WITH src AS (
+    SELECT report_id, 'status' AS kind, status_id AS source_id, changed_by AS actor_id,
+           status, note AS body, changed_at AS occurred_at
+    FROM status_update
+    WHERE changed_at >= now() - since
+    UNION ALL
+    SELECT report_id, 'comment', comment_id, user_id, NULL::report_status, body, created_at
+    FROM comment
+    WHERE created_at >= now() - since
+  ),
+  reach AS (
+    SELECT report_id, feed_reach(report_id) AS subscribers
+    FROM (SELECT DISTINCT report_id FROM src) d
+  )
+  INSERT INTO feed_event (report_id, report_title, kind, source_id, actor_id, status, excerpt, occurred_at, fanned_out)
+  SELECT src.report_id, r.title, src.kind, src.source_id, src.actor_id, src.status, left(src.body, 280),
+         src.occurred_at, reach.subscribers < feed_fanout_limit()
+  FROM src
+  JOIN reach ON reach.report_id = src.report_id
+  JOIN report r ON r.report_id = src.report_id
+  WHERE reach.subscribers > 0
+  ORDER BY src.occurred_at, src.source_id;
+
+  GET DIAGNOSTICS events = ROW_COUNT;
+  RETURN events;
+END $$ LANGUAGE plpgsql;
+
+-- seed resets truncate the source tables; drop the feeds with them
+CREATE OR REPLACE FUNCTION feed_on_truncate() RETURNS trigger AS $$
+BEGIN
+  TRUNCATE user_feed, feed_event RESTART IDENTITY;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_status_update_feed_truncate ON status_update;
+CREATE TRIGGER trg_status_update_feed_truncate
+  AFTER TRUNCATE ON status_update
+  FOR EACH STATEMENT EXECUTE FUNCTION feed_on_truncate();
+
+DROP TRIGGER IF EXISTS trg_comment_feed_truncate ON comment;
+CREATE TRIGGER trg_comment_feed_truncate
+  AFTER TRUNCATE ON comment
+  FOR EACH STATEMENT EXECUTE FUNCTION feed_on_truncate();
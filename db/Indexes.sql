@@ -0,0 +1,32 @@
+-- Indexes.sql — indexes found missing by the query-plan suite (bench/plans.py)
+--
+-- idx_report_archive_area / _category : the archived tier had no filter
+--   indexes, so ?area_id= / ?category_id= listings with include_archived (or
+--   status=CLOSED / RESOLVED) read all of report_archive to keep a few
+--   percent. Same columns as idx_report_area / idx_report_category on report.
+-- idx_status_update_resolved : /analytics/resolution-times only wants the
+--   RESOLVED / CLOSED changes of hot reports, a sliver of status_update;
+--   partial, so it stays small and needs no upkeep on the other statuses.
+-- idx_report_created / _status_keyset / _area_keyset : faceted list pages
+--   (GET /reports/?facets=true) read the newest limit + 1 matches by keyset
+--   on (created_at, report_id); without them every page sorted all matching
+--   hot reports, and status / area filtered pages walked past thousands of
+--   newer non-matching rows. The status / area ones end in report_id too:
+--   on (x, created_at) alone the planner preferred walking idx_report_created
+--   backwards and filtering (status=CLOSED pages read ~6k buffers at 1M
+--   reports), since the keyset order needed a sort on report_id.
+--
+-- Run after Archive.sql. Safe to re-run.
+
+CREATE INDEX IF NOT EXISTS idx_report_archive_area     ON report_archive (area_id);
+CREATE INDEX IF NOT EXISTS idx_report_archive_category ON report_archive (category_id);
+
+CREATE INDEX IF NOT EXISTS idx_status_update_resolved
+    ON status_update (report_id, changed_at)
+    WHERE status IN ('RESOLVED', 'CLOSED');
+
+CREATE INDEX IF NOT EXISTS idx_report_created        ON report (created_at, report_id);
+DROP INDEX IF EXISTS idx_report_status_created;
+DROP INDEX IF EXISTS idx_report_area_created;
+CREATE INDEX IF NOT EXISTS idx_report_status_keyset  ON report (current_status, created_at, report_id);
+CREATE INDEX IF NOT EXISTS idx_report_area_keyset    ON report (area_id, created_at, report_id);
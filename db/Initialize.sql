@@ -25,6 +25,30 @@ SELECT format('CREATE DATABASE %I', :'DB')\gexec
 \echo --- ProjectSchema.sql ---
 \i ProjectSchema.sql
 
+\echo --- Versioning.sql ---
+\i Versioning.sql
+
+\echo --- Partitioning.sql ---
+\i Partitioning.sql
+
+\echo --- Archive.sql ---
+\i Archive.sql
+
+\echo --- Timeseries.sql ---
+\i Timeseries.sql
+
+\echo --- Feed.sql ---
+\i Feed.sql
+
+\echo --- Costs.sql ---
+\i Costs.sql
+
+\echo --- Indexes.sql ---
+\i Indexes.sql
+
+\echo --- Jobs.sql ---
+\i Jobs.sql
+
 \echo --- DataSeeding.sql ---
 \i DataSeeding.sql
 
@@ -32,6 +56,11 @@ SELECT format('CREATE DATABASE %I', :'DB')\gexec
 \i InsertFurther.sql
 \i InsertRecent.sql
 
+-- seeded history lands in the default partition; give it monthly ones
+SELECT maintain_status_update_partitions();
+-- seeded history predates the seeded subscriptions; fan it out now
+SELECT rebuild_user_feeds();
+
 \echo --- Verification.sql ---
 \i Verification.sql
 
@@ -0,0 +1,41 @@
+-- Jobs.sql — background job queue behind /jobs and `python -m backend.manage worker`
+--
+-- job : one row per submitted job. The API inserts it as QUEUED; a worker
+--       process claims the oldest queued job of a type with
+--       UPDATE ... WHERE job_id = (SELECT ... FOR UPDATE SKIP LOCKED LIMIT 1),
+--       so concurrent workers never wait on or double-claim a row, and keeps
+--       heartbeat_at / progress current while it runs. result holds a small
+--       JSON summary (exports also write a file, see JOB_RESULT_DIR).
+--
+-- Per-type concurrency limits are not stored here: a worker holds the
+-- session-level advisory lock (hashtext('gridwatch.job:' || job_type), slot)
+-- for one of the type's slots while it runs a job of that type, so a crashed
+-- worker frees its slot with its connection. RUNNING jobs whose heartbeat is
+-- older than JOB_STALE_SECONDS are requeued (or failed after
+-- JOB_MAX_ATTEMPTS) by the next worker that looks.
+-- Run after ProjectSchema.sql. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS job (
+    job_id              BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    job_type            TEXT NOT NULL,
+    params              JSONB NOT NULL DEFAULT '{}',
+    status              TEXT NOT NULL DEFAULT 'QUEUED'
+                        CHECK (status IN ('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED')),
+    progress            REAL NOT NULL DEFAULT 0 CHECK (progress BETWEEN 0 AND 1),
+    progress_note       TEXT,
+    result              JSONB,
+    error               TEXT,
+    cancel_requested    BOOLEAN NOT NULL DEFAULT FALSE,
+    attempts            INT NOT NULL DEFAULT 0,
+    worker              TEXT,                   -- host:pid of the claiming worker process
+    submitted_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at          TIMESTAMPTZ,
+    heartbeat_at        TIMESTAMPTZ,
+    finished_at         TIMESTAMPTZ
+);
+
+-- the claim: oldest queued job of a type; holds only the queue, so it stays small
+CREATE INDEX IF NOT EXISTS idx_job_queued   ON job (job_type, job_id) WHERE status = 'QUEUED';
+-- the stale sweep
+CREATE INDEX IF NOT EXISTS idx_job_running  ON job (heartbeat_at) WHERE status = 'RUNNING';
+CREATE INDEX IF NOT EXISTS idx_job_type     ON job (job_type, job_id);
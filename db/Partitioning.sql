@@ -0,0 +1,114 @@
+-- Partitioning.sql — monthly range partitions for status_update
+--
+-- status_update is append-only and grows with every transition plus the
+-- imported 311 history. It is converted (once) into a table partitioned by
+-- changed_at, one partition per UTC month, with a DEFAULT partition for
+-- rows outside the created ranges:
+--
+--   status_update_pYYYY_MM  : FOR VALUES FROM (month start) TO (next month)
+--   status_update_default   : anything else, until a partition is created
+--
+-- Identity columns are not allowed on partitioned tables, so status_id takes
+-- its value from status_update_id_seq (owned by the column, so TRUNCATE ...
+-- RESTART IDENTITY still resets it). The primary key must include the
+-- partition key: (status_id, changed_at).
+--
+-- ensure_status_update_partitions(from, to) creates any missing monthly
+-- partitions in [from, to), moving matching rows out of the default
+-- partition first. maintain_status_update_partitions(months_ahead) covers
+-- everything from the oldest row in the default partition to a few months
+-- ahead of now(); `python -m backend.manage ensure-partitions` runs it and
+-- should be scheduled monthly (bulk loads call it afterwards).
+--
+-- Run before Timeseries.sql: converting an existing table drops the
+-- triggers on the old one, so re-run Timeseries.sql after upgrading.
+-- Safe to re-run.
+
+CREATE OR REPLACE FUNCTION ensure_status_update_partitions(from_ts TIMESTAMPTZ, to_ts TIMESTAMPTZ)
+RETURNS INT AS $$
+DECLARE
+  lo      TIMESTAMPTZ := date_trunc('month', from_ts, 'UTC');
+  hi      TIMESTAMPTZ;
+  part    TEXT;
+  created INT := 0;
+BEGIN
+  WHILE lo < to_ts LOOP
+    hi   := lo + INTERVAL '1 month';
+    part := format('status_update_p%s', to_char(lo AT TIME ZONE 'UTC', 'YYYY_MM'));
+
+    IF to_regclass(part) IS NULL THEN
+      -- rows for this month may already sit in the default partition; move
+      -- them into a standalone table and attach it as the new partition
+      EXECUTE format('CREATE TABLE %I (LIKE status_update INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+      EXECUTE format(
+        'WITH moved AS (DELETE FROM status_update_default WHERE changed_at >= $1 AND changed_at < $2 RETURNING *)
+         INSERT INTO %I SELECT * FROM moved', part
+      ) USING lo, hi;
+      EXECUTE format(
+        'ALTER TABLE status_update ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)', part, lo, hi
+      );
+      created := created + 1;
+    END IF;
+
+    lo := hi;
+  END LOOP;
+  RETURN created;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_status_update_partitions(months_ahead INT DEFAULT 3)
+RETURNS INT AS $$
+BEGIN
+  RETURN ensure_status_update_partitions(
+    least(now(), (SELECT min(changed_at) FROM status_update_default)),
+    now() + make_interval(months => months_ahead)
+  );
+END $$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+  lo TIMESTAMPTZ;
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = 'status_update'::regclass) = 'p' THEN
+    RETURN;  -- already partitioned
+  END IF;
+
+  ALTER TABLE status_update RENAME TO status_update_unpartitioned;
+
+  CREATE SEQUENCE status_update_id_seq;
+
+  CREATE TABLE status_update (
+      status_id           BIGINT NOT NULL DEFAULT nextval('status_update_id_seq'),
+      report_id           BIGINT NOT NULL,
+      status              report_status NOT NULL,
+      note                TEXT,
+      changed_by          BIGINT NOT NULL,
+      changed_at          TIMESTAMPTZ NOT NULL DEFAULT now(),
+      PRIMARY KEY (status_id, changed_at),
+      FOREIGN KEY (report_id) REFERENCES report(report_id),
+      FOREIGN KEY (changed_by) REFERENCES "user"(user_id)
+  ) PARTITION BY RANGE (changed_at);
+
+  ALTER SEQUENCE status_update_id_seq OWNED BY status_update.status_id;
+
+  CREATE TABLE status_update_default PARTITION OF status_update DEFAULT;
+
+  -- report detail / history and the resolution-time CTE look up by report
+  CREATE INDEX idx_status_update_report ON status_update (report_id, changed_at);
+
+  SELECT min(changed_at) INTO lo FROM status_update_unpartitioned;
+  PERFORM ensure_status_update_partitions(coalesce(lo, now()), now() + INTERVAL '3 months');
+
+  INSERT INTO status_update (status_id, report_id, status, note, changed_by, changed_at)
+  SELECT status_id, report_id, status, note, changed_by, changed_at
+  FROM status_update_unpartitioned;
+
+  PERFORM setval(
+    'status_update_id_seq',
+    coalesce((SELECT max(status_id) FROM status_update), 0) + 1,
+    false
+  );
+
+  DROP TABLE status_update_unpartitioned;
+END $$;
+
+SELECT maintain_status_update_partitions();
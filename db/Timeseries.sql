@@ -0,0 +1,179 @@
+-- Timeseries.sql — pre-aggregated activity buckets for /analytics/timeseries
+--
+-- report_activity_hourly : counts per (dimension, UTC hour, group)
+-- report_activity_daily  : same shape per UTC day, rolled up from hourly
+-- report_activity_rollup : daily_until, the first day not rolled up yet
+--
+--   dimension 'category' / 'area' : reports created, group_id = category_id / area_id
+--   dimension 'status'            : status_update rows entering `status`, group_id = 0
+--
+-- Each dimension is stored separately so a chart reads only the rows it
+-- returns (a year of daily totals per category is 365 x categories rows),
+-- never the category x area x status cross product.
+--
+-- Statement-level triggers with transition tables keep the hourly grain
+-- current for every writer, so a bulk INSERT costs one upsert per touched
+-- hour bucket rather than one per row. roll_up_report_activity() (nightly,
+-- `python -m backend.manage rollup-timeseries`) sums the finished days of
+-- hourly into daily and moves daily_until on; day / week reads take daily
+-- rows before daily_until and hourly rows from there on. Only back-dated
+-- rows (before daily_until, e.g. a 311 import) are added to daily by the
+-- triggers themselves.
+--
+-- Buckets record activity as it happened: deleting or re-categorising a
+-- report does not rewrite history. TRUNCATE of either base table (seed
+-- resets) recomputes from whatever rows remain, as does
+-- rebuild_report_activity(). Archiving moves rows without touching buckets.
+-- Run after Archive.sql. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS report_activity_hourly (
+    dimension           TEXT NOT NULL CHECK (dimension IN ('category', 'area', 'status')),
+    bucket_start        TIMESTAMPTZ NOT NULL,
+    group_id            BIGINT NOT NULL DEFAULT 0,
+    status              report_status NOT NULL DEFAULT 'SUBMITTED',
+    count               BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, bucket_start, group_id, status)
+);
+
+CREATE TABLE IF NOT EXISTS report_activity_daily (
+    dimension           TEXT NOT NULL CHECK (dimension IN ('category', 'area', 'status')),
+    bucket_start        TIMESTAMPTZ NOT NULL,
+    group_id            BIGINT NOT NULL DEFAULT 0,
+    status              report_status NOT NULL DEFAULT 'SUBMITTED',
+    count               BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, bucket_start, group_id, status)
+);
+
+CREATE TABLE IF NOT EXISTS report_activity_rollup (
+    id                  SMALLINT PRIMARY KEY DEFAULT 1,
+    daily_until         TIMESTAMPTZ NOT NULL DEFAULT '-infinity',
+    CONSTRAINT single_row CHECK (id = 1)
+);
+
+INSERT INTO report_activity_rollup(id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION report_activity_on_report_insert() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO report_activity_hourly AS b (dimension, bucket_start, group_id, count)
+  SELECT d.dimension, date_trunc('hour', n.created_at, 'UTC'), d.group_id, count(*)
+  FROM new_rows n
+  CROSS JOIN LATERAL (VALUES ('category', n.category_id), ('area', n.area_id)) AS d(dimension, group_id)
+  GROUP BY 1, 2, 3
+  ON CONFLICT (dimension, bucket_start, group_id, status)
+  DO UPDATE SET count = b.count + EXCLUDED.count;
+
+  -- back-dated rows: their day is already rolled up
+  INSERT INTO report_activity_daily AS b (dimension, bucket_start, group_id, count)
+  SELECT d.dimension, date_trunc('day', n.created_at, 'UTC'), d.group_id, count(*)
+  FROM new_rows n
+  CROSS JOIN LATERAL (VALUES ('category', n.category_id), ('area', n.area_id)) AS d(dimension, group_id)
+  WHERE n.created_at < (SELECT daily_until FROM report_activity_rollup)
+  GROUP BY 1, 2, 3
+  ON CONFLICT (dimension, bucket_start, group_id, status)
+  DO UPDATE SET count = b.count + EXCLUDED.count;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION report_activity_on_status_insert() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO report_activity_hourly AS b (dimension, bucket_start, status, count)
+  SELECT 'status', date_trunc('hour', changed_at, 'UTC'), status, count(*)
+  FROM new_rows
+  GROUP BY 2, 3
+  ON CONFLICT (dimension, bucket_start, group_id, status)
+  DO UPDATE SET count = b.count + EXCLUDED.count;
+
+  INSERT INTO report_activity_daily AS b (dimension, bucket_start, status, count)
+  SELECT 'status', date_trunc('day', changed_at, 'UTC'), status, count(*)
+  FROM new_rows
+  WHERE changed_at < (SELECT daily_until FROM report_activity_rollup)
+  GROUP BY 2, 3
+  ON CONFLICT (dimension, bucket_start, group_id, status)
+  DO UPDATE SET count = b.count + EXCLUDED.count;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_report_activity ON report;
+CREATE TRIGGER trg_report_activity
+  AFTER INSERT ON report
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION report_activity_on_report_insert();
+
+DROP TRIGGER IF EXISTS trg_status_update_activity ON status_update;
+CREATE TRIGGER trg_status_update_activity
+  AFTER INSERT ON status_update
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION report_activity_on_status_insert();
+
+-- Sum the finished days of hourly into daily. The SHARE lock waits for
+-- in-flight bucket writes and holds new ones off for the few ms this takes,
+-- so no hourly row of a day being rolled up is missed: writers that commit
+-- afterwards see the new daily_until and add back-dated rows to daily
+-- themselves.
+CREATE OR REPLACE FUNCTION roll_up_report_activity() RETURNS TIMESTAMPTZ AS $$
+DECLARE
+  old_until TIMESTAMPTZ;
+  new_until TIMESTAMPTZ := date_trunc('day', now(), 'UTC');
+BEGIN
+  LOCK TABLE report_activity_hourly IN SHARE MODE;
+  SELECT daily_until INTO old_until FROM report_activity_rollup FOR UPDATE;
+  IF new_until <= old_until THEN
+    RETURN old_until;
+  END IF;
+
+  INSERT INTO report_activity_daily AS b (dimension, bucket_start, group_id, status, count)
+  SELECT dimension, date_trunc('day', bucket_start, 'UTC'), group_id, status, sum(count)
+  FROM report_activity_hourly
+  WHERE bucket_start >= old_until AND bucket_start < new_until
+  GROUP BY 1, 2, 3, 4
+  ON CONFLICT (dimension, bucket_start, group_id, status)
+  DO UPDATE SET count = b.count + EXCLUDED.count;
+
+  UPDATE report_activity_rollup SET daily_until = new_until;
+  RETURN new_until;
+END $$ LANGUAGE plpgsql;
+
+-- Full recompute: hourly from the hot + archive tables, then the rollup.
+CREATE OR REPLACE FUNCTION rebuild_report_activity() RETURNS void AS $$
+BEGIN
+  TRUNCATE report_activity_hourly, report_activity_daily;
+  UPDATE report_activity_rollup SET daily_until = '-infinity';
+
+  INSERT INTO report_activity_hourly (dimension, bucket_start, group_id, status, count)
+  SELECT d.dimension, date_trunc('hour', r.created_at, 'UTC'), d.group_id, 'SUBMITTED', count(*)
+  FROM (
+    SELECT created_at, category_id, area_id FROM report
+    UNION ALL
+    SELECT created_at, category_id, area_id FROM report_archive
+  ) r
+  CROSS JOIN LATERAL (VALUES ('category', r.category_id), ('area', r.area_id)) AS d(dimension, group_id)
+  GROUP BY 1, 2, 3
+  UNION ALL
+  SELECT 'status', date_trunc('hour', changed_at, 'UTC'), 0, status, count(*)
+  FROM (
+    SELECT changed_at, status FROM status_update
+    UNION ALL
+    SELECT changed_at, status FROM status_update_archive
+  ) s
+  GROUP BY 2, 4;
+
+  PERFORM roll_up_report_activity();
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION report_activity_on_truncate() RETURNS trigger AS $$
+BEGIN
+  PERFORM rebuild_report_activity();
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_report_activity_truncate ON report;
+CREATE TRIGGER trg_report_activity_truncate
+  AFTER TRUNCATE ON report
+  FOR EACH STATEMENT EXECUTE FUNCTION report_activity_on_truncate();
+
+DROP TRIGGER IF EXISTS trg_status_update_activity_truncate ON status_update;
+CREATE TRIGGER trg_status_update_activity_truncate
+  AFTER TRUNCATE ON status_update
+  FOR EACH STATEMENT EXECUTE FUNCTION report_activity_on_truncate();
+
+SELECT rebuild_report_activity();
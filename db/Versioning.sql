@@ -0,0 +1,65 @@
+-- Versioning.sql — change versions for conditional GETs / response caching
+--
+-- report.row_version   : bumped on every UPDATE of a report row
+-- report_table_version : 64 counter slots; each statement that inserts,
+--                        updates, deletes or truncates report bumps one,
+--                        and the table version is their sum
+--
+-- Both are maintained by triggers so every writer (API, seed scripts,
+-- 311 import) invalidates cached responses. A writer holds its slot's row
+-- lock until it commits, so the version moves exactly when the write
+-- becomes visible (a sequence would move before, letting a reader tag
+-- pre-write data with the new version). The slot is picked with
+-- SKIP LOCKED, so concurrent writers never wait on each other's slot.
+-- Safe to re-run.
+
+ALTER TABLE report ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT 1;
+
+CREATE TABLE IF NOT EXISTS report_table_version (
+    id                  SMALLINT PRIMARY KEY,
+    version             BIGINT NOT NULL DEFAULT 0,
+    changed_at          TIMESTAMPTZ NOT NULL DEFAULT now(),
+    CONSTRAINT slot_range CHECK (id BETWEEN 0 AND 63)
+);
+
+-- upgrade from the single-row counter (id = 1), keeping its count
+ALTER TABLE report_table_version DROP CONSTRAINT IF EXISTS single_row;
+ALTER TABLE report_table_version ALTER COLUMN id DROP DEFAULT;
+ALTER TABLE report_table_version ALTER COLUMN version SET DEFAULT 0;
+INSERT INTO report_table_version(id) SELECT generate_series(0, 63) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION report_bump_row_version() RETURNS trigger AS $$
+BEGIN
+  NEW.row_version := OLD.row_version + 1;
+  RETURN NEW;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION report_bump_table_version() RETURNS trigger AS $$
+BEGIN
+  -- a free slot, trying this backend's own first (so the statements of one
+  -- transaction keep reusing the slot it already holds)
+  UPDATE report_table_version SET version = version + 1, changed_at = now()
+  WHERE id = (
+    SELECT id FROM report_table_version
+    ORDER BY (id + pg_backend_pid()) % 64
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+  );
+  IF NOT FOUND THEN
+    -- 64 other transactions are mid-write: wait for the slot the pick above
+    -- prefers, the one where (id + pid) % 64 = 0
+    UPDATE report_table_version SET version = version + 1, changed_at = now()
+    WHERE id = (64 - pg_backend_pid() % 64) % 64;
+  END IF;
+  RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_report_row_version ON report;
+CREATE TRIGGER trg_report_row_version
+  BEFORE UPDATE ON report
+  FOR EACH ROW EXECUTE FUNCTION report_bump_row_version();
+
+DROP TRIGGER IF EXISTS trg_report_table_version ON report;
+CREATE TRIGGER trg_report_table_version
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON report
+  FOR EACH STATEMENT EXECUTE FUNCTION report_bump_table_version();
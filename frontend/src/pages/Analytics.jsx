@@ -1,6 +1,6 @@
 // src/pages/Analytics.jsx
 import React, { useEffect, useMemo, useState } from "react";
-import { getReports } from "../utils/api.js";
+import { getReports, getTimeseries } from "../utils/api.js";
 
 // same notion as Home.jsx
 function isOpenStatus(status) {
@@ -19,6 +19,7 @@ function isBreaching(report) {
 
 export default function Analytics() {
   const [reports, setReports] = useState([]);
+  const [dailySeries, setDailySeries] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
@@ -28,9 +29,14 @@ export default function Analytics() {
     async function load() {
       try {
         setLoading(true);
-        const data = await getReports();
+        // daily volume comes pre-bucketed from the backend
+        const [data, series] = await Promise.all([
+          getReports(),
+          getTimeseries({ interval: "day", group_by: "category" }),
+        ]);
         if (!cancelled) {
           setReports(data || []);
+          setDailySeries(series);
           setError("");
         }
       } catch (err) {
@@ -71,9 +77,6 @@ export default function Analytics() {
     const deptBuckets = new Map();
     const dailyMap = new Map();
 
-    const now = Date.now();
-    const THIRTY_DAYS_MS = 30 * 24 * 60 * 60 * 1000;
-
     for (const r of reports) {
       const status = String(r.current_status || "UNKNOWN").toUpperCase();
       const sevRaw = String(r.severity_label || "UNKNOWN").toUpperCase();
@@ -131,15 +134,12 @@ export default function Analytics() {
         entry.score += weight;
         if (sev === "HIGH") entry.highOpen += 1;
       }
+    }
 
-      // daily volume (last 30 days)
-      if (r.created_at) {
-        const ts = new Date(r.created_at).getTime();
-        if (now - ts <= THIRTY_DAYS_MS) {
-          const dayKey = new Date(ts).toISOString().slice(0, 10); // YYYY-MM-DD
-          dailyMap.set(dayKey, (dailyMap.get(dayKey) || 0) + 1);
-        }
-      }
+    // daily volume (last 30 days): sum the per-category buckets per day
+    for (const p of dailySeries?.points || []) {
+      const dayKey = p.bucket_start.slice(0, 10); // YYYY-MM-DD
+      dailyMap.set(dayKey, (dailyMap.get(dayKey) || 0) + p.count);
     }
 
     // finalize severity
@@ -175,7 +175,7 @@ export default function Analytics() {
     }));
 
     return result;
-  }, [reports]);
+  }, [reports, dailySeries]);
 
   return (
     <div className="min-h-screen bg-slate-950 text-slate-50">
@@ -3,7 +3,8 @@ import React, { useEffect, useState } from "react";
 import { useParams, useNavigate, Link } from "react-router-dom";
 import {
   getReport,
-  getStatuses,
+  getReportHistory,
+  getStatusTransitions,
   updateReportStatus,
   deleteReport,
 } from "../utils/api.js";
@@ -16,12 +17,13 @@ export default function ReportDetail() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
-  const [statuses, setStatuses] = useState([]);
+  const [transitions, setTransitions] = useState({});
   const [newStatus, setNewStatus] = useState("");
   const [statusNote, setStatusNote] = useState("");
   const [changingStatus, setChangingStatus] = useState(false);
 
   const [banner, setBanner] = useState("");
+  const [loadingHistory, setLoadingHistory] = useState(false);
 
   useEffect(() => {
     let cancelled = false;
@@ -29,14 +31,14 @@ export default function ReportDetail() {
     async function load() {
       try {
         setLoading(true);
-        const [detail, statusList] = await Promise.all([
+        const [detail, transitionMap] = await Promise.all([
           getReport(id),
-          getStatuses(),
+          getStatusTransitions(),
         ]);
         if (!cancelled) {
           setReport(detail);
-          setStatuses(statusList || []);
-          setNewStatus(detail.current_status || "");
+          setTransitions(transitionMap || {});
+          setNewStatus("");
           setError("");
         }
       } catch (err) {
@@ -55,6 +57,25 @@ export default function ReportDetail() {
     };
   }, [id]);
 
+  // detail embeds only the most recent entries; fetch older ones on demand
+  async function handleLoadOlder() {
+    if (!report?.status_history_next_cursor) return;
+    try {
+      setLoadingHistory(true);
+      const page = await getReportHistory(id, report.status_history_next_cursor);
+      setReport((prev) => ({
+        ...prev,
+        status_history: [...page.items.slice().reverse(), ...prev.status_history],
+        status_history_next_cursor: page.next_cursor,
+      }));
+    } catch (err) {
+      console.error(err);
+      setBanner("Failed to load older status history.");
+    } finally {
+      setLoadingHistory(false);
+    }
+  }
+
   async function handleStatusChange(e) {
     e.preventDefault();
     if (!newStatus) return;
@@ -72,6 +93,7 @@ export default function ReportDetail() {
       // re-fetch updated detail
       const updated = await getReport(id);
       setReport(updated);
+      setNewStatus("");
       setStatusNote("");
       setBanner("Status updated successfully.");
     } catch (err) {
@@ -201,6 +223,16 @@ export default function ReportDetail() {
               <h3 className="text-xs font-semibold text-slate-200 mb-2">
                 Status history
               </h3>
+              {report.status_history_next_cursor && (
+                <button
+                  type="button"
+                  onClick={handleLoadOlder}
+                  disabled={loadingHistory}
+                  className="mb-2 text-[0.7rem] text-sky-300 hover:text-sky-200 disabled:opacity-50"
+                >
+                  {loadingHistory ? "Loading…" : "Load older entries"}
+                </button>
+              )}
               {report.status_history && report.status_history.length > 0 ? (
                 <ol className="space-y-2 text-xs">
                   {report.status_history.map((entry) => (
@@ -253,11 +285,16 @@ export default function ReportDetail() {
                   onChange={(e) => setNewStatus(e.target.value)}
                 >
                   <option value="">Select status</option>
-                  {statuses.map((s) => (
+                  {/* only statuses reachable from the current one */}
+                  {(transitions[report.current_status] || []).map((s) => (
                     <option key={s} value={s}>
                       {s}
                     </option>
                   ))}
+                  {/* the current status again records the note only */}
+                  <option value={report.current_status}>
+                    {report.current_status} (note only)
+                  </option>
                 </select>
               </div>
 
@@ -276,7 +313,11 @@ export default function ReportDetail() {
 
               <button
                 type="submit"
-                disabled={changingStatus || !newStatus}
+                disabled={
+                  changingStatus ||
+                  !newStatus ||
+                  (newStatus === report.current_status && !statusNote.trim())
+                }
                 className="w-full rounded-full bg-gradient-to-r from-teal-400 via-sky-400 to-emerald-400 px-4 py-2 text-xs font-semibold text-slate-950 shadow-lg shadow-teal-500/40 hover:shadow-xl disabled:opacity-70"
               >
                 {changingStatus ? "Updating…" : "Update status"}
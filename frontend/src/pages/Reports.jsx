@@ -1,10 +1,29 @@
 // src/pages/Reports.jsx
-import React, { useEffect, useMemo, useState } from "react";
+import React, { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { getReports } from "../utils/api.js";
+import {
+  cancelJob,
+  getJob,
+  getReportPage,
+  jobResultUrl,
+  reportsExportUrl,
+  submitJob,
+} from "../utils/api.js";
 
 const PER_PAGE = 25;
 
+const NO_FILTERS = {
+  status: null,
+  area_id: null,
+  category_id: null,
+  severity_id: null,
+  created_after: null, // ISO time, set by the Last 24h toggle
+  open: false,
+  breaching: false,
+};
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
 // --- helpers reused from Home ---
 
 function timeAgo(iso) {
@@ -20,60 +39,56 @@ function timeAgo(iso) {
   return `${diffD} day${diffD === 1 ? "" : "s"} ago`;
 }
 
-function isOpenStatus(status) {
-  if (!status) return false;
-  const s = status.toUpperCase();
-  return !["RESOLVED", "CLOSED"].includes(s);
-}
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
 
-// crude SLA breach: open + older than 48h
-function isBreaching(record) {
-  if (!isOpenStatus(record.current_status) || !record.created_at) return false;
-  const created = new Date(record.created_at);
-  const diffMs = Date.now() - created.getTime();
-  return diffMs > 48 * 60 * 60 * 1000;
-}
-
-// CSV escaping
-function csvEscape(value) {
-  if (value === null || value === undefined) return "";
-  const str = String(value);
-  if (/[",\r\n]/.test(str)) {
-    return `"${str.replace(/"/g, '""')}"`;
-  }
-  return str;
-}
+// a job no worker has claimed by then is cancelled and the CSV fetched from
+// GET /reports/export instead; a claimed one gets until the deadline
+const EXPORT_QUEUE_WAIT_MS = 10 * 1000;
+const EXPORT_DEADLINE_MS = 5 * 60 * 1000;
 
 export default function Reports() {
+  // one server page at a time (GET /reports/?facets=true); the first page of a
+  // filter combination also brings the total and the per-value facet counts
   const [reports, setReports] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [facets, setFacets] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
-  const [filters, setFilters] = useState({
-    severity: "all", // "all" | "high"
-    status: "all", // "all" | "open"
-    breachingOnly: false,
-    last24h: false,
-  });
+  const [filters, setFilters] = useState(NO_FILTERS);
 
+  // cursors[i] fetches page i + 1; nextCursor is the current page's next_cursor
+  const [cursors, setCursors] = useState([null]);
   const [page, setPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState(null);
 
   // search box state
   const [searchInput, setSearchInput] = useState("");
   const [searchTerm, setSearchTerm] = useState(""); // actual applied query
 
+  const [exporting, setExporting] = useState(false);
+
   const navigate = useNavigate();
 
-  // ---- load from API once ----
+  // ---- load the current page whenever it, the filters or the search change ----
   useEffect(() => {
     let cancelled = false;
 
     async function load() {
       try {
         setLoading(true);
-        const data = await getReports(); // backend /reports
+        const data = await getReportPage(
+          { ...filters, search: searchTerm },
+          cursors[page - 1],
+          PER_PAGE
+        );
         if (!cancelled) {
-          setReports(Array.isArray(data) ? data : []);
+          setReports(data.items);
+          setNextCursor(data.next_cursor);
+          if (data.facets) {
+            setFacets(data.facets);
+            setTotal(data.total);
+          }
           setError("");
         }
       } catch (err) {
@@ -91,152 +106,150 @@ export default function Reports() {
     return () => {
       cancelled = true;
     };
-  }, []);
+  }, [filters, searchTerm, page, cursors]);
+
+  // back to the first page (and fresh counts); called with every filter or
+  // search change, so both land in one render and one request
+  const resetPaging = () => {
+    setCursors([null]);
+    setPage(1);
+  };
 
   // ---- when search input becomes empty, clear searchTerm so all reports show ----
   useEffect(() => {
-    if (searchInput.trim() === "") {
+    if (searchInput.trim() === "" && searchTerm !== "") {
       setSearchTerm("");
-      setPage(1);
+      resetPaging();
     }
-  }, [searchInput]);
-
-  // ---- apply filters + search in-memory ----
-  const filtered = useMemo(() => {
-    const now = Date.now();
-    const q = searchTerm.trim().toLowerCase();
-
-    return reports.filter((r) => {
-      const created = r.created_at ? new Date(r.created_at).getTime() : null;
-
-      // search by title
-      if (q && !(r.title || "").toLowerCase().includes(q)) {
-        return false;
-      }
-
-      if (filters.last24h && created !== null) {
-        const diff = now - created;
-        if (diff > 24 * 60 * 60 * 1000) return false;
-      }
+  }, [searchInput, searchTerm]);
 
-      if (filters.severity === "high") {
-        if ((r.severity_label || "").toUpperCase() !== "HIGH") return false;
-      }
-
-      if (filters.status === "open") {
-        if (!isOpenStatus(r.current_status)) return false;
-      }
-
-      if (filters.breachingOnly) {
-        if (!isBreaching(r)) return false;
-      }
+  const totalPages = Math.max(1, Math.ceil(total / PER_PAGE));
 
-      return true;
-    });
-  }, [reports, filters, searchTerm]);
-
-  // reset page when filters or applied searchTerm change
-  useEffect(() => {
-    setPage(1);
-  }, [filters, searchTerm]);
+  const goNext = () => {
+    if (!nextCursor) return;
+    setCursors((prev) => [...prev.slice(0, page), nextCursor]);
+    setPage((p) => p + 1);
+  };
 
-  const totalPages = Math.max(1, Math.ceil(filtered.length / PER_PAGE));
-  const currentPageReports = filtered.slice(
-    (page - 1) * PER_PAGE,
-    page * PER_PAGE
-  );
+  const goPrev = () => {
+    setPage((p) => Math.max(1, p - 1));
+  };
 
   // ---- filter handlers ----
   const handleAllGrids = () => {
-    setFilters({
-      severity: "all",
-      status: "all",
-      breachingOnly: false,
-      last24h: false,
-    });
+    setFilters(NO_FILTERS);
+    resetPaging();
   };
 
-  const toggleHighSeverity = () => {
+  // clicking the chosen value again clears that filter
+  const toggleFilter = (key, value) => {
     setFilters((prev) => ({
       ...prev,
-      severity: prev.severity === "high" ? "all" : "high",
+      [key]: prev[key] === value ? null : value,
     }));
+    resetPaging();
   };
 
-  const toggleOpen = () => {
-    setFilters((prev) => ({
-      ...prev,
-      status: prev.status === "open" ? "all" : "open",
-    }));
+  // Open / Breaching SLA: server-side open= / breaching=
+  const toggleFlag = (key) => {
+    setFilters((prev) => ({ ...prev, [key]: !prev[key] }));
+    resetPaging();
   };
 
-  const toggleBreaching = () => {
+  // the cutoff is fixed when toggled on, so every page of the list shares it
+  const toggleLast24h = () => {
     setFilters((prev) => ({
       ...prev,
-      breachingOnly: !prev.breachingOnly,
+      created_after: prev.created_after
+        ? null
+        : new Date(Date.now() - DAY_MS).toISOString(),
     }));
+    resetPaging();
   };
 
-  const toggleLast24h = () => {
-    setFilters((prev) => ({
-      ...prev,
-      last24h: !prev.last24h,
-    }));
+  const selectFilter = (key) => (e) => {
+    const value = e.target.value;
+    setFilters((prev) => ({ ...prev, [key]: value ? Number(value) : null }));
+    resetPaging();
   };
 
   // ---- search handlers ----
-  const handleSearchClick = () => {
+  const applySearch = () => {
     setSearchTerm(searchInput.trim());
+    resetPaging();
+  };
+
+  const handleSearchClick = () => {
+    applySearch();
   };
 
   const handleSearchKeyDown = (e) => {
     if (e.key === "Enter") {
       e.preventDefault();
-      setSearchTerm(searchInput.trim());
+      applySearch();
     }
   };
 
-  // ---- CSV export of *filtered* reports ----
-  const handleExportCsv = () => {
-    if (!filtered.length) return;
-
-    const header = [
-      "Report ID",
-      "Title",
-      "Area",
-      "Category",
-      "Status",
-      "Severity",
-      "Created At",
-    ];
-
-    const rows = filtered.map((r) => [
-      r.report_id,
-      r.title,
-      r.area_name,
-      r.category_name,
-      r.current_status,
-      r.severity_label,
-      r.created_at,
-    ]);
-
-    const csvLines = [header, ...rows].map((row) =>
-      row.map(csvEscape).join(",")
-    );
-    const csv = csvLines.join("\r\n");
-
-    const blob = new Blob([csv], {
-      type: "text/csv;charset=utf-8;",
-    });
-    const url = URL.createObjectURL(blob);
-
-    const link = document.createElement("a");
-    link.href = url;
-    link.download = "gridwatch_reports.csv";
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
-    URL.revokeObjectURL(url);
+  // ---- CSV export of *filtered* reports, as a background job ----
+  const handleExportCsv = async () => {
+    if (!total || exporting) return;
+
+    const params = {
+      fields: [
+        "report_id",
+        "title",
+        "area_name",
+        "category_name",
+        "current_status",
+        "severity_label",
+        "created_at",
+      ],
+    };
+    if (searchTerm) params.search = searchTerm;
+    for (const key of Object.keys(NO_FILTERS)) {
+      if (filters[key]) params[key] = filters[key];
+    }
+
+    try {
+      setExporting(true);
+      const started = Date.now();
+      let job = await submitJob("export-reports", params);
+      while (["QUEUED", "RUNNING"].includes(job.status)) {
+        const waited = Date.now() - started;
+        if (job.status === "QUEUED" && waited >= EXPORT_QUEUE_WAIT_MS) {
+          try {
+            job = await cancelJob(job.job_id);
+          } catch {
+            // finished meanwhile (409): use its outcome below
+            job = await getJob(job.job_id);
+          }
+          // dequeued, or claimed just now and told to stop
+          if (["QUEUED", "RUNNING", "CANCELLED"].includes(job.status)) {
+            window.location.href = reportsExportUrl(params);
+            return;
+          }
+          break;
+        }
+        if (waited >= EXPORT_DEADLINE_MS) {
+          setError(
+            `CSV export is taking longer than ${EXPORT_DEADLINE_MS / 60000} minutes; ` +
+              `job ${job.job_id} is still ${job.status}. Check GET /jobs/${job.job_id} later.`
+          );
+          return;
+        }
+        await sleep(1000);
+        job = await getJob(job.job_id);
+      }
+      if (job.status !== "SUCCEEDED") {
+        throw new Error(`export job ${job.job_id} ${job.status}`);
+      }
+      window.location.href = jobResultUrl(job.job_id);
+    } catch (err) {
+      console.error(err);
+      setError("CSV export failed.");
+    } finally {
+      setExporting(false);
+    }
   };
 
   return (
@@ -299,66 +312,91 @@ export default function Reports() {
           </div>
         </section>
 
-        {/* Filter row */}
-        <section className="mb-4 flex flex-col gap-3 md:flex-row md:items-center md:justify-between">
+        {/* Filter row: one pill / option per facet value, with its count */}
+        <section className="mb-4 flex flex-col gap-3">
           <div className="flex flex-wrap gap-2">
             <FilterPill
               label="All grids"
-              active={
-                filters.severity === "all" &&
-                filters.status === "all" &&
-                !filters.breachingOnly
-              }
+              active={Object.values(filters).every((v) => !v)}
               onClick={handleAllGrids}
             />
             <FilterPill
-              label="High severity"
-              active={filters.severity === "high"}
-              onClick={toggleHighSeverity}
-            />
-            <FilterPill
-              label="Open"
-              active={filters.status === "open"}
-              onClick={toggleOpen}
+              label={facets ? `Open · ${facets.open}` : "Open"}
+              active={filters.open}
+              onClick={() => toggleFlag("open")}
             />
             <FilterPill
-              label="Breaching SLA"
-              active={filters.breachingOnly}
-              onClick={toggleBreaching}
+              label={facets ? `Breaching SLA · ${facets.breaching}` : "Breaching SLA"}
+              active={filters.breaching}
+              onClick={() => toggleFlag("breaching")}
             />
+            {(facets?.status || []).map((f) => (
+              <FilterPill
+                key={f.value}
+                label={`${f.label} · ${f.count}`}
+                active={filters.status === f.value}
+                onClick={() => toggleFilter("status", f.value)}
+              />
+            ))}
           </div>
 
-          <div className="flex items-center gap-2 text-xs">
-            <button
-              onClick={toggleLast24h}
-              className={
-                "rounded-full border px-3 py-1.5 text-[0.7rem] transition " +
-                (filters.last24h
-                  ? "border-sky-400 bg-sky-500/10 text-sky-100"
-                  : "border-slate-700 bg-slate-900/70 text-slate-200 hover:border-sky-400/70 hover:text-sky-100")
-              }
-            >
-              Filter • Last 24h
-            </button>
-            <button
-              onClick={handleExportCsv}
-              className="rounded-full border border-slate-700 bg-slate-900/70 px-3 py-1.5 text-[0.7rem] text-slate-200 hover:border-sky-400/70 hover:text-sky-100"
-            >
-              Export CSV
-            </button>
+          <div className="flex flex-col gap-3 md:flex-row md:items-center md:justify-between">
+            <div className="flex flex-wrap items-center gap-2">
+              {(facets?.severity || []).map((f) => (
+                <FilterPill
+                  key={f.value}
+                  label={`${f.label} severity · ${f.count}`}
+                  active={filters.severity_id === f.value}
+                  onClick={() => toggleFilter("severity_id", f.value)}
+                />
+              ))}
+              <FacetSelect
+                label="All areas"
+                options={facets?.area}
+                value={filters.area_id}
+                onChange={selectFilter("area_id")}
+              />
+              <FacetSelect
+                label="All categories"
+                options={facets?.category}
+                value={filters.category_id}
+                onChange={selectFilter("category_id")}
+              />
+            </div>
+
+            <div className="flex items-center gap-2 text-xs">
+              <button
+                onClick={toggleLast24h}
+                className={
+                  "rounded-full border px-3 py-1.5 text-[0.7rem] transition " +
+                  (filters.created_after
+                    ? "border-sky-400 bg-sky-500/10 text-sky-100"
+                    : "border-slate-700 bg-slate-900/70 text-slate-200 hover:border-sky-400/70 hover:text-sky-100")
+                }
+              >
+                Filter • Last 24h{facets ? ` · ${facets.last_24h}` : ""}
+              </button>
+              <button
+                onClick={handleExportCsv}
+                disabled={exporting || !total}
+                className="rounded-full border border-slate-700 bg-slate-900/70 px-3 py-1.5 text-[0.7rem] text-slate-200 hover:border-sky-400/70 hover:text-sky-100 disabled:opacity-40"
+              >
+                {exporting ? "Exporting…" : "Export CSV"}
+              </button>
+            </div>
           </div>
         </section>
 
         {/* Meta row: counts + pagination controls */}
         <section className="mb-3 flex flex-col gap-2 text-[0.7rem] text-slate-400 md:flex-row md:items-center md:justify-between">
           <span>
-            Showing {filtered.length} of {reports.length} reports
+            Showing {reports.length} of {total} reports
             {searchTerm && ` (search: “${searchTerm}”)`}
           </span>
           <div className="flex items-center gap-2">
             <button
-              onClick={() => setPage((p) => Math.max(1, p - 1))}
-              disabled={page === 1}
+              onClick={goPrev}
+              disabled={page === 1 || loading}
               className="rounded-full border border-slate-700 bg-slate-900/70 px-3 py-1 disabled:opacity-40"
             >
               Prev
@@ -367,8 +405,8 @@ export default function Reports() {
               Page {page} / {totalPages}
             </span>
             <button
-              onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-              disabled={page === totalPages}
+              onClick={goNext}
+              disabled={!nextCursor || loading}
               className="rounded-full border border-slate-700 bg-slate-900/70 px-3 py-1 disabled:opacity-40"
             >
               Next
@@ -388,14 +426,14 @@ export default function Reports() {
             <div className="text-[0.8rem] text-rose-300">{error}</div>
           )}
 
-          {!loading && !error && currentPageReports.length === 0 && (
+          {!loading && !error && reports.length === 0 && (
             <div className="text-[0.8rem] text-slate-400">
               No reports match the current filters.
             </div>
           )}
 
           <div className="space-y-3">
-            {currentPageReports.map((r) => (
+            {reports.map((r) => (
               <article
                 key={r.report_id}
                 className="group rounded-2xl border border-slate-800/80 bg-slate-900/70 px-4 py-3 text-xs md:text-[0.8rem] hover:border-sky-400/60 hover:bg-slate-900/90 transition"
@@ -447,6 +485,24 @@ function FilterPill({ label, active, onClick }) {
   );
 }
 
+// area / category picker; options are facet counts ({ value, label, count })
+function FacetSelect({ label, options, value, onChange }) {
+  return (
+    <select
+      value={value ?? ""}
+      onChange={onChange}
+      className="rounded-full border border-slate-700 bg-slate-900/70 px-3 py-1.5 text-xs text-slate-200 outline-none hover:border-sky-400/70"
+    >
+      <option value="">{label}</option>
+      {(options || []).map((f) => (
+        <option key={f.value} value={f.value}>
+          {f.label} ({f.count})
+        </option>
+      ))}
+    </select>
+  );
+}
+
 function Tag({ label, tone }) {
   if (!label) return null;
 
@@ -42,10 +42,31 @@ export async function getReports(params = {}) {
   return res.json();
 }
 
+// one page of reports plus total, per-status / area / category / severity counts
+// and the open / breaching / last-24h counts; pass next_cursor back for the next page
+export async function getReportPage(params = {}, cursor = null, limit = 50) {
+  const qs = new URLSearchParams({ facets: "true", limit: String(limit) });
+  for (const key of ["search", "area_id", "category_id", "status", "severity_id", "created_after"]) {
+    if (params[key]) qs.set(key, params[key]);
+  }
+  for (const key of ["open", "breaching", "include_archived"]) {
+    if (params[key]) qs.set(key, "true");
+  }
+  if (cursor) qs.set("cursor", cursor);
+  return apiRequest(`/reports/?${qs.toString()}`);
+}
+
 export async function getReport(reportId) {
   return apiRequest(`/reports/${reportId}`);
 }
 
+// status history, newest first; pass next_cursor back for older pages
+export async function getReportHistory(reportId, cursor = null, limit = 50) {
+  const qs = new URLSearchParams({ limit: String(limit) });
+  if (cursor) qs.set("cursor", cursor);
+  return apiRequest(`/reports/${reportId}/history?${qs.toString()}`);
+}
+
 export async function createReport(payload) {
   return apiRequest("/reports/", {
     method: "POST",
@@ -66,8 +87,63 @@ export async function deleteReport(reportId) {
   });
 }
 
+// ---------- JOBS ----------
+
+// queue a background job (GET /jobs/types lists them); returns the job
+export async function submitJob(jobType, params = {}) {
+  return apiRequest("/jobs/", {
+    method: "POST",
+    body: JSON.stringify({ job_type: jobType, params }),
+  });
+}
+
+export async function getJob(jobId) {
+  return apiRequest(`/jobs/${jobId}`);
+}
+
+// download link for a SUCCEEDED job's result file (export-reports CSV)
+export function jobResultUrl(jobId) {
+  return `${API_BASE}/jobs/${jobId}/result`;
+}
+
+// dequeue a queued job or stop a running one; 409 once it has finished
+export async function cancelJob(jobId) {
+  return apiRequest(`/jobs/${jobId}/cancel`, { method: "POST" });
+}
+
+// download link for the same CSV written inside the request (GET /reports/export),
+// for when no job worker is running; takes export-reports params
+export function reportsExportUrl(params = {}) {
+  const qs = new URLSearchParams();
+  if (params.fields) qs.set("fields", params.fields.join(","));
+  for (const key of ["search", "area_id", "category_id", "status", "severity_id", "created_after"]) {
+    if (params[key]) qs.set(key, params[key]);
+  }
+  for (const key of ["open", "breaching", "include_archived"]) {
+    if (params[key]) qs.set(key, "true");
+  }
+  return `${API_BASE}/reports/export?${qs.toString()}`;
+}
+
 // ---------- REFDATA (for statuses on detail page) ----------
 
 export async function getStatuses() {
   return apiRequest("/statuses");
 }
+
+// { STATUS: [allowed next statuses] }
+export async function getStatusTransitions() {
+  return apiRequest("/statuses/transitions");
+}
+
+// ---------- ANALYTICS ----------
+
+// interval: hour | day | week, group_by: category | area | status,
+// since / until: ISO timestamps (defaults: last 30 days)
+export async function getTimeseries(params = {}) {
+  const qs = new URLSearchParams();
+  for (const key of ["interval", "group_by", "since", "until"]) {
+    if (params[key]) qs.set(key, params[key]);
+  }
+  return apiRequest(`/analytics/timeseries?${qs.toString()}`);
+}